@@ -0,0 +1,246 @@
+# Importing testing frameworks:
+import unittest
+
+# Importing 3rd party packages:
+import os
+import time
+import tempfile
+import datetime
+import threading
+import numpy as np
+import pandas as pd
+
+# Importing Base Objects for testing:
+from velkoz_web_packages.objects_base.web_objects_base import BaseWebPageResponse
+from velkoz_web_packages.objects_base.ingestion_engines_base import BaseWebPageIngestionEngine
+from velkoz_web_packages.objects_stock_data.objects_stock_price.web_objects_stock_price import NASDAQStockPriceResponseObject
+from velkoz_web_packages.objects_stock_data.objects_stock_price.ingestion_engines_stock_price import StockPriceDataIngestionEngine
+
+class OfflineResponse(object):
+    """A stand-in for the requests.Response object of an offline Web Object."""
+    status_code = 200
+
+class OfflineWebPageResponse(BaseWebPageResponse):
+    """
+    A BaseWebPageResponse that does not perform a GET request so that the
+    Ingestion Engine can be tested without network access. Each object is given
+    a unique initialized time as it is the primary key of the default table.
+    """
+    _time_lock = threading.Lock()
+    _time_counter = 0
+
+    def __init__(self, url, html_body=b"<html></html>"):
+
+        with OfflineWebPageResponse._time_lock:
+            OfflineWebPageResponse._time_counter += 1
+            counter = OfflineWebPageResponse._time_counter
+
+        self._kwargs = {}
+        self._url = url
+        self._initialized_time = datetime.datetime(2020, 1, 1) + datetime.timedelta(seconds=counter)
+        self._http_response = OfflineResponse()
+        self._html_body = html_body
+
+def build_offline_price_obj(ticker, num_rows):
+    """Builds a NASDAQStockPriceResponseObject without any network requests."""
+    price_obj = NASDAQStockPriceResponseObject.__new__(NASDAQStockPriceResponseObject)
+    price_obj._ticker = ticker
+    price_obj._initialized_time = datetime.datetime.now()
+    price_obj._price_history_full = pd.DataFrame(
+        {"close": np.arange(num_rows, dtype=float), "volume": np.arange(num_rows)},
+        index=pd.date_range("2000-01-01", periods=num_rows, name="Date"))
+
+    return price_obj
+
+def count_rows(ingestion_engine):
+    """Counts the rows written to the default Web Object table."""
+    if "default_web_obj_tbl" not in ingestion_engine._sqlaengine.table_names():
+        return 0
+
+    return len(pd.read_sql_table("default_web_obj_tbl", con=ingestion_engine._sqlaengine))
+
+class BaseIngestionEngineStreamingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_uri = f"sqlite:///{os.path.join(self.tmp_dir.name, 'streaming.db')}"
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_streaming_size_and_time_flush(self):
+        """
+        The method tests that the streaming writer flushes a batch as soon as it
+        reaches the flush size, flushes partial batches once the flush interval
+        has passed and writes all remaining Web Objects when streaming is stopped.
+        """
+        ingestion_engine = BaseWebPageIngestionEngine(self.db_uri)
+        ingestion_engine._start_stream_writer(max_que_size=4, flush_size=5, flush_interval=0.3)
+
+        # Pushing a full batch of Web Objects; it should be written without stopping:
+        for num in range(5):
+            ingestion_engine._stream_web_obj(OfflineWebPageResponse(f"https://test/{num}"))
+
+        deadline = time.monotonic() + 5
+        while count_rows(ingestion_engine) < 5 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(count_rows(ingestion_engine), 5)
+
+        # Pushing a partial batch that is only flushed by the flush interval:
+        ingestion_engine._stream_web_obj(OfflineWebPageResponse("https://test/partial"))
+        deadline = time.monotonic() + 5
+        while count_rows(ingestion_engine) < 6 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(count_rows(ingestion_engine), 6)
+
+        # Stopping the writer writes the rest of the que:
+        for num in range(3):
+            ingestion_engine._stream_web_obj(OfflineWebPageResponse(f"https://test/final/{num}"))
+
+        self.assertEqual(ingestion_engine._stop_stream_writer(), [])
+        self.assertEqual(count_rows(ingestion_engine), 9)
+        self.assertEqual(ingestion_engine._stream_stats["objects_written"], 9)
+
+    def test_streaming_byte_flush(self):
+        """
+        The method tests that a batch is flushed once the estimated size of its
+        Web Objects reaches the flush byte limit.
+        """
+        ingestion_engine = BaseWebPageIngestionEngine(self.db_uri)
+        ingestion_engine._start_stream_writer(flush_size=1000, flush_bytes=3000, flush_interval=60)
+
+        for num in range(3):
+            ingestion_engine._stream_web_obj(OfflineWebPageResponse(f"https://test/{num}", b"x" * 1000))
+
+        deadline = time.monotonic() + 5
+        while count_rows(ingestion_engine) < 3 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(count_rows(ingestion_engine), 3)
+
+        ingestion_engine._stop_stream_writer()
+        self.assertEqual(ingestion_engine._stream_stats["batches_written"], 1)
+
+class BaseIngestionEngineThreadSafetyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_uri = f"sqlite:///{os.path.join(self.tmp_dir.name, 'threads.db')}"
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_concurrent_insert_and_write(self):
+        """
+        The method stress tests the que of the Ingestion Engine. Several producer
+        threads insert Web Objects while several writer threads repeatedly write
+        the que. Every Web Object must be written exactly once.
+        """
+        ingestion_engine = BaseWebPageIngestionEngine(self.db_uri)
+        self.assertIsNot(ingestion_engine._write_lock, None)
+        producers_done = threading.Event()
+        errors = []
+
+        def produce(producer_num):
+            for num in range(50):
+                ingestion_engine._insert_web_obj(OfflineWebPageResponse(f"https://test/{producer_num}/{num}"))
+
+        def write():
+            try:
+                while not producers_done.is_set():
+                    ingestion_engine._write_web_objects()
+                ingestion_engine._write_web_objects()
+            except Exception as error:
+                errors.append(error)
+            finally:
+                ingestion_engine._db_session.remove()
+
+        producers = [threading.Thread(target=produce, args=(num,)) for num in range(8)]
+        writers = [threading.Thread(target=write) for num in range(3)]
+
+        for thread in producers + writers:
+            thread.start()
+        for thread in producers:
+            thread.join()
+        producers_done.set()
+        for thread in writers:
+            thread.join()
+
+        # Writing any Web Objects inserted after the final writer loop:
+        ingestion_engine._write_web_objects()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(ingestion_engine._WebPageResponseObjs), 0)
+
+        written_df = pd.read_sql_table("default_web_obj_tbl", con=ingestion_engine._sqlaengine)
+        self.assertEqual(len(written_df), 400)
+        self.assertEqual(written_df["url"].nunique(), 400)
+
+    def test_concurrent_streaming_producers(self):
+        """
+        The method stress tests streaming mode with several producer threads
+        pushing Web Objects into a small bounded que.
+        """
+        ingestion_engine = BaseWebPageIngestionEngine(self.db_uri)
+        ingestion_engine._start_stream_writer(max_que_size=10, flush_size=25, flush_interval=0.1)
+
+        def produce(producer_num):
+            for num in range(50):
+                ingestion_engine._stream_web_obj(OfflineWebPageResponse(f"https://test/{producer_num}/{num}"))
+
+        producers = [threading.Thread(target=produce, args=(num,)) for num in range(8)]
+        for thread in producers:
+            thread.start()
+        for thread in producers:
+            thread.join()
+
+        self.assertEqual(ingestion_engine._stop_stream_writer(), [])
+
+        written_df = pd.read_sql_table("default_web_obj_tbl", con=ingestion_engine._sqlaengine)
+        self.assertEqual(len(written_df), 400)
+        self.assertEqual(written_df["url"].nunique(), 400)
+
+    def test_in_memory_database_shared_between_threads(self):
+        """
+        The method tests that data written to an in-memory database from a worker
+        thread is visible from other threads.
+        """
+        ingestion_engine = BaseWebPageIngestionEngine("sqlite:///:memory:")
+        ingestion_engine._insert_web_obj(OfflineWebPageResponse("https://test/in-memory"))
+
+        writer = threading.Thread(target=ingestion_engine._write_web_objects)
+        writer.start()
+        writer.join()
+
+        self.assertEqual(count_rows(ingestion_engine), 1)
+
+    def test_concurrent_price_ingestion(self):
+        """
+        The method stress tests the StockPriceDataIngestionEngine with several
+        threads each inserting and writing their own price objects through one
+        shared engine in single writer mode.
+        """
+        ingestion_engine = StockPriceDataIngestionEngine(self.db_uri)
+        errors = []
+
+        def ingest(thread_num):
+            try:
+                for num in range(10):
+                    ingestion_engine._insert_web_obj(build_offline_price_obj(f"T{thread_num}_{num}", 50 + num))
+                    ingestion_engine._write_web_objects()
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=ingest, args=(num,)) for num in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+
+        db_tables = set(ingestion_engine._sqlaengine.table_names())
+        self.assertEqual(len(db_tables), 60)
+        for thread_num in range(6):
+            for num in range(10):
+                price_df = pd.read_sql_table(f"T{thread_num}_{num}_price_history", ingestion_engine._sqlaengine)
+                self.assertEqual(len(price_df), 50 + num)
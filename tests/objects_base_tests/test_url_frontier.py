@@ -0,0 +1,86 @@
+# Importing testing frameworks:
+import unittest
+
+# Importing 3rd party packages:
+import os
+import tempfile
+import threading
+
+# Importing velkoz web packages for testing:
+from velkoz_web_packages.objects_base.url_frontier_base import URLFrontier
+
+class URLFrontierTest(unittest.TestCase):
+
+    def test_url_frontier_claims_and_dedup(self):
+        """
+        The method tests that claimed (pending), normalized-equal and seen urls are
+        not claimed again, and that released urls are.
+        """
+        url_frontier = URLFrontier()
+
+        self.assertTrue(url_frontier.claim_url("https://www.sec.gov/a"))
+        self.assertTrue(url_frontier.claim_url("https://www.sec.gov/b"))
+
+        # Duplicates of pending urls, including urls that only differ by fragment or host case:
+        self.assertFalse(url_frontier.claim_url("https://www.sec.gov/a"))
+        self.assertFalse(url_frontier.claim_url("https://WWW.SEC.GOV/a#section-1"))
+        self.assertFalse(url_frontier.is_seen("https://www.sec.gov/a"))
+
+        # Seen urls are not claimed again, released urls are:
+        url_frontier.mark_seen("https://www.sec.gov/a")
+        url_frontier.release_url("https://www.sec.gov/b")
+        self.assertTrue(url_frontier.is_seen("https://www.sec.gov/a"))
+        self.assertFalse(url_frontier.claim_url("https://www.sec.gov/a"))
+        self.assertTrue(url_frontier.claim_url("https://www.sec.gov/b"))
+        self.assertEqual(repr(url_frontier), "URLFrontier(pending=1, seen=1)")
+
+    def test_url_frontier_concurrent_claims(self):
+        """
+        The method tests that when many threads claim the same urls each url is
+        claimed by exactly one thread.
+        """
+        url_frontier = URLFrontier()
+        claimed_urls = []
+        claimed_urls_lock = threading.Lock()
+        start_barrier = threading.Barrier(8)
+
+        def claim_urls():
+            start_barrier.wait()
+            for url_num in range(500):
+                if url_frontier.claim_url(f"https://www.sec.gov/Archives/{url_num}"):
+                    with claimed_urls_lock:
+                        claimed_urls.append(url_num)
+
+        claim_threads = [threading.Thread(target=claim_urls) for i in range(8)]
+        for claim_thread in claim_threads:
+            claim_thread.start()
+        for claim_thread in claim_threads:
+            claim_thread.join()
+
+        self.assertEqual(sorted(claimed_urls), list(range(500)))
+
+    def test_url_frontier_persistence(self):
+        """
+        The method tests that the seen-set is persisted as 8 byte digests and read
+        by the frontier of a resumed run, ignoring a partially written digest.
+        """
+        with tempfile.TemporaryDirectory() as frontier_dir:
+            seen_path = os.path.join(frontier_dir, "seen_urls.bin")
+
+            url_frontier = URLFrontier(seen_path)
+            for url_num in range(100):
+                url_frontier.mark_seen(f"https://www.sec.gov/Archives/{url_num}")
+            url_frontier.mark_seen("https://www.sec.gov/Archives/0")
+            url_frontier.close()
+
+            self.assertEqual(os.path.getsize(seen_path), 100 * URLFrontier.DIGEST_SIZE)
+
+            # Simulating a run interrupted while writing a digest:
+            with open(seen_path, "ab") as seen_file:
+                seen_file.write(b"\x00\x01\x02")
+
+            resumed_frontier = URLFrontier(seen_path)
+            self.assertTrue(resumed_frontier.is_seen("https://www.sec.gov/Archives/99"))
+            self.assertFalse(resumed_frontier.claim_url("https://www.sec.gov/Archives/50"))
+            self.assertTrue(resumed_frontier.claim_url("https://www.sec.gov/Archives/100"))
+            resumed_frontier.close()
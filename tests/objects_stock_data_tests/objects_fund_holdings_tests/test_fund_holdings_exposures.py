@@ -0,0 +1,62 @@
+# Importing testing frameworks:
+import unittest
+
+# Importing 3rd party packages for testing:
+import datetime
+import numpy as np
+import pandas as pd
+
+# Importing velkoz web packages for testing:
+from velkoz_web_packages.objects_stock_data.objects_fund_holdings.ingestion_engines_fund_holdings import FundHoldingsDataIngestionEngine
+from velkoz_web_packages.objects_stock_data.objects_fund_holdings.exposure_analytics_fund_holdings import FundHoldingsMatrix, build_holdings_matrix, compute_exposures_pandas, generate_synthetic_holdings, generate_synthetic_portfolios
+
+class FundHoldingsExposureTest(unittest.TestCase):
+
+    def test_portfolio_exposures(self):
+        """
+        This method tests the look-through exposures computed from a holdings matrix
+        built from the holdings stored by the FundHoldingsDataIngestionEngine.
+        """
+        ingestion_engine = FundHoldingsDataIngestionEngine("sqlite:///:memory:")
+        ingestion_engine._write_holdings_data("VOO", pd.DataFrame(
+            {"name": ["Apple", "Microsoft"], "percent_holdings": [6.0, 5.0]},
+            index=pd.Index(["AAPL", "MSFT"], name="symbol")), as_of_date=datetime.date(2021, 1, 4))
+        ingestion_engine._write_holdings_data("QQQ", pd.DataFrame(
+            {"name": ["Apple", "Amazon"], "percent_holdings": [10.0, 8.0]},
+            index=pd.Index(["AAPL", "AMZN"], name="symbol")), as_of_date=datetime.date(2021, 1, 4))
+
+        holdings_matrix = build_holdings_matrix(ingestion_engine)
+        self.assertEqual(holdings_matrix.shape, (2, 3))
+        self.assertEqual(holdings_matrix.nnz, 4)
+        self.assertEqual(holdings_matrix.to_dense().loc["QQQ", "AMZN"], 8.0)
+
+        exposures_df = holdings_matrix.compute_exposures({
+            "balanced": {"VOO": 0.5, "QQQ": 0.5},
+            "voo_only": {"VOO": 1.0}})
+
+        self.assertEqual(list(exposures_df.columns), ["AAPL", "AMZN", "MSFT"])
+        self.assertEqual(list(exposures_df.loc["balanced"]), [8.0, 4.0, 2.5])
+        self.assertEqual(list(exposures_df.loc["voo_only"]), [6.0, 0.0, 5.0])
+
+        # Funds without holdings are ignored with a warning:
+        with self.assertWarns(UserWarning):
+            single_exposure = holdings_matrix.compute_exposure({"QQQ": 1.0, "UNKNOWN": 1.0})
+
+        self.assertEqual(list(single_exposure.index[:2]), ["AAPL", "AMZN"])
+        self.assertEqual(single_exposure["AAPL"], 10.0)
+
+    def test_exposures_match_pandas(self):
+        """
+        This method tests that the sparse exposures of many synthetic portfolios
+        match the pandas merge implementation.
+        """
+        holdings_df = generate_synthetic_holdings(300, 20, 1000, seed=1)
+        portfolio_weights = generate_synthetic_portfolios(holdings_df["fund"].unique(), 25, 8, seed=2)
+
+        exposures_df = FundHoldingsMatrix(holdings_df).compute_exposures(portfolio_weights)
+        pandas_exposures_df = compute_exposures_pandas(holdings_df, portfolio_weights)
+
+        self.assertEqual(sorted(exposures_df.columns), sorted(pandas_exposures_df.columns))
+        np.testing.assert_allclose(
+            exposures_df[pandas_exposures_df.columns].to_numpy(), pandas_exposures_df.to_numpy(), atol=1e-12)
+        np.testing.assert_allclose(exposures_df.sum(axis=1).to_numpy(), 100.0)
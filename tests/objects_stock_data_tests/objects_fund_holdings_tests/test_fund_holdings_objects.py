@@ -149,8 +149,9 @@ class FundHoldingsDataIngestionEngineTest(unittest.TestCase):
 
         The method tests the Ingestion Engine’s ability to:
 
-        * Create a new table for a ticker if it does not already exist and populate
-            it with the most recent pricing data.
+        * Write a snapshot of the holdings of each fund to the “fund_holdings”
+            table and the digest of each snapshot to the “fund_holdings_digests” table.
+        * Read the latest snapshot of each fund back in the written format.
 
         """
         # Creating a populated ingestion engine for testing:
@@ -163,16 +164,17 @@ class FundHoldingsDataIngestionEngineTest(unittest.TestCase):
 
         # Asserting that the correct data was written to the database:
         extracted_db_tbls_lst = sorted(ingestion_engine._sqlaengine.table_names())
-        test_db_tbls_lst = sorted(["ICLN_holdings_data", "QCLN_holdings_data", "VOO_holdings_data"])
+        test_db_tbls_lst = sorted(["fund_holdings", "fund_holdings_by_symbol", "fund_holdings_digests", "symbols"])
 
         self.assertEqual(extracted_db_tbls_lst, test_db_tbls_lst)
 
-        # Extracting data from the in-memory database as pandas dataframe for type-checking:
-        icln_data = pd.read_sql_table("ICLN_holdings_data", con=ingestion_engine._sqlaengine, index_col='symbol')
-        qcln_data = pd.read_sql_table("QCLN_holdings_data", con=ingestion_engine._sqlaengine, index_col='symbol')
-        voo_data = pd.read_sql_table("VOO_holdings_data", con=ingestion_engine._sqlaengine, index_col='symbol')
+        # Extracting the latest snapshots from the in-memory database for type-checking:
+        latest_holdings_df = ingestion_engine._get_latest_holdings()
+        self.assertEqual(sorted(latest_holdings_df.fund.unique()), ["ICLN", "QCLN", "VOO"])
 
         # Comparing the read data to the written data to ensure accurate writing:
-        self.assertEqual(icln_data.equals(icln_holdings._holdings_data), True)
-        self.assertEqual(qcln_data.equals(qcln_holdings._holdings_data), True)
-        self.assertEqual(voo_data.equals(voo_holdings._holdings_data), True)
+        for fund_holdings in (icln_holdings, qcln_holdings, voo_holdings):
+
+            fund_df = latest_holdings_df[latest_holdings_df.fund == fund_holdings._ticker].set_index("symbol")
+            self.assertEqual(
+                fund_df[["name", "percent_holdings"]].sort_index().equals(fund_holdings._holdings_data.sort_index()), True)
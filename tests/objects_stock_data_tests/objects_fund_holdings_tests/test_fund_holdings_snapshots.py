@@ -0,0 +1,272 @@
+# Importing testing frameworks:
+import unittest
+
+# Importing 3rd party packages for testing:
+import os
+import datetime
+import threading
+import tempfile
+import sqlalchemy
+import pandas as pd
+
+# Importing velkoz web packages for testing:
+from velkoz_web_packages.objects_stock_data.objects_fund_holdings.ingestion_engines_fund_holdings import FundHoldingsDataIngestionEngine
+
+def build_holdings_df(holdings):
+    """Builds a holdings dataframe in the NASDAQFundHoldingsResponseObject schema from (symbol, name, percent) tuples."""
+    return pd.DataFrame(holdings, columns=["symbol", "name", "percent_holdings"]).set_index("symbol")
+
+class FundHoldingsSnapshotTest(unittest.TestCase):
+
+    def test_change_only_snapshot_writes(self):
+        """
+        This method tests that the FundHoldingsDataIngestionEngine only writes a new
+        holdings snapshot when the holdings of a fund change, that a snapshot taken
+        twice on the same date is replaced and that the latest snapshot of each fund
+        is read back.
+        """
+        ingestion_engine = FundHoldingsDataIngestionEngine("sqlite:///:memory:")
+
+        first_df = build_holdings_df([("AAPL", "Apple Inc", 6.5), ("MSFT", "Microsoft Corp", 5.9)])
+        changed_df = build_holdings_df([("AAPL", "Apple Inc", 6.7), ("MSFT", "Microsoft Corp", 5.9), ("AMZN", "Amazon.com Inc", 4.1)])
+
+        # Writing the first snapshot of two funds, then unchanged holdings on a later date:
+        self.assertTrue(ingestion_engine._write_holdings_data("VOO", first_df, as_of_date=datetime.date(2021, 1, 4)))
+        self.assertTrue(ingestion_engine._write_holdings_data("SPY", first_df, as_of_date=datetime.date(2021, 1, 4)))
+        self.assertFalse(ingestion_engine._write_holdings_data(
+            "VOO", first_df.iloc[::-1], as_of_date=datetime.date(2021, 1, 5)))
+
+        # Writing changed holdings for a single fund:
+        self.assertTrue(ingestion_engine._write_holdings_data("VOO", changed_df, as_of_date=datetime.date(2021, 1, 6)))
+
+        voo_id = ingestion_engine._symbol_registry.get_symbol_id("VOO", register=False)
+        with ingestion_engine._sqlaengine.connect() as db_con:
+            snapshot_counts = dict(db_con.execute(
+                f"SELECT as_of_date, COUNT(*) FROM fund_holdings WHERE fund_id = {voo_id} GROUP BY as_of_date").fetchall())
+            digest_row = db_con.execute(
+                f"SELECT as_of_date, row_count FROM fund_holdings_digests WHERE fund_id = {voo_id}").first()
+            symbol_count = db_con.execute("SELECT COUNT(*) FROM symbols").scalar()
+
+        self.assertEqual(snapshot_counts, {"2021-01-04": 2, "2021-01-06": 3})
+        self.assertEqual(tuple(digest_row), ("2021-01-06", 3))
+        self.assertEqual(symbol_count, 5) # VOO, SPY, AAPL, MSFT and AMZN are each stored once
+
+        latest_holdings_df = ingestion_engine._get_latest_holdings()
+        self.assertEqual(list(latest_holdings_df.fund), ["SPY", "SPY", "VOO", "VOO", "VOO"])
+        self.assertEqual(list(latest_holdings_df[latest_holdings_df.fund == "VOO"].symbol), ["AAPL", "MSFT", "AMZN"])
+        self.assertEqual(latest_holdings_df.as_of_date.max(), pd.Timestamp("2021-01-06"))
+
+        # Replacing the snapshot of a fund taken earlier on the same date:
+        self.assertTrue(ingestion_engine._write_holdings_data("VOO", first_df, as_of_date=datetime.date(2021, 1, 6)))
+        voo_df = ingestion_engine._get_latest_holdings(["VOO"])
+        self.assertEqual(sorted(voo_df.symbol), ["AAPL", "MSFT"])
+
+    def test_backfilled_snapshot_writes(self):
+        """
+        This method tests that a snapshot backfilled with an earlier date than the
+        latest snapshot is compared to the snapshot in effect on its date rather than
+        to the latest snapshot, so that no gap is left in the history of the fund.
+        """
+        ingestion_engine = FundHoldingsDataIngestionEngine("sqlite:///:memory:")
+
+        first_df = build_holdings_df([("AAPL", "Apple Inc", 6.5), ("MSFT", "Microsoft Corp", 5.9)])
+        latest_df = build_holdings_df([("AAPL", "Apple Inc", 6.9), ("TSLA", "Tesla Inc", 2.1)])
+
+        self.assertTrue(ingestion_engine._write_holdings_data("VOO", first_df, as_of_date=datetime.date(2021, 1, 4)))
+        self.assertTrue(ingestion_engine._write_holdings_data("VOO", latest_df, as_of_date=datetime.date(2021, 2, 1)))
+
+        # Backfilling the latest holdings on an earlier date writes a snapshot:
+        self.assertTrue(ingestion_engine._write_holdings_data("VOO", latest_df, as_of_date=datetime.date(2021, 1, 20)))
+
+        # Backfilling the holdings already in effect on a date writes nothing:
+        self.assertFalse(ingestion_engine._write_holdings_data("VOO", first_df.iloc[::-1], as_of_date=datetime.date(2021, 1, 11)))
+        self.assertFalse(ingestion_engine._write_holdings_data("VOO", latest_df, as_of_date=datetime.date(2021, 1, 25)))
+
+        # Backfilling a date before the first snapshot writes a snapshot:
+        self.assertTrue(ingestion_engine._write_holdings_data("VOO", first_df, as_of_date=datetime.date(2020, 12, 1)))
+
+        voo_id = ingestion_engine._symbol_registry.get_symbol_id("VOO", register=False)
+        with ingestion_engine._sqlaengine.connect() as db_con:
+            snapshot_dates = [snapshot_date for snapshot_date, in db_con.execute(
+                f"SELECT DISTINCT as_of_date FROM fund_holdings WHERE fund_id = {voo_id} ORDER BY as_of_date")]
+            digest_row = db_con.execute(
+                f"SELECT as_of_date, row_count FROM fund_holdings_digests WHERE fund_id = {voo_id}").first()
+
+        self.assertEqual(snapshot_dates, ["2020-12-01", "2021-01-04", "2021-01-20", "2021-02-01"])
+        self.assertEqual(tuple(digest_row), ("2021-02-01", 2))
+
+        # The latest snapshot is still compared to the stored digest:
+        self.assertFalse(ingestion_engine._write_holdings_data("VOO", latest_df, as_of_date=datetime.date(2021, 2, 2)))
+
+    def test_symbol_reverse_index(self):
+        """
+        This method tests that the reverse index of the latest holdings is kept up
+        to date as snapshots are written, that the cached lookup is cleared by new
+        snapshots and that the index is built for databases written without it.
+        """
+        ingestion_engine = FundHoldingsDataIngestionEngine("sqlite:///:memory:")
+
+        ingestion_engine._write_holdings_data("VOO", build_holdings_df(
+            [("AAPL", "Apple Inc", 6.5), ("MSFT", "Microsoft Corp", 5.9)]), as_of_date=datetime.date(2021, 1, 4))
+        ingestion_engine._write_holdings_data("QQQ", build_holdings_df(
+            [("AAPL", "Apple Inc", 11.2), ("AMZN", "Amazon.com Inc", 8.4)]), as_of_date=datetime.date(2021, 1, 4))
+
+        aapl_funds_df = ingestion_engine._get_funds_holding_symbol("AAPL")
+        self.assertEqual(list(aapl_funds_df.fund), ["QQQ", "VOO"])
+        self.assertEqual(list(aapl_funds_df.percent_holdings), [11.2, 6.5])
+        self.assertEqual(list(ingestion_engine._get_funds_holding_symbol("AAPL", min_percent=10).fund), ["QQQ"])
+        self.assertEqual(len(ingestion_engine._get_funds_holding_symbol("TSLA")), 0)
+
+        # Caching the lookup, then replacing the holdings of a fund:
+        self.assertEqual(list(ingestion_engine._get_funds_holding_symbol_cached("MSFT").fund), ["VOO"])
+        ingestion_engine._get_funds_holding_symbol_cached("MSFT")
+        self.assertEqual(ingestion_engine._symbol_lookup_stats["hits"], 1)
+
+        ingestion_engine._write_holdings_data("VOO", build_holdings_df(
+            [("AAPL", "Apple Inc", 6.9), ("TSLA", "Tesla Inc", 2.1)]), as_of_date=datetime.date(2021, 2, 1))
+
+        self.assertEqual(len(ingestion_engine._get_funds_holding_symbol_cached("MSFT")), 0)
+        self.assertEqual(list(ingestion_engine._get_funds_holding_symbol_cached("TSLA").fund), ["VOO"])
+
+        # Backfilling an older snapshot does not change the reverse index:
+        ingestion_engine._write_holdings_data("VOO", build_holdings_df(
+            [("NVDA", "Nvidia Corp", 1.0)]), as_of_date=datetime.date(2020, 12, 1))
+        self.assertEqual(len(ingestion_engine._get_funds_holding_symbol("NVDA")), 0)
+
+        # Rebuilding the reverse index from the latest snapshots:
+        with ingestion_engine._sqlaengine.begin() as db_con:
+            db_con.execute("DELETE FROM fund_holdings_by_symbol")
+
+        ingestion_engine._build_symbol_index()
+        self.assertEqual(list(ingestion_engine._get_funds_holding_symbol("AAPL").percent_holdings), [11.2, 6.9])
+        self.assertEqual(len(ingestion_engine._get_funds_holding_symbol("MSFT")), 0)
+
+    def test_symbol_lookup_cache_cleared_after_commit(self):
+        """
+        This method tests that the cached symbol lookup is only cleared once a new
+        snapshot is committed, so that a lookup made while the snapshot is being
+        written does not cache the replaced rows.
+        """
+        with tempfile.TemporaryDirectory() as db_dir:
+
+            ingestion_engine = FundHoldingsDataIngestionEngine(f"sqlite:///{os.path.join(db_dir, 'holdings.db')}")
+            ingestion_engine._write_holdings_data("VOO", build_holdings_df(
+                [("AAPL", "Apple Inc", 6.5), ("MSFT", "Microsoft Corp", 5.9)]), as_of_date=datetime.date(2021, 1, 4))
+
+            with ingestion_engine._sqlaengine.begin() as db_con:
+                ingestion_engine._write_holdings_data("VOO", build_holdings_df(
+                    [("AAPL", "Apple Inc", 6.9)]), con=db_con, as_of_date=datetime.date(2021, 2, 1))
+
+                # The lookup reads the committed rows while the snapshot is uncommitted:
+                self.assertEqual(list(ingestion_engine._get_funds_holding_symbol_cached("MSFT").fund), ["VOO"])
+
+            self.assertEqual(len(ingestion_engine._get_funds_holding_symbol_cached("MSFT")), 0)
+
+            # A rolled back snapshot does not clear the cache:
+            with self.assertRaises(RuntimeError):
+                with ingestion_engine._sqlaengine.begin() as db_con:
+                    ingestion_engine._write_holdings_data("VOO", build_holdings_df(
+                        [("MSFT", "Microsoft Corp", 5.9)]), con=db_con, as_of_date=datetime.date(2021, 3, 1))
+                    raise RuntimeError("Write failed")
+
+            ingestion_engine._get_funds_holding_symbol_cached("MSFT")
+            self.assertEqual(ingestion_engine._symbol_lookup_stats["hits"], 1)
+            ingestion_engine._sqlaengine.dispose()
+
+    def test_symbol_lookup_during_commit(self):
+        """
+        This method tests that a cached symbol lookup that reads the reverse index
+        before a new snapshot is committed, and returns after the cache is cleared,
+        does not put the replaced rows back into the cache.
+        """
+        with tempfile.TemporaryDirectory() as db_dir:
+
+            ingestion_engine = FundHoldingsDataIngestionEngine(f"sqlite:///{os.path.join(db_dir, 'holdings.db')}")
+            ingestion_engine._write_holdings_data("VOO", build_holdings_df(
+                [("AAPL", "Apple Inc", 6.5), ("MSFT", "Microsoft Corp", 5.9)]), as_of_date=datetime.date(2021, 1, 4))
+
+            # Holding the lookup after its query returns until the write is committed:
+            lookup_queried, write_committed = threading.Event(), threading.Event()
+            query_funds_holding_symbol = ingestion_engine._query_funds_holding_symbol
+
+            def delayed_query(symbol):
+                holding_rows = query_funds_holding_symbol(symbol)
+                lookup_queried.set()
+                write_committed.wait(10)
+                return holding_rows
+
+            ingestion_engine._query_funds_holding_symbol = delayed_query
+            lookup_results = []
+            lookup_thread = threading.Thread(
+                target=lambda: lookup_results.append(ingestion_engine._get_funds_holding_symbol_cached("MSFT")))
+            lookup_thread.start()
+
+            self.assertTrue(lookup_queried.wait(10))
+            ingestion_engine._write_holdings_data("VOO", build_holdings_df(
+                [("AAPL", "Apple Inc", 6.9)]), as_of_date=datetime.date(2021, 2, 1))
+            write_committed.set()
+            lookup_thread.join(10)
+
+            # The lookup returns the rows it read, but they are not cached:
+            self.assertEqual(list(lookup_results[0].fund), ["VOO"])
+            self.assertNotIn("MSFT", ingestion_engine._symbol_lookup_cache)
+
+            ingestion_engine._query_funds_holding_symbol = query_funds_holding_symbol
+            self.assertEqual(len(ingestion_engine._get_funds_holding_symbol_cached("MSFT")), 0)
+            self.assertEqual(ingestion_engine._symbol_lookup_stats, {"hits": 0, "misses": 2, "evictions": 0})
+            ingestion_engine._sqlaengine.dispose()
+
+    def test_ticker_keyed_holdings_migration(self):
+        """
+        This method tests that holdings tables written with ticker keys, before
+        funds and holdings were stored by symbol id, are migrated to the current
+        schema when the Ingestion Engine is initialized.
+        """
+        holdings_df = build_holdings_df([("AAPL", "Apple Inc", 6.5), ("MSFT", "Microsoft Corp", 5.9)])
+        digest_engine = FundHoldingsDataIngestionEngine("sqlite:///:memory:")
+        holdings_digest = digest_engine._get_holdings_digest(digest_engine._format_holdings_rows(holdings_df))
+
+        with tempfile.TemporaryDirectory() as db_dir:
+
+            db_uri = f"sqlite:///{os.path.join(db_dir, 'legacy_holdings.db')}"
+            legacy_engine = sqlalchemy.create_engine(db_uri)
+            with legacy_engine.begin() as db_con:
+                db_con.execute(
+                    "CREATE TABLE fund_holdings (fund VARCHAR(20) NOT NULL, as_of_date DATE NOT NULL, "
+                    "symbol VARCHAR(20) NOT NULL, name VARCHAR(255), percent_holdings FLOAT, "
+                    "PRIMARY KEY (fund, as_of_date, symbol))")
+                db_con.execute(
+                    "CREATE TABLE fund_holdings_digests (fund VARCHAR(20) NOT NULL, holdings_digest VARCHAR(64) NOT NULL, "
+                    "as_of_date DATE NOT NULL, row_count INTEGER, last_updated DATETIME, PRIMARY KEY (fund))")
+                db_con.execute(
+                    "CREATE TABLE fund_holdings_by_symbol (symbol VARCHAR(20) NOT NULL, fund VARCHAR(20) NOT NULL, "
+                    "as_of_date DATE NOT NULL, percent_holdings FLOAT, PRIMARY KEY (symbol, fund))")
+                db_con.execute(
+                    "INSERT INTO fund_holdings VALUES ('VOO', '2021-01-04', 'AAPL', 'Apple Inc', 6.5), "
+                    "('VOO', '2021-01-04', 'MSFT', 'Microsoft Corp', 5.9), ('QQQ', '2021-01-04', 'AAPL', 'Apple Inc', 11.2)")
+                db_con.execute(
+                    "INSERT INTO fund_holdings_digests VALUES ('VOO', ?, '2021-01-04', 2, '2021-01-04 00:00:00.000000'), "
+                    "('QQQ', 'qqq-digest', '2021-01-04', 1, '2021-01-04 00:00:00.000000')", (holdings_digest,))
+                db_con.execute("INSERT INTO fund_holdings_by_symbol VALUES ('AAPL', 'VOO', '2021-01-04', 6.5)")
+            legacy_engine.dispose()
+
+            ingestion_engine = FundHoldingsDataIngestionEngine(db_uri)
+
+            latest_holdings_df = ingestion_engine._get_latest_holdings()
+            self.assertEqual(list(latest_holdings_df.fund), ["QQQ", "VOO", "VOO"])
+            self.assertEqual(list(latest_holdings_df.symbol), ["AAPL", "AAPL", "MSFT"])
+            self.assertEqual(list(ingestion_engine._get_funds_holding_symbol("AAPL").fund), ["QQQ", "VOO"])
+
+            # The migrated digests still detect unchanged holdings:
+            self.assertFalse(ingestion_engine._write_holdings_data("VOO", holdings_df, as_of_date=datetime.date(2021, 1, 5)))
+            self.assertTrue(ingestion_engine._write_holdings_data("QQQ", holdings_df, as_of_date=datetime.date(2021, 1, 5)))
+
+            with ingestion_engine._sqlaengine.connect() as db_con:
+                self.assertEqual(
+                    {column["name"] for column in sqlalchemy.inspect(db_con).get_columns("fund_holdings_by_symbol")},
+                    {"symbol_id", "fund_id", "as_of_date", "percent_holdings"})
+                self.assertFalse(ingestion_engine._sqlaengine.dialect.has_table(db_con, "fund_holdings_migration"))
+
+            # A migrated database is left unchanged by the following engines:
+            FundHoldingsDataIngestionEngine(db_uri)._sqlaengine.dispose()
+            ingestion_engine._sqlaengine.dispose()
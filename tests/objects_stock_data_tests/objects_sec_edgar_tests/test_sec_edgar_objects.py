@@ -0,0 +1,763 @@
+# Importing testing frameworks:
+import unittest
+from unittest import mock
+
+# Importing 3rd party packages:
+import os
+import time
+import threading
+import urllib.parse
+import http.server
+import zlib
+import datetime
+import tempfile
+import sqlalchemy
+import pandas as pd
+
+# Importing velkoz web packages for testing:
+from velkoz_web_packages.objects_base.web_objects_base import RequestRateLimiter
+from velkoz_web_packages.objects_base.url_frontier_base import URLFrontier
+from velkoz_web_packages.objects_stock_data.objects_sec_edgar.web_objects_sec_edgar import EDGARResultsPageResponse, EDGARResultsPageCrawler
+from velkoz_web_packages.objects_stock_data.objects_sec_edgar.text_extraction_sec_edgar import compress_report, extract_report_text, extract_report_texts
+from velkoz_web_packages.objects_stock_data.objects_sec_edgar import ingestion_engines_sec_edgar
+from velkoz_web_packages.objects_stock_data.objects_sec_edgar.ingestion_engines_sec_edgar import EDGARPageIngestionEngine, EDGARFullIndexIngestionEngine
+from velkoz_web_packages.objects_stock_data.objects_sec_edgar.full_index_sec_edgar import iter_full_index_records, get_full_index_file
+from velkoz_web_packages.objects_stock_data.objects_sec_edgar.financial_data_sec_edgar import iter_financial_report_rows, iter_financial_report_chunks
+
+# The headers of the requests made to the local fixture server:
+EDGAR_TEST_HEADERS = {"User-Agent": "velkoz_web_packages tests tests@localhost"}
+
+# The directory of saved EDGAR pages served by the local fixture server:
+EDGAR_FIXTURE_DIR = os.path.join(
+    os.path.dirname(__file__), "..", "..", "static_test_files", "static_files_sec_edgar_test")
+
+class EDGARFixtureRequestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Serves the saved EDGAR fixture pages, mapping EDGAR urls to fixture files:
+
+    * /cgi-bin/browse-edgar?start=N --> browse_edgar_page_N.html
+    * /cgi-bin/viewer?accession_number=X --> viewer_X.html
+    * /Archives/.../file --> file
+
+    It records the number of requests and the maximum number of requests being
+    served at the same time.
+    """
+    lock = threading.Lock()
+    request_paths = []
+    user_agents = set()
+    active_requests = 0
+    max_active_requests = 0
+    response_delay = 0.05
+
+    def do_GET(self):
+
+        with EDGARFixtureRequestHandler.lock:
+            EDGARFixtureRequestHandler.request_paths.append(self.path)
+            EDGARFixtureRequestHandler.user_agents.add(self.headers.get("User-Agent"))
+            EDGARFixtureRequestHandler.active_requests += 1
+            EDGARFixtureRequestHandler.max_active_requests = max(
+                EDGARFixtureRequestHandler.max_active_requests, EDGARFixtureRequestHandler.active_requests)
+
+        try:
+            time.sleep(EDGARFixtureRequestHandler.response_delay)
+
+            parsed_url = urllib.parse.urlparse(self.path)
+            query = urllib.parse.parse_qs(parsed_url.query)
+
+            if parsed_url.path == "/cgi-bin/browse-edgar":
+                fixture_name = f"browse_edgar_page_{query.get('start', ['0'])[0]}.html"
+            elif parsed_url.path == "/cgi-bin/viewer":
+                fixture_name = f"viewer_{query['accession_number'][0]}.html"
+            else:
+                fixture_name = os.path.basename(parsed_url.path)
+
+            fixture_path = os.path.join(EDGAR_FIXTURE_DIR, fixture_name)
+            if not os.path.isfile(fixture_path):
+                self.send_error(404)
+                return
+
+            with open(fixture_path, "rb") as fixture_file:
+                fixture_content = fixture_file.read()
+
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(fixture_content)))
+            self.end_headers()
+            self.wfile.write(fixture_content)
+
+        finally:
+            with EDGARFixtureRequestHandler.lock:
+                EDGARFixtureRequestHandler.active_requests -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+    @classmethod
+    def reset(cls):
+        cls.request_paths = []
+        cls.user_agents = set()
+        cls.active_requests = 0
+        cls.max_active_requests = 0
+
+def setUpModule():
+    global edgar_server, edgar_base_url
+    edgar_server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), EDGARFixtureRequestHandler)
+    threading.Thread(target=edgar_server.serve_forever, daemon=True).start()
+    edgar_base_url = f"http://127.0.0.1:{edgar_server.server_address[1]}"
+
+def tearDownModule():
+    edgar_server.shutdown()
+    edgar_server.server_close()
+
+class EDGARResultsPageResponseTest(unittest.TestCase):
+
+    def setUp(self):
+        EDGARFixtureRequestHandler.reset()
+
+    def test_edgar_results_page_extraction(self):
+        """
+        The method tests that the EDGARResultsPageResponse extracts the company
+        addresses and the metadata of each filing from a locally served results
+        page using a single request.
+        """
+        edgar_page = EDGARResultsPageResponse(
+            f"{edgar_base_url}/cgi-bin/browse-edgar",
+            params={"action": "getcompany", "CIK": "0000320193"},
+            sec_base_url=edgar_base_url, headers=EDGAR_TEST_HEADERS, rate_limiter=RequestRateLimiter(50))
+
+        # Testing the company header information:
+        self.assertEqual(edgar_page._addr_mail, "ONE APPLE PARK WAY CUPERTINO CA 95014")
+        self.assertEqual(edgar_page._addr_business, "ONE APPLE PARK WAY CUPERTINO CA 95014 (408) 996-1010")
+
+        # Testing the filing table:
+        reports_tbl = edgar_page._reports_tbl
+        self.assertIsInstance(reports_tbl, pd.DataFrame)
+        self.assertEqual(list(reports_tbl["filing"]), ["10-K", "10-Q", "8-K"])
+        self.assertEqual(list(reports_tbl["filing_date"]), ["2020-10-30", "2020-07-31", "2020-07-30"])
+        self.assertEqual(
+            list(reports_tbl["accession_number"]),
+            ["0000320193-20-000096", "0000320193-20-000062", "0000320193-20-000060"])
+        self.assertIn("Annual report", reports_tbl["filing_description"][0])
+        self.assertIsNone(reports_tbl["data_page_href"][2])
+
+        # Listing the filings only requests the results page, with the User-Agent passed:
+        self.assertEqual(len(EDGARFixtureRequestHandler.request_paths), 1)
+        self.assertEqual(EDGARFixtureRequestHandler.user_agents, {EDGAR_TEST_HEADERS["User-Agent"]})
+
+    def test_edgar_user_agent_required(self):
+        """
+        The method tests that requests to the SEC are only made with a User-Agent,
+        passed via the headers kwarg or the VELKOZ_SEC_USER_AGENT environment variable.
+        """
+        with mock.patch.dict(os.environ, {"VELKOZ_SEC_USER_AGENT": ""}):
+            with self.assertRaises(ValueError):
+                EDGARResultsPageResponse(
+                    f"{edgar_base_url}/cgi-bin/browse-edgar", params={"CIK": "320193"},
+                    sec_base_url=edgar_base_url, rate_limiter=RequestRateLimiter(50))
+
+            with self.assertRaises(ValueError):
+                EDGARResultsPageCrawler(f"{edgar_base_url}/cgi-bin/browse-edgar", headers={"Accept": "text/html"})
+
+        self.assertEqual(len(EDGARFixtureRequestHandler.request_paths), 0)
+
+        with mock.patch.dict(os.environ, {"VELKOZ_SEC_USER_AGENT": "velkoz_web_packages env tests@localhost"}):
+            edgar_page = EDGARResultsPageResponse(
+                f"{edgar_base_url}/cgi-bin/browse-edgar", params={"CIK": "320193"},
+                sec_base_url=edgar_base_url, rate_limiter=RequestRateLimiter(50), max_workers=1)
+            edgar_page._get_report(0)
+
+        self.assertEqual(EDGARFixtureRequestHandler.user_agents, {"velkoz_web_packages env tests@localhost"})
+
+    def test_edgar_lazy_report_fetching(self):
+        """
+        The method tests that the documents of a filing are only fetched when they
+        are requested, that they are cached and that a subset of filings is
+        fetched concurrently while the rate limiter spaces out the requests.
+        """
+        edgar_page = EDGARResultsPageResponse(
+            f"{edgar_base_url}/cgi-bin/browse-edgar", params={"CIK": "0000320193"},
+            sec_base_url=edgar_base_url, headers=EDGAR_TEST_HEADERS, rate_limiter=RequestRateLimiter(50), max_workers=3)
+
+        # Fetching a single report: 2 requests for the document + 1 interactive data page:
+        ten_k_report = edgar_page._get_report(0)
+        self.assertEqual(len(EDGARFixtureRequestHandler.request_paths), 4)
+        self.assertIsInstance(ten_k_report["report_contents_zlib"], bytes)
+        self.assertIn(b"fiscal year ended", zlib.decompress(ten_k_report["report_contents_zlib"]))
+        self.assertNotIn("report_contents_txt", ten_k_report)
+        self.assertEqual(
+            ten_k_report["report_data_href"],
+            f"{edgar_base_url}/Archives/edgar/data/320193/000032019320000096/Financial_Report.xlsx")
+
+        # The text is extracted lazily, without the contents of <script> and <style> tags:
+        ten_k_text = edgar_page._get_report_text(0)
+        self.assertIn("fiscal year ended September 26, 2020", ten_k_text)
+        self.assertNotIn("not report text", ten_k_text)
+        self.assertNotIn("margin", ten_k_text)
+        self.assertIs(edgar_page._get_report_text(0), ten_k_text)
+
+        # Requesting the same report again is served from the cache:
+        self.assertIs(edgar_page._get_report(0), ten_k_report)
+        self.assertEqual(len(EDGARFixtureRequestHandler.request_paths), 4)
+
+        # Fetching a subset of reports concurrently:
+        EDGARFixtureRequestHandler.reset()
+        start_time = time.monotonic()
+        subset_tbl = edgar_page._get_reports([1, 2], extract_text=True)
+        elapsed_time = time.monotonic() - start_time
+
+        self.assertEqual(list(subset_tbl["filing"]), ["10-Q", "8-K"])
+        self.assertEqual(subset_tbl["report_data_href"][2], "NaN")
+        self.assertIn("Results of Operations", subset_tbl["report_contents_txt"][2])
+        self.assertEqual(len(EDGARFixtureRequestHandler.request_paths), 5)
+        self.assertGreater(EDGARFixtureRequestHandler.max_active_requests, 1)
+        self.assertGreaterEqual(elapsed_time, 4 / 50)
+
+    def test_edgar_eager_report_fetching(self):
+        """
+        The method tests that the fetch_reports kwarg fetches the documents of
+        every filing when the object is initialized.
+        """
+        edgar_page = EDGARResultsPageResponse(
+            f"{edgar_base_url}/cgi-bin/browse-edgar", params={"CIK": "0000320193"},
+            sec_base_url=edgar_base_url, headers=EDGAR_TEST_HEADERS, rate_limiter=RequestRateLimiter(50), fetch_reports=True)
+
+        self.assertEqual(len(EDGARFixtureRequestHandler.request_paths), 9)
+        self.assertIn("report_contents_zlib", edgar_page._reports_tbl.columns)
+        self.assertNotIn("report_contents_txt", edgar_page._reports_tbl.columns)
+        self.assertIn("quarterly period ended June 27, 2020", edgar_page._get_report_text(1))
+
+class EDGARResultsPageCrawlerTest(unittest.TestCase):
+
+    def setUp(self):
+        EDGARFixtureRequestHandler.reset()
+
+    def build_crawler(self, **kwargs):
+        return EDGARResultsPageCrawler(
+            f"{edgar_base_url}/cgi-bin/browse-edgar", params={"action": "getcompany", "CIK": "0000320193"},
+            sec_base_url=edgar_base_url, headers=EDGAR_TEST_HEADERS, rate_limiter=RequestRateLimiter(50), count=3, **kwargs)
+
+    def test_edgar_paginated_crawl(self):
+        """
+        The method tests that the crawler walks every page of results in order and
+        stops at the first page that is not full.
+        """
+        crawled_filings = [
+            results_page._reports_tbl.loc[filing_index, "accession_number"]
+            for results_page, filing_index in self.build_crawler().iter_filings()]
+
+        self.assertEqual(crawled_filings, [
+            "0000320193-20-000096", "0000320193-20-000062", "0000320193-20-000060",
+            "0000320193-20-000052", "0000320193-20-000010"])
+
+        # Only the two pages of results were requested, using the pagination params:
+        request_queries = [
+            urllib.parse.parse_qs(urllib.parse.urlparse(request_path).query)
+            for request_path in EDGARFixtureRequestHandler.request_paths]
+        self.assertEqual([(query["start"], query["count"]) for query in request_queries], [
+            (["0"], ["3"]), (["3"], ["3"])])
+
+    def test_edgar_crawl_watermark_and_prefetch(self):
+        """
+        The method tests that the next page is prefetched while the current page is
+        consumed and that crawling stops once filings older than the watermark are
+        reached without requesting further pages.
+        """
+        filings_iter = self.build_crawler().iter_filings(watermark=datetime.date(2020, 7, 30))
+        first_page, first_index = next(filings_iter)
+
+        # While the first filing is being consumed the second page is requested:
+        time.sleep(0.5)
+        self.assertEqual(len(EDGARFixtureRequestHandler.request_paths), 2)
+
+        remaining_filings = [filing_index for results_page, filing_index in filings_iter]
+        self.assertEqual([first_index] + remaining_filings, [0, 1, 2])
+        self.assertEqual(len(EDGARFixtureRequestHandler.request_paths), 2)
+        self.assertEqual(first_page._reports_tbl.loc[first_index, "filing"], "10-K")
+
+        # A watermark reached on the first page means no further page is requested:
+        EDGARFixtureRequestHandler.reset()
+        crawled_pages = list(self.build_crawler().iter_pages(watermark=datetime.date(2020, 10, 1)))
+        self.assertEqual(len(crawled_pages), 1)
+        self.assertEqual(len(EDGARFixtureRequestHandler.request_paths), 1)
+
+        # The max_pages limit also stops the crawl:
+        EDGARFixtureRequestHandler.reset()
+        self.assertEqual(len(list(self.build_crawler(max_pages=1).iter_filings())), 3)
+        self.assertEqual(len(EDGARFixtureRequestHandler.request_paths), 1)
+
+class EDGARPageIngestionEngineTest(unittest.TestCase):
+
+    def setUp(self):
+        EDGARFixtureRequestHandler.reset()
+        self.db_dir = tempfile.TemporaryDirectory()
+        self.db_uri = f"sqlite:///{os.path.join(self.db_dir.name, 'edgar_test.db')}"
+
+    def tearDown(self):
+        self.db_dir.cleanup()
+
+    def build_edgar_page(self, **kwargs):
+        return EDGARResultsPageResponse(
+            f"{edgar_base_url}/cgi-bin/browse-edgar", params={"CIK": "320193"},
+            sec_base_url=edgar_base_url, headers=EDGAR_TEST_HEADERS, rate_limiter=RequestRateLimiter(50), **kwargs)
+
+    def test_edgar_ingestion_engine_dedup_and_watermark(self):
+        """
+        The method tests that the EDGARPageIngestionEngine writes the metadata and
+        text of every filing, that the company high-water mark is raised once the
+        crawl is complete, and that re-ingesting the same results page writes (and
+        fetches) nothing new.
+        """
+        edgar_page = self.build_edgar_page()
+        self.assertEqual(edgar_page._cik, "0000320193")
+        self.assertEqual(edgar_page._company_name, "Apple Inc.")
+
+        edgar_engine = EDGARPageIngestionEngine(self.db_uri, edgar_page)
+        self.assertIsNone(edgar_engine._get_company_watermark("0000320193"))
+        edgar_engine._write_web_objects()
+
+        # The results page and the documents of all three filings were requested:
+        self.assertEqual(len(EDGARFixtureRequestHandler.request_paths), 9)
+
+        test_db_engine = sqlalchemy.create_engine(self.db_uri)
+        filings_df = pd.read_sql_table("edgar_filings", test_db_engine)
+        text_df = pd.read_sql_table("edgar_filing_text", test_db_engine)
+
+        self.assertEqual(sorted(filings_df["accession_number"]), [
+            "0000320193-20-000060", "0000320193-20-000062", "0000320193-20-000096"])
+        self.assertEqual(set(filings_df["cik"]), {"0000320193"})
+        ten_k_row = filings_df.set_index("accession_number").loc["0000320193-20-000096"]
+        self.assertEqual(ten_k_row["filing"], "10-K")
+        self.assertTrue(ten_k_row["report_data_href"].endswith("Financial_Report.xlsx"))
+        self.assertIsNone(filings_df.set_index("accession_number").loc["0000320193-20-000060", "report_data_href"])
+        self.assertIn(
+            "fiscal year ended September 26, 2020",
+            text_df.set_index("accession_number").loc["0000320193-20-000096", "report_contents_txt"])
+        self.assertIsNone(edgar_engine._get_company_watermark("0000320193"))
+        self.assertEqual(edgar_engine._complete_company_crawl("0000320193"), datetime.date(2020, 10, 30))
+
+        # Re-crawling the company writes no duplicate rows and fetches no documents:
+        EDGARFixtureRequestHandler.reset()
+        recrawl_engine = EDGARPageIngestionEngine(self.db_uri, self.build_edgar_page())
+        recrawl_engine._write_web_objects()
+
+        self.assertEqual(len(EDGARFixtureRequestHandler.request_paths), 1)
+        self.assertEqual(len(pd.read_sql_table("edgar_filings", test_db_engine)), 3)
+        self.assertEqual(len(pd.read_sql_table("edgar_filing_text", test_db_engine)), 3)
+        self.assertEqual(len(recrawl_engine._WebPageResponseObjs), 0)
+
+    def test_edgar_interrupted_crawl_watermark(self):
+        """
+        The method tests that the high-water mark of a company is not raised by a
+        crawl that is interrupted after its first page, so that the next crawl still
+        requests and writes the older pages, and that it is raised once a crawl is
+        complete.
+        """
+        def build_crawler(**kwargs):
+            return EDGARResultsPageCrawler(
+                f"{edgar_base_url}/cgi-bin/browse-edgar", params={"action": "getcompany", "CIK": "0000320193"},
+                sec_base_url=edgar_base_url, headers=EDGAR_TEST_HEADERS, rate_limiter=RequestRateLimiter(50),
+                count=3, **kwargs)
+
+        edgar_engine = EDGARPageIngestionEngine(self.db_uri, write_reports=False)
+        test_db_engine = sqlalchemy.create_engine(self.db_uri)
+
+        # Writing the first page of a crawl, then interrupting it:
+        crawler = build_crawler()
+        for results_page in crawler.iter_pages(edgar_engine._get_company_watermark("0000320193")):
+            edgar_engine._insert_web_obj(results_page)
+            edgar_engine._write_web_objects()
+            break
+
+        self.assertFalse(crawler._crawl_complete)
+        self.assertEqual(len(pd.read_sql_table("edgar_filings", test_db_engine)), 3)
+        self.assertIsNone(edgar_engine._get_company_watermark("0000320193"))
+
+        # A crawl stopped by the max_pages limit is not complete either:
+        crawler = build_crawler(max_pages=1)
+        self.assertEqual(len(list(crawler.iter_pages())), 1)
+        self.assertFalse(crawler._crawl_complete)
+
+        # The next crawl still requests and writes the older page:
+        EDGARFixtureRequestHandler.reset()
+        crawler = build_crawler()
+        for results_page in crawler.iter_pages(edgar_engine._get_company_watermark("0000320193")):
+            edgar_engine._insert_web_obj(results_page)
+            edgar_engine._write_web_objects()
+
+        self.assertTrue(crawler._crawl_complete)
+        self.assertEqual(len(EDGARFixtureRequestHandler.request_paths), 2)
+        self.assertEqual(len(pd.read_sql_table("edgar_filings", test_db_engine)), 5)
+        self.assertEqual(edgar_engine._complete_company_crawl("0000320193"), datetime.date(2020, 10, 30))
+
+        # Once the mark is raised a crawl stops at the first page:
+        EDGARFixtureRequestHandler.reset()
+        crawler = build_crawler()
+        self.assertEqual(len(list(crawler.iter_pages(edgar_engine._get_company_watermark("0000320193")))), 1)
+        self.assertTrue(crawler._crawl_complete)
+        test_db_engine.dispose()
+
+    def test_edgar_ingestion_fetches_outside_write_lock(self):
+        """
+        The method tests that the documents of new filings are fetched and their
+        text extracted before the write lock of the engine is taken.
+        """
+        edgar_engine = EDGARPageIngestionEngine(self.db_uri, self.build_edgar_page())
+        EDGARFixtureRequestHandler.reset()
+
+        with edgar_engine._write_lock:
+            writer_thread = threading.Thread(target=edgar_engine._write_web_objects)
+            writer_thread.start()
+
+            # Every document is fetched while another thread holds the write lock:
+            fetch_deadline = time.monotonic() + 10
+            while len(EDGARFixtureRequestHandler.request_paths) < 8 and time.monotonic() < fetch_deadline:
+                time.sleep(0.01)
+
+            self.assertEqual(len(EDGARFixtureRequestHandler.request_paths), 8)
+            self.assertTrue(writer_thread.is_alive())
+
+        writer_thread.join()
+        self.assertEqual(len(pd.read_sql_table("edgar_filing_text", sqlalchemy.create_engine(self.db_uri))), 3)
+
+    def test_edgar_ingestion_url_frontier(self):
+        """
+        The method tests that web objects sharing a url frontier do not fetch a
+        results page or the documents of a filing claimed by another object, that a
+        skipped filing is still fetched and written if it is not stored, and that
+        the pages and documents are only marked as seen once they are committed.
+        """
+        url_frontier = URLFrontier()
+        first_page = EDGARResultsPageResponse(
+            f"{edgar_base_url}/cgi-bin/browse-edgar", params={"CIK": "320193"},
+            sec_base_url=edgar_base_url, headers=EDGAR_TEST_HEADERS, rate_limiter=RequestRateLimiter(50), url_frontier=url_frontier)
+        second_page = EDGARResultsPageResponse(
+            f"{edgar_base_url}/cgi-bin/browse-edgar", params={"CIK": "320193", "owner": "include"},
+            sec_base_url=edgar_base_url, headers=EDGAR_TEST_HEADERS, rate_limiter=RequestRateLimiter(50), url_frontier=url_frontier)
+
+        # The results pages are claimed, but not seen until they are written:
+        self.assertFalse(url_frontier.is_seen(first_page._request_url))
+        self.assertFalse(url_frontier.claim_url(first_page._request_url))
+
+        # A results page claimed by another object is not requested and has no filings:
+        EDGARFixtureRequestHandler.reset()
+        claimed_page = EDGARResultsPageResponse(
+            f"{edgar_base_url}/cgi-bin/browse-edgar", params={"CIK": "320193"},
+            sec_base_url=edgar_base_url, headers=EDGAR_TEST_HEADERS, rate_limiter=RequestRateLimiter(50), url_frontier=url_frontier)
+        self.assertTrue(claimed_page._skipped)
+        self.assertEqual(len(claimed_page._reports_tbl), 0)
+        self.assertEqual(claimed_page._cik, "0000320193")
+        self.assertEqual(len(EDGARFixtureRequestHandler.request_paths), 0)
+
+        # Fetched documents are claimed but not seen until they are written:
+        first_page._get_report(0)
+        self.assertFalse(url_frontier.is_seen(first_page._get_documents_url(0)))
+
+        EDGARFixtureRequestHandler.reset()
+        self.assertTrue(second_page._get_report(0)["report_skipped"])
+        self.assertEqual(second_page._get_report_text(0), "NaN")
+        self.assertEqual(len(EDGARFixtureRequestHandler.request_paths), 0)
+
+        # Only the documents of the filings that are not stored are fetched:
+        edgar_engine = EDGARPageIngestionEngine(self.db_uri, first_page, second_page)
+        edgar_engine._write_web_objects()
+
+        self.assertEqual(len(EDGARFixtureRequestHandler.request_paths), 5)
+        test_db_engine = sqlalchemy.create_engine(self.db_uri)
+        self.assertEqual(len(pd.read_sql_table("edgar_filings", test_db_engine)), 3)
+        self.assertEqual(len(pd.read_sql_table("edgar_filing_text", test_db_engine)), 3)
+        for filing_index in first_page._reports_tbl.index:
+            self.assertTrue(url_frontier.is_seen(first_page._get_documents_url(filing_index)))
+        self.assertTrue(url_frontier.is_seen(first_page._request_url))
+        self.assertTrue(url_frontier.is_seen(second_page._request_url))
+
+        # A skipped filing that is not stored is fetched regardless of the frontier:
+        skipped_page = EDGARResultsPageResponse(
+            f"{edgar_base_url}/cgi-bin/browse-edgar", params={"CIK": "320193", "type": ""},
+            sec_base_url=edgar_base_url, headers=EDGAR_TEST_HEADERS, rate_limiter=RequestRateLimiter(50), url_frontier=url_frontier)
+        self.assertTrue(skipped_page._get_report(0)["report_skipped"])
+
+        new_db_uri = f"sqlite:///{os.path.join(self.db_dir.name, 'edgar_frontier_test.db')}"
+        EDGARPageIngestionEngine(new_db_uri, skipped_page)._write_web_objects()
+
+        text_df = pd.read_sql_table("edgar_filing_text", sqlalchemy.create_engine(new_db_uri))
+        self.assertEqual(len(text_df), 3)
+        self.assertIn(
+            "fiscal year ended September 26, 2020",
+            text_df.set_index("accession_number").loc["0000320193-20-000096", "report_contents_txt"])
+
+    def test_edgar_ingestion_url_frontier_rollback(self):
+        """
+        The method tests that the results page and the documents of filings that
+        fail to be written are released rather than marked as seen, so that they are
+        fetched and written again, and that a resumed crawl skips the written page.
+        """
+        with tempfile.TemporaryDirectory() as frontier_dir:
+            seen_path = os.path.join(frontier_dir, "seen_urls.bin")
+            url_frontier = URLFrontier(seen_path)
+            edgar_page = EDGARResultsPageResponse(
+                f"{edgar_base_url}/cgi-bin/browse-edgar", params={"CIK": "320193", "start": 0, "count": 3},
+                sec_base_url=edgar_base_url, headers=EDGAR_TEST_HEADERS, rate_limiter=RequestRateLimiter(50), url_frontier=url_frontier)
+
+            edgar_engine = EDGARPageIngestionEngine(self.db_uri, edgar_page)
+            def failing_null_nan(value):
+                raise RuntimeError("Filing could not be written")
+
+            edgar_engine._null_nan = failing_null_nan
+            with self.assertRaises(RuntimeError):
+                edgar_engine._write_web_objects()
+
+            self.assertEqual(len(pd.read_sql_table("edgar_filings", sqlalchemy.create_engine(self.db_uri))), 0)
+            self.assertFalse(url_frontier.is_seen(edgar_page._request_url))
+            self.assertTrue(url_frontier.claim_url(edgar_page._request_url))
+            url_frontier.release_url(edgar_page._request_url)
+            for filing_index in edgar_page._reports_tbl.index:
+                self.assertFalse(url_frontier.is_seen(edgar_page._get_documents_url(filing_index)))
+                self.assertTrue(url_frontier.claim_url(edgar_page._get_documents_url(filing_index)))
+                url_frontier.release_url(edgar_page._get_documents_url(filing_index))
+
+            # Writing the web object again marks its documents as seen once committed:
+            del edgar_engine._null_nan
+            edgar_engine._write_web_objects()
+            url_frontier.close()
+
+            resumed_frontier = URLFrontier(seen_path)
+            self.assertTrue(resumed_frontier.is_seen(edgar_page._request_url))
+            for filing_index in edgar_page._reports_tbl.index:
+                self.assertTrue(resumed_frontier.is_seen(edgar_page._get_documents_url(filing_index)))
+
+            # A resumed crawl skips the written page without requesting it and continues with the next page:
+            EDGARFixtureRequestHandler.reset()
+            resumed_crawler = EDGARResultsPageCrawler(
+                f"{edgar_base_url}/cgi-bin/browse-edgar", params={"CIK": "320193"}, sec_base_url=edgar_base_url,
+                headers=EDGAR_TEST_HEADERS, rate_limiter=RequestRateLimiter(50), url_frontier=resumed_frontier, count=3)
+            crawled_pages = list(resumed_crawler.iter_pages())
+
+            self.assertEqual([results_page._skipped for results_page in crawled_pages], [True, False])
+            self.assertEqual(len(EDGARFixtureRequestHandler.request_paths), 1)
+            self.assertTrue(resumed_crawler._crawl_complete)
+            resumed_frontier.close()
+
+    def test_edgar_full_text_search_index(self):
+        """
+        The method tests that the full-text index is maintained as filings are
+        inserted, including filings stored before the index was created, and that
+        searches return ranked filings with snippets.
+        """
+        # Storing filings before the index exists:
+        EDGARPageIngestionEngine(self.db_uri, self.build_edgar_page())._write_web_objects()
+
+        edgar_engine = EDGARPageIngestionEngine(self.db_uri, full_text_index=True)
+        search_results = edgar_engine._search_filing_text('"fiscal year"')
+        self.assertEqual(list(search_results["accession_number"]), ["0000320193-20-000096"])
+        self.assertIn("[fiscal year]", search_results["snippet"][0])
+
+        # Every filing mentions net sales, the filings are ranked and limited:
+        search_results = edgar_engine._search_filing_text("net sales", limit=2)
+        self.assertEqual(len(search_results), 2)
+        self.assertTrue(search_results["rank"].is_monotonic_increasing)
+        self.assertEqual(len(edgar_engine._search_filing_text("smartphones OR announced")), 2)
+
+        # New filings are indexed as they are inserted:
+        test_db_engine = sqlalchemy.create_engine(self.db_uri)
+        with test_db_engine.begin() as db_con:
+            db_con.execute(sqlalchemy.text(
+                "INSERT INTO edgar_filing_text VALUES ('0000320193-20-000001', 'Dividend declared')"))
+
+        self.assertEqual(list(edgar_engine._search_filing_text("dividend")["accession_number"]), [])
+        with test_db_engine.begin() as db_con:
+            db_con.execute(sqlalchemy.text(
+                "INSERT INTO edgar_filings (accession_number, cik) VALUES ('0000320193-20-000001', '0000320193')"))
+
+        self.assertEqual(
+            list(edgar_engine._search_filing_text("dividend")["accession_number"]), ["0000320193-20-000001"])
+
+    def test_edgar_financial_data_ingestion(self):
+        """
+        The method tests that the engine downloads the workbooks of new filings with
+        interactive data and writes their statements in long format.
+        """
+        edgar_engine = EDGARPageIngestionEngine(self.db_uri, self.build_edgar_page(), write_financial_data=True)
+        edgar_engine._write_web_objects()
+
+        # The workbooks of the two filings with interactive data were downloaded:
+        self.assertEqual(len([
+            request_path for request_path in EDGARFixtureRequestHandler.request_paths
+            if request_path.endswith("Financial_Report.xlsx")]), 2)
+
+        financial_data_df = pd.read_sql_table("edgar_financial_data", sqlalchemy.create_engine(self.db_uri))
+        self.assertEqual(len(financial_data_df), 2 * 14)
+        self.assertEqual(set(financial_data_df["accession_number"]), {
+            "0000320193-20-000096", "0000320193-20-000062"})
+
+    def test_edgar_financial_data_partial_workbook(self):
+        """
+        The method tests that the rows of a workbook that fails part way through
+        are rolled back, while the filings and the other workbooks are written.
+        """
+        def failing_financial_report_chunks(workbook, accession_number):
+            rows_chunks = iter_financial_report_chunks(workbook, accession_number, chunk_size=5)
+            if accession_number == "0000320193-20-000096":
+                yield next(rows_chunks)
+                raise ValueError("Corrupt worksheet")
+
+            yield from rows_chunks
+
+        edgar_engine = EDGARPageIngestionEngine(self.db_uri, self.build_edgar_page(), write_financial_data=True)
+        with mock.patch.object(ingestion_engines_sec_edgar, "iter_financial_report_chunks", failing_financial_report_chunks):
+            with self.assertWarns(UserWarning):
+                edgar_engine._write_web_objects()
+
+        test_db_engine = sqlalchemy.create_engine(self.db_uri)
+        financial_data_df = pd.read_sql_table("edgar_financial_data", test_db_engine)
+        self.assertEqual(len(financial_data_df), 14)
+        self.assertEqual(set(financial_data_df["accession_number"]), {"0000320193-20-000062"})
+        self.assertEqual(len(pd.read_sql_table("edgar_filings", test_db_engine)), 3)
+
+class EDGARFullIndexIngestionEngineTest(unittest.TestCase):
+
+    def setUp(self):
+        EDGARFixtureRequestHandler.reset()
+        self.db_dir = tempfile.TemporaryDirectory()
+        self.db_uri = f"sqlite:///{os.path.join(self.db_dir.name, 'edgar_index_test.db')}"
+
+    def tearDown(self):
+        self.db_dir.cleanup()
+
+    def test_full_index_file_parsing(self):
+        """
+        The method tests that the fixed-width and pipe delimited index layouts are
+        parsed into the same records, including form types containing spaces.
+        """
+        index_records = {
+            index_name: sorted(
+                tuple(sorted(index_record.items()))
+                for index_record in iter_full_index_records(os.path.join(EDGAR_FIXTURE_DIR, index_name)))
+            for index_name in ["master.idx", "company.idx", "form.idx", "master.gz"]}
+
+        self.assertEqual(len(index_records["master.idx"]), 6)
+        for index_name in ["company.idx", "form.idx", "master.gz"]:
+            self.assertEqual(index_records[index_name], index_records["master.idx"])
+
+        apple_10k = next(
+            dict(index_record) for index_record in index_records["form.idx"]
+            if dict(index_record)["form_type"] == "10-K")
+        self.assertEqual(apple_10k, {
+            "cik": "0000320193", "company_name": "Apple Inc.", "form_type": "10-K",
+            "date_filed": datetime.date(2020, 10, 30),
+            "filename": "edgar/data/320193/0000320193-20-000096.txt",
+            "accession_number": "0000320193-20-000096"})
+        self.assertIn("SC 13G/A", {dict(index_record)["form_type"] for index_record in index_records["company.idx"]})
+
+        with self.assertRaises(ValueError):
+            list(iter_full_index_records(os.path.join(EDGAR_FIXTURE_DIR, "browse_edgar_page_0.html")))
+
+    def test_full_index_bulk_load_and_lookup(self):
+        """
+        The method tests that index files are bulk loaded in chunks, that re-loading
+        overlapping index files adds no duplicate records and that filings are looked
+        up by company, form type and date.
+        """
+        cache_dir = os.path.join(self.db_dir.name, "full_index_cache")
+        index_path = get_full_index_file(
+            2020, 4, cache_dir, sec_base_url=edgar_base_url, headers=EDGAR_TEST_HEADERS, rate_limiter=RequestRateLimiter(50))
+
+        # The index file is downloaded once and then read from the cache:
+        self.assertEqual(get_full_index_file(2020, 4, cache_dir, sec_base_url=edgar_base_url), index_path)
+        self.assertEqual(EDGARFixtureRequestHandler.request_paths, ["/Archives/edgar/full-index/2020/QTR4/master.gz"])
+
+        index_engine = EDGARFullIndexIngestionEngine(self.db_uri, index_path, chunk_size=4)
+        index_engine._write_web_objects()
+
+        # Re-loading the same filings from another layout of the index:
+        index_engine._insert_web_obj(os.path.join(EDGAR_FIXTURE_DIR, "company.idx"))
+        index_engine._write_web_objects()
+        self.assertEqual(len(index_engine._WebPageResponseObjs), 0)
+        self.assertEqual(len(pd.read_sql_table("edgar_filing_index", sqlalchemy.create_engine(self.db_uri))), 6)
+
+        apple_filings = index_engine._lookup_filings(cik=320193)
+        self.assertEqual(list(apple_filings["form_type"]), ["10-K", "8-K"])
+        self.assertEqual(apple_filings["date_filed"][0], pd.Timestamp("2020-10-30"))
+
+        # A filing with several filers is listed once per filer:
+        ownership_filings = index_engine._lookup_filings(form_type="SC 13G/A")
+        self.assertEqual(sorted(ownership_filings["cik"]), ["0000102909", "0001018724"])
+        self.assertEqual(ownership_filings["accession_number"].nunique(), 1)
+
+        quarterly_filings = index_engine._lookup_filings(
+            form_type="10-Q", start_date=datetime.date(2020, 10, 30), end_date=datetime.date(2020, 10, 30), limit=1)
+        self.assertEqual(len(quarterly_filings), 1)
+
+class EDGARFinancialDataExtractionTest(unittest.TestCase):
+
+    def test_financial_report_long_format_rows(self):
+        """
+        The method tests that a Financial_Report.xlsx fixture workbook is normalized
+        into long format rows with period labels built from multi-row headers.
+        """
+        workbook_path = os.path.join(EDGAR_FIXTURE_DIR, "Financial_Report.xlsx")
+        report_df = pd.DataFrame(iter_financial_report_rows(workbook_path, "0000320193-20-000096"))
+
+        self.assertEqual(list(report_df.columns), ["accession_number", "statement", "line_item", "period", "value"])
+        self.assertEqual(len(report_df), 14)
+        self.assertEqual(report_df["statement"].nunique(), 2)
+
+        # Single header row balance sheet, section titles without values are skipped:
+        balance_sheet_df = report_df[report_df["statement"].str.startswith("CONSOLIDATED BALANCE SHEETS")]
+        self.assertNotIn("Current assets:", list(balance_sheet_df["line_item"]))
+        cash_row = balance_sheet_df[
+            (balance_sheet_df["line_item"] == "Cash and cash equivalents") & (balance_sheet_df["period"] == "Sep. 28, 2019")]
+        self.assertEqual(cash_row["value"].iloc[0], 48844.0)
+
+        # Multi row headers are joined into a single period label:
+        operations_df = report_df[report_df["statement"].str.startswith("CONSOLIDATED STATEMENTS OF OPERATIONS")]
+        self.assertEqual(set(operations_df["period"]), {"12 Months Ended Sep. 26, 2020", "12 Months Ended Sep. 28, 2019"})
+        eps_row = operations_df[
+            (operations_df["line_item"] == "Basic (in dollars per share)") & (operations_df["period"] == "12 Months Ended Sep. 26, 2020")]
+        self.assertAlmostEqual(eps_row["value"].iloc[0], 3.31)
+
+        # The rows are chunked for bulk writes, from bytes as well as paths:
+        with open(workbook_path, "rb") as workbook_file:
+            rows_chunks = list(iter_financial_report_chunks(workbook_file.read(), "0000320193-20-000096", chunk_size=5))
+
+        self.assertEqual([len(rows_chunk) for rows_chunk in rows_chunks], [5, 5, 4])
+
+class EDGARReportTextExtractionTest(unittest.TestCase):
+
+    def test_streaming_report_text_extraction(self):
+        """
+        The method tests that the text of a compressed report spanning many parser
+        chunks is extracted without the contents of ignored tags, with inline text
+        joined and a line per block tag.
+        """
+        report_rows = "".join(
+            f"<tr><td><span>Line</span> <b>item</b>&nbsp;{row_num}</td><td>{row_num * 1000:,}</td></tr>"
+            for row_num in range(20000))
+        report_html = (
+            "<html><head><style>td { color: red; }</style></head><body>"
+            "<script>var hidden = 'not report text';</script>"
+            f"<p>Total net sales &amp; revenue</p><table>{report_rows}</table></body></html>").encode("utf-8")
+
+        report_text = extract_report_text(compress_report(report_html))
+        report_lines = report_text.split("\n")
+
+        self.assertGreater(len(report_html), 64 * 1024 * 10)
+        self.assertEqual(report_lines[0], "Total net sales & revenue")
+        self.assertEqual(report_lines[1:5], ["Line item 0", "0", "Line item 1", "1,000"])
+        self.assertEqual(len(report_lines), 1 + 20000 * 2)
+        self.assertNotIn("not report text", report_text)
+        self.assertNotIn("color", report_text)
+
+        # Uncompressed html produces the same text:
+        self.assertEqual(extract_report_text(report_html, compressed=False), report_text)
+
+    def test_parallel_report_text_extraction(self):
+        """
+        The method tests that extracting the text of several reports with a pool
+        of processes returns the same texts, in order, as extracting them serially.
+        """
+        report_htmls = [
+            compress_report(f"<html><body><p>Report {report_num}</p><script>x = 1;</script></body></html>".encode())
+            for report_num in range(12)]
+
+        parallel_texts = extract_report_texts(report_htmls, max_workers=2)
+        self.assertEqual(parallel_texts, [f"Report {report_num}" for report_num in range(12)])
+        self.assertEqual(extract_report_texts(report_htmls, max_workers=1), parallel_texts)
@@ -145,4 +145,4 @@ class StockDataSummaryIngestionEngineTest(unittest.TestCase):
 
             # Funds should have both stock price data and holdings data:
             self.assertEqual(row['price_tbl'], f"{index}_price_history")
-            self.assertEqual(row['holdings_tbl'], f"{index}_holdings_data")
+            self.assertEqual(row['holdings_tbl'], "fund_holdings")
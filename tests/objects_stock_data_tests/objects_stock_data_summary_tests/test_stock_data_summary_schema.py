@@ -0,0 +1,47 @@
+# Importing testing frameworks:
+import unittest
+
+# Importing 3rd party packages for testing:
+import os
+import tempfile
+import sqlalchemy
+
+# Importing velkoz web packages for testing:
+from velkoz_web_packages.objects_stock_data.objects_stock_db_summary.ingestion_engines_stock_data_summary import StockDataSummaryIngestionEngine
+
+class StockDataSummarySchemaTest(unittest.TestCase):
+
+    def test_summary_symbol_id_migration(self):
+        """
+        This method tests that a summary table written before the symbol_id column
+        existed has the column added and filled in with the symbol ids of its stored
+        tickers when the Ingestion Engine is initialized.
+        """
+        with tempfile.TemporaryDirectory() as db_dir:
+
+            db_uri = f"sqlite:///{os.path.join(db_dir, 'legacy_summary.db')}"
+            legacy_engine = sqlalchemy.create_engine(db_uri)
+            with legacy_engine.begin() as db_con:
+                db_con.execute(
+                    "CREATE TABLE nasdaq_stock_data_summary_tbl (ticker VARCHAR(20) NOT NULL, price_tbl VARCHAR(20), "
+                    "holdings_tbl VARCHAR(20), last_updated DATETIME, PRIMARY KEY (ticker))")
+                db_con.execute(
+                    "INSERT INTO nasdaq_stock_data_summary_tbl VALUES ('AAPL', 'AAPL_price_history', NULL, NULL), "
+                    "('VOO', 'VOO_price_history', 'VOO_holdings_data', NULL)")
+            legacy_engine.dispose()
+
+            summary_engine = StockDataSummaryIngestionEngine(db_uri)
+
+            with summary_engine._sqlaengine.connect() as db_con:
+                summary_inspector = sqlalchemy.inspect(db_con)
+                self.assertIn("symbol_id", {column["name"] for column in summary_inspector.get_columns("nasdaq_stock_data_summary_tbl")})
+                self.assertIn(["symbol_id"], [summary_index["column_names"] for summary_index in summary_inspector.get_indexes("nasdaq_stock_data_summary_tbl")])
+
+                stored_symbol_ids = dict(db_con.execute("SELECT ticker, symbol_id FROM nasdaq_stock_data_summary_tbl").fetchall())
+
+            self.assertEqual(stored_symbol_ids, summary_engine._symbol_registry.get_symbol_ids(["AAPL", "VOO"]))
+            self.assertNotIn(None, stored_symbol_ids.values())
+
+            # A migrated table is left unchanged by the following engines:
+            StockDataSummaryIngestionEngine(db_uri)._sqlaengine.dispose()
+            summary_engine._sqlaengine.dispose()
@@ -0,0 +1,73 @@
+# Importing testing frameworks:
+import unittest
+
+# Importing 3rd party packages for testing:
+import os
+import tempfile
+import sqlalchemy
+import numpy as np
+import pandas as pd
+
+# Importing velkoz web packages for testing:
+from velkoz_web_packages.objects_stock_data.objects_stock_price.bars_stock_price import resample_price_bars
+from velkoz_web_packages.objects_stock_data.objects_stock_price.ingestion_engines_stock_price import StockPriceDataIngestionEngine
+
+def build_price_df(start, num_rows):
+    """Builds a daily price history dataframe in the StockPriceDataIngestionEngine schema."""
+    close = 100.0 + np.arange(num_rows, dtype=float)
+    return pd.DataFrame(
+        {"open": close - 0.5, "high": close + 1.0, "low": close - 1.0, "close": close, "volume": np.full(num_rows, 10)},
+        index=pd.date_range(start, periods=num_rows, freq="B", name="Date"))
+
+class PriceBarsTest(unittest.TestCase):
+
+    def test_resample_price_bars(self):
+        """
+        This method tests that daily prices are resampled into weekly and monthly
+        bars labeled by the last day of their period.
+        """
+        price_df = build_price_df("2021-01-04", 30)
+        weekly_df = resample_price_bars(price_df, "weekly")
+
+        self.assertEqual(weekly_df.index[0], pd.Timestamp("2021-01-08"))
+        self.assertEqual(list(weekly_df.iloc[0][["open", "high", "low", "close", "volume", "trading_days"]]),
+            [99.5, 105.0, 99.0, 104.0, 50, 5])
+
+        monthly_df = resample_price_bars(price_df, "monthly")
+        self.assertEqual(list(monthly_df.index), [pd.Timestamp("2021-01-31"), pd.Timestamp("2021-02-28")])
+        self.assertEqual(list(monthly_df.trading_days), [20, 10])
+
+    def test_incremental_bar_materialization(self):
+        """
+        This method tests that the StockPriceDataIngestionEngine maintains the bar
+        tables of a ticker, only rebuilding the periods affected by appended daily
+        rows, so that the stored bars equal the bars of the full daily history.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+
+            db_uri = f"sqlite:///{os.path.join(tmp_dir, 'bars.db')}"
+            price_engine = StockPriceDataIngestionEngine(db_uri, materialize_bars=True)
+            full_price_df = build_price_df("2021-01-04", 60)
+
+            price_engine._write_price_history("AAPL", full_price_df.iloc[:23])
+
+            # Counting the bars rewritten by an append ending mid-week and mid-month:
+            executed_statements = []
+            sqlalchemy.event.listen(price_engine._sqlaengine, "before_cursor_execute",
+                lambda con, cursor, statement, params, context, executemany: executed_statements.append((statement, params)))
+
+            self.assertEqual(price_engine._append_price_history("AAPL", full_price_df.iloc[20:25]), 2)
+
+            weekly_inserts = [params for statement, params in executed_statements if statement.startswith('INSERT INTO "AAPL_price_weekly"')]
+            self.assertEqual(sum(len(params) if isinstance(params, list) else 1 for params in weekly_inserts), 1)
+
+            price_engine._append_price_history("AAPL", full_price_df.iloc[25:])
+
+            for frequency in ("weekly", "monthly"):
+                stored_df = pd.read_sql_table(f"AAPL_price_{frequency}", price_engine._sqlaengine, index_col="Date")
+                expected_df = resample_price_bars(full_price_df, frequency)
+
+                self.assertEqual(list(stored_df.index), list(expected_df.index))
+                np.testing.assert_allclose(stored_df[expected_df.columns].values.astype(float), expected_df.values.astype(float))
+
+            price_engine._sqlaengine.dispose()
@@ -0,0 +1,91 @@
+# Importing testing frameworks:
+import unittest
+
+# Importing 3rd party packages for testing:
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Importing velkoz web packages for testing:
+from velkoz_web_packages.objects_stock_data.objects_stock_price.derived_metrics_stock_price import DERIVED_METRIC_COLUMNS, compute_derived_metrics
+from velkoz_web_packages.objects_stock_data.objects_stock_price.ingestion_engines_stock_price import StockPriceDataIngestionEngine
+
+def build_random_price_df(num_rows, seed):
+    """Builds a random walk price history dataframe in the StockPriceDataIngestionEngine schema."""
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, num_rows)))
+    return pd.DataFrame(
+        {"open": close * 0.99, "close": close, "volume": rng.integers(1000, 5000, num_rows),
+            "dividends": np.zeros(num_rows), "stock_splits": np.zeros(num_rows)},
+        index=pd.date_range("2020-01-01", periods=num_rows, freq="B", name="Date"))
+
+class DerivedMetricsTest(unittest.TestCase):
+
+    def test_batch_derived_metrics(self):
+        """
+        This method tests that the derived metrics computed for a batch of tickers
+        at once equal the metrics computed for each ticker with pandas, and that
+        dividends are only applied to the adjusted close when requested.
+        """
+        price_dfs = {"AAPL": build_random_price_df(80, 1), "MSFT": build_random_price_df(45, 2), "NONE": build_random_price_df(0, 3)}
+        metric_dfs = compute_derived_metrics(price_dfs, volatility_window=10)
+
+        self.assertEqual(list(metric_dfs), ["AAPL", "MSFT", "NONE"])
+        self.assertEqual(len(metric_dfs["NONE"]), 0)
+
+        for ticker in ("AAPL", "MSFT"):
+
+            close = price_dfs[ticker].close
+            log_return = np.log(close / close.shift(1))
+
+            np.testing.assert_allclose(metric_dfs[ticker].adj_close, close)
+            np.testing.assert_allclose(metric_dfs[ticker]["return"], close.pct_change())
+            np.testing.assert_allclose(metric_dfs[ticker].log_return, log_return)
+            np.testing.assert_allclose(
+                metric_dfs[ticker].volatility, log_return.rolling(10).std() * np.sqrt(252))
+
+        # Applying a dividend to the adjusted close of an unadjusted price source:
+        dividend_df = build_random_price_df(5, 4)
+        dividend_df.iloc[3, dividend_df.columns.get_loc("dividends")] = 1.0
+
+        dividend_metrics_df = compute_derived_metrics({"T": dividend_df}, volatility_window=2, adjust_dividends=True)["T"]
+        close = dividend_df.close.values
+        self.assertAlmostEqual(dividend_metrics_df["return"].iloc[3], (close[3] + 1.0) / close[2] - 1.0)
+        self.assertAlmostEqual(dividend_metrics_df.adj_close.iloc[4], close[2] * (close[3] + 1.0) / close[2] * close[4] / close[3])
+
+    def test_incremental_derived_metrics(self):
+        """
+        This method tests that appending prices to a stored price history only
+        writes the new rows and that their derived metrics, computed from a warm-up
+        window of the stored rows, equal the metrics of a full recomputation.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+
+            db_uri = f"sqlite:///{os.path.join(tmp_dir, 'metrics.db')}"
+            price_engine = StockPriceDataIngestionEngine(db_uri, derived_metrics=True, volatility_window=10)
+            full_price_df = build_random_price_df(100, 5)
+
+            # Writing a batch as the pipeline would, then appending overlapping prices:
+            write_batch = price_engine._prepare_write_batch([("AAPL", full_price_df.iloc[:60])])
+            self.assertTrue(set(DERIVED_METRIC_COLUMNS).issubset(write_batch[0][1].columns))
+            price_engine._write_price_history(*write_batch[0])
+
+            self.assertEqual(price_engine._append_price_history("AAPL", full_price_df.iloc[50:]), 40)
+            self.assertEqual(price_engine._append_price_history("AAPL", full_price_df.iloc[90:]), 0)
+
+            stored_df = pd.read_sql_table("AAPL_price_history", price_engine._sqlaengine, index_col="Date")
+            expected_df = compute_derived_metrics({"AAPL": full_price_df}, volatility_window=10)["AAPL"]
+
+            self.assertEqual(len(stored_df), 100)
+            for metric_column in DERIVED_METRIC_COLUMNS:
+                np.testing.assert_allclose(stored_df[metric_column], expected_df[metric_column])
+
+            # Appending to a table written without the metrics rewrites it with them:
+            StockPriceDataIngestionEngine(db_uri)._write_price_history("MSFT", full_price_df.iloc[:30])
+            self.assertEqual(price_engine._append_price_history("MSFT", full_price_df.iloc[30:40]), 10)
+
+            msft_df = pd.read_sql_table("MSFT_price_history", price_engine._sqlaengine, index_col="Date")
+            np.testing.assert_allclose(msft_df.volatility.values, expected_df.volatility.values[:40])
+
+            price_engine._sqlaengine.dispose()
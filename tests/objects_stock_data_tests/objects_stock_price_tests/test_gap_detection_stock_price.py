@@ -0,0 +1,121 @@
+# Importing testing frameworks:
+import unittest
+
+# Importing 3rd party packages for testing:
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Importing velkoz web packages for testing:
+from velkoz_web_packages.objects_stock_data.stock_data_reader import StockDataReader
+from velkoz_web_packages.objects_stock_data.objects_stock_price.gap_detection_stock_price import get_trading_days, get_last_completed_trading_day, plan_price_backfill, backfill_price_gaps
+from velkoz_web_packages.objects_stock_data.objects_stock_price.derived_metrics_stock_price import DERIVED_METRIC_COLUMNS, compute_derived_metrics
+from velkoz_web_packages.objects_stock_data.objects_stock_price.ingestion_engines_stock_price import StockPriceDataIngestionEngine
+
+# The full price history of the trading days of January and February 2021:
+TRADING_DAYS = get_trading_days("2021-01-01", "2021-02-28")
+FULL_PRICE_DF = pd.DataFrame(
+    {"open": 100.0 + np.arange(len(TRADING_DAYS)), "close": 100.5 + np.arange(len(TRADING_DAYS)) * 1.01,
+        "volume": np.arange(len(TRADING_DAYS)) * 10},
+    index=pd.DatetimeIndex(TRADING_DAYS, name="Date"))
+
+class FakeRangeFetcher(object):
+    """A fake range-aware fetch function returning the rows of FULL_PRICE_DF within the requested range."""
+    def __init__(self):
+        self.fetched_ranges = []
+
+    def __call__(self, ticker, start=None, end=None):
+        self.fetched_ranges.append((ticker, start, end))
+        return FULL_PRICE_DF.loc[start:end]
+
+class PriceGapDetectionTest(unittest.TestCase):
+
+    def test_trading_days(self):
+        """
+        This method tests that the trading days of the NYSE-like calendar exclude
+        weekends and the observed exchange holidays.
+        """
+        self.assertEqual(len(get_trading_days("2021-01-01", "2021-12-31")), 252)
+        self.assertEqual(len(get_trading_days("2022-01-01", "2022-12-31")), 251)
+
+        trading_days_2021 = get_trading_days("2021-01-01", "2021-12-31")
+        for holiday in ("2021-01-01", "2021-01-18", "2021-04-02", "2021-07-05", "2021-12-24"):
+            self.assertNotIn(pd.Timestamp(holiday), trading_days_2021)
+
+    def test_last_completed_trading_day(self):
+        """
+        This method tests that the last completed trading day excludes the current
+        day, weekends and holidays, and that it is the default end of a backfill plan.
+        """
+        self.assertEqual(get_last_completed_trading_day("2021-01-06"), pd.Timestamp("2021-01-05"))
+        self.assertEqual(get_last_completed_trading_day("2021-01-05"), pd.Timestamp("2021-01-04"))
+        self.assertEqual(get_last_completed_trading_day("2021-01-04 15:00"), pd.Timestamp("2020-12-31"))
+        self.assertEqual(get_last_completed_trading_day("2021-01-19"), pd.Timestamp("2021-01-15"))
+        self.assertEqual(get_last_completed_trading_day("2021-04-05"), pd.Timestamp("2021-04-01"))
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+
+            db_uri = f"sqlite:///{os.path.join(tmp_dir, 'gaps.db')}"
+            price_engine = StockPriceDataIngestionEngine(db_uri)
+
+            # A history stored up to the last completed trading day has no gap planned for today:
+            last_trading_day = get_last_completed_trading_day()
+            recent_days = get_trading_days(last_trading_day - pd.Timedelta(days=14), last_trading_day)
+            price_engine._write_price_history("AAPL", pd.DataFrame(
+                {"open": 100.0, "close": 100.5, "volume": 10}, index=pd.DatetimeIndex(recent_days, name="Date")))
+
+            stock_data_reader = StockDataReader(db_uri)
+            self.assertEqual(plan_price_backfill(stock_data_reader, ["AAPL"], recent_days[0]), [])
+
+            stock_data_reader.close()
+            price_engine._sqlaengine.dispose()
+
+    def test_plan_and_backfill_price_gaps(self):
+        """
+        This method tests that the planner finds the minimal ranges of trading days
+        missing from stored price histories, ignoring holidays and the days before a
+        ticker was listed, and that backfilling the ranges fills every gap while
+        keeping the derived metrics equal to a full recomputation.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+
+            db_uri = f"sqlite:///{os.path.join(tmp_dir, 'gaps.db')}"
+            price_engine = StockPriceDataIngestionEngine(db_uri, derived_metrics=True, volatility_window=5)
+
+            # Storing AAPL with two gaps and TSLA listed on the 11th trading day:
+            aapl_missing_days = list(TRADING_DAYS[[3, 4, 5, 20, 22]])
+            price_engine._write_price_history("AAPL", FULL_PRICE_DF.drop(aapl_missing_days))
+            price_engine._write_price_history("TSLA", FULL_PRICE_DF.iloc[10:])
+
+            stock_data_reader = StockDataReader(db_uri)
+            backfill_plan = plan_price_backfill(stock_data_reader, ["AAPL", "TSLA", "MSFT"], "2021-01-01", "2021-02-28")
+
+            self.assertEqual(backfill_plan, [
+                ("AAPL", TRADING_DAYS[3], TRADING_DAYS[5]),
+                ("AAPL", TRADING_DAYS[20], TRADING_DAYS[20]),
+                ("AAPL", TRADING_DAYS[22], TRADING_DAYS[22]),
+                ("MSFT", TRADING_DAYS[0], TRADING_DAYS[-1])])
+
+            # Merging ranges separated by a single stored day:
+            merged_plan = plan_price_backfill(stock_data_reader, ["AAPL"], "2021-01-01", "2021-02-28", merge_gap_days=1)
+            self.assertEqual(merged_plan, [("AAPL", TRADING_DAYS[3], TRADING_DAYS[5]), ("AAPL", TRADING_DAYS[20], TRADING_DAYS[22])])
+
+            # Backfilling only the missing ranges:
+            range_fetcher = FakeRangeFetcher()
+            backfill_report = backfill_price_gaps(price_engine, merged_plan, fetch_func=range_fetcher, parse_func=lambda price_df: price_df)
+
+            self.assertEqual(backfill_report["inserted"], {"AAPL": 5})
+            self.assertEqual(backfill_report["failed"], {})
+            self.assertEqual(len(range_fetcher.fetched_ranges), 2)
+            self.assertEqual(plan_price_backfill(stock_data_reader, ["AAPL"], "2021-01-01", "2021-02-28"), [])
+
+            stored_df = pd.read_sql_table("AAPL_price_history", price_engine._sqlaengine, index_col="Date")
+            expected_df = compute_derived_metrics({"AAPL": FULL_PRICE_DF}, volatility_window=5)["AAPL"]
+
+            self.assertEqual(list(stored_df.index), list(FULL_PRICE_DF.index))
+            for metric_column in DERIVED_METRIC_COLUMNS:
+                np.testing.assert_allclose(stored_df[metric_column], expected_df[metric_column])
+
+            stock_data_reader.close()
+            price_engine._sqlaengine.dispose()
@@ -0,0 +1,101 @@
+# Importing testing frameworks:
+import unittest
+
+# Importing 3rd party packages:
+import os
+import datetime
+import tempfile
+import threading
+import sqlalchemy
+
+# Importing velkoz web packages for testing:
+from velkoz_web_packages.objects_stock_data.objects_symbols.symbol_metadata_cache import SymbolMetadataCache
+from velkoz_web_packages.objects_stock_data.objects_fund_holdings.web_objects_fund_holdings import NASDAQFundHoldingsResponseObject, fetch_holdings_html
+
+# Declaring the fake symbol metadata returned without any network requests:
+FAKE_SYMBOL_METADATA = {
+    "VOO": {"quote_type": "ETF", "exchange": "PCX", "name": "Vanguard S&P 500 ETF"},
+    "VFIAX": {"quote_type": "MUTUALFUND", "exchange": "NAS", "name": "Vanguard 500 Index Fund Admiral"},
+    "AAPL": {"quote_type": "EQUITY", "exchange": "NMS", "name": "Apple Inc."},
+    "MSFT": {"quote_type": "EQUITY", "exchange": "NMS", "name": "Microsoft Corporation"}}
+
+class FakeMetadataFetcher(object):
+    """A fake symbol metadata fetch function that counts the symbols it is called with."""
+    def __init__(self):
+        self.fetched_symbols = []
+        self._lock = threading.Lock()
+
+    def __call__(self, symbol):
+        with self._lock:
+            self.fetched_symbols.append(symbol)
+
+        if symbol not in FAKE_SYMBOL_METADATA:
+            raise KeyError(symbol)
+
+        return FAKE_SYMBOL_METADATA[symbol]
+
+class SymbolMetadataCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_uri = f"sqlite:///{os.path.join(self.tmp_dir.name, 'symbols.db')}"
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_batch_fill_and_persistence(self):
+        """
+        The method tests that uncached symbols are fetched once in a batch, that
+        failed fetches are skipped with a warning and that the metadata persists
+        across cache instances sharing a database.
+        """
+        metadata_fetcher = FakeMetadataFetcher()
+        symbol_cache = SymbolMetadataCache(self.db_uri, fetch_func=metadata_fetcher)
+
+        with self.assertWarns(UserWarning):
+            symbol_metadata = symbol_cache.get_metadata(["VOO", "AAPL", "VOO", "UNKNOWN"])
+
+        self.assertEqual(sorted(metadata_fetcher.fetched_symbols), ["AAPL", "UNKNOWN", "VOO"])
+        self.assertEqual(sorted(symbol_metadata), ["AAPL", "VOO"])
+        self.assertEqual(symbol_metadata["VOO"]["name"], "Vanguard S&P 500 ETF")
+
+        # Cached symbols are not fetched again, by this instance or a new one:
+        self.assertEqual(symbol_cache.get_quote_type("AAPL"), "EQUITY")
+        new_fetcher = FakeMetadataFetcher()
+        new_cache = SymbolMetadataCache(self.db_uri, fetch_func=new_fetcher)
+        self.assertEqual(new_cache.filter_funds(["AAPL", "VFIAX", "MSFT", "VOO"]), ["VFIAX", "VOO"])
+
+        self.assertEqual(len(metadata_fetcher.fetched_symbols), 3)
+        self.assertEqual(sorted(new_fetcher.fetched_symbols), ["MSFT", "VFIAX"])
+
+        sqlaengine = sqlalchemy.create_engine(self.db_uri)
+        self.assertEqual(sqlaengine.execute("SELECT COUNT(*) FROM symbol_metadata").scalar(), 4)
+        sqlaengine.dispose()
+
+    def test_ttl_expiry(self):
+        """
+        The method tests that stale metadata is fetched again and replaces the stored row.
+        """
+        metadata_fetcher = FakeMetadataFetcher()
+        SymbolMetadataCache(self.db_uri, fetch_func=metadata_fetcher).get_metadata(["VOO"])
+
+        expired_cache = SymbolMetadataCache(self.db_uri, ttl=datetime.timedelta(0), fetch_func=metadata_fetcher)
+        expired_cache.get_metadata(["VOO"])
+        self.assertEqual(metadata_fetcher.fetched_symbols, ["VOO", "VOO"])
+
+        fresh_cache = SymbolMetadataCache(self.db_uri, fetch_func=metadata_fetcher)
+        fresh_cache.get_metadata(["VOO"])
+        fresh_cache.get_metadata(["VOO"], refresh=True)
+        self.assertEqual(metadata_fetcher.fetched_symbols, ["VOO", "VOO", "VOO"])
+
+    def test_holdings_objects_use_cache(self):
+        """
+        The method tests that holdings objects read the quote type from the cache,
+        raising a ValueError for an equity without making any request.
+        """
+        symbol_cache = SymbolMetadataCache(self.db_uri, fetch_func=FakeMetadataFetcher())
+
+        with self.assertRaises(ValueError):
+            NASDAQFundHoldingsResponseObject("AAPL", symbol_cache=symbol_cache)
+
+        self.assertIsNone(fetch_holdings_html("MSFT", symbol_cache=symbol_cache))
@@ -0,0 +1,77 @@
+# Importing testing frameworks:
+import unittest
+
+# Importing 3rd party packages:
+import os
+import tempfile
+import sqlalchemy
+
+# Importing velkoz web packages for testing:
+from velkoz_web_packages.objects_stock_data.objects_symbols.symbol_registry import SymbolRegistry
+
+class SymbolRegistryTest(unittest.TestCase):
+
+    def test_symbol_interning(self):
+        """
+        This method tests that the SymbolRegistry assigns a single integer id to
+        each ticker symbol, serves interned ids without querying the database and
+        maps ids back to their symbols.
+        """
+        sqlaengine = sqlalchemy.create_engine("sqlite:///:memory:")
+        symbol_registry = SymbolRegistry(sqlaengine)
+
+        symbol_ids = symbol_registry.get_symbol_ids(["AAPL", "MSFT", "AAPL", "VOO"])
+        self.assertEqual(sorted(symbol_ids), ["AAPL", "MSFT", "VOO"])
+        self.assertEqual(len(set(symbol_ids.values())), 3)
+        self.assertEqual(len(symbol_registry), 3)
+
+        # Interned symbols are resolved without executing any statement:
+        executed_statements = []
+        sqlalchemy.event.listen(sqlaengine, "before_cursor_execute",
+            lambda *args: executed_statements.append(args[2]))
+
+        self.assertEqual(symbol_registry.get_symbol_id("MSFT"), symbol_ids["MSFT"])
+        self.assertEqual(symbol_registry.get_symbols(symbol_ids.values()), {
+            symbol_id: symbol for symbol, symbol_id in symbol_ids.items()})
+        self.assertEqual(executed_statements, [])
+
+        # Unknown symbols are only registered if requested:
+        self.assertIsNone(symbol_registry.get_symbol_id("TSLA", register=False))
+        self.assertEqual(sqlaengine.execute("SELECT COUNT(*) FROM symbols").scalar(), 3)
+
+    def test_symbol_registration_transactions(self):
+        """
+        This method tests that ids registered within a transaction are only
+        interned once it is committed and that stored ids are read by a new
+        registry connected to the same database.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+
+            sqlaengine = sqlalchemy.create_engine(f"sqlite:///{os.path.join(tmp_dir, 'symbols.db')}")
+            symbol_registry = SymbolRegistry(sqlaengine)
+
+            # Rolling back the transaction that registered a symbol:
+            try:
+                with sqlaengine.begin() as db_con:
+                    symbol_registry.get_symbol_id("QQQ", con=db_con)
+                    raise RuntimeError("Failed write")
+            except RuntimeError:
+                pass
+
+            self.assertEqual(len(symbol_registry), 0)
+            self.assertIsNone(symbol_registry.get_symbol_id("QQQ", register=False))
+
+            # Committing the transaction that registered a symbol:
+            with sqlaengine.begin() as db_con:
+                spy_id = symbol_registry.get_symbol_id("SPY", con=db_con)
+                self.assertEqual(symbol_registry.get_symbol_id("SPY", con=db_con), spy_id)
+                self.assertEqual(len(symbol_registry), 0)
+
+            self.assertEqual(len(symbol_registry), 1)
+
+            # Reading the stored ids from a new registry:
+            new_registry = SymbolRegistry(sqlaengine)
+            self.assertEqual(new_registry.get_symbol_id("SPY", register=False), spy_id)
+            self.assertEqual(new_registry.get_symbols([spy_id]), {spy_id: "SPY"})
+
+            sqlaengine.dispose()
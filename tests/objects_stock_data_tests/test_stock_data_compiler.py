@@ -1,8 +1,14 @@
 # Importing testing frameworks:
 import unittest
 
+# Importing 3rd party packages:
+import os
+import tempfile
+import pandas as pd
+import sqlalchemy
+
 # Importing library packages for testing:
-from velkoz_web_packages.objects_stock_data.stock_data_compiler import compile_ticker_list
+from velkoz_web_packages.objects_stock_data.stock_data_compiler import compile_ticker_list, compile_ticker_costs, shard_ticker_list
 
 class TickerListCompilerTest(unittest.TestCase):
 
@@ -25,3 +31,65 @@ class TickerListCompilerTest(unittest.TestCase):
 
         # Asserting that the ticker list was compiled correctly:
         self.assertEqual(sorted(compiled_ticker_lst), sorted(manually_compiled_ticker_lst))
+
+class TickerListShardingTest(unittest.TestCase):
+
+    def test_compile_ticker_costs_method(self):
+        """
+        Method tests that “compile_ticker_costs” counts the rows stored for each
+        ticker in a database and combines them with previous fetch durations,
+        assigning the mean cost to tickers with no history.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+
+            # Writing price tables of different lengths to a temporary database:
+            db_uri = f"sqlite:///{os.path.join(tmp_dir, 'costs.db')}"
+            sqlaengine = sqlalchemy.create_engine(db_uri)
+            pd.DataFrame({"close": range(300)}).to_sql("AAPL_price_history", sqlaengine)
+            pd.DataFrame({"close": range(100)}).to_sql("TSLA_price_history", sqlaengine)
+            sqlaengine.dispose()
+
+            ticker_costs = compile_ticker_costs(["AAPL", "TSLA", "NEW"], db_uri=db_uri)
+
+        # Row counts are normalized by their mean (200 rows):
+        self.assertAlmostEqual(ticker_costs["AAPL"], 1.5)
+        self.assertAlmostEqual(ticker_costs["TSLA"], 0.5)
+        self.assertAlmostEqual(ticker_costs["NEW"], 1.0)
+
+        # Fetch durations are normalized and summed with other sources:
+        ticker_costs = compile_ticker_costs(
+            ["AAPL", "TSLA"], fetch_durations={"AAPL": 3.0, "TSLA": 1.0})
+        self.assertAlmostEqual(ticker_costs["AAPL"], 1.5)
+        self.assertAlmostEqual(ticker_costs["TSLA"], 0.5)
+
+    def test_shard_ticker_list_method(self):
+        """
+        Method tests that “shard_ticker_list” balances expected work across
+        shards, keeps every ticker exactly once and produces deterministic stable
+        assignments that barely move when the ticker list changes.
+        """
+        ticker_lst = [f"T{num}" for num in range(200)]
+        ticker_costs = {ticker: (100.0 if num < 10 else 1.0) for num, ticker in enumerate(ticker_lst)}
+
+        for stable in (False, True):
+
+            shards = shard_ticker_list(ticker_lst, 4, ticker_costs, stable=stable)
+
+            # Every ticker is assigned to exactly one shard:
+            self.assertEqual(len(shards), 4)
+            self.assertEqual(sorted(sum(shards, [])), sorted(ticker_lst))
+
+            # The heaviest shard is within the allowed load of the mean shard:
+            shard_loads = [sum(ticker_costs[ticker] for ticker in shard) for shard in shards]
+            mean_load = sum(shard_loads) / 4
+            self.assertLessEqual(max(shard_loads), mean_load * (1.25 if stable else 1.1))
+
+        # Stable assignment is deterministic and mostly unaffected by a new ticker:
+        stable_shards = shard_ticker_list(ticker_lst, 4, ticker_costs, stable=True)
+        self.assertEqual(stable_shards, shard_ticker_list(ticker_lst, 4, ticker_costs, stable=True))
+
+        extended_shards = shard_ticker_list(ticker_lst + ["NEW"], 4, ticker_costs, stable=True)
+        assignment = {ticker: num for num, shard in enumerate(stable_shards) for ticker in shard}
+        extended_assignment = {ticker: num for num, shard in enumerate(extended_shards) for ticker in shard}
+        moved_tickers = [ticker for ticker in ticker_lst if assignment[ticker] != extended_assignment[ticker]]
+        self.assertLess(len(moved_tickers), len(ticker_lst) * 0.1)
@@ -0,0 +1,229 @@
+# Importing testing frameworks:
+import unittest
+
+# Importing 3rd party packages:
+import os
+import tempfile
+import sqlalchemy
+import pandas as pd
+import numpy as np
+
+# Importing velkoz web packages for testing:
+from velkoz_web_packages.objects_stock_data.stock_data_pipeline import StockDataPipeline, format_pipeline_report, encode_stock_data_payload, decode_stock_data_payload, _write_stock_data_batch
+from velkoz_web_packages.objects_stock_data.objects_stock_price.ingestion_engines_stock_price import StockPriceDataIngestionEngine
+
+# Declaring module level stage functions so they can be sent to the parse process pool:
+def fake_fetch_price_history(ticker):
+    """Builds a raw yfinance style price dataframe without any network requests."""
+    if ticker == "FAIL":
+        raise ConnectionError("Fetch failed")
+
+    if ticker == "EMPTY":
+        return None
+
+    num_rows = 10 * (len(ticker) + 1)
+    return pd.DataFrame(
+        {"Open": np.arange(num_rows, dtype=float), "Close": np.arange(num_rows, dtype=float),
+            "Volume": np.arange(num_rows)},
+        index=pd.date_range("2020-01-01", periods=num_rows, name="Date"))
+
+def crashing_fetch_price_history(ticker):
+    """Kills the worker process fetching the 'CRASH' ticker (eg: as an out of memory kill would)."""
+    if ticker == "CRASH":
+        os._exit(1)
+
+    return fake_fetch_price_history(ticker)
+
+def fake_parse_price_history(raw_price_df):
+    """Formats the fake raw price dataframe into the price history schema."""
+    return raw_price_df.rename(columns={"Open": "open", "Close": "close", "Volume": "volume"})
+
+class WriterKiller(object):
+    """An object that kills the process unpickling it."""
+    def __reduce__(self):
+        return (os._exit, (1,))
+
+def writer_killing_parse_price_history(raw_price_df):
+    """Formats the fake raw price dataframe into a dataframe that kills the writer process decoding it."""
+    parsed_df = fake_parse_price_history(raw_price_df)
+    parsed_df.attrs["writer_killer"] = WriterKiller()
+    return parsed_df
+
+class StockDataPipelineTest(unittest.TestCase):
+
+    def test_pipeline_run(self):
+        """
+        The method runs the StockDataPipeline with stage functions that do not
+        perform network requests and tests that every ticker is fetched, parsed in
+        the process pool and written by the batched writer, and that failures and
+        skipped tickers are recorded in the throughput report.
+        """
+        ticker_lst = [f"T{num}" for num in range(25)] + ["FAIL", "EMPTY"]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+
+            db_uri = f"sqlite:///{os.path.join(tmp_dir, 'pipeline.db')}"
+            pipeline = StockDataPipeline(
+                db_uri, data_type="price", fetch_workers=4, parse_workers=2,
+                write_batch_size=10, queue_size=3,
+                fetch_func=fake_fetch_price_history, parse_func=fake_parse_price_history)
+
+            report = pipeline.run(ticker_lst)
+
+            # Asserting the contents of the throughput report:
+            self.assertEqual(report["tickers"], 27)
+            self.assertEqual(report["written"], 25)
+            self.assertEqual(report["batches_written"], 3)
+            self.assertEqual(report["skipped"], ["EMPTY"])
+            self.assertIn("FAIL", report["failed"])
+            self.assertEqual(len(report["fetch_durations"]), 27)
+            self.assertIsInstance(format_pipeline_report(report), str)
+
+            # Asserting that the parsed data was written to the database:
+            sqlaengine = sqlalchemy.create_engine(db_uri)
+            db_tables = set(sqlalchemy.inspect(sqlaengine).get_table_names())
+            self.assertEqual(db_tables, {f"T{num}_price_history" for num in range(25)})
+
+            t10_df = pd.read_sql_table("T10_price_history", sqlaengine, index_col="Date")
+            self.assertEqual(sorted(t10_df.columns), ["close", "open", "volume"])
+            self.assertEqual(len(t10_df), 40)
+            self.assertEqual(report["rows_written"], sum(10 * (len(f"T{num}") + 1) for num in range(25)))
+            sqlaengine.dispose()
+
+    def test_write_batch_prepare_failure(self):
+        """
+        The method tests that a batch whose derived metrics fail to be computed is
+        reported as failed for every ticker, and that none of its price histories
+        are written without the metrics.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+
+            price_engine = StockPriceDataIngestionEngine(
+                f"sqlite:///{os.path.join(tmp_dir, 'pipeline.db')}", derived_metrics=True)
+            write_batch = [(ticker, fake_parse_price_history(fake_fetch_price_history(ticker))) for ticker in ("T1", "T2")]
+
+            def failing_prepare_write_batch(write_batch):
+                raise MemoryError("Metrics failed")
+
+            price_engine._prepare_write_batch = failing_prepare_write_batch
+            written_batch, batches_written, write_failures = _write_stock_data_batch(
+                price_engine, price_engine._write_price_history, write_batch)
+
+            self.assertEqual((written_batch, batches_written), ([], 0))
+            self.assertEqual(write_failures, {
+                "T1": "prepare: MemoryError: Metrics failed", "T2": "prepare: MemoryError: Metrics failed"})
+            self.assertEqual(sqlalchemy.inspect(price_engine._sqlaengine).get_table_names(), [])
+            price_engine._sqlaengine.dispose()
+
+    def test_pipeline_run_multiprocess(self):
+        """
+        The method runs the StockDataPipeline in multiprocess mode and tests that
+        payloads built by the worker processes are written by the single writer
+        process, and that encoded payloads round trip to identical dataframes.
+        """
+        # Testing the payload encoding used between the worker and writer processes:
+        parsed_df = fake_parse_price_history(fake_fetch_price_history("AAPL" * 100))
+        payload = encode_stock_data_payload("AAPL", parsed_df)
+        ticker, decoded_df = decode_stock_data_payload(payload)
+        self.assertEqual(ticker, "AAPL")
+        self.assertTrue(decoded_df.equals(parsed_df))
+
+        # Asserting that the data buffers are sent through shared memory rather than the pickle stream:
+        if payload[2] is not None:
+            self.assertLess(len(payload[1]), sum(payload[3]))
+            self.assertFalse(os.path.exists(os.path.join("/dev/shm", payload[2].lstrip("/"))))
+
+        ticker_lst = [f"T{num}" for num in range(20)] + ["FAIL", "EMPTY"]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+
+            db_uri = f"sqlite:///{os.path.join(tmp_dir, 'pipeline.db')}"
+            pipeline = StockDataPipeline(
+                db_uri, data_type="price", write_batch_size=8, queue_size=4,
+                fetch_func=fake_fetch_price_history, parse_func=fake_parse_price_history)
+
+            report = pipeline.run_multiprocess(ticker_lst, worker_processes=3)
+
+            self.assertEqual(report["written"], 20)
+            self.assertEqual(report["batches_written"], 3)
+            self.assertEqual(report["skipped"], ["EMPTY"])
+            self.assertEqual(list(report["failed"]), ["FAIL"])
+            self.assertEqual(len(report["fetch_durations"]), 22)
+
+            sqlaengine = sqlalchemy.create_engine(db_uri)
+            db_tables = set(sqlalchemy.inspect(sqlaengine).get_table_names())
+            self.assertEqual(db_tables, {f"T{num}_price_history" for num in range(20)})
+            self.assertEqual(len(pd.read_sql_table("T5_price_history", sqlaengine)), 30)
+            self.assertEqual(report["process_errors"], {})
+            sqlaengine.dispose()
+
+    def test_pipeline_run_multiprocess_process_failure(self):
+        """
+        The method tests that a multiprocess run in which a worker process or the
+        writer process dies ends with the dead process in the report instead of
+        blocking forever.
+        """
+        ticker_lst = [f"T{num}" for num in range(20)]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+
+            db_uri = f"sqlite:///{os.path.join(tmp_dir, 'pipeline.db')}"
+
+            # A worker process dying, so that the writer never receives its end signal:
+            pipeline = StockDataPipeline(
+                db_uri, data_type="price", write_batch_size=8, queue_size=2,
+                fetch_func=crashing_fetch_price_history, parse_func=fake_parse_price_history)
+            report = pipeline.run_multiprocess(["CRASH"] + ticker_lst, worker_processes=2)
+
+            self.assertEqual(len(report["process_errors"]), 1)
+            self.assertIn("exit code 1", list(report["process_errors"].values())[0])
+            self.assertIn("PROCESS ERROR", format_pipeline_report(report))
+
+            # The writer process dying, so that the workers block on the full payload queue:
+            pipeline = StockDataPipeline(
+                db_uri, data_type="price", write_batch_size=8, queue_size=2,
+                fetch_func=fake_fetch_price_history, parse_func=writer_killing_parse_price_history)
+            report = pipeline.run_multiprocess(ticker_lst, worker_processes=2)
+
+            self.assertEqual(len(report["process_errors"]), 1)
+            self.assertEqual(report["written"], 0)
+
+def fake_fetch_holdings_html(ticker):
+    """Builds a raw holdings dataframe without any network requests."""
+    return pd.DataFrame({
+        "symbol": [f"{ticker}H{num}" for num in range(3)], "name": ["Holding"] * 3, "percent_holdings": [5.0, 3.0, 1.0]})
+
+def fake_parse_holdings_html(raw_holdings_df):
+    """Formats the fake raw holdings dataframe into the holdings schema."""
+    return raw_holdings_df.set_index("symbol")
+
+def fake_fetch_symbol_metadata(symbol):
+    """Returns symbol metadata without any network requests: tickers starting with 'F' are ETFs."""
+    return {"quote_type": "ETF" if symbol.startswith("F") else "EQUITY", "exchange": "NYQ", "name": symbol}
+
+class StockDataPipelineSymbolCacheTest(unittest.TestCase):
+
+    def test_holdings_pipeline_filters_equities(self):
+        """
+        The method tests that a holdings pipeline given a SymbolMetadataCache
+        filters out equities before fetching, reporting them as skipped.
+        """
+        from velkoz_web_packages.objects_stock_data.objects_symbols.symbol_metadata_cache import SymbolMetadataCache
+
+        ticker_lst = ["FUND1", "AAPL", "FUND2", "MSFT"]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+
+            db_uri = f"sqlite:///{os.path.join(tmp_dir, 'pipeline.db')}"
+            symbol_cache = SymbolMetadataCache(db_uri, fetch_func=fake_fetch_symbol_metadata)
+            pipeline = StockDataPipeline(
+                db_uri, data_type="holdings", fetch_workers=2, parse_workers=0,
+                fetch_func=fake_fetch_holdings_html, parse_func=fake_parse_holdings_html,
+                symbol_cache=symbol_cache)
+
+            report = pipeline.run(ticker_lst)
+
+            self.assertEqual(report["tickers"], 4)
+            self.assertEqual(report["written"], 2)
+            self.assertEqual(report["skipped"], ["AAPL", "MSFT"])
+            self.assertEqual(sorted(report["fetch_durations"]), ["FUND1", "FUND2"])
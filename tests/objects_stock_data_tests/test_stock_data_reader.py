@@ -0,0 +1,141 @@
+# Importing testing frameworks:
+import unittest
+
+# Importing 3rd party packages for testing:
+import os
+import datetime
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Importing velkoz web packages for testing:
+from velkoz_web_packages.objects_stock_data.stock_data_reader import StockDataReader
+from velkoz_web_packages.objects_stock_data.objects_stock_price.ingestion_engines_stock_price import StockPriceDataIngestionEngine
+from velkoz_web_packages.objects_stock_data.objects_fund_holdings.ingestion_engines_fund_holdings import FundHoldingsDataIngestionEngine
+
+def build_price_df(num_rows, start_price=100.0):
+    """Builds a price history dataframe in the StockPriceDataIngestionEngine schema."""
+    return pd.DataFrame(
+        {"open": start_price + np.arange(num_rows, dtype=float), "close": start_price + np.arange(num_rows, dtype=float) + 0.5,
+            "volume": np.arange(num_rows) * 100},
+        index=pd.date_range("2021-01-04", periods=num_rows, freq="B", name="Date"))
+
+class StockDataReaderTest(unittest.TestCase):
+
+    def test_cached_price_history_reads(self):
+        """
+        This method tests that the StockDataReader reads price histories restricted
+        to a date range and columns, serves repeated reads from its LRU cache and
+        drops the cached entries of a ticker once an Ingestion Engine commits a
+        write of that ticker.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+
+            db_uri = f"sqlite:///{os.path.join(tmp_dir, 'reader.db')}"
+            price_engine = StockPriceDataIngestionEngine(db_uri)
+            price_engine._write_price_history("AAPL", build_price_df(20))
+            price_engine._write_price_history("MSFT", build_price_df(10, 200.0))
+
+            stock_data_reader = StockDataReader(db_uri, cache_size=2)
+
+            aapl_df = stock_data_reader.get_price_history("AAPL", start="2021-01-05", end="2021-01-08", columns=["close"])
+            self.assertEqual(list(aapl_df.columns), ["close"])
+            self.assertEqual(list(aapl_df.close), [101.5, 102.5, 103.5, 104.5])
+
+            # Reading several tickers, one of which has no price history:
+            price_histories = stock_data_reader.get_price_history(["AAPL", "MSFT", "NONE"])
+            self.assertEqual(sorted(price_histories), ["AAPL", "MSFT"])
+            self.assertEqual(len(price_histories["AAPL"]), 20)
+
+            cache_stats = stock_data_reader.get_cache_stats()
+            self.assertEqual((cache_stats["hits"], cache_stats["misses"], cache_stats["evictions"]), (1, 3, 1))
+
+            # Returned dataframes do not share memory with the cache:
+            price_histories["MSFT"]["close"] = 0.0
+            self.assertEqual(stock_data_reader.get_price_history("MSFT").close.iloc[0], 200.5)
+
+            # Committed writes invalidate the cached ticker, rolled back writes do not:
+            with self.assertRaises(RuntimeError):
+                with price_engine._sqlaengine.begin() as db_con:
+                    price_engine._write_price_history("MSFT", build_price_df(5), con=db_con)
+                    raise RuntimeError("Failed write")
+
+            self.assertEqual(stock_data_reader.get_cache_stats()["invalidations"], 0)
+
+            price_engine._write_price_history("MSFT", build_price_df(5))
+            self.assertEqual(stock_data_reader.get_cache_stats()["invalidations"], 1)
+            self.assertEqual(len(stock_data_reader.get_price_history("MSFT")), 5)
+
+            stock_data_reader.close()
+            price_engine._sqlaengine.dispose()
+
+    def test_price_panel_loading(self):
+        """
+        This method tests that the StockDataReader loads the prices of several
+        tickers into a dense (date x ticker x field) array aligned on business days,
+        with NaN for missing days, tickers and fields, in memory or memory-mapped.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+
+            db_uri = f"sqlite:///{os.path.join(tmp_dir, 'reader.db')}"
+            price_engine = StockPriceDataIngestionEngine(db_uri)
+            price_engine._write_price_history("AAPL", build_price_df(20))
+            price_engine._write_price_history("MSFT", build_price_df(10, 200.0).drop(pd.Timestamp("2021-01-06")))
+
+            stock_data_reader = StockDataReader(db_uri)
+
+            for memmap_path in (None, os.path.join(tmp_dir, "panel.npy")):
+
+                panel, dates, tickers = stock_data_reader.get_price_panel(
+                    ["MSFT", "NONE", "AAPL"], "2021-01-02", "2021-01-15", fields=["close", "volume", "high"], chunk_size=2,
+                    memmap_path=memmap_path)
+
+                self.assertEqual(panel.shape, (10, 3, 3))
+                self.assertEqual(dates[0], pd.Timestamp("2021-01-04"))
+                self.assertEqual(tickers, ["MSFT", "NONE", "AAPL"])
+
+                # Comparing the panel to the price histories read as dataframes:
+                aapl_df = stock_data_reader.get_price_history("AAPL", start=dates[0], end=dates[-1])
+                np.testing.assert_array_equal(panel[:, 2, 0], aapl_df.close.values)
+                np.testing.assert_array_equal(panel[:, 2, 1], aapl_df.volume.values)
+
+                self.assertTrue(np.isnan(panel[2, 0, 0]))
+                self.assertEqual(panel[3, 0, 0], 203.5)
+                self.assertTrue(np.isnan(panel[:, 1, :]).all())
+                self.assertTrue(np.isnan(panel[:, :, 2]).all())
+
+            self.assertTrue(np.array_equal(np.load(memmap_path), panel, equal_nan=True))
+
+            stock_data_reader.close()
+            price_engine._sqlaengine.dispose()
+
+    def test_cached_holdings_reads(self):
+        """
+        This method tests that the StockDataReader reads the latest holdings
+        snapshot of a fund and that the cached holdings are invalidated by a new
+        snapshot of the fund.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+
+            db_uri = f"sqlite:///{os.path.join(tmp_dir, 'reader.db')}"
+            holdings_engine = FundHoldingsDataIngestionEngine(db_uri)
+            holdings_engine._write_holdings_data("VOO", pd.DataFrame(
+                {"symbol": ["AAPL", "MSFT"], "name": ["Apple Inc", "Microsoft Corp"], "percent_holdings": [6.5, 5.9]}).set_index("symbol"),
+                as_of_date=datetime.date(2021, 1, 4))
+
+            stock_data_reader = StockDataReader(db_uri)
+            self.assertIsNone(stock_data_reader.get_holdings("QQQ"))
+            self.assertEqual(list(stock_data_reader.get_holdings("VOO").index), ["AAPL", "MSFT"])
+            self.assertEqual(stock_data_reader.get_cache_stats()["misses"], 2)
+
+            holdings_engine._write_holdings_data("VOO", pd.DataFrame(
+                {"symbol": ["AMZN"], "name": ["Amazon.com Inc"], "percent_holdings": [4.1]}).set_index("symbol"),
+                as_of_date=datetime.date(2021, 2, 1))
+
+            voo_df = stock_data_reader.get_holdings("VOO")
+            self.assertEqual(list(voo_df.index), ["AMZN"])
+            self.assertEqual(voo_df.percent_holdings.iloc[0], 4.1)
+            self.assertEqual(stock_data_reader.get_cache_stats()["misses"], 3)
+
+            stock_data_reader.close()
+            holdings_engine._sqlaengine.dispose()
@@ -1,14 +1,73 @@
 # Importing native packages:
+import sys
 import time
+import queue
+import weakref
 import warnings
+import threading
+import contextlib
 
 # Importing local packages:
 from velkoz_web_packages.objects_base.web_objects_base import BaseWebPageResponse
 from velkoz_web_packages.objects_base.db_orm_models_base import BaseWebPageResponseModel, Base
 
 # Importing thrid party packages:
-from sqlalchemy import create_engine, MetaData, Column, String, DateTime, Integer, inspect
+from sqlalchemy import create_engine, MetaData, Column, String, DateTime, Integer, inspect, event
 from sqlalchemy.orm import sessionmaker, Session, scoped_session
+from sqlalchemy.pool import StaticPool
+import pandas as pd
+
+# The sentinel object placed onto the streaming que to stop the background writer:
+_STREAM_COMPLETE = object()
+
+# The key of the writes made by an uncommitted transaction in Connection.info:
+_PENDING_WRITES = "velkoz_pending_writes"
+
+# The key of the callbacks waiting for an uncommitted transaction in Connection.info:
+_PENDING_CALLBACKS = "velkoz_pending_callbacks"
+
+# The weak references to the callbacks notified of the tickers written by any Ingestion Engine:
+_write_listeners = []
+_write_listeners_lock = threading.Lock()
+
+def add_write_listener(callback):
+    """
+    The method registers a callback that is notified each time an Ingestion Engine
+    of this process writes data for a set of tickers, once the write is committed.
+    It is used by readers that cache data to invalidate the cached tickers.
+
+    The callback is called with the arguments (db_url, data_type, tickers) where
+    db_url is the rendered URL of the written database, data_type the kind of data
+    written (eg: "price" or "holdings") and tickers a frozenset of ticker symbols.
+    Only a weak reference to the callback is kept, so registering a bound method
+    does not keep its object alive.
+
+    Args:
+        callback (function): The function or bound method to be notified.
+
+    """
+    callback_ref = weakref.WeakMethod(callback) if hasattr(callback, "__self__") else weakref.ref(callback)
+
+    with _write_listeners_lock:
+        _write_listeners.append(callback_ref)
+
+def remove_write_listener(callback):
+    """Unregisters a callback registered via the add_write_listener() method."""
+    with _write_listeners_lock:
+        _write_listeners[:] = [
+            callback_ref for callback_ref in _write_listeners
+            if callback_ref() is not None and callback_ref() != callback]
+
+def _notify_write_listeners(db_url, data_type, tickers):
+    """Calls every registered write listener, dropping the listeners that were garbage collected."""
+    with _write_listeners_lock:
+        callbacks = [callback_ref() for callback_ref in _write_listeners]
+        _write_listeners[:] = [
+            callback_ref for callback_ref, callback in zip(_write_listeners, callbacks) if callback is not None]
+
+    for callback in callbacks:
+        if callback is not None:
+            callback(db_url, data_type, tickers)
 
 
 class BaseWebPageIngestionEngine(object):
@@ -26,6 +85,20 @@ class BaseWebPageIngestionEngine(object):
     should be written with an accompanying Ingestion Engine that Inherits from
     the BaseDataIngestionEngine().
 
+    The Ingestion Engine is thread-safe. Any number of threads can insert Web
+    Objects into the que and call the writing methods concurrently:
+
+    * The que of Web Objects is guarded by a lock and each call to _write_web_objects()
+        takes ownership of the Web Objects it writes, so a Web Object is never
+        written twice or purged before it is written.
+    * The database session is a scoped_session, meaning each thread uses its
+        own Session object. The validation dict is also stored per thread.
+    * In single writer mode (the default for SQLite databases) all commits are
+        serialized by a write lock so that threads do not contend for SQLite’s
+        database lock, while the creation and parsing of Web Objects in those
+        threads remains parallel. Work done by the _prepare_web_obj() method of
+        an Ingestion Engine is also performed outside of the write lock.
+
     Args:
         db_uri (str): The string URI for the database to be connected to. It is
             used to initialize the SQLAlchemy database engine.
@@ -34,6 +107,10 @@ class BaseWebPageIngestionEngine(object):
             (and type checked) to be instances of BaseWebPageResponse() objects or
             any object that uses BaseWebPageResponse() as its base.
 
+        single_writer (bool): Whether all database writes of the Ingestion Engine
+            are serialized by a lock. If it is not provided single writer mode is
+            enabled for SQLite databases only.
+
     Attributes:
             _WebPageResponseObjs (list): A list of arguments that are assumed (and type
                 checked) to be instances of BaseWebPageResponse() objects or any object
@@ -53,21 +130,80 @@ class BaseWebPageIngestionEngine(object):
                 connection to the database binded to the database engine via the
                 _sqlaengine parameter.
 
+            _que_lock (threading.RLock): The lock guarding the _WebPageResponseObjs
+                list.
+
+            _write_lock (threading.RLock): The lock serializing database writes in
+                single writer mode. It is a no-op context when single writer mode
+                is disabled.
+
+            _stream_que (queue.Queue): The bounded, thread-safe que of Web Objects
+                waiting to be written by the background writer when the Ingestion
+                Engine is in streaming mode. It is None when streaming is not active.
+
+            _stream_writer (threading.Thread): The background thread that writes
+                batches of Web Objects from the _stream_que to the database.
+
+            _stream_stats (dict): Counters describing the Web Objects and batches
+                written by the background writer in the current streaming session.
+
+            _db_url (str): The rendered URL of the connected database, passed to
+                the write listeners notified by the _notify_written() method.
+
     References:
         * https://hackersandslackers.com/python-database-management-sqlalchemy
 
     """
-    def __init__(self, db_uri, *WebPageResponseObjs):
+    def __init__(self, db_uri, *WebPageResponseObjs, single_writer=None):
 
         # Declaring instance variables:
         self._WebPageResponseObjs = list(WebPageResponseObjs)
         self._db_uri = db_uri
 
         # Creating the sqlalchemy database engine and binding session to database:
-        self._sqlaengine = create_engine(self._db_uri, pool_pre_ping=True, echo=True)
+        if self._db_uri.startswith("sqlite") and (":memory:" in self._db_uri or self._db_uri.rstrip("/") == "sqlite:"):
+
+            # An in-memory SQLite database only exists within a single connection,
+            # so it is shared between threads instead of creating one per thread:
+            self._sqlaengine = create_engine(self._db_uri, echo=True, poolclass=StaticPool,
+                connect_args={"check_same_thread": False})
+
+        else:
+            self._sqlaengine = create_engine(self._db_uri, pool_pre_ping=True, echo=True)
+
         self._db_session_maker = sessionmaker(bind=self._sqlaengine)
         self._db_session = scoped_session(self._db_session_maker)
 
+        # Notifying the write listeners of writes made within a transaction once it is committed:
+        self._db_url = str(self._sqlaengine.url)
+        event.listen(self._sqlaengine, "commit", self._notify_pending_writes)
+        event.listen(self._sqlaengine, "rollback", self._discard_pending_writes)
+
+        # Declaring the locks that make the Ingestion Engine thread-safe:
+        if single_writer is None:
+            single_writer = self._sqlaengine.dialect.name == "sqlite"
+
+        self._que_lock = threading.RLock()
+        self._write_lock = threading.RLock() if single_writer else contextlib.nullcontext()
+        self._thread_state = threading.local()
+
+        # Declaring the streaming mode instance variables (inactive by default):
+        self._stream_que = None
+        self._stream_writer = None
+        self._stream_stats = {}
+
+    @property
+    def _validation_dict(self):
+        """dict: The {object: object_status_code} dict generated by the most recent
+        call to the _validate_args() method in the current thread. It is stored
+        per thread so that concurrent writes do not overwrite each other’s
+        validation status."""
+        return getattr(self._thread_state, "validation_dict", {})
+
+    @_validation_dict.setter
+    def _validation_dict(self, validation_dict):
+        self._thread_state.validation_dict = validation_dict
+
     def _insert_web_obj(self, web_obj):
         """The method contains the basic logic that allows a Web Object to be added
         to the que (list) of Web Objects currently in the ingestion engine.
@@ -82,11 +218,10 @@ class BaseWebPageIngestionEngine(object):
         validation_status_code = self._get_validation_status(web_obj)
 
         # If the input parameter is validated, appending it to the main Web Obj Que:
-        if validation_status_code > 10:
-            self._WebPageResponseObjs.append(web_obj)
-
-        else:
+        if validation_status_code <= 10:
             warnings.warn(f"Input Parameters Failed Internal Validation, Parameter is status code {validation_status_code}. It was added to the list of ingestion objects however this may cause conflicts. Please check input.")
+
+        with self._que_lock:
             self._WebPageResponseObjs.append(web_obj)
 
     def _purge_web_obj_que(self):
@@ -98,7 +233,8 @@ class BaseWebPageIngestionEngine(object):
 
         """
         # Performing the clear method on the main Web Object Que:
-        self._WebPageResponseObjs.clear()
+        with self._que_lock:
+            self._WebPageResponseObjs.clear()
 
     def _write_web_objects(self):
         """The method that writes data from the WebPageResponseObj passed into the
@@ -121,21 +257,406 @@ class BaseWebPageIngestionEngine(object):
         As such, any WebObjects within the que will be removed after this method
         is called only if their data is sucessfully written to the database.
 
+        The method is safe to call from several threads at once. Each call takes
+        the Web Objects that are currently in the que out of it, so Web Objects
+        inserted by other threads while the write is in progress remain in the
+        que for the next call. If writing fails, the Web Objects that were not
+        written are returned to the front of the que before the error is raised.
+
         """
+        # Taking ownership of the Web Objects currently in the que:
+        web_objects = self._take_web_obj_que()
+
         # Performing validation/type checking on the *_WebResponseObj arguments:
-        self._validation_dict = self._validate_args()
+        self._validation_dict = self._validate_args(web_objects)
 
         # Iterating through the list of web objects adding them to the db session:
-        for web_object in self._WebPageResponseObjs:
+        for web_object_index, web_object in enumerate(web_objects):
+
+            try:
+                # Preparing the web object before the write lock is taken:
+                self._prepare_web_obj(web_object)
+
+                with self._write_lock:
+
+                    # Adding them to the database session:
+                    self._add_session_web_obj(web_object)
+
+                    # Writing the web objects to the database.
+                    self._db_session.commit()
+
+            except Exception:
+
+                # Returning the Web Objects that were not written to the que:
+                self._db_session.rollback()
+                self._web_objs_rolled_back([web_object])
+                self._return_web_obj_que(web_objects[web_object_index:])
+                raise
+
+            self._web_objs_committed([web_object])
+
+    def _take_web_obj_que(self):
+        """The method removes every Web Object from the que and returns them. It is
+        used by writing methods to take ownership of the Web Objects they write so
+        that concurrent writes never write the same Web Object twice.
+
+        Returns:
+            list: The Web Objects that were in the que.
+
+        """
+        with self._que_lock:
+            web_objects = list(self._WebPageResponseObjs)
+            self._WebPageResponseObjs.clear()
+
+        return web_objects
+
+    def _return_web_obj_que(self, web_objects):
+        """The method places Web Objects that failed to be written back at the
+        front of the que.
+
+        Args:
+            web_objects (list): The Web Objects to return to the que.
+
+        """
+        with self._que_lock:
+            self._WebPageResponseObjs[0:0] = web_objects
+
+    def _start_stream_writer(self, max_que_size=1000, flush_size=50,
+        flush_bytes=64 * 1024 * 1024, flush_interval=5.0):
+        """The method puts the Ingestion Engine into streaming mode.
+
+        In streaming mode Web Objects are not collected in the _WebPageResponseObjs
+        list and written all at once. Instead producers (from any thread) push
+        Web Objects onto a bounded thread-safe que via the _stream_web_obj() method
+        and a background writer thread writes them to the database in batches.
+        A batch is written (flushed) as soon as any of the following is true:
+
+        * The batch contains flush_size Web Objects.
+        * The estimated in-memory size of the batch reaches flush_bytes.
+        * flush_interval seconds have passed since the first Web Object was added
+            to the batch.
+
+        This means that the first Web Objects are written to the database while
+        later ones are still being created, and because the que is bounded the
+        memory used by the Ingestion Engine is capped regardless of the number
+        of Web Objects ingested. Once a producer fills the que, _stream_web_obj()
+        blocks until the writer catches up.
+
+        Streaming mode is ended via the _stop_stream_writer() method.
+
+        Args:
+            max_que_size (int): The maximum number of Web Objects waiting in the que.
+
+            flush_size (int): The number of Web Objects that triggers a flush.
+
+            flush_bytes (int): The estimated size in bytes of a batch that triggers
+                a flush. The size of each Web Object is estimated by the
+                _get_web_obj_size() method.
+
+            flush_interval (float): The maximum number of seconds a Web Object waits
+                in a batch before the batch is flushed.
+
+        """
+        if self._stream_writer is not None:
+            raise RuntimeError("The Ingestion Engine is already in streaming mode.")
+
+        # Declaring the streaming parameters and the bounded que:
+        self._stream_que = queue.Queue(maxsize=max_que_size)
+        self._stream_flush_size = max(1, flush_size)
+        self._stream_flush_bytes = flush_bytes
+        self._stream_flush_interval = flush_interval
+        self._stream_failed_objs = []
+        self._stream_stats = {"objects_written": 0, "batches_written": 0, "objects_failed": 0}
+
+        # Starting the background writer thread:
+        self._stream_writer = threading.Thread(target=self._stream_writer_loop, daemon=True)
+        self._stream_writer.start()
+
+    def _stream_web_obj(self, web_obj, timeout=None):
+        """The method pushes a Web Object onto the streaming que to be written by
+        the background writer. It can safely be called from any thread.
+
+        The Web Object is validated in the same manner as the _insert_web_obj()
+        method. If the que is full the method blocks until the background writer
+        has made room or until the timeout expires.
+
+        Args:
+            web_obj (BaseWebPageResponse): The Web Object to be written.
+
+            timeout (float): The maximum number of seconds to wait for room in
+                the que. If None the method blocks until there is room.
+
+        Raises:
+            queue.Full: If the que is still full once the timeout expires.
+
+        """
+        if self._stream_que is None:
+            raise RuntimeError("The Ingestion Engine is not in streaming mode. Call _start_stream_writer() first.")
+
+        # Validating the input parameter:
+        validation_status_code = self._get_validation_status(web_obj)
+        if validation_status_code <= 10:
+            warnings.warn(f"Input Parameters Failed Internal Validation, Parameter is status code {validation_status_code}. It was added to the streaming que however this may cause conflicts. Please check input.")
 
-            # Adding them to the database session:
-            self._add_session_web_obj(web_object)
+        self._stream_que.put(web_obj, timeout=timeout)
 
-            # Writing the web objects to the database.
-            self._db_session.commit()
+    def _stop_stream_writer(self):
+        """The method ends streaming mode. It blocks until every Web Object in the
+        streaming que has been written and the background writer has stopped.
 
-        # If all web objects are sucessfully added to the session, purging the que:
-        self._purge_web_obj_que()
+        Returns:
+            list: The Web Objects that the background writer failed to write to
+                the database. A warning is raised if this list is not empty.
+
+        """
+        if self._stream_writer is None:
+            return []
+
+        # Signaling the writer to flush its final batch and stop:
+        self._stream_que.put(_STREAM_COMPLETE)
+        self._stream_writer.join()
+
+        failed_objs = self._stream_failed_objs
+        self._stream_que = None
+        self._stream_writer = None
+
+        if len(failed_objs) > 0:
+            warnings.warn(f"{len(failed_objs)} Web Objects failed to be written by the streaming writer.")
+
+        return failed_objs
+
+    def _stream_writer_loop(self):
+        """The method run by the background writer thread while the Ingestion
+        Engine is in streaming mode.
+
+        It collects Web Objects from the streaming que into a batch and flushes
+        the batch via the _flush_web_obj_batch() method when the batch reaches
+        the size, byte or time limit set by _start_stream_writer().
+
+        """
+        batch = []
+        batch_bytes = 0
+        batch_deadline = None
+
+        while True:
+
+            # Waiting for the next Web Object no longer than the batch deadline:
+            try:
+                if batch_deadline is None:
+                    web_obj = self._stream_que.get()
+                else:
+                    web_obj = self._stream_que.get(timeout=max(0, batch_deadline - time.monotonic()))
+
+            except queue.Empty:
+                self._flush_stream_batch(batch)
+                batch, batch_bytes, batch_deadline = [], 0, None
+                continue
+
+            if web_obj is _STREAM_COMPLETE:
+                self._flush_stream_batch(batch)
+                break
+
+            # Adding the Web Object to the batch and flushing if a limit is reached:
+            if batch_deadline is None:
+                batch_deadline = time.monotonic() + self._stream_flush_interval
+
+            batch.append(web_obj)
+            batch_bytes += self._get_web_obj_size(web_obj)
+
+            if len(batch) >= self._stream_flush_size or batch_bytes >= self._stream_flush_bytes:
+                self._flush_stream_batch(batch)
+                batch, batch_bytes, batch_deadline = [], 0, None
+
+        # Releasing the writer thread's database session:
+        self._db_session.remove()
+
+    def _flush_stream_batch(self, batch):
+        """The method writes a batch collected by the background writer, recording
+        the outcome in the _stream_stats instead of raising so that a single bad
+        batch does not stop the writer.
+
+        """
+        if len(batch) == 0:
+            return
+
+        try:
+            self._flush_web_obj_batch(batch)
+            self._stream_stats["objects_written"] += len(batch)
+            self._stream_stats["batches_written"] += 1
+
+        except Exception as error:
+            self._db_session.rollback()
+            warnings.warn(f"Streaming batch of {len(batch)} Web Objects failed to be written: {error}")
+            self._stream_failed_objs.extend(batch)
+            self._stream_stats["objects_failed"] += len(batch)
+
+    def _flush_web_obj_batch(self, batch):
+        """The method writes a batch of Web Objects to the database in a single
+        commit. It is the streaming mode equivalent of the _write_web_objects()
+        method and uses the same _add_session_web_obj() method to add each Web
+        Object to the database session, so Ingestion Engines that overwrite
+        _add_session_web_obj() support streaming mode without any changes.
+
+        Args:
+            batch (list): The list of Web Objects to be written.
+
+        """
+        # Validating the Web Objects in the batch:
+        self._validation_dict = self._validate_args(batch)
+
+        try:
+            for web_object in batch:
+                self._prepare_web_obj(web_object)
+
+            with self._write_lock:
+
+                for web_object in batch:
+                    self._add_session_web_obj(web_object)
+
+                self._db_session.commit()
+
+        except Exception:
+            self._db_session.rollback()
+            self._web_objs_rolled_back(batch)
+            raise
+
+        self._web_objs_committed(batch)
+
+    def _prepare_web_obj(self, web_object):
+        """The method is called by the _write_web_objects() and _flush_web_obj_batch()
+        methods for each Web Object before the write lock is taken and the Web
+        Object is added to the database session. It does nothing by default.
+        Ingestion Engines overwrite it to perform slow work that does not write to
+        the database (eg: fetching or parsing documents) without serializing it
+        behind the writes of other threads.
+
+        Args:
+            web_object (BaseWebPageResponse): The Web Object about to be written.
+
+        """
+        pass
+
+    def _web_objs_committed(self, web_objects):
+        """The method is called by the _write_web_objects() and _flush_web_obj_batch()
+        methods once the Web Objects they added to the database session have been
+        committed. By default it records the url of each Web Object as seen by its
+        url_frontier (see BaseWebPageResponse._mark_url_seen()). Ingestion Engines
+        extend it to act on other writes only once they are durable.
+
+        Args:
+            web_objects (list): The Web Objects that were committed.
+
+        """
+        for web_object in web_objects:
+            if isinstance(web_object, BaseWebPageResponse):
+                web_object._mark_url_seen()
+
+    def _web_objs_rolled_back(self, web_objects):
+        """The method is called by the _write_web_objects() and _flush_web_obj_batch()
+        methods when writing Web Objects failed and the database session was rolled
+        back. By default it releases the claim of the url_frontier of each Web Object
+        on its url (see BaseWebPageResponse._release_url()). It is the counterpart
+        of the _web_objs_committed() method.
+
+        Args:
+            web_objects (list): The Web Objects that were not written.
+
+        """
+        for web_object in web_objects:
+            if isinstance(web_object, BaseWebPageResponse):
+                web_object._release_url()
+
+    def _notify_written(self, data_type, tickers, con=None):
+        """
+        The method notifies the write listeners registered via add_write_listener()
+        that data of a set of tickers was written to the database. Ingestion Engines
+        call it from their writing methods so that cached reads of the tickers are
+        invalidated.
+
+        If the data was written within the transaction of a connection the listeners
+        are only notified once said transaction is committed (and never if it is
+        rolled back), so that a reader does not re-cache the data before the write
+        is visible.
+
+        Args:
+            data_type (str): The kind of data written (eg: "price" or "holdings").
+
+            tickers (iterable): The ticker symbols whose data was written.
+
+            con (sqlalchemy.engine.Connection): The connection the data was written
+                with, if the write is part of an uncommitted transaction.
+
+        """
+        if con is None or not con.in_transaction():
+            _notify_write_listeners(self._db_url, data_type, frozenset(tickers))
+            return
+
+        con.info.setdefault(_PENDING_WRITES, {}).setdefault(data_type, set()).update(tickers)
+
+    def _call_after_commit(self, callback, con=None):
+        """
+        The method calls a callback once the data written within the transaction
+        of a connection is committed, in the same manner as the write listeners
+        notified by the _notify_written() method. It is used by Ingestion Engines
+        to invalidate their own caches so that a concurrent read can not cache
+        the data being replaced before the write is committed.
+
+        The callback is discarded if the transaction is rolled back, and is called
+        immediately if no connection is passed or it is not in a transaction. A
+        callback passed several times within a transaction is called once.
+
+        Args:
+            callback (function): The function called without arguments.
+
+            con (sqlalchemy.engine.Connection): The connection the data was written
+                with, if the write is part of an uncommitted transaction.
+
+        """
+        if con is None or not con.in_transaction():
+            callback()
+            return
+
+        con.info.setdefault(_PENDING_CALLBACKS, {})[callback] = None
+
+    def _notify_pending_writes(self, con):
+        """The commit event listener notifying the write listeners and calling the callbacks of the committed transaction."""
+        for data_type, tickers in con.info.pop(_PENDING_WRITES, {}).items():
+            _notify_write_listeners(self._db_url, data_type, frozenset(tickers))
+
+        for callback in con.info.pop(_PENDING_CALLBACKS, {}):
+            callback()
+
+    def _discard_pending_writes(self, con):
+        """The rollback event listener discarding the writes and callbacks of the rolled back transaction."""
+        con.info.pop(_PENDING_WRITES, None)
+        con.info.pop(_PENDING_CALLBACKS, None)
+
+    def _get_web_obj_size(self, web_obj):
+        """The method estimates the in-memory size in bytes of a Web Object. It is
+        used by the streaming writer to flush batches once they reach a byte limit.
+
+        The estimate is the sum of the sizes of the bulk data parameters of the
+        Web Object: bytes parameters (eg: the raw html body) and pandas dataframes
+        (eg: price history or holdings data). If the Web Object has no such
+        parameters the size of the object itself is used.
+
+        Args:
+            web_obj (object): The Web Object whose size is being estimated.
+
+        Returns:
+            int: The estimated size of the Web Object in bytes.
+
+        """
+        web_obj_size = 0
+        for web_obj_param in getattr(web_obj, "__dict__", {}).values():
+
+            if isinstance(web_obj_param, (bytes, bytearray)):
+                web_obj_size += len(web_obj_param)
+
+            elif isinstance(web_obj_param, pd.DataFrame):
+                web_obj_size += int(web_obj_param.memory_usage(deep=True).sum())
+
+        return web_obj_size or sys.getsizeof(web_obj)
 
     def _add_session_web_obj(self, web_object):
         """The method ingests a web_object, validates said object and adds the
@@ -193,10 +714,11 @@ class BaseWebPageIngestionEngine(object):
         else:
             raise ValueError(f"Object {web_object} Was Not Added to Session due to Validation Error")
 
-    def _validate_args(self):
+    def _validate_args(self, web_objs=None):
         '''
         A method used to collect data on and type check the argumens passed into the
-        _WebPageResponseObjs parameter.
+        _WebPageResponseObjs parameter (or an explicit list of Web Objects such as a
+        batch written by the streaming writer).
 
         The method at base ensures that each element passed into the argument is
         either an instance of BaseWebPageResponse or one of its subclasses. It
@@ -210,14 +732,22 @@ class BaseWebPageIngestionEngine(object):
         It builds a dictionary in order to associate the status_code with the object
         for debugging purposes in the event of an error.
 
+        Args:
+            web_objs (list): An optional list of Web Objects to validate. If it is
+                not provided the _WebPageResponseObjs list is validated.
+
         Returns:
             dict: The dictionary that contains the key-value pairs of
                 {object: object_status_code} generated from the list of arguments
                 passed into _WebPageResponseObjs.
 
         '''
+        if web_objs is None:
+            with self._que_lock:
+                web_objs = list(self._WebPageResponseObjs)
+
         # Iterating through the list of _WebPageResponseObjs and determining obj type:
-        object_type_dict = {obj:self._get_validation_status(obj) for obj in self._WebPageResponseObjs}
+        object_type_dict = {obj:self._get_validation_status(obj) for obj in web_objs}
 
         return object_type_dict
 
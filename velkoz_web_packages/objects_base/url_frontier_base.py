@@ -0,0 +1,165 @@
+# Importing native packages:
+import os
+import hashlib
+import threading
+import urllib.parse
+
+class URLFrontier(object):
+    """
+    A thread-safe crawl frontier shared by the web objects of a crawl. It keeps
+    track of the urls that are being fetched and of the urls whose data has been
+    written, so that no url is fetched twice when several companies (or several
+    threads) link to the same documents.
+
+    The frontier consists of two parts:
+
+    * A set of pending urls. Web objects claim a url with claim_url() before
+        fetching it, which atomically checks that the url is neither pending nor
+        seen and marks it as pending, so that when several threads race to fetch
+        the same url only one of them does. The url remains pending until it is
+        marked as seen via mark_seen() or released via release_url().
+    * A seen-set of the urls whose data has been committed. Urls are stored as
+        8 byte blake2b digests of their normalized form rather than as strings, so
+        millions of urls take tens of MB. If a seen_path is provided every digest
+        is also appended to said file as it is added, and the file is read when
+        the frontier is initialized, so a resumed crawl skips the urls written by
+        previous runs. A seen_path holds the state of a single crawl: pages whose
+        content changes over time (eg: search results pages) are only skipped
+        when resuming said crawl, so a new crawl uses a new seen_path.
+
+    A priority queue of urls to be fetched is not part of the frontier, as the
+    crawls of the package walk the pages of each company in order, each page
+    being only known once the previous page has been parsed.
+
+    Args:
+        seen_path (str): The path of the append-only file the seen-set is persisted
+            to. Defaults to None (the seen-set is not persisted).
+
+    Attributes:
+        _seen_path (str): The path of the file the seen-set is persisted to or None.
+
+        _seen_digests (set): The digests of the urls whose data has been written.
+
+        _pending_digests (set): The digests of the urls that are being fetched.
+
+        _lock (threading.Lock): The lock guarding the digest sets.
+
+    """
+    # The number of bytes of each url digest:
+    DIGEST_SIZE = 8
+
+    def __init__(self, seen_path=None):
+
+        self._seen_path = seen_path
+        self._seen_digests = set()
+        self._pending_digests = set()
+        self._lock = threading.Lock()
+
+        # Loading the seen-set persisted by previous runs:
+        self._seen_file = None
+        if seen_path is not None:
+
+            if os.path.isfile(seen_path):
+                with open(seen_path, "rb") as seen_file:
+                    seen_bytes = seen_file.read()
+
+                # Ignoring a partially written digest at the end of an interrupted run:
+                seen_bytes = seen_bytes[:len(seen_bytes) - len(seen_bytes) % self.DIGEST_SIZE]
+                self._seen_digests.update(
+                    seen_bytes[digest_start:digest_start + self.DIGEST_SIZE]
+                    for digest_start in range(0, len(seen_bytes), self.DIGEST_SIZE))
+
+            self._seen_file = open(seen_path, "ab")
+
+    def claim_url(self, url):
+        """
+        The method atomically checks that a url has neither been seen nor is
+        pending and marks it as pending, so that only one of several threads about
+        to fetch the same url fetches it.
+
+        Args:
+            url (str): The url about to be fetched.
+
+        Returns:
+            bool: Whether the url was claimed and should be fetched.
+
+        """
+        url_digest = self._get_url_digest(url)
+
+        with self._lock:
+            if url_digest in self._seen_digests or url_digest in self._pending_digests:
+                return False
+
+            self._pending_digests.add(url_digest)
+
+        return True
+
+    def mark_seen(self, url):
+        """
+        The method adds a url whose data has been written to the seen-set, persisting
+        it if the frontier has a seen_path.
+
+        Args:
+            url (str): The url whose data has been written.
+
+        """
+        url_digest = self._get_url_digest(url)
+
+        with self._lock:
+            self._pending_digests.discard(url_digest)
+            if url_digest in self._seen_digests:
+                return
+
+            self._seen_digests.add(url_digest)
+            if self._seen_file is not None:
+                self._seen_file.write(url_digest)
+                self._seen_file.flush()
+
+    def release_url(self, url):
+        """
+        The method releases a pending url that failed to be fetched or written so
+        that it can be claimed again.
+
+        Args:
+            url (str): The url that failed to be fetched or written.
+
+        """
+        with self._lock:
+            self._pending_digests.discard(self._get_url_digest(url))
+
+    def is_seen(self, url):
+        """Returns whether the data of a url has been written."""
+        url_digest = self._get_url_digest(url)
+
+        with self._lock:
+            return url_digest in self._seen_digests
+
+    def close(self):
+        """Closes the file the seen-set is persisted to."""
+        with self._lock:
+            if self._seen_file is not None:
+                self._seen_file.close()
+                self._seen_file = None
+
+    def _get_url_digest(self, url):
+        """
+        The method hashes the normalized form of a url: the scheme and host are
+        lower cased and the fragment is dropped, as they do not change the
+        document being fetched.
+
+        Args:
+            url (str): The url to be hashed.
+
+        Returns:
+            bytes: The 8 byte blake2b digest of the url.
+
+        """
+        split_url = urllib.parse.urlsplit(url)
+        normalized_url = urllib.parse.urlunsplit((
+            split_url.scheme.lower(), split_url.netloc.lower(), split_url.path or "/", split_url.query, ""))
+
+        return hashlib.blake2b(normalized_url.encode("utf-8"), digest_size=self.DIGEST_SIZE).digest()
+
+    def __repr__(self):
+        with self._lock:
+            return f"URLFrontier(pending={len(self._pending_digests)}, seen={len(self._seen_digests)})"
@@ -1,5 +1,6 @@
 # Importing native packages:
 import time
+import threading
 
 # Importing thrid party packages:
 import requests
@@ -24,7 +25,18 @@ class BaseWebPageResponse(object):
 
         kwargs (dictionary): Optional arguments that modify functionality of
             various methods within the object as well future-proofing further
-            development of the Base Class.
+            development of the Base Class. The currently supported arguments are:
+
+            * params (dict): The query parameters of the GET request.
+            * headers (dict): The HTTP headers of the GET request.
+            * rate_limiter (RequestRateLimiter): A rate limiter that is waited
+                on before the GET request is sent.
+            * url_frontier (URLFrontier): A crawl frontier shared by the web objects
+                of a crawl. The url is claimed before it is fetched and is not
+                fetched if another web object of the crawl has claimed it or if it
+                has been seen (see _skipped). The Ingestion Engine writing the
+                object marks the url as seen once its data is committed, and
+                releases it if the write fails.
 
     Attributes:
 
@@ -50,6 +62,12 @@ class BaseWebPageResponse(object):
             returned by the HTTP GET request. This contains all of the HTML content
             of the webpage.
 
+        _request_url (str): The url of the GET request, including its params.
+
+        _skipped (bool): Whether the url was not fetched as the url_frontier had
+            already claimed or seen it. The _http_response of a skipped object is
+            None and its _html_body is empty.
+
     """
 
     def __init__(self, url, **kwargs):
@@ -58,13 +76,51 @@ class BaseWebPageResponse(object):
         self._kwargs = kwargs
         self._url = url
         self._initialized_time = datetime.datetime.now()
+        self._request_url = requests.Request('GET', url, params=self._kwargs.get('params')).prepare().url
+
+        # Claiming the url in the crawl frontier if one has been passed, skipping urls claimed by other objects:
+        url_frontier = self._kwargs.get('url_frontier')
+        self._skipped = url_frontier is not None and not url_frontier.claim_url(self._request_url)
+
+        if self._skipped:
+            self._http_response = None
+            self._html_body = b''
+            return
 
         # HTTP requests.Response object.
-        self._http_response = self.__perform_get_request()
+        try:
+            self._http_response = self.__perform_get_request()
+
+        except Exception:
+            self._release_url()
+            raise
 
         # HTML body of response:
         self._html_body = self._http_response.content
 
+    def _mark_url_seen(self):
+        '''
+        The method records the url of the object as seen by its url_frontier, so
+        that it is skipped by the rest of the crawl (and by resumed runs of the
+        crawl if the frontier is persisted). It is called by the Ingestion Engine
+        once the data of the object is committed. It does nothing if the object has
+        no url_frontier or was skipped.
+
+        '''
+        if self._kwargs.get('url_frontier') is not None and not self._skipped:
+            self._kwargs['url_frontier'].mark_seen(self._request_url)
+
+    def _release_url(self):
+        '''
+        The method releases the claim of the url_frontier of the object on its url,
+        so that another object can fetch it. It is called by the Ingestion Engine
+        when writing the data of the object fails. It does nothing if the object
+        has no url_frontier or was skipped.
+
+        '''
+        if self._kwargs.get('url_frontier') is not None and not self._skipped:
+            self._kwargs['url_frontier'].release_url(self._request_url)
+
     def __perform_get_request(self):
         '''
         Internal method that performs the request.get() HTTP requests.
@@ -72,20 +128,27 @@ class BaseWebPageResponse(object):
         The internal method performs the HTTP GET request to the url specificed
         by the self._url instance variable. It uses the requests.get() method to
         perform said GET request. In addition to the url it also passes in the
-        'params' argument of the main objects kwargs if present.
+        'params' and 'headers' arguments of the main objects kwargs if present.
+        If a 'rate_limiter' argument is present the request is only sent once
+        the rate limiter allows it.
 
         Returns:
             response_obj: The result of the request.get() method- A requests.Response
                 object.
 
         '''
+        # Waiting on the rate limiter of the website if one has been passed:
+        if 'rate_limiter' in self._kwargs:
+            self._kwargs['rate_limiter'].wait()
+
         # Determining if the 'params' key-word argument has been passed:
         if 'params' in self._kwargs:
 
             # Try-Catch for the 'params' kwarg mainly to assert dictionary type:
             try:
 
-                respone_obj = requests.get(self._url, params=self._kwargs['params'])
+                respone_obj = requests.get(self._url, params=self._kwargs['params'],
+                    headers=self._kwargs.get('headers'))
                 return respone_obj
 
             except (AttributeError, TypeError):
@@ -93,8 +156,53 @@ class BaseWebPageResponse(object):
 
         else:
 
-            respone_obj = requests.get(self._url)
+            respone_obj = requests.get(self._url, headers=self._kwargs.get('headers'))
             return respone_obj
 
     def __repr__(self):
         return f'WebObject({self._url}_{self._initialized_time})'
+
+class RequestRateLimiter(object):
+    """
+    A thread-safe limiter of the rate at which HTTP requests are sent to a website.
+
+    Websites such as the SEC’s EDGAR system limit the number of requests a client
+    can send per second. A single RequestRateLimiter is meant to be shared by every
+    web object (and every thread) sending requests to the same website. Each call
+    to the wait() method reserves the next available request slot and sleeps until
+    said slot is reached, meaning requests are evenly spaced at no more than
+    max_requests_per_second.
+
+    Args:
+        max_requests_per_second (float): The maximum number of requests that can
+            be sent per second.
+
+    Attributes:
+        _request_interval (float): The minimum number of seconds between requests.
+
+        _next_request_time (float): The time.monotonic() value of the next free
+            request slot.
+
+        _lock (threading.Lock): The lock guarding the _next_request_time.
+
+    """
+    def __init__(self, max_requests_per_second):
+
+        self._request_interval = 1.0 / max_requests_per_second
+        self._next_request_time = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """
+        The method blocks the calling thread until it is allowed to send a request.
+
+        """
+        # Reserving the next request slot:
+        with self._lock:
+            current_time = time.monotonic()
+            request_time = max(self._next_request_time, current_time)
+            self._next_request_time = request_time + self._request_interval
+
+        # Sleeping outside of the lock until the reserved slot is reached:
+        if request_time > current_time:
+            time.sleep(request_time - current_time)
@@ -0,0 +1,202 @@
+# Importing 3rd Party Packages:
+from sqlalchemy import Column, Integer, Float, String, Date, DateTime
+from sqlalchemy.ext.declarative import declarative_base
+
+# Creating the declarative base object used to create base database orm models:
+Base = declarative_base()
+
+class FundHoldingsModel(Base):
+    """The FundHoldingsModel is the SQLAlchemy model that represents the database
+    table storing the holdings snapshots of every fund ingested via the
+    FundHoldingsDataIngestionEngine.
+
+    Each row is a single holding of a fund on the date the snapshot was taken. A
+    new snapshot is only written when the holdings of a fund change, so the table
+    is an append-only history of the holdings of every fund. Funds and holdings
+    are referenced by their integer id in the symbols dimension table (see
+    SymbolModel) rather than by their ticker string. The primary key
+    (fund_id, as_of_date, symbol_id) also serves as the index used to find the
+    latest snapshot of each fund.
+
+    Attributes:
+        __tablename__ (str): A metadata attribute that determines the name of the table
+            created by the engine.
+
+        __table_args__ (str): A metadata attribute that determines how the model
+            interacts with an existing equivalent databaset table that already
+            exists. In this case it is set to utilize any already existing database
+            table with the same name.
+
+        fund_id (sqlalchemy.Column): The symbol id of the fund.
+
+        as_of_date (sqlalchemy.Column): The date of the snapshot.
+
+        symbol_id (sqlalchemy.Column): The symbol id of the holding.
+
+        name (sqlalchemy.Column): The name of the holding.
+
+        percent_holdings (sqlalchemy.Column): The percentage of the fund's assets
+            invested in the holding.
+
+    """
+    # Declaring table meta-data:
+    __tablename__ = "fund_holdings"
+    __table_args__ = {'extend_existing': True}
+
+    # Declaring the table schema:
+    fund_id = Column(
+        'fund_id',
+        Integer,
+        primary_key = True,
+        autoincrement = False)
+
+    as_of_date = Column(
+        'as_of_date',
+        Date,
+        primary_key = True)
+
+    symbol_id = Column(
+        'symbol_id',
+        Integer,
+        primary_key = True,
+        autoincrement = False)
+
+    name = Column(
+        'name',
+        String(255),
+        nullable = True)
+
+    percent_holdings = Column(
+        'percent_holdings',
+        Float,
+        nullable = True)
+
+    # Dunder Methods:
+    def __repr__(self):
+        return f"FundHoldingsModel({self.fund_id}, {self.as_of_date}, {self.symbol_id})"
+
+class FundHoldingsDigestModel(Base):
+    """The FundHoldingsDigestModel is the SQLAlchemy model that represents the
+    database table storing the digest of the latest holdings snapshot of each fund.
+
+    The FundHoldingsDataIngestionEngine compares the digest of newly extracted
+    holdings to the stored digest to determine if the holdings of a fund changed
+    without reading the stored snapshot.
+
+    Attributes:
+        __tablename__ (str): A metadata attribute that determines the name of the table
+            created by the engine.
+
+        __table_args__ (str): A metadata attribute that determines how the model
+            interacts with an existing equivalent databaset table that already
+            exists.
+
+        fund_id (sqlalchemy.Column): The symbol id of the fund. This is the
+            primary key for the database table.
+
+        holdings_digest (sqlalchemy.Column): The hex sha256 digest of the latest
+            holdings snapshot of the fund.
+
+        as_of_date (sqlalchemy.Column): The date of the latest snapshot of the fund.
+
+        row_count (sqlalchemy.Column): The number of holdings in the latest snapshot.
+
+        last_updated (sqlalchemy.Column): The datetime the holdings of the fund
+            were last compared to the digest, whether they changed or not.
+
+    """
+    # Declaring table meta-data:
+    __tablename__ = "fund_holdings_digests"
+    __table_args__ = {'extend_existing': True}
+
+    # Declaring the table schema:
+    fund_id = Column(
+        'fund_id',
+        Integer,
+        primary_key = True,
+        autoincrement = False)
+
+    holdings_digest = Column(
+        'holdings_digest',
+        String(64),
+        nullable = False)
+
+    as_of_date = Column(
+        'as_of_date',
+        Date,
+        nullable = False)
+
+    row_count = Column(
+        'row_count',
+        Integer,
+        nullable = True)
+
+    last_updated = Column(
+        'last_updated',
+        DateTime,
+        nullable = True)
+
+    # Dunder Methods:
+    def __repr__(self):
+        return f"FundHoldingsDigestModel({self.fund_id})"
+
+class FundHoldingsBySymbolModel(Base):
+    """The FundHoldingsBySymbolModel is the SQLAlchemy model that represents the
+    database table storing the reverse index of the latest holdings of every fund:
+    for each held symbol, the funds that hold it and at what weight.
+
+    The table is maintained by the FundHoldingsDataIngestionEngine each time a new
+    holdings snapshot of a fund is written, so that the question “which funds hold
+    a symbol” is answered by a primary key range lookup instead of a scan of the
+    holdings of every fund.
+
+    Attributes:
+        __tablename__ (str): A metadata attribute that determines the name of the table
+            created by the engine.
+
+        __table_args__ (str): A metadata attribute that determines how the model
+            interacts with an existing equivalent databaset table that already
+            exists.
+
+        symbol_id (sqlalchemy.Column): The symbol id of the holding. It is the
+            leading column of the primary key.
+
+        fund_id (sqlalchemy.Column): The symbol id of the fund holding the symbol.
+
+        as_of_date (sqlalchemy.Column): The date of the fund's snapshot the row was
+            taken from.
+
+        percent_holdings (sqlalchemy.Column): The percentage of the fund's assets
+            invested in the symbol.
+
+    """
+    # Declaring table meta-data:
+    __tablename__ = "fund_holdings_by_symbol"
+    __table_args__ = {'extend_existing': True}
+
+    # Declaring the table schema:
+    symbol_id = Column(
+        'symbol_id',
+        Integer,
+        primary_key = True,
+        autoincrement = False)
+
+    fund_id = Column(
+        'fund_id',
+        Integer,
+        primary_key = True,
+        autoincrement = False)
+
+    as_of_date = Column(
+        'as_of_date',
+        Date,
+        nullable = False)
+
+    percent_holdings = Column(
+        'percent_holdings',
+        Float,
+        nullable = True)
+
+    # Dunder Methods:
+    def __repr__(self):
+        return f"FundHoldingsBySymbolModel({self.symbol_id}, {self.fund_id})"
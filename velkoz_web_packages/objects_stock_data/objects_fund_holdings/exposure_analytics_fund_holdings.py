@@ -0,0 +1,331 @@
+# Importing native packages:
+import sys
+import time
+import argparse
+import warnings
+
+# Importing 3rd party packages:
+import numpy as np
+import pandas as pd
+
+"""
+The script contains the methods used to compute the look-through exposure of
+portfolios of funds to the symbols held by said funds, from the holdings written
+by the FundHoldingsDataIngestionEngine.
+
+The holdings of every fund are stored as a sparse fund × symbol weight matrix
+(see FundHoldingsMatrix) in which funds and symbols are identified by integer
+ids. A portfolio of funds is a vector of fund weights and its exposure to each
+symbol is the product of said vector and the holdings matrix. The product for
+many portfolios at once is computed as a sparse × sparse product: the non-zero
+(portfolio, fund) weights are expanded into the holdings of each fund (the rows
+of the compressed sparse row matrix) and the weighted holdings are summed per
+(portfolio, symbol) with np.bincount(). The work done is proportional to the
+number of holdings of the funds of each portfolio rather than to the size of the
+matrix. Only numpy is required.
+
+The script can be run to benchmark the computation on synthetic holdings:
+
+    python -m velkoz_web_packages.objects_stock_data.objects_fund_holdings.exposure_analytics_fund_holdings --funds 5000
+
+"""
+
+class FundHoldingsMatrix(object):
+    """
+    The sparse fund × symbol matrix of the percent of each fund's assets invested
+    in each symbol, used to compute the look-through exposures of portfolios of
+    funds.
+
+    The matrix is stored in compressed sparse row form: the (symbol id, percent)
+    of every holding sorted by fund id, along with the offset of the first holding
+    of each fund.
+
+    Args:
+        holdings_df (pandas.DataFrame): The holdings of every fund with the columns
+            fund, symbol and percent_holdings (eg: the dataframe returned by
+            FundHoldingsDataIngestionEngine._get_latest_holdings()).
+
+    Attributes:
+        _funds (pandas.Index): The fund tickers, positioned by fund id.
+
+        _symbols (pandas.Index): The held symbols, positioned by symbol id.
+
+        _holding_fund_ids (numpy.ndarray): The fund id of each holding, sorted.
+
+        _holding_symbol_ids (numpy.ndarray): The symbol id of each holding, sorted by fund id.
+
+        _holding_percents (numpy.ndarray): The percent_holdings of each holding,
+            sorted by fund id.
+
+        _fund_indptr (numpy.ndarray): The offset of the first holding of each
+            fund id, followed by the number of holdings.
+
+    """
+    def __init__(self, holdings_df):
+
+        holdings_df = holdings_df[holdings_df["symbol"].notna() & holdings_df["percent_holdings"].notna()]
+
+        # Assigning integer ids to the funds and symbols:
+        fund_ids, funds = pd.factorize(holdings_df["fund"], sort=True)
+        symbol_ids, symbols = pd.factorize(holdings_df["symbol"], sort=True)
+        self._funds = pd.Index(funds, name="fund")
+        self._symbols = pd.Index(symbols, name="symbol")
+
+        # Sorting the holdings by fund id into compressed sparse row form:
+        fund_order = np.argsort(fund_ids, kind="stable")
+        self._holding_fund_ids = fund_ids[fund_order].astype(np.int64)
+        self._holding_symbol_ids = symbol_ids[fund_order].astype(np.int64)
+        self._holding_percents = holdings_df["percent_holdings"].to_numpy(dtype=np.float64)[fund_order]
+
+        self._fund_indptr = np.zeros(len(self._funds) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self._holding_fund_ids, minlength=len(self._funds)), out=self._fund_indptr[1:])
+
+    @property
+    def shape(self):
+        """The (funds, symbols) shape of the matrix."""
+        return (len(self._funds), len(self._symbols))
+
+    @property
+    def nnz(self):
+        """The number of holdings stored in the matrix."""
+        return len(self._holding_percents)
+
+    def to_dense(self):
+        """
+        The method converts the matrix into a dense dataframe, intended for small
+        matrices and for testing.
+
+        Returns:
+            pandas.DataFrame: The percent_holdings of each fund (index) in each symbol (columns).
+
+        """
+        dense_percents = np.zeros(self.shape, dtype=np.float64)
+        np.add.at(dense_percents, (self._holding_fund_ids, self._holding_symbol_ids), self._holding_percents)
+
+        return pd.DataFrame(dense_percents, index=self._funds, columns=self._symbols)
+
+    def compute_exposures(self, portfolio_weights):
+        """
+        The method computes the look-through exposure of many portfolios of funds
+        to the symbols held by said funds.
+
+        The exposure of a portfolio p to a symbol s is the sum over its funds f of
+        weight(p, f) * percent_holdings(f, s). The non-zero weights of the portfolios
+        are expanded into one (portfolio, symbol, weighted percent) triplet per
+        holding of each weighted fund, by gathering the rows of the holdings matrix
+        with vectorized index arithmetic, and the triplets are summed per
+        (portfolio, symbol) with np.bincount().
+
+        Funds of the portfolios without holdings in the matrix are ignored with a
+        warning.
+
+        Args:
+            portfolio_weights (pandas.DataFrame or dict): The weight of each fund
+                (columns) in each portfolio (index), or a dict of {portfolio: {fund: weight}}.
+                Missing weights are treated as 0.
+
+        Returns:
+            pandas.DataFrame: The exposure of each portfolio (index) to each symbol
+                held by its funds (columns), in the units of percent_holdings scaled
+                by the portfolio weights (ie: percent of the portfolio if the fund
+                weights of a portfolio sum to 1).
+
+        """
+        if isinstance(portfolio_weights, dict):
+            portfolio_weights = pd.DataFrame.from_dict(portfolio_weights, orient="index")
+
+        portfolio_weights = portfolio_weights.fillna(0.0)
+
+        # Mapping the funds of the portfolios onto fund ids:
+        column_fund_ids = self._funds.get_indexer(portfolio_weights.columns)
+        unknown_funds = list(portfolio_weights.columns[column_fund_ids < 0])
+        if unknown_funds:
+            warnings.warn(f"{len(unknown_funds)} portfolio funds have no holdings and are ignored: {unknown_funds[:10]}")
+
+        # Building the (portfolio, fund, weight) triplets of the non-zero portfolio weights:
+        weight_values = portfolio_weights.to_numpy(dtype=np.float64)[:, column_fund_ids >= 0]
+        weight_portfolio_ids, weight_columns = np.nonzero(weight_values)
+        weight_fund_ids = column_fund_ids[column_fund_ids >= 0][weight_columns]
+        weights = weight_values[weight_portfolio_ids, weight_columns]
+
+        # Expanding each weight into the holdings of its fund:
+        fund_holding_counts = self._fund_indptr[weight_fund_ids + 1] - self._fund_indptr[weight_fund_ids]
+        weight_of_holding = np.repeat(np.arange(len(weights)), fund_holding_counts)
+        holding_offsets = np.arange(len(weight_of_holding)) - np.repeat(
+            np.cumsum(fund_holding_counts) - fund_holding_counts, fund_holding_counts)
+        holding_positions = self._fund_indptr[weight_fund_ids][weight_of_holding] + holding_offsets
+
+        # Summing the weighted holdings per (portfolio, symbol) over the symbols held:
+        used_symbol_ids, holding_symbol_columns = np.unique(
+            self._holding_symbol_ids[holding_positions], return_inverse=True)
+        exposures = np.bincount(
+            weight_portfolio_ids[weight_of_holding] * len(used_symbol_ids) + holding_symbol_columns,
+            weights=weights[weight_of_holding] * self._holding_percents[holding_positions],
+            minlength=len(portfolio_weights) * len(used_symbol_ids))
+
+        return pd.DataFrame(
+            exposures.reshape(len(portfolio_weights), len(used_symbol_ids)),
+            index=portfolio_weights.index, columns=self._symbols[used_symbol_ids])
+
+    def compute_exposure(self, fund_weights):
+        """
+        The method computes the look-through exposure of a single portfolio.
+
+        Args:
+            fund_weights (dict or pandas.Series): The weight of each fund in the portfolio.
+
+        Returns:
+            pandas.Series: The exposure to each symbol sorted in descending order.
+
+        """
+        exposures_df = self.compute_exposures(pd.DataFrame([pd.Series(fund_weights)], index=["portfolio"]))
+
+        return exposures_df.iloc[0].sort_values(ascending=False)
+
+    def __repr__(self):
+        return f"FundHoldingsMatrix(funds={self.shape[0]}, symbols={self.shape[1]}, nnz={self.nnz})"
+
+def build_holdings_matrix(ingestion_engine, funds=None):
+    """
+    The method builds the FundHoldingsMatrix of the latest holdings snapshot of
+    each fund stored in the database of a FundHoldingsDataIngestionEngine.
+
+    Args:
+        ingestion_engine (FundHoldingsDataIngestionEngine): The engine connected to
+            the database the holdings are stored in.
+
+        funds (list): The ticker symbols of the funds to include. Defaults to None
+            (every fund).
+
+    Returns:
+        FundHoldingsMatrix: The holdings matrix.
+
+    """
+    return FundHoldingsMatrix(ingestion_engine._get_latest_holdings(funds))
+
+def compute_exposures_pandas(holdings_df, portfolio_weights):
+    """
+    The reference implementation of FundHoldingsMatrix.compute_exposures() that
+    merges the holdings of the funds of each portfolio with pandas, one portfolio
+    at a time. It is used to validate and benchmark the sparse implementation.
+
+    Args:
+        holdings_df (pandas.DataFrame): The holdings with the columns fund, symbol
+            and percent_holdings.
+
+        portfolio_weights (pandas.DataFrame): The weight of each fund (columns) in
+            each portfolio (index).
+
+    Returns:
+        pandas.DataFrame: The exposure of each portfolio to each symbol.
+
+    """
+    portfolio_exposures = {}
+    for portfolio, fund_weights in portfolio_weights.fillna(0.0).iterrows():
+
+        weights_df = fund_weights[fund_weights != 0].rename("weight").rename_axis("fund").reset_index()
+        merged_df = holdings_df.merge(weights_df, on="fund")
+        portfolio_exposures[portfolio] = (merged_df["percent_holdings"] * merged_df["weight"]).groupby(
+            merged_df["symbol"]).sum()
+
+    return pd.DataFrame.from_dict(portfolio_exposures, orient="index").fillna(0.0).rename_axis(columns="symbol")
+
+def generate_synthetic_holdings(num_funds, holdings_per_fund, num_symbols, seed=0):
+    """
+    The method generates random fund holdings for benchmarking: each fund holds
+    holdings_per_fund distinct symbols drawn from num_symbols with Zipf-like
+    popularity, with random weights summing to 100 percent.
+
+    Returns:
+        pandas.DataFrame: The holdings with the columns fund, symbol and percent_holdings.
+
+    """
+    random_state = np.random.default_rng(seed)
+
+    symbol_popularity = 1.0 / np.arange(1, num_symbols + 1)
+    symbol_popularity /= symbol_popularity.sum()
+
+    fund_symbols = np.concatenate([
+        random_state.choice(num_symbols, size=holdings_per_fund, replace=False, p=symbol_popularity)
+        for fund_num in range(num_funds)])
+
+    fund_percents = random_state.random((num_funds, holdings_per_fund))
+    fund_percents = (100.0 * fund_percents / fund_percents.sum(axis=1, keepdims=True)).ravel()
+
+    return pd.DataFrame({
+        "fund": np.repeat(np.array([f"F{fund_num:05d}" for fund_num in range(num_funds)]), holdings_per_fund),
+        "symbol": np.array([f"S{symbol_num:06d}" for symbol_num in range(num_symbols)])[fund_symbols],
+        "percent_holdings": fund_percents})
+
+def generate_synthetic_portfolios(funds, num_portfolios, funds_per_portfolio, seed=0):
+    """
+    The method generates random portfolios of funds for benchmarking, each with
+    funds_per_portfolio funds whose weights sum to 1.
+
+    Returns:
+        pandas.DataFrame: The weight of each fund (columns) in each portfolio (index).
+
+    """
+    random_state = np.random.default_rng(seed)
+    portfolio_weights = np.zeros((num_portfolios, len(funds)))
+
+    for portfolio_num in range(num_portfolios):
+        portfolio_funds = random_state.choice(len(funds), size=min(funds_per_portfolio, len(funds)), replace=False)
+        fund_weights = random_state.random(len(portfolio_funds))
+        portfolio_weights[portfolio_num, portfolio_funds] = fund_weights / fund_weights.sum()
+
+    return pd.DataFrame(
+        portfolio_weights, index=[f"P{portfolio_num}" for portfolio_num in range(num_portfolios)], columns=funds)
+
+def main(argv=None):
+    """
+    The command line entry point that benchmarks the exposure computation on
+    synthetic holdings, printing the time taken to build the holdings matrix and
+    to compute the exposures of every portfolio, compared to the pandas merge
+    implementation.
+
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark look-through exposure computation over synthetic fund holdings.")
+    parser.add_argument("--funds", type=int, default=5000)
+    parser.add_argument("--holdings-per-fund", type=int, default=50)
+    parser.add_argument("--symbols", type=int, default=20000)
+    parser.add_argument("--portfolios", type=int, default=200)
+    parser.add_argument("--funds-per-portfolio", type=int, default=20)
+    parser.add_argument("--skip-pandas", action="store_true",
+        help="Do not run the (slow) pandas merge implementation.")
+    args = parser.parse_args(argv)
+
+    holdings_df = generate_synthetic_holdings(args.funds, args.holdings_per_fund, args.symbols)
+    portfolio_weights = generate_synthetic_portfolios(
+        holdings_df["fund"].unique(), args.portfolios, args.funds_per_portfolio)
+    print(f"{args.funds} funds, {len(holdings_df)} holdings, {args.portfolios} portfolios:")
+
+    start_time = time.perf_counter()
+    holdings_matrix = FundHoldingsMatrix(holdings_df)
+    build_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    exposures_df = holdings_matrix.compute_exposures(portfolio_weights)
+    sparse_seconds = time.perf_counter() - start_time
+
+    print(f"build matrix     seconds={build_seconds:8.3f}")
+    print(f"sparse exposures seconds={sparse_seconds:8.3f} portfolios/s={args.portfolios / sparse_seconds:10.1f}")
+
+    if not args.skip_pandas:
+
+        start_time = time.perf_counter()
+        pandas_exposures_df = compute_exposures_pandas(holdings_df, portfolio_weights)
+        pandas_seconds = time.perf_counter() - start_time
+
+        max_difference = np.abs(
+            exposures_df.reindex(columns=pandas_exposures_df.columns, fill_value=0.0).to_numpy()
+            - pandas_exposures_df.to_numpy()).max()
+        print(
+            f"pandas exposures seconds={pandas_seconds:8.3f} portfolios/s={args.portfolios / pandas_seconds:10.1f} "
+            f"speedup={pandas_seconds / sparse_seconds:6.1f}x max_difference={max_difference:.2e}")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,12 +2,109 @@
 from velkoz_web_packages.objects_base.ingestion_engines_base import BaseWebPageIngestionEngine
 from velkoz_web_packages.objects_stock_data.objects_fund_holdings.web_objects_fund_holdings import NASDAQFundHoldingsResponseObject
 
+# Importing the SQLAlchemy database models and model base:
+from velkoz_web_packages.objects_stock_data.objects_fund_holdings.db_orm_models_fund_holdings import Base, FundHoldingsModel, FundHoldingsDigestModel, FundHoldingsBySymbolModel
+from velkoz_web_packages.objects_stock_data.objects_symbols.db_orm_models_symbols import SymbolModel
+from velkoz_web_packages.objects_stock_data.objects_symbols.symbol_registry import SymbolRegistry
+
 # Importing 3rd party packages:
-import requests
-from bs4 import BeautifulSoup
+import hashlib
 import datetime
-import yfinance as yf
+import threading
+import collections
 import pandas as pd
+from sqlalchemy import MetaData, Table, select, func, and_, inspect, text
+
+
+def migrate_ticker_keyed_holdings(sqlaengine, symbol_registry):
+    """
+    The method migrates the holdings tables of a database written before funds
+    and holdings were referenced by symbol id, whose rows are keyed by the
+    “fund” and “symbol” ticker strings. create_all() does not alter existing
+    tables, so without the migration the Ingestion Engines reading and writing
+    holdings would fail on such databases. It is called when they are initialized.
+
+    The tickers of the stored rows are registered in the symbols table and the
+    rows of the “fund_holdings” and “fund_holdings_digests” tables are copied
+    into tables of the current schema with a single INSERT ... SELECT joined to
+    the symbols table, which then replace the legacy tables. The legacy reverse
+    index is dropped, to be rebuilt by the FundHoldingsDataIngestionEngine. The
+    migration runs in one transaction and does nothing for current databases.
+
+    Args:
+        sqlaengine (sqlalchemy.engine.Engine): The engine of the database.
+
+        symbol_registry (SymbolRegistry): The registry of the database's symbols.
+
+    """
+    holdings_table = FundHoldingsModel.__table__
+    digest_table = FundHoldingsDigestModel.__table__
+    symbol_index_table = FundHoldingsBySymbolModel.__table__
+
+    with sqlaengine.begin() as db_con:
+
+        db_inspector = inspect(db_con)
+        legacy_tables = {
+            table.name: Table(table.name, MetaData(), autoload=True, autoload_with=db_con)
+            for table in (holdings_table, digest_table, symbol_index_table)
+            if db_con.dialect.has_table(db_con, table.name)
+            and "fund_id" not in {column["name"] for column in db_inspector.get_columns(table.name)}}
+
+        if len(legacy_tables) == 0:
+            return
+
+        # Registering the tickers of the stored rows in the symbols table:
+        legacy_holdings = legacy_tables.get(holdings_table.name)
+        legacy_digests = legacy_tables.get(digest_table.name)
+
+        stored_tickers = set()
+        if legacy_holdings is not None:
+            stored_tickers.update(ticker for ticker, in db_con.execute(
+                select([legacy_holdings.c.fund]).distinct()))
+            stored_tickers.update(ticker for ticker, in db_con.execute(
+                select([legacy_holdings.c.symbol]).distinct()))
+
+        if legacy_digests is not None:
+            stored_tickers.update(ticker for ticker, in db_con.execute(
+                select([legacy_digests.c.fund]).distinct()))
+
+        symbol_registry.get_symbol_ids(sorted(stored_tickers), con=db_con)
+
+        fund_symbols = SymbolModel.__table__.alias("fund_symbols")
+        held_symbols = SymbolModel.__table__.alias("held_symbols")
+
+        if legacy_holdings is not None:
+            _replace_legacy_table(db_con, legacy_holdings, holdings_table, select([
+                fund_symbols.c.symbol_id, legacy_holdings.c.as_of_date, held_symbols.c.symbol_id,
+                legacy_holdings.c.name, legacy_holdings.c.percent_holdings]).select_from(
+                legacy_holdings.join(fund_symbols, legacy_holdings.c.fund == fund_symbols.c.symbol).join(
+                    held_symbols, legacy_holdings.c.symbol == held_symbols.c.symbol)))
+
+        if legacy_digests is not None:
+            _replace_legacy_table(db_con, legacy_digests, digest_table, select([
+                fund_symbols.c.symbol_id, legacy_digests.c.holdings_digest, legacy_digests.c.as_of_date,
+                legacy_digests.c.row_count, legacy_digests.c.last_updated]).select_from(
+                legacy_digests.join(fund_symbols, legacy_digests.c.fund == fund_symbols.c.symbol)))
+
+        if symbol_index_table.name in legacy_tables:
+            legacy_tables[symbol_index_table.name].drop(db_con)
+
+def _replace_legacy_table(db_con, legacy_table, table, migrated_rows):
+    """
+    Replaces a legacy table by a table of the current schema holding the rows
+    selected by the migrated_rows query. The new table is created under a
+    temporary name and renamed once the legacy table is dropped, so that the
+    constraint and index names of the two tables never clash.
+    """
+    migration_table = table.tometadata(MetaData(), name=f"{table.name}_migration")
+    migration_table.create(db_con)
+    db_con.execute(migration_table.insert().from_select(
+        [column.name for column in migration_table.columns], migrated_rows))
+
+    legacy_table.drop(db_con)
+
+    quote = db_con.dialect.identifier_preparer.quote
+    db_con.execute(text(f"ALTER TABLE {quote(migration_table.name)} RENAME TO {quote(table.name)}"))
 
 
 class FundHoldingsDataIngestionEngine(BaseWebPageIngestionEngine):
@@ -21,20 +118,31 @@ class FundHoldingsDataIngestionEngine(BaseWebPageIngestionEngine):
     It performs data validation for Response Objects that are passed into it to
     ensure this compatibility.
 
-    The Ingestion Engine off-loads the database writing functionality to the pandas
-    library due to the simplicity of the data being written. The FundHoldingsResponse
-    Objects contain information about the top 10 holdings of a fund, represented as a
-    pandas dataframe. This dataframe can easily be read into the relevant database via
-    the pandas dataframe.to_sql method. As such it allows the database writing logic to
-    be outsourced to pandas for simplicity.
-
-    This simplicity comes at a cost. Notably due to the limitation of the .to_sql
-    method, anytime the holdings data for a fund is written to a database that already
-    contains previous holdings data the Ingestion Engine does not update the table,
-    it drops and replaces it with the new data table. For smaller, simplistic datasets
-    such as fund holdings dataframes (and stock price time series), this method of
-    updating while inefficient is effective. It may run into performance issues at
-    scale however.
+    The holdings of every fund are written to a single “fund_holdings” table as
+    dated snapshots (see FundHoldingsModel) rather than to a table per fund that
+    is replaced on every run. The holdings of a fund rarely change between runs,
+    so a sha256 digest of the latest snapshot of each fund is stored in the
+    “fund_holdings_digests” table (see FundHoldingsDigestModel). When holdings
+    are written their digest is compared to the stored digest and a new snapshot
+    is only inserted if the holdings changed. This keeps the full history of the
+    holdings of each fund while unchanged holdings cost a single digest lookup.
+
+    The latest snapshot of every fund can be read in a single query via the
+    _get_latest_holdings() method, which makes use of the (fund_id, as_of_date)
+    prefix of the primary key of the holdings table.
+
+    Funds and holdings are stored by their integer id in the “symbols” dimension
+    table rather than by their ticker string. The ids are resolved through a
+    SymbolRegistry that interns them in memory, and the ticker strings are joined
+    back onto the rows returned by the read methods.
+
+    The engine also maintains a reverse index of the latest holdings of every fund
+    keyed by the held symbol (see FundHoldingsBySymbolModel). The rows of a fund
+    are replaced whenever a new snapshot of the fund is written, so the funds
+    holding a symbol are found with the _get_funds_holding_symbol() method in one
+    indexed query. Repeated lookups can be served from memory via the
+    _get_funds_holding_symbol_cached() method, whose cache is cleared whenever this
+    engine writes a new snapshot.
 
     The methods from the BaseDataIngestionEngine that are overwritten for functionality
     are:
@@ -51,6 +159,12 @@ class FundHoldingsDataIngestionEngine(BaseWebPageIngestionEngine):
             (and type checked) to be instances of BaseWebPageResponse() objects or
             any object that uses BaseWebPageResponse() as its base.
 
+        symbol_lookup_cache_size (int): The maximum number of symbols whose lookups
+            are cached by _get_funds_holding_symbol_cached(). Defaults to 1024.
+
+        kwargs (dictionary): Optional key-word arguments passed to the
+            BaseWebPageIngestionEngine (eg: single_writer).
+
     Attributes:
 
             _WebPageResponseObjs (list): A list of arguments that are assumed (and type
@@ -71,11 +185,43 @@ class FundHoldingsDataIngestionEngine(BaseWebPageIngestionEngine):
                 connection to the database binded to the database engine via the
                 _sqlaengine parameter.
 
+            _symbol_registry (SymbolRegistry): The registry mapping ticker symbols
+                to their integer ids in the symbols table.
+
+            _symbol_lookup_cache_size (int): The maximum number of cached symbol lookups.
+
+            _symbol_lookup_cache (collections.OrderedDict): The cached {symbol: rows}
+                of the funds holding each symbol, in least to most recently used order.
+
+            _symbol_lookup_lock (threading.Lock): The lock guarding the symbol lookup
+                cache, its statistics and its generation.
+
+            _symbol_lookup_stats (dict): The hits, misses and evictions of the cache.
+
+            _symbol_lookup_generation (int): The number of reverse index writes so
+                far, used to discard lookups that were read while a write committed.
+
     """
-    def __init__(self, db_uri, *WebPageResponseObjs):
+    def __init__(self, db_uri, *WebPageResponseObjs, **kwargs):
+
+        symbol_lookup_cache_size = kwargs.pop("symbol_lookup_cache_size", 1024)
 
         # Initalizing the Parent BaseWebPageIngestionEngine object:
-        super().__init__(db_uri, *WebPageResponseObjs)
+        super().__init__(db_uri, *WebPageResponseObjs, **kwargs)
+
+        # Migrating tables written with ticker keys, then creating the tables that do not exist:
+        self._symbol_registry = SymbolRegistry(self._sqlaengine)
+        migrate_ticker_keyed_holdings(self._sqlaengine, self._symbol_registry)
+        Base.metadata.create_all(self._sqlaengine)
+
+        # Building the reverse index of a database written before it was maintained:
+        self._build_symbol_index()
+
+        self._symbol_lookup_cache_size = symbol_lookup_cache_size
+        self._symbol_lookup_cache = collections.OrderedDict()
+        self._symbol_lookup_lock = threading.Lock()
+        self._symbol_lookup_stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._symbol_lookup_generation = 0
 
     def _add_session_web_obj(self, web_object):
         """
@@ -83,14 +229,9 @@ class FundHoldingsDataIngestionEngine(BaseWebPageIngestionEngine):
         Engines’ database session in the appropriate schema.
 
         This method overwrites the default implementation of the __add_session_web_obj
-        method. Contrary to the established format of importing a SQLAlchemy db
-        model and initializing an instance of said model with the fields extracted
-        from the Web Object, this method makes use of the pandas library.
-
-        The method uses the dataframe.to_sql method from the pandas library in order
-        to write the holdings data extracted from the FundHoldingsResponse Objects
-        to the connected database. The benefits and drawbacks of this method are
-        described above in the Ingestion Engine’s documentation.
+        method. The holdings data extracted from the FundHoldingsResponse Objects
+        is written as a snapshot via the _write_holdings_data() method, which only
+        inserts rows if the holdings of the fund changed.
 
         Args:
             web_object (BaseWebPageResponse): An object containing the parameters
@@ -104,19 +245,399 @@ class FundHoldingsDataIngestionEngine(BaseWebPageIngestionEngine):
         # Extracting the validation of the web_object from the validation dict:
         if self._validation_dict[web_object] > 10:
 
-            # Extracting the dataframe to be written to the db from the web_object:
-            fund_holdings_df = web_object._holdings_data
+            # Writing the holdings dataframe extracted from the web_object to the db:
+            self._write_holdings_data(web_object._ticker, web_object._holdings_data)
+
+        else:
+            raise ValueError(f"Object {web_object} Was Not Added to Session due to Validation Error")
+
+    def _write_holdings_data(self, ticker, fund_holdings_df, con=None, as_of_date=None):
+        """
+        The method writes the holdings dataframe of a single fund to the
+        “fund_holdings” table as a snapshot dated as_of_date, if the holdings
+        differ from the stored snapshot of the fund in effect on as_of_date.
+
+        The digest of the holdings is compared to the digest stored in the
+        “fund_holdings_digests” table. If they match only the last_updated column
+        of the digest row is updated. A snapshot backfilled with an earlier date
+        than the latest snapshot is instead compared to the digest of the stored
+        snapshot dated on or immediately before as_of_date, and only extends the
+        history of the fund if it is written. Otherwise the snapshot rows are inserted
+        (replacing a snapshot already written for the fund on the same date), the
+        digest row is updated and the rows of the fund in the reverse index
+        (“fund_holdings_by_symbol”) are replaced.
+
+        It contains the database writing logic of the _add_session_web_obj method
+        without requiring a FundHoldingsResponse Object so that data pipelines that
+        parse holdings data outside of a WebPageResponse Object can write it using
+        the same schema.
+
+        Args:
+            ticker (str): The ticker symbol of the fund that the holdings describe.
+
+            fund_holdings_df (pandas.DataFrame): The holdings dataframe in the schema
+                of the NASDAQFundHoldingsResponseObject._holdings_data parameter.
 
-            # Creating the database table name:
-            fund_holdings_tbl_name = f"{web_object._ticker}_holdings_data"
+            con (sqlalchemy.engine.Connection): An optional connection used to
+                write the dataframe so that several writes can share a single
+                transaction. A transaction of the Ingestion Engine’s SQLAlchemy
+                engine is used if no connection is provided.
 
-            # Making use of the pandas library to write the dataframe to the database:
-            fund_holdings_df.to_sql(
-                fund_holdings_tbl_name, con=self._sqlaengine, if_exists='replace',
-                index=True)
+            as_of_date (datetime.date): The date of the snapshot. Defaults to today.
+
+        Returns:
+            bool: Whether a new snapshot was written (the holdings changed).
 
+        """
+        if con is None:
+            with self._sqlaengine.begin() as conn:
+                return self._write_holdings_data(ticker, fund_holdings_df, con=conn, as_of_date=as_of_date)
+
+        as_of_date = as_of_date or datetime.date.today()
+        holdings_rows = self._format_holdings_rows(fund_holdings_df)
+        holdings_digest = self._get_holdings_digest(holdings_rows)
+
+        holdings_table = FundHoldingsModel.__table__
+        digest_table = FundHoldingsDigestModel.__table__
+
+        fund_id = self._symbol_registry.get_symbol_id(ticker, con=con)
+
+        # Comparing the digest of the holdings to the digest of the latest snapshot:
+        stored_digest, stored_as_of_date = con.execute(
+            select([digest_table.c.holdings_digest, digest_table.c.as_of_date]).where(
+                digest_table.c.fund_id == fund_id)).first() or (None, None)
+
+        is_backfill = stored_as_of_date is not None and as_of_date < stored_as_of_date
+
+        if not is_backfill and stored_digest == holdings_digest:
+            con.execute(digest_table.update().where(digest_table.c.fund_id == fund_id).values(
+                last_updated=datetime.datetime.now()))
+            return False
+
+        # Comparing a backfilled snapshot to the snapshot in effect on its date:
+        if is_backfill and self._get_snapshot_digest(fund_id, as_of_date, con) == holdings_digest:
+            return False
+
+        # Resolving the ids of the holdings, registering symbols not seen before:
+        symbol_ids = self._symbol_registry.get_symbol_ids(
+            [holdings_row["symbol"] for holdings_row in holdings_rows], con=con)
+
+        # Writing the new snapshot, replacing a snapshot taken earlier on the same date:
+        con.execute(holdings_table.delete().where(and_(
+            holdings_table.c.fund_id == fund_id, holdings_table.c.as_of_date == as_of_date)))
+
+        if holdings_rows:
+            con.execute(holdings_table.insert(), [
+                {
+                    "fund_id": fund_id, "as_of_date": as_of_date,
+                    "symbol_id": symbol_ids[holdings_row["symbol"]], "name": holdings_row["name"],
+                    "percent_holdings": holdings_row["percent_holdings"]}
+                for holdings_row in holdings_rows])
+
+        digest_values = {
+            "holdings_digest": holdings_digest,
+            "as_of_date": as_of_date,
+            "row_count": len(holdings_rows),
+            "last_updated": datetime.datetime.now()}
+
+        # Invalidating cached reads of the fund once the write is committed:
+        self._notify_written("holdings", [ticker], con=con)
+
+        # Snapshots backfilled with an earlier date than the latest snapshot only extend the history:
+        if is_backfill:
+            return True
+
+        if stored_digest is None:
+            con.execute(digest_table.insert(), dict(digest_values, fund_id=fund_id))
         else:
-            raise ValueError(f"Object {web_object} Was Not Added to Session due to Validation Error")
+            con.execute(digest_table.update().where(digest_table.c.fund_id == fund_id).values(**digest_values))
+
+        # Replacing the rows of the fund in the reverse index:
+        symbol_index_table = FundHoldingsBySymbolModel.__table__
+        con.execute(symbol_index_table.delete().where(symbol_index_table.c.fund_id == fund_id))
+
+        if holdings_rows:
+            con.execute(symbol_index_table.insert(), [
+                {
+                    "symbol_id": symbol_ids[holdings_row["symbol"]], "fund_id": fund_id, "as_of_date": as_of_date,
+                    "percent_holdings": holdings_row["percent_holdings"]}
+                for holdings_row in holdings_rows])
+
+        # Clearing the cached symbol lookups (and discarding those in progress) once the new reverse index rows are committed:
+        self._call_after_commit(self._clear_symbol_lookup_cache, con=con)
+
+        return True
+
+    def _get_funds_holding_symbol(self, symbol, min_percent=None):
+        """
+        The method reads the funds that hold a symbol in their latest holdings
+        snapshot and at what weight, via a range lookup on the primary key of the
+        reverse index.
+
+        Args:
+            symbol (str): The ticker symbol of the holding.
+
+            min_percent (float): An optional minimum percent_holdings of the
+                returned funds.
+
+        Returns:
+            pandas.DataFrame: The funds holding the symbol with the columns fund,
+                as_of_date and percent_holdings, sorted by descending percent_holdings.
+
+        """
+        return self._format_holding_funds(self._query_funds_holding_symbol(symbol), min_percent)
+
+    def _get_funds_holding_symbol_cached(self, symbol, min_percent=None):
+        """
+        The method returns the same dataframe as the _get_funds_holding_symbol()
+        method but reads the rows of each symbol from the database at most once
+        until this engine commits a new holdings snapshot, keeping the rows of the
+        most recently looked up symbols in an LRU cache.
+
+        Writes made by other processes or other Ingestion Engine instances do not
+        clear the cache of this engine; the _clear_symbol_lookup_cache() method can
+        be called to do so.
+
+        Args:
+            symbol (str): The ticker symbol of the holding.
+
+            min_percent (float): An optional minimum percent_holdings of the
+                returned funds.
+
+        Returns:
+            pandas.DataFrame: The funds holding the symbol (see _get_funds_holding_symbol()).
+
+        """
+        with self._symbol_lookup_lock:
+            if symbol in self._symbol_lookup_cache:
+                self._symbol_lookup_cache.move_to_end(symbol)
+                self._symbol_lookup_stats["hits"] += 1
+                return self._format_holding_funds(self._symbol_lookup_cache[symbol], min_percent)
+
+            self._symbol_lookup_stats["misses"] += 1
+            lookup_generation = self._symbol_lookup_generation
+
+        holding_rows = self._query_funds_holding_symbol(symbol)
+
+        with self._symbol_lookup_lock:
+
+            # Not caching the lookup if the reverse index was written while it was in progress:
+            if lookup_generation == self._symbol_lookup_generation:
+                self._symbol_lookup_cache[symbol] = holding_rows
+                self._symbol_lookup_cache.move_to_end(symbol)
+
+                while len(self._symbol_lookup_cache) > self._symbol_lookup_cache_size:
+                    self._symbol_lookup_cache.popitem(last=False)
+                    self._symbol_lookup_stats["evictions"] += 1
+
+        return self._format_holding_funds(holding_rows, min_percent)
+
+    def _format_holding_funds(self, holding_rows, min_percent=None):
+        """Builds the dataframe of the funds holding a symbol from the rows of the reverse index."""
+        holding_funds_df = pd.DataFrame(list(holding_rows), columns=["fund", "as_of_date", "percent_holdings"])
+
+        if min_percent is not None:
+            holding_funds_df = holding_funds_df[holding_funds_df.percent_holdings >= min_percent].reset_index(drop=True)
+
+        return holding_funds_df
+
+    def _clear_symbol_lookup_cache(self):
+        """
+        Clears the LRU cache of the _get_funds_holding_symbol_cached() method and
+        advances its generation, so that the lookups in progress are not cached.
+        """
+        with self._symbol_lookup_lock:
+            self._symbol_lookup_cache.clear()
+            self._symbol_lookup_generation += 1
+
+    def _query_funds_holding_symbol(self, symbol):
+        """
+        The method queries the reverse index for the funds holding a symbol.
+
+        Args:
+            symbol (str): The ticker symbol of the holding.
+
+        Returns:
+            tuple: The (fund, as_of_date, percent_holdings) rows, sorted by
+                descending percent_holdings. A tuple is returned so that cached
+                results cannot be modified by the caller.
+
+        """
+        symbol_index_table = FundHoldingsBySymbolModel.__table__
+        fund_symbols = SymbolModel.__table__.alias("fund_symbols")
+
+        symbol_id = self._symbol_registry.get_symbol_id(symbol, register=False)
+        if symbol_id is None:
+            return ()
+
+        with self._sqlaengine.connect() as db_con:
+            return tuple(tuple(holding_row) for holding_row in db_con.execute(
+                select([
+                    fund_symbols.c.symbol, symbol_index_table.c.as_of_date,
+                    symbol_index_table.c.percent_holdings]).select_from(
+                    symbol_index_table.join(fund_symbols, symbol_index_table.c.fund_id == fund_symbols.c.symbol_id)).where(
+                    symbol_index_table.c.symbol_id == symbol_id).order_by(
+                    symbol_index_table.c.percent_holdings.desc(), fund_symbols.c.symbol)))
+
+    def _build_symbol_index(self):
+        """
+        The method populates an empty reverse index from the latest holdings
+        snapshot of every fund in a single INSERT ... SELECT statement. It only
+        does work for databases whose snapshots were written before the reverse
+        index was maintained.
+
+        """
+        holdings_table = FundHoldingsModel.__table__
+        digest_table = FundHoldingsDigestModel.__table__
+        symbol_index_table = FundHoldingsBySymbolModel.__table__
+
+        with self._sqlaengine.begin() as db_con:
+
+            if db_con.execute(select([symbol_index_table.c.symbol_id]).limit(1)).first() is not None:
+                return
+
+            latest_holdings = select([
+                holdings_table.c.symbol_id, holdings_table.c.fund_id, holdings_table.c.as_of_date,
+                holdings_table.c.percent_holdings]).select_from(
+                holdings_table.join(digest_table, and_(
+                    holdings_table.c.fund_id == digest_table.c.fund_id,
+                    holdings_table.c.as_of_date == digest_table.c.as_of_date)))
+
+            db_con.execute(symbol_index_table.insert().from_select(
+                ["symbol_id", "fund_id", "as_of_date", "percent_holdings"], latest_holdings))
+
+    def _get_latest_holdings(self, funds=None):
+        """
+        The method reads the latest holdings snapshot of each fund in a single
+        query, joining the holdings table to the latest as_of_date of each fund.
+        Both the grouping and the join are served by the (fund_id, as_of_date)
+        prefix of the primary key of the holdings table. The ticker symbols of the
+        funds and holdings are joined from the symbols table.
+
+        Args:
+            funds (list): The ticker symbols of the funds to read. Defaults to None
+                (the latest snapshot of every fund is read).
+
+        Returns:
+            pandas.DataFrame: The latest holdings with the columns fund, as_of_date,
+                symbol, name and percent_holdings, sorted by fund and by descending
+                percent_holdings.
+
+        """
+        holdings_table = FundHoldingsModel.__table__
+        fund_symbols = SymbolModel.__table__.alias("fund_symbols")
+        holding_symbols = SymbolModel.__table__.alias("holding_symbols")
+
+        # Reading the funds in chunks to stay within the bound parameter limits of the database:
+        if funds is None:
+            fund_id_chunks = [None]
+        else:
+            fund_ids = list(self._symbol_registry.get_symbol_ids(funds, register=False).values())
+            fund_id_chunks = [fund_ids[chunk_start:chunk_start + 500] for chunk_start in range(0, len(fund_ids), 500)] or [[]]
+
+        latest_holdings_dfs = []
+        for fund_id_chunk in fund_id_chunks:
+
+            latest_snapshots = select([
+                holdings_table.c.fund_id, func.max(holdings_table.c.as_of_date).label("as_of_date")])
+            if fund_id_chunk is not None:
+                latest_snapshots = latest_snapshots.where(holdings_table.c.fund_id.in_(fund_id_chunk))
+            latest_snapshots = latest_snapshots.group_by(holdings_table.c.fund_id).alias("latest_snapshots")
+
+            latest_holdings_query = select([
+                fund_symbols.c.symbol.label("fund"), holdings_table.c.as_of_date,
+                holding_symbols.c.symbol.label("symbol"), holdings_table.c.name,
+                holdings_table.c.percent_holdings]).select_from(
+                holdings_table.join(latest_snapshots, and_(
+                    holdings_table.c.fund_id == latest_snapshots.c.fund_id,
+                    holdings_table.c.as_of_date == latest_snapshots.c.as_of_date)).join(
+                    fund_symbols, holdings_table.c.fund_id == fund_symbols.c.symbol_id).join(
+                    holding_symbols, holdings_table.c.symbol_id == holding_symbols.c.symbol_id)).order_by(
+                fund_symbols.c.symbol, holdings_table.c.percent_holdings.desc())
+
+            latest_holdings_dfs.append(pd.read_sql(latest_holdings_query, self._sqlaengine, parse_dates=["as_of_date"]))
+
+        return pd.concat(latest_holdings_dfs, ignore_index=True) if len(latest_holdings_dfs) > 1 else latest_holdings_dfs[0]
+
+    def _format_holdings_rows(self, fund_holdings_df):
+        """
+        The method converts a holdings dataframe (indexed by symbol) into the list
+        of rows written to the holdings table, sorted by symbol. Holdings without
+        a symbol and repeated symbols are dropped as the symbol is part of the
+        primary key of the table.
+
+        Args:
+            fund_holdings_df (pandas.DataFrame): The holdings dataframe.
+
+        Returns:
+            list: The {symbol, name, percent_holdings} dict of each holding.
+
+        """
+        holdings_df = fund_holdings_df.reset_index()
+        holdings_df = holdings_df[holdings_df["symbol"].notna()].drop_duplicates("symbol").sort_values("symbol")
+
+        return [
+            {
+                "symbol": str(symbol),
+                "name": None if pd.isna(name) else str(name),
+                "percent_holdings": None if pd.isna(percent_holdings) else float(percent_holdings)}
+            for symbol, name, percent_holdings in zip(
+                holdings_df["symbol"], holdings_df["name"], holdings_df["percent_holdings"])]
+
+    def _get_snapshot_digest(self, fund_id, as_of_date, con):
+        """
+        The method builds the digest of the stored snapshot of a fund in effect on
+        a date: the snapshot dated on or immediately before said date.
+
+        Args:
+            fund_id (int): The symbol id of the fund.
+
+            as_of_date (datetime.date): The date.
+
+            con (sqlalchemy.engine.Connection): The connection the snapshot is read with.
+
+        Returns:
+            str: The hex digest of the snapshot (see _get_holdings_digest()) or None
+                if the fund has no snapshot dated on or before as_of_date.
+
+        """
+        holdings_table = FundHoldingsModel.__table__
+        holding_symbols = SymbolModel.__table__
+
+        snapshot_date = con.execute(select([func.max(holdings_table.c.as_of_date)]).where(and_(
+            holdings_table.c.fund_id == fund_id, holdings_table.c.as_of_date <= as_of_date))).scalar()
+
+        if snapshot_date is None:
+            return None
+
+        snapshot_rows = con.execute(
+            select([holding_symbols.c.symbol, holdings_table.c.name, holdings_table.c.percent_holdings]).select_from(
+                holdings_table.join(holding_symbols, holdings_table.c.symbol_id == holding_symbols.c.symbol_id)).where(and_(
+                holdings_table.c.fund_id == fund_id, holdings_table.c.as_of_date == snapshot_date)))
+
+        # Sorting the rows by symbol in Python, as the collation of the database may differ:
+        return self._get_holdings_digest([
+            {"symbol": symbol, "name": name, "percent_holdings": percent_holdings}
+            for symbol, name, percent_holdings in sorted(snapshot_rows, key=lambda snapshot_row: snapshot_row[0])])
+
+    def _get_holdings_digest(self, holdings_rows):
+        """
+        The method builds the sha256 digest of a list of sorted holdings rows,
+        used to detect if the holdings of a fund changed.
+
+        Args:
+            holdings_rows (list): The rows built by the _format_holdings_rows() method.
+
+        Returns:
+            str: The hex digest of the holdings.
+
+        """
+        holdings_hash = hashlib.sha256()
+        for holdings_row in holdings_rows:
+            holdings_hash.update(
+                f"{holdings_row['symbol']}\x1f{holdings_row['name']}\x1f{holdings_row['percent_holdings']!r}\n".encode("utf-8"))
+
+        return holdings_hash.hexdigest()
 
     def _get_validation_status(self, obj):
         '''
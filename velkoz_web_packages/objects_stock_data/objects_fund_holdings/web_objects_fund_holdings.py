@@ -1,11 +1,13 @@
 # Importing Base Web Objects:
 from velkoz_web_packages.objects_base.web_objects_base import BaseWebPageResponse
 
+# Importing the symbol metadata methods used to check ticker types:
+from velkoz_web_packages.objects_stock_data.objects_symbols.symbol_metadata_cache import fetch_symbol_metadata, is_fund_quote_type
+
 # Importing 3rd party packages:
 import requests
 from bs4 import BeautifulSoup
 import datetime
-import yfinance as yf
 import pandas as pd
 
 class NASDAQFundHoldingsResponseObject(BaseWebPageResponse):
@@ -13,10 +15,14 @@ class NASDAQFundHoldingsResponseObject(BaseWebPageResponse):
     This Web Page Response Object is designed to represent the top 10 holdings of
     a particular Fund listed on the NASDAQ extracted through Yahoo Finance.
 
-    The Object is initialized by a ticker symbol and makes use of the yfinance python
-    package to determine if the input ticker is a fund that would contain holdings
-    data. If its status is confirmed then the NASDAQFundHoldingsResponseObject’s Parent
-    Object is initialized using a custom built Yahoo Finance URL.
+    The Object is initialized by a ticker symbol and makes use of the quote type of
+    the ticker to determine if it is a fund that would contain holdings data. The
+    quote type is read from a SymbolMetadataCache if one is provided, otherwise it is
+    fetched via the yfinance python package. If its status is confirmed then the
+    NASDAQFundHoldingsResponseObject’s Parent Object is initialized using a custom
+    built Yahoo Finance URL. When ingesting many tickers they should be filtered
+    via SymbolMetadataCache.filter_funds() before any object is built, so that the
+    quote types are fetched in a single batch and at most once per time-to-live.
 
     Once the parent object has been initialized, the html stored in the http_response
     is parsed via internal methods to extract the holdings data as a dataframe. This
@@ -27,6 +33,13 @@ class NASDAQFundHoldingsResponseObject(BaseWebPageResponse):
         ticker (str): The string representing the ticker symbol of the stock that
             the WebResponseObject represents.
 
+        symbol_cache (SymbolMetadataCache): An optional cache the quote type of the
+            ticker is read from. Defaults to None (the quote type is fetched).
+
+    Raises:
+        ValueError: If the ticker is not a fund (eg: an equity) and so has no
+            holdings data.
+
     Attributes:
 
         _ticker (str): The string representing the ticker symbol of the stock that
@@ -52,16 +65,19 @@ class NASDAQFundHoldingsResponseObject(BaseWebPageResponse):
             +------------------+--------+-----------------+
 
     """
-    def __init__(self, ticker):
+    def __init__(self, ticker, symbol_cache=None):
 
         self._ticker = ticker
 
-        # Initalizing the yfinance object to test for ticker type:
-        yf_ticker_information = yf.Ticker(ticker).info
+        # Determining the ticker type, preferably from the symbol metadata cache:
+        if symbol_cache is not None:
+            quote_type = symbol_cache.get_quote_type(ticker)
+        else:
+            quote_type = fetch_symbol_metadata(ticker)["quote_type"]
 
         # Performing ticker type checking to ensure ticker contains holdings data:
-        if yf_ticker_information['quoteType'] == 'EQUITY':
-            return
+        if not is_fund_quote_type(quote_type):
+            raise ValueError(f"{ticker} has quote type {quote_type} and is not a fund with holdings data")
 
         # Declaring the base url for the holdings page of Yahoo Finance:
         self._yhfinance_url = f"https://finance.yahoo.com/quote/{self._ticker}/holdings"
@@ -101,24 +117,107 @@ class NASDAQFundHoldingsResponseObject(BaseWebPageResponse):
         # Converting html body into a BeautifulSoup Object:
         soup = BeautifulSoup(html_content, 'html.parser')
 
-        #print(soup.prettify())
-
         # Searching for the holdings html table:
-        self._holdings_tbl = soup.find('table', attrs={
-            "class":"W(100%) M(0) BdB Bdc($seperatorColor)"})
+        self._holdings_tbl = find_holdings_tbl(soup)
+
+        return format_holdings_tbl(self._holdings_tbl)
+
+def fetch_holdings_html(ticker, symbol_cache=None, check_quote_type=True):
+    """
+    The method performs the network requests of the NASDAQFundHoldingsResponseObject
+    without parsing the response. It is the “fetch” half of the object that is
+    used by data pipelines that perform network I/O and html parsing in separate
+    stages.
+
+    As with the NASDAQFundHoldingsResponseObject the ticker is first checked to
+    ensure that it is a fund that would contain holdings data, unless the tickers
+    have already been filtered (eg: via SymbolMetadataCache.filter_funds()).
+
+    Args:
+        ticker (str): The ticker symbol of the fund whose holdings page is fetched.
+
+        symbol_cache (SymbolMetadataCache): An optional cache the quote type of the
+            ticker is read from. Defaults to None (the quote type is fetched).
+
+        check_quote_type (bool): Whether the quote type of the ticker is checked.
+            Defaults to True.
+
+    Returns:
+        bytes: The raw html content of the Yahoo Finance holdings page. None is
+            returned if the ticker is not a fund and therefore has no holdings.
+
+    """
+    # Performing ticker type checking to ensure ticker contains holdings data:
+    if check_quote_type:
+        if symbol_cache is not None:
+            quote_type = symbol_cache.get_quote_type(ticker)
+        else:
+            quote_type = fetch_symbol_metadata(ticker)["quote_type"]
+
+        if not is_fund_quote_type(quote_type):
+            return None
+
+    # Performing the GET request for the holdings page:
+    holdings_response = requests.get(
+        f"https://finance.yahoo.com/quote/{ticker}/holdings", params={"p": ticker})
+
+    return holdings_response.content
+
+def parse_holdings_html(html_content):
+    """
+    The method parses the raw html content of a Yahoo Finance holdings page into
+    the holdings dataframe. It is the “parse” half of the NASDAQFundHoldingsResponseObject.
+
+    Args:
+        html_content (bytes): The raw html of the holdings page.
+
+    Returns:
+        pandas.Dataframe: The holdings information extracted from the html.
+
+    """
+    return format_holdings_tbl(find_holdings_tbl(BeautifulSoup(html_content, 'html.parser')))
+
+def find_holdings_tbl(soup):
+    """
+    The method searches a BeautifulSoup object of a Yahoo Finance holdings page
+    for the html table containing the holdings information.
+
+    Args:
+        soup (bs4.BeautifulSoup): The parsed holdings page.
 
-        # Attempting to create a pandas dataframe from the html table:
-        holdings_df = pd.read_html(str(self._holdings_tbl))[0]
+    Returns:
+        bs4.element.Tag: The html table containing the holdings data.
+
+    """
+    return soup.find('table', attrs={
+        "class":"W(100%) M(0) BdB Bdc($seperatorColor)"})
+
+def format_holdings_tbl(holdings_tbl):
+    """
+    The method converts the html table containing a fund’s holdings information
+    to a pandas dataframe in the schema used by the NASDAQFundHoldingsResponseObject.
+
+    Args:
+        holdings_tbl (bs4.element.Tag): The html table containing the holdings data.
+
+    Returns:
+        pandas.Dataframe: The holdings information converted to a pandas dataframe.
+
+    References:
+        * https://stackoverflow.com/questions/56967976/convert-html-table-to-pandas-data-frame-in-python
+    """
+    # Attempting to create a pandas dataframe from the html table:
+    holdings_df = pd.read_html(str(holdings_tbl))[0]
 
-        # Formatting dataframe to appropriate schema:
-        holdings_df.rename(columns = {
-            "Name":"name", "Symbol":"symbol", "% Assets": "percent_holdings"},
-            inplace=True)
+    # Formatting dataframe to appropriate schema:
+    holdings_df.rename(columns = {
+        "Name":"name", "Symbol":"symbol", "% Assets": "percent_holdings"},
+        inplace=True)
 
-        # Converting percentage strings to float (drop "%" then str -> float):
-        holdings_df['percent_holdings'] = holdings_df['percent_holdings'].map(
-            lambda x : float(x.replace("%", "")))
+    # Converting percentage strings to float (drop "%" then str -> float):
+    holdings_df['percent_holdings'] = holdings_df['percent_holdings'].map(
+        lambda x : float(x.replace("%", "")))
 
-        holdings_df.set_index('symbol', inplace=True)
+    holdings_df.set_index('symbol', inplace=True)
 
-        return holdings_df
+    return holdings_df
@@ -0,0 +1,348 @@
+# Importing 3rd Party Packages:
+from sqlalchemy import Column, Integer, Float, String, Text, Date, DateTime, ForeignKey, Index
+from sqlalchemy.ext.declarative import declarative_base
+
+# Creating the declarative base object used to create base database orm models:
+Base = declarative_base()
+
+class EDGARFilingModel(Base):
+    """The EDGARFilingModel is the SQLAlchemy model that represents the database
+    table storing the metadata of every filing ingested via the EDGARPageIngestionEngine.
+
+    Each row represents a single filing, keyed by its accession number (the unique
+    id the SEC assigns to every filing). The text of each filing is stored in the
+    separate table described by the EDGARFilingTextModel so that the metadata
+    table stays small enough to be scanned quickly.
+
+    Attributes:
+        __tablename__ (str): A metadata attribute that determines the name of the table
+            created by the engine.
+
+        __table_args__ (str): A metadata attribute that determines how the model
+            interacts with an existing equivalent databaset table that already
+            exists. In this case it is set to utilize any already existing database
+            table with the same name.
+
+        accession_number (sqlalchemy.Column): The accession number of the filing.
+            This is the primary key for the database table.
+
+        cik (sqlalchemy.Column): The Central Index Key of the company that made
+            the filing. It is indexed so that the filings of a company can be
+            queried quickly.
+
+        filing (sqlalchemy.Column): The type of the filing (eg: '10-K').
+
+        filing_description (sqlalchemy.Column): The description of the filing.
+
+        filing_date (sqlalchemy.Column): The date the filing was made.
+
+        file_id (sqlalchemy.Column): The SEC internal file number of the filing.
+
+        documents_href (sqlalchemy.Column): The href of the filing's documents page.
+
+        data_page_href (sqlalchemy.Column): The href of the filing's interactive
+            data page. Null if the filing has no interactive data.
+
+        report_data_href (sqlalchemy.Column): The full url of the .xlsx file of
+            the filing's financial data. Null if it was not fetched or not found.
+
+        last_updated (sqlalchemy.Column): The datetime the row was written.
+
+    """
+    # Declaring table meta-data:
+    __tablename__ = "edgar_filings"
+    __table_args__ = {'extend_existing': True}
+
+    # Declaring the table schema:
+    accession_number = Column(
+        'accession_number',
+        String(25),
+        primary_key = True)
+
+    cik = Column(
+        'cik',
+        String(10),
+        index = True,
+        nullable = False)
+
+    filing = Column(
+        'filing',
+        String(20),
+        nullable = True)
+
+    filing_description = Column(
+        'filing_description',
+        Text,
+        nullable = True)
+
+    filing_date = Column(
+        'filing_date',
+        Date,
+        index = True,
+        nullable = True)
+
+    file_id = Column(
+        'file_id',
+        String(30),
+        nullable = True)
+
+    documents_href = Column(
+        'documents_href',
+        Text,
+        nullable = True)
+
+    data_page_href = Column(
+        'data_page_href',
+        Text,
+        nullable = True)
+
+    report_data_href = Column(
+        'report_data_href',
+        Text,
+        nullable = True)
+
+    last_updated = Column(
+        'last_updated',
+        DateTime,
+        nullable = True)
+
+    # Dunder Methods:
+    def __repr__(self):
+        return f"EDGARFilingModel({self.accession_number})"
+
+class EDGARFilingTextModel(Base):
+    """The EDGARFilingTextModel is the SQLAlchemy model that represents the database
+    table storing the text of the report document of each filing ingested via the
+    EDGARPageIngestionEngine. Each row references a row of the edgar_filings table.
+
+    Attributes:
+        __tablename__ (str): A metadata attribute that determines the name of the table
+            created by the engine.
+
+        __table_args__ (str): A metadata attribute that determines how the model
+            interacts with an existing equivalent databaset table that already
+            exists.
+
+        accession_number (sqlalchemy.Column): The accession number of the filing.
+            This is the primary key of the table and a foreign key to edgar_filings.
+
+        report_contents_txt (sqlalchemy.Column): The text extracted from the
+            report document of the filing.
+
+    """
+    # Declaring table meta-data:
+    __tablename__ = "edgar_filing_text"
+    __table_args__ = {'extend_existing': True}
+
+    # Declaring the table schema:
+    accession_number = Column(
+        'accession_number',
+        String(25),
+        ForeignKey('edgar_filings.accession_number'),
+        primary_key = True)
+
+    report_contents_txt = Column(
+        'report_contents_txt',
+        Text,
+        nullable = True)
+
+    # Dunder Methods:
+    def __repr__(self):
+        return f"EDGARFilingTextModel({self.accession_number})"
+
+class EDGARCompanyWatermarkModel(Base):
+    """The EDGARCompanyWatermarkModel is the SQLAlchemy model that represents the
+    database table storing the high-water mark of the filings ingested for each
+    company: the date of the latest filing that is stored in the database.
+
+    Crawlers use the high-water mark to stop requesting further results pages
+    once they reach filings that have already been ingested.
+
+    Attributes:
+        __tablename__ (str): A metadata attribute that determines the name of the table
+            created by the engine.
+
+        __table_args__ (str): A metadata attribute that determines how the model
+            interacts with an existing equivalent databaset table that already
+            exists.
+
+        cik (sqlalchemy.Column): The Central Index Key of the company. This is
+            the primary key for the database table.
+
+        latest_filing_date (sqlalchemy.Column): The date of the latest filing of
+            the company stored in the database.
+
+        last_updated (sqlalchemy.Column): The datetime the watermark was last written.
+
+    """
+    # Declaring table meta-data:
+    __tablename__ = "edgar_company_watermarks"
+    __table_args__ = {'extend_existing': True}
+
+    # Declaring the table schema:
+    cik = Column(
+        'cik',
+        String(10),
+        primary_key = True)
+
+    latest_filing_date = Column(
+        'latest_filing_date',
+        Date,
+        nullable = True)
+
+    last_updated = Column(
+        'last_updated',
+        DateTime,
+        nullable = True)
+
+    # Dunder Methods:
+    def __repr__(self):
+        return f"EDGARCompanyWatermarkModel({self.cik})"
+
+class EDGARFinancialDataModel(Base):
+    """The EDGARFinancialDataModel is the SQLAlchemy model that represents the database
+    table storing the financial data extracted from the Financial_Report.xlsx workbook
+    of each filing ingested via the EDGARPageIngestionEngine.
+
+    The data is stored in long format: each row is a single value of a line item of
+    a financial statement for a single period. An index over the accession number
+    and statement allows the statements of a filing to be queried quickly.
+
+    Attributes:
+        __tablename__ (str): A metadata attribute that determines the name of the table
+            created by the engine.
+
+        __table_args__ (tuple): A metadata attribute containing the index of the
+            table and allowing the model to use an existing equivalent table.
+
+        id (sqlalchemy.Column): The autoincrementing primary key of the table.
+
+        accession_number (sqlalchemy.Column): The accession number of the filing.
+
+        statement (sqlalchemy.Column): The title of the financial statement
+            (eg: 'CONSOLIDATED BALANCE SHEETS - USD ($) $ in Millions').
+
+        line_item (sqlalchemy.Column): The line item of the statement (eg: 'Total net sales').
+
+        period (sqlalchemy.Column): The label of the period of the value
+            (eg: '12 Months Ended Sep. 26, 2020').
+
+        value (sqlalchemy.Column): The value of the line item for the period.
+
+    """
+    # Declaring table meta-data:
+    __tablename__ = "edgar_financial_data"
+    __table_args__ = (
+        Index('ix_edgar_financial_data_filing_statement', 'accession_number', 'statement'),
+        {'extend_existing': True})
+
+    # Declaring the table schema:
+    id = Column(
+        'id',
+        Integer,
+        primary_key = True,
+        autoincrement = True)
+
+    accession_number = Column(
+        'accession_number',
+        String(25),
+        ForeignKey('edgar_filings.accession_number'),
+        nullable = False)
+
+    statement = Column(
+        'statement',
+        String(255),
+        nullable = True)
+
+    line_item = Column(
+        'line_item',
+        Text,
+        nullable = True)
+
+    period = Column(
+        'period',
+        String(100),
+        nullable = True)
+
+    value = Column(
+        'value',
+        Float,
+        nullable = True)
+
+    # Dunder Methods:
+    def __repr__(self):
+        return f"EDGARFinancialDataModel({self.accession_number}, {self.statement}, {self.line_item})"
+
+class EDGARFilingIndexModel(Base):
+    """The EDGARFilingIndexModel is the SQLAlchemy model that represents the database
+    table storing the records of the EDGAR full-index files ingested via the
+    EDGARFullIndexIngestionEngine: one row per filing per filer.
+
+    The table is indexed by company and by form type (each with the filing date)
+    so that the filings of a company or the filings of a form type within a date
+    range are found with an index lookup rather than by crawling results pages.
+
+    Attributes:
+        __tablename__ (str): A metadata attribute that determines the name of the table
+            created by the engine.
+
+        __table_args__ (tuple): A metadata attribute containing the indexes of the
+            table and allowing the model to use an existing equivalent table.
+
+        accession_number (sqlalchemy.Column): The accession number of the filing.
+            Together with the cik it is the primary key of the table, as a filing
+            with several filers is listed once per filer.
+
+        cik (sqlalchemy.Column): The Central Index Key of the filer.
+
+        company_name (sqlalchemy.Column): The name of the filer.
+
+        form_type (sqlalchemy.Column): The form type of the filing (eg: '10-K').
+
+        date_filed (sqlalchemy.Column): The date the filing was made.
+
+        filename (sqlalchemy.Column): The path of the filing's full submission
+            text file relative to https://www.sec.gov/Archives/.
+
+    """
+    # Declaring table meta-data:
+    __tablename__ = "edgar_filing_index"
+    __table_args__ = (
+        Index('ix_edgar_filing_index_cik_date', 'cik', 'date_filed'),
+        Index('ix_edgar_filing_index_form_date', 'form_type', 'date_filed'),
+        {'extend_existing': True})
+
+    # Declaring the table schema:
+    accession_number = Column(
+        'accession_number',
+        String(25),
+        primary_key = True)
+
+    cik = Column(
+        'cik',
+        String(10),
+        primary_key = True)
+
+    company_name = Column(
+        'company_name',
+        String(255),
+        nullable = True)
+
+    form_type = Column(
+        'form_type',
+        String(30),
+        nullable = True)
+
+    date_filed = Column(
+        'date_filed',
+        Date,
+        nullable = True)
+
+    filename = Column(
+        'filename',
+        Text,
+        nullable = True)
+
+    # Dunder Methods:
+    def __repr__(self):
+        return f"EDGARFilingIndexModel({self.accession_number}, {self.cik})"
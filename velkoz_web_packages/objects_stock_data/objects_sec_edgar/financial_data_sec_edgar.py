@@ -0,0 +1,157 @@
+# Importing native packages:
+import io
+import itertools
+import numbers
+
+"""
+The script contains the methods used to extract the financial data of an EDGAR
+filing from its Financial_Report.xlsx workbook (the 'Interactive Data' of the
+filing, see EDGARResultsPageResponse.__extract_report_csv()).
+
+Each sheet of the workbook is a financial statement (balance sheet, income
+statement etc) laid out as a table: the first rows are headers naming the period
+of each column (eg: '12 Months Ended' / 'Sep. 26, 2020') and every following row
+is a line item followed by its value for each period. The workbook is read with
+openpyxl in read-only mode, which streams the rows of each sheet from the xlsx
+archive instead of loading the whole workbook into memory, and each sheet is
+normalized into long format rows:
+
+(accession_number, statement, line_item, period, value)
+
+openpyxl is an optional dependency of the library. It is only imported when a
+workbook is read.
+
+"""
+
+# The number of rows yielded per chunk by iter_financial_report_chunks():
+DEFAULT_CHUNK_SIZE = 5000
+
+def _import_openpyxl():
+    """Imports openpyxl, raising an ImportError explaining why it is needed if it is missing."""
+    try:
+        import openpyxl
+    except ImportError as error:
+        raise ImportError(
+            "openpyxl is required to extract EDGAR financial data. Install it with 'pip install openpyxl'") from error
+
+    return openpyxl
+
+def _is_numeric_value(cell_value):
+    """Returns whether a cell value is a number (booleans are not numbers here)."""
+    return isinstance(cell_value, numbers.Number) and not isinstance(cell_value, bool)
+
+def _iter_statement_rows(worksheet):
+    """
+    The method normalizes the rows of a single statement sheet into long format.
+
+    The leading rows of the sheet that contain no numeric values are treated as
+    headers. The first cell of the first header row is the title of the statement
+    and the remaining cells of the header rows are joined column-wise into the
+    label of the period of each column. Every following row is a line item whose
+    numeric cells are yielded as values. Rows without numeric values after the
+    headers (eg: section titles) are skipped.
+
+    Args:
+        worksheet (openpyxl.worksheet): The read-only worksheet of the statement.
+
+    Yields:
+        tuple: The (statement, line_item, period, value) of each value of the statement.
+
+    """
+    statement = worksheet.title
+    header_rows = []
+    period_labels = None
+
+    for sheet_row in worksheet.iter_rows(values_only=True):
+
+        if not sheet_row:
+            continue
+
+        line_item, row_values = sheet_row[0], sheet_row[1:]
+
+        # Collecting header rows until the first row containing values:
+        if period_labels is None:
+
+            if not any(_is_numeric_value(cell_value) for cell_value in row_values):
+                header_rows.append(sheet_row)
+                continue
+
+            if header_rows and header_rows[0][0]:
+                statement = " ".join(str(header_rows[0][0]).split())
+
+            # Joining the header cells of each column into its period label:
+            period_labels = [
+                " ".join(
+                    " ".join(str(header_row[column_num]).split()) for header_row in header_rows
+                    if column_num < len(header_row) and header_row[column_num] not in (None, ""))
+                for column_num in range(1, max([len(sheet_row)] + [len(header_row) for header_row in header_rows]))]
+
+        if line_item in (None, ""):
+            continue
+
+        line_item = " ".join(str(line_item).split())
+        for period_label, cell_value in zip(period_labels, row_values):
+
+            if _is_numeric_value(cell_value):
+                yield statement, line_item, period_label or None, float(cell_value)
+
+def iter_financial_report_rows(workbook, accession_number):
+    """
+    The method streams the financial data of a Financial_Report.xlsx workbook as
+    long format rows, one sheet row at a time.
+
+    Args:
+        workbook (str, bytes or file-like object): The path of the workbook, its
+            raw content or a file-like object containing it.
+
+        accession_number (str): The accession number of the filing the workbook
+            belongs to.
+
+    Yields:
+        dict: The {accession_number, statement, line_item, period, value} of each
+            value in the workbook.
+
+    """
+    openpyxl = _import_openpyxl()
+
+    if isinstance(workbook, (bytes, bytearray)):
+        workbook = io.BytesIO(workbook)
+
+    report_workbook = openpyxl.load_workbook(workbook, read_only=True, data_only=True)
+    try:
+        for worksheet in report_workbook.worksheets:
+            for statement, line_item, period, value in _iter_statement_rows(worksheet):
+                yield {
+                    'accession_number': accession_number,
+                    'statement': statement,
+                    'line_item': line_item,
+                    'period': period,
+                    'value': value}
+
+    finally:
+        report_workbook.close()
+
+def iter_financial_report_chunks(workbook, accession_number, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    The method groups the rows streamed by iter_financial_report_rows() into
+    lists of at most chunk_size rows so that they can be written with bulk inserts
+    without holding every row of the workbook in memory.
+
+    Args:
+        workbook (str, bytes or file-like object): The workbook (see iter_financial_report_rows()).
+
+        accession_number (str): The accession number of the filing.
+
+        chunk_size (int): The maximum number of rows per chunk.
+
+    Yields:
+        list: The chunks of row dicts.
+
+    """
+    report_rows = iter_financial_report_rows(workbook, accession_number)
+    while True:
+        rows_chunk = list(itertools.islice(report_rows, chunk_size))
+        if not rows_chunk:
+            return
+
+        yield rows_chunk
@@ -0,0 +1,188 @@
+# Importing native packages:
+import os
+import gzip
+import datetime
+
+# Importing 3-rd party modules:
+import requests
+
+# Importing the SEC request headers method:
+from velkoz_web_packages.objects_stock_data.objects_sec_edgar.web_objects_sec_edgar import get_sec_headers
+
+"""
+The script contains the methods used to read the EDGAR full-index files. Every
+quarter the SEC publishes an index of all of the filings made that quarter in
+three layouts, each sorted differently:
+
+* company.idx --> Fixed-width columns (Company Name, Form Type, CIK, Date Filed,
+    File Name) sorted by company name.
+* form.idx --> Fixed-width columns (Form Type, Company Name, CIK, Date Filed,
+    File Name) sorted by form type.
+* master.idx --> Pipe delimited columns (CIK|Company Name|Form Type|Date Filed|Filename)
+    sorted by CIK.
+
+Each file starts with a preamble describing the index, followed by a header line,
+a line of dashes and one line per filing. The files contain hundreds of thousands
+of lines each so they are parsed as a stream of records rather than being read
+into memory. The files can be read uncompressed or gzipped (as they are published
+at https://www.sec.gov/Archives/edgar/full-index/{year}/QTR{quarter}/).
+
+"""
+
+# The names of the columns of the fixed-width index files as they appear in the header:
+_FIXED_WIDTH_COLUMNS = {
+    "Company Name": "company_name",
+    "Form Type": "form_type",
+    "CIK": "cik",
+    "Date Filed": "date_filed",
+    "File Name": "filename"}
+
+# The order of the columns of the pipe delimited master.idx file:
+_MASTER_COLUMNS = ["cik", "company_name", "form_type", "date_filed", "filename"]
+
+def _open_index_file(index_path):
+    """Opens an index file as text, decompressing it if it is gzipped."""
+    if index_path.endswith(".gz"):
+        return gzip.open(index_path, "rt", encoding="latin-1")
+
+    return open(index_path, "r", encoding="latin-1")
+
+def _parse_date_filed(date_filed):
+    """Parses the 'Date Filed' of a record, in either the YYYY-MM-DD or YYYYMMDD format."""
+    if len(date_filed) == 8 and date_filed.isdigit():
+        return datetime.datetime.strptime(date_filed, "%Y%m%d").date()
+
+    return datetime.date.fromisoformat(date_filed)
+
+def _format_index_record(record):
+    """
+    The method converts the raw column strings of an index record into the format
+    of the edgar_filing_index table: a zero-padded CIK, a date and the accession
+    number of the filing (the name of its file without the extension).
+
+    """
+    record["cik"] = record["cik"].zfill(10)
+    record["date_filed"] = _parse_date_filed(record["date_filed"])
+    record["accession_number"] = os.path.splitext(os.path.basename(record["filename"]))[0]
+
+    return record
+
+def _get_fixed_width_slices(header_line):
+    """
+    The method builds the slice of each column of a fixed-width index file from
+    the position of the column names in its header line.
+
+    Args:
+        header_line (str): The header line of the index file.
+
+    Returns:
+        list: The (column_name, slice) of each column, in order.
+
+    """
+    column_starts = sorted(
+        (header_line.index(header_name), column_name)
+        for header_name, column_name in _FIXED_WIDTH_COLUMNS.items())
+
+    return [
+        (column_name, slice(column_start, column_starts[column_num + 1][0] if column_num + 1 < len(column_starts) else None))
+        for column_num, (column_start, column_name) in enumerate(column_starts)]
+
+def iter_full_index_records(index_path):
+    """
+    The method streams the records of an EDGAR full-index file (company.idx,
+    form.idx or master.idx, optionally gzipped). The layout of the file is
+    detected from its header line.
+
+    Args:
+        index_path (str): The path of the index file.
+
+    Yields:
+        dict: The {cik, company_name, form_type, date_filed, filename, accession_number}
+            of each filing in the index.
+
+    Raises:
+        ValueError: If the file does not contain an EDGAR index header.
+
+    """
+    with _open_index_file(index_path) as index_file:
+
+        # Skipping the preamble up to the line of dashes that follows the header:
+        header_line = None
+        for index_line in index_file:
+            if index_line.startswith("---"):
+                break
+
+            if index_line.strip():
+                header_line = index_line.rstrip("\n")
+
+        else:
+            raise ValueError(f"{index_path} is not an EDGAR full-index file")
+
+        if header_line is not None and "|" in header_line:
+
+            for index_line in index_file:
+                record_values = index_line.rstrip("\n").split("|")
+                if len(record_values) == len(_MASTER_COLUMNS):
+                    yield _format_index_record(dict(zip(_MASTER_COLUMNS, record_values)))
+
+        elif header_line is not None and all(header_name in header_line for header_name in _FIXED_WIDTH_COLUMNS):
+
+            column_slices = _get_fixed_width_slices(header_line)
+            for index_line in index_file:
+                if index_line.strip():
+                    yield _format_index_record({
+                        column_name: index_line[column_slice].strip()
+                        for column_name, column_slice in column_slices})
+
+        else:
+            raise ValueError(f"{index_path} does not contain an EDGAR full-index header")
+
+def get_full_index_file(year, quarter, cache_dir, index_type="master", sec_base_url="https://www.sec.gov",
+    headers=None, rate_limiter=None):
+    """
+    The method returns the path of the gzipped full-index file of a quarter in a
+    local cache directory, downloading it from the SEC only if it is not already
+    cached. Past quarters never change so cached files are never refreshed; the
+    file of the current quarter should be deleted from the cache to refresh it.
+
+    Args:
+        year (int): The year of the index.
+
+        quarter (int): The quarter of the index (1-4).
+
+        cache_dir (str): The directory the index files are cached in.
+
+        index_type (str): The layout of the index: 'master', 'company' or 'form'.
+
+        sec_base_url (str): The root url of the SEC website.
+
+        headers (dict): The headers of the request. The SEC requires a User-Agent,
+            see get_sec_headers().
+
+        rate_limiter (RequestRateLimiter): An optional rate limiter waited on
+            before the request is made.
+
+    Returns:
+        str: The path of the cached index file.
+
+    """
+    cached_path = os.path.join(cache_dir, f"{year}_QTR{quarter}_{index_type}.idx.gz")
+    if os.path.isfile(cached_path):
+        return cached_path
+
+    if rate_limiter is not None:
+        rate_limiter.wait()
+
+    index_response = requests.get(
+        f"{sec_base_url.rstrip('/')}/Archives/edgar/full-index/{year}/QTR{quarter}/{index_type}.gz",
+        headers=get_sec_headers(headers))
+    index_response.raise_for_status()
+
+    # Writing to a temporary file first so that an interrupted download is never cached:
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(cached_path + ".part", "wb") as cache_file:
+        cache_file.write(index_response.content)
+
+    os.replace(cached_path + ".part", cached_path)
+
+    return cached_path
@@ -0,0 +1,144 @@
+# Importing 3-rd party modules:
+import pandas as pd
+from sqlalchemy import text
+
+"""
+The script contains the methods used to maintain and query a full-text search
+index over the text of the filings stored in the edgar_filing_text table (see
+EDGARFilingTextModel). The index is native to the database backend:
+
+* SQLite --> An external content FTS5 virtual table (edgar_filing_text_fts) that
+    indexes the report_contents_txt column without storing a second copy of the
+    text. It is kept up to date by triggers on the edgar_filing_text table.
+* PostgreSQL --> A generated tsvector column (report_contents_tsv) on the
+    edgar_filing_text table with a GIN index.
+
+In both cases the index is updated incrementally by the database itself as filings
+are inserted, so the ingestion engine’s bulk inserts need no changes.
+
+"""
+
+# The name of the SQLite FTS5 table:
+FTS_TABLE_NAME = "edgar_filing_text_fts"
+
+_SQLITE_INDEX_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE_NAME} USING fts5(
+        report_contents_txt, content='edgar_filing_text', content_rowid='rowid')""",
+    f"""CREATE TRIGGER IF NOT EXISTS edgar_filing_text_fts_insert AFTER INSERT ON edgar_filing_text BEGIN
+        INSERT INTO {FTS_TABLE_NAME}(rowid, report_contents_txt) VALUES (new.rowid, new.report_contents_txt);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS edgar_filing_text_fts_delete AFTER DELETE ON edgar_filing_text BEGIN
+        INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}, rowid, report_contents_txt)
+            VALUES ('delete', old.rowid, old.report_contents_txt);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS edgar_filing_text_fts_update AFTER UPDATE ON edgar_filing_text BEGIN
+        INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}, rowid, report_contents_txt)
+            VALUES ('delete', old.rowid, old.report_contents_txt);
+        INSERT INTO {FTS_TABLE_NAME}(rowid, report_contents_txt) VALUES (new.rowid, new.report_contents_txt);
+    END"""]
+
+_POSTGRES_INDEX_DDL = [
+    """ALTER TABLE edgar_filing_text ADD COLUMN IF NOT EXISTS report_contents_tsv tsvector
+        GENERATED ALWAYS AS (to_tsvector('english', coalesce(report_contents_txt, ''))) STORED""",
+    """CREATE INDEX IF NOT EXISTS ix_edgar_filing_text_tsv ON edgar_filing_text USING GIN (report_contents_tsv)"""]
+
+_SQLITE_SEARCH_QUERY = f"""
+    SELECT edgar_filings.accession_number, edgar_filings.cik, edgar_filings.filing,
+        edgar_filings.filing_date, bm25({FTS_TABLE_NAME}) AS rank,
+        snippet({FTS_TABLE_NAME}, 0, '[', ']', '...', :snippet_tokens) AS snippet
+    FROM {FTS_TABLE_NAME}
+    JOIN edgar_filing_text ON edgar_filing_text.rowid = {FTS_TABLE_NAME}.rowid
+    JOIN edgar_filings ON edgar_filings.accession_number = edgar_filing_text.accession_number
+    WHERE {FTS_TABLE_NAME} MATCH :query
+    ORDER BY rank
+    LIMIT :limit"""
+
+# ts_rank is negated so that, as with bm25, lower ranks are better matches:
+_POSTGRES_SEARCH_QUERY = """
+    SELECT edgar_filings.accession_number, edgar_filings.cik, edgar_filings.filing,
+        edgar_filings.filing_date, -ts_rank(edgar_filing_text.report_contents_tsv, search_query) AS rank,
+        ts_headline('english', edgar_filing_text.report_contents_txt, search_query,
+            'StartSel=[, StopSel=], MaxWords=' || :snippet_tokens || ', MinWords=1') AS snippet
+    FROM edgar_filing_text
+    JOIN edgar_filings ON edgar_filings.accession_number = edgar_filing_text.accession_number,
+        websearch_to_tsquery('english', :query) AS search_query
+    WHERE edgar_filing_text.report_contents_tsv @@ search_query
+    ORDER BY rank
+    LIMIT :limit"""
+
+def create_filing_text_index(sqlaengine):
+    """
+    The method creates the full-text search index over the edgar_filing_text table
+    if it does not already exist. Filings that were stored before the index was
+    created are indexed when it is created.
+
+    Args:
+        sqlaengine (sqlalchemy.engine.Engine): The engine of the database containing
+            the edgar_filing_text table.
+
+    Raises:
+        NotImplementedError: If the database is neither SQLite nor PostgreSQL.
+
+    """
+    dialect_name = sqlaengine.dialect.name
+
+    with sqlaengine.begin() as db_con:
+
+        if dialect_name == "sqlite":
+
+            index_exists = db_con.execute(
+                text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": FTS_TABLE_NAME}).first()
+
+            for ddl_statement in _SQLITE_INDEX_DDL:
+                db_con.execute(text(ddl_statement))
+
+            # Indexing the filings that were stored before the index existed:
+            if index_exists is None:
+                db_con.execute(text(f"INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}) VALUES ('rebuild')"))
+
+        elif dialect_name == "postgresql":
+
+            for ddl_statement in _POSTGRES_INDEX_DDL:
+                db_con.execute(text(ddl_statement))
+
+        else:
+            raise NotImplementedError(f"Full-text search is not supported for {dialect_name} databases")
+
+def search_filing_text(sqlaengine, query, limit=10, snippet_tokens=16):
+    """
+    The method searches the full-text index for the filings whose text matches
+    a query and returns them ranked by relevance, best match first.
+
+    The query uses the search syntax of the database backend: FTS5 query syntax
+    for SQLite (eg: 'net NEAR(sales revenue)' or '"fiscal year"') and web search
+    syntax for PostgreSQL (eg: '"fiscal year" -quarterly').
+
+    Args:
+        sqlaengine (sqlalchemy.engine.Engine): The engine of the database containing
+            the index created by create_filing_text_index().
+
+        query (str): The full-text search query.
+
+        limit (int): The maximum number of filings returned. Defaults to 10.
+
+        snippet_tokens (int): The approximate number of words in each snippet.
+
+    Returns:
+        pandas dataframe: The matching filings with the columns accession_number,
+            cik, filing, filing_date, rank (lower is better) and snippet (the
+            matching text with the matched terms surrounded by '[' and ']').
+
+    """
+    if sqlaengine.dialect.name == "sqlite":
+        search_query = _SQLITE_SEARCH_QUERY
+
+    elif sqlaengine.dialect.name == "postgresql":
+        search_query = _POSTGRES_SEARCH_QUERY
+
+    else:
+        raise NotImplementedError(f"Full-text search is not supported for {sqlaengine.dialect.name} databases")
+
+    with sqlaengine.connect() as db_con:
+        return pd.read_sql(
+            text(search_query), db_con,
+            params={"query": query, "limit": limit, "snippet_tokens": snippet_tokens})
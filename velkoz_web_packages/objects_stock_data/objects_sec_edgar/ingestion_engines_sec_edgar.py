@@ -1,8 +1,29 @@
+# Importing native packages:
+import os
+import datetime
+import warnings
+import itertools
+
 # Importing 3-rd party modules:
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+
+# Importing base ingestion engine:
+from velkoz_web_packages.objects_base.ingestion_engines_base import BaseWebPageIngestionEngine
+from velkoz_web_packages.objects_stock_data.objects_sec_edgar.web_objects_sec_edgar import EDGARResultsPageResponse
+
+# Importing the SQLAlchemy database models and model base:
+from velkoz_web_packages.objects_stock_data.objects_sec_edgar.db_orm_models_sec_edgar import Base, EDGARFilingModel, EDGARFilingTextModel, EDGARCompanyWatermarkModel, EDGARFinancialDataModel, EDGARFilingIndexModel
 
+# Importing the full-text search index methods:
+from velkoz_web_packages.objects_stock_data.objects_sec_edgar.full_text_search_sec_edgar import create_filing_text_index, search_filing_text
+
+# Importing the financial data extraction methods:
+from velkoz_web_packages.objects_stock_data.objects_sec_edgar.financial_data_sec_edgar import iter_financial_report_chunks
+
+# Importing the EDGAR full-index parsing methods:
+from velkoz_web_packages.objects_stock_data.objects_sec_edgar.full_index_sec_edgar import iter_full_index_records
 
 class EDGARPageIngestionEngine(BaseWebPageIngestionEngine):
     """
@@ -11,18 +32,664 @@ class EDGARPageIngestionEngine(BaseWebPageIngestionEngine):
 
     The ingestion engine performs data transformation on the parameters of an
     EDGARResultsPageResponse() object and writes said formatted data to a backed database
-    via the SQLAlchemy ORM. When this object is initialized its instance variables
-    contain metadata on the database tables that it has accessed/created. The
-    actual writing to the database is done by calling an internal writing method.
-    # TODO: Once Method is written describe it.
+    via the SQLAlchemy ORM. The filings of each EDGARResultsPageResponse() are written
+    to normalized tables keyed by the accession number of each filing:
+
+    * edgar_filings --> The metadata and data links of each filing (EDGARFilingModel).
+    * edgar_filing_text --> The text of the report document of each filing (EDGARFilingTextModel).
+    * edgar_company_watermarks --> The date of the latest stored filing of each company
+        (EDGARCompanyWatermarkModel).
+    * edgar_financial_data --> The values of the financial statements of each filing
+        in long format (EDGARFinancialDataModel), if the write_financial_data kwarg is set.
+
+    Before a web object is written the database is queried for the accession numbers
+    of its filings and only filings that are not already stored are written, so
+    re-crawling a company only writes (and only fetches the documents of) its new
+    filings. Rows are written with bulk inserts (a single executemany per table
+    per web object) rather than one ORM instance per row. The per-company
+    high-water mark is read via the _get_company_watermark() method so that crawlers
+    can stop paging once they reach filings that are already stored. As crawls
+    go newest first the mark is not raised as pages are written, but only once
+    a crawl is complete via the _complete_company_crawl() method, so that an
+    interrupted crawl does not skip the older pages it did not write.
+
+    If the full_text_index kwarg is set the engine maintains a full-text search
+    index over the text of the stored filings (an FTS5 table for SQLite or a
+    tsvector column for PostgreSQL, see full_text_search_sec_edgar). The index is
+    updated by the database as filings are inserted and is queried via the
+    _search_filing_text() method.
 
     The ingestion engine is designed to ingest multiple instances of the EDGARResultsPageResponse()
     object through the *args parameter and as such the method that performs the data
     ingestion iterates through the list of *argments and performs the specific
-    writing operation for each instance of EDGARResultsPageResponse().
+    writing operation for each instance of EDGARResultsPageResponse(). The documents
+    of the new filings are fetched and their text extracted before the write lock is
+    taken, so only the queries and the bulk inserts of a web object are serialized
+    with the writes of other threads. The methods from the BaseDataIngestionEngine
+    that are overwritten are:
+
+    * _prepare_web_obj
+    * _add_session_web_obj
+    * _web_objs_committed
+    * _web_objs_rolled_back
+    * _get_validation_status
+
+    Args:
+
+        db_uri (str): The string URI for the database to be connected to. It is
+            used to initialize the SQLAlchemy database engine.
+
+        WebPageResponseObjs (EDGARResultsPageResponse): Arguments that are assumed
+            (and type checked) to be instances of EDGARResultsPageResponse() objects.
+
+        kwargs (dictionary): Optional key-word arguments passed to the
+            BaseWebPageIngestionEngine (eg: single_writer) as well as:
+
+            * write_reports (bool): Whether the report documents of new filings
+                are fetched (if they have not been already) and their text and
+                data links written. Defaults to True.
+            * full_text_index (bool): Whether a full-text search index is maintained
+                over the text of the stored filings. Defaults to False.
+            * write_financial_data (bool): Whether the Financial_Report.xlsx workbook
+                of each new filing is downloaded and its financial statements written
+                in long format. Requires openpyxl. Defaults to False.
+
+    Attributes:
+
+            _WebPageResponseObjs (list): A list of arguments that are assumed (and type
+                checked) to be instances of BaseWebPageResponse() objects or any object
+                that uses BaseWebPageResponse() as its base.
+
+            _db_uri (str): The URI of the database used to initialize the SQLA engine.
+
+            _sqlaengine (sqlalchemy.engine.Engine): The SQLAlchemy engine object that
+                is used to represent and interact with the database. The database
+                engine is initialized by the URI passed as the db_uri argument.
+
+            _db_session_maker (sqlalchemy.orm.session.sessionmaker): The object
+                that configures the Session factory that is used to create Session()
+                objects within the Ingestion engine.
+
+            _db_session (sqlalchemy.orm.session.Session): A persistent database
+                connection to the database binded to the database engine via the
+                _sqlaengine parameter.
+
+            _write_reports (bool): Whether the report documents of new filings are written.
+
+            _full_text_index (bool): Whether the full-text search index is maintained.
+
+            _write_financial_data (bool): Whether the financial data of new filings is written.
+
+            _uncommitted_reports (dict): The row indices of the filings of each web
+                object whose documents were written to the database session but
+                not yet committed. They are marked as seen by the url frontier of
+                the web object once committed and released if the write fails.
+
+            _prepared_reports (dict): The filings of each web object prepared by
+                the _prepare_web_obj() method that have not been added to the
+                database session yet, with their downloaded financial workbooks.
+
+    """
+    def __init__(self, db_uri, *WebPageResponseObjs, **kwargs):
+
+        # Declaring the EDGAR specific configuration kwargs:
+        self._write_reports = kwargs.pop('write_reports', True)
+        self._full_text_index = kwargs.pop('full_text_index', False)
+        self._write_financial_data = kwargs.pop('write_financial_data', False)
+
+        # Initalizing the Parent BaseWebPageIngestionEngine object:
+        super().__init__(db_uri, *WebPageResponseObjs, **kwargs)
+
+        # Declaring the {web_object: [filing_index]} dict of the documents written but not committed:
+        self._uncommitted_reports = {}
+
+        # Declaring the {web_object: (new_reports_tbl, financial_reports)} dict of prepared filings:
+        self._prepared_reports = {}
+
+        # Creating all tables associated with the SQLAlchemy Base Database Model:
+        Base.metadata.create_all(self._sqlaengine)
+
+        # Creating the full-text search index if it does not already exist:
+        if self._full_text_index:
+            create_filing_text_index(self._sqlaengine)
+
+    def _prepare_web_obj(self, web_object):
+        """
+        The method prepares the filings of an EDGARResultsPageResponse() object
+        that are not already stored in the database to be written by the
+        _add_session_web_obj() method. It is called by the parent writing methods
+        before the write lock is taken, so that the requests and the text extraction
+        of a web object never block the writes of other threads.
+
+        The method queries the edgar_filings table for the accession numbers of
+        the web object’s filings and drops the filings that are already stored
+        (as well as filings without an accession number). If the write_reports
+        kwarg is set, the report documents of the remaining filings are fetched
+        via the web object (concurrently, and only if they are not cached, see
+        _get_new_reports()) and their text extracted. If the write_financial_data
+        kwarg is set, the Financial_Report.xlsx workbooks of the remaining filings
+        are downloaded.
+
+        Args:
+            web_object (EDGARResultsPageResponse): The web object containing the
+                filings to be prepared. Web objects that failed validation are
+                not prepared.
+
+        """
+        if self._validation_dict.get(web_object, 0) <= 10:
+            return
+
+        reports_tbl = web_object._reports_tbl
+        reports_tbl = reports_tbl[reports_tbl['accession_number'] != 'NaN']
+
+        # Dropping the filings that are already stored in the database:
+        stored_accession_numbers = self._get_stored_accession_numbers(
+            list(reports_tbl['accession_number']))
+        new_reports_tbl = reports_tbl[~reports_tbl['accession_number'].isin(stored_accession_numbers)]
+
+        # Dropping duplicate filings within the web object itself:
+        new_reports_tbl = new_reports_tbl.drop_duplicates(subset='accession_number')
+
+        # Fetching the documents of the new filings only:
+        if self._write_reports and len(new_reports_tbl) > 0:
+            new_reports_tbl = self._get_new_reports(web_object, new_reports_tbl)
+
+            # Recording the documents to be marked as seen once they are committed:
+            self._uncommitted_reports.setdefault(web_object, []).extend(new_reports_tbl.index)
+
+        # Downloading the workbooks of the new filings that have interactive data:
+        financial_reports = {}
+        if self._write_financial_data:
+            for filing_index, filing_row in new_reports_tbl.iterrows():
+                if filing_row['data_page_href']:
+                    financial_reports[filing_index] = web_object._get_financial_report(filing_index)
+
+        self._prepared_reports[web_object] = (new_reports_tbl, financial_reports)
+
+    def _add_session_web_obj(self, web_object):
+        """
+        The method adds the filings of an EDGARResultsPageResponse() object that are
+        not already stored in the database to the database session. The rows are
+        committed by the parent method “_write_web_objects”.
+
+        The filings and their documents are prepared by the _prepare_web_obj()
+        method (which is called here if the parent writing methods have not called
+        it). As other threads may have written some of the filings since, the
+        edgar_filings table is queried again for their accession numbers and only
+        the filings that are still not stored are written. The metadata of the
+        new filings is bulk inserted into the edgar_filings table and their text
+        into the edgar_filing_text table. The company’s high-water mark is not
+        raised (see _complete_company_crawl()).
+
+        Args:
+            web_object (EDGARResultsPageResponse): The web object containing the
+                filings to be added to the database session. It is validated.
+
+        """
+        # Ensuring that the Web Object has been validated:
+        if self._validation_dict[web_object] > 10:
+
+            if web_object not in self._prepared_reports:
+                self._prepare_web_obj(web_object)
+
+            new_reports_tbl, financial_reports = self._prepared_reports.pop(web_object)
+
+            # Dropping the filings that were stored since the web object was prepared:
+            stored_accession_numbers = self._get_stored_accession_numbers(
+                list(new_reports_tbl['accession_number']))
+            new_reports_tbl = new_reports_tbl[~new_reports_tbl['accession_number'].isin(stored_accession_numbers)]
+
+            if len(new_reports_tbl) == 0:
+                return
+
+            last_updated = datetime.datetime.now()
+            filing_dates = pd.to_datetime(new_reports_tbl['filing_date'], errors='coerce')
+
+            # Building the rows of each table:
+            filing_rows = [
+                {
+                    'accession_number': filing_row.accession_number,
+                    'cik': web_object._cik,
+                    'filing': filing_row.filing,
+                    'filing_description': filing_row.filing_description,
+                    'filing_date': filing_date.date() if not pd.isnull(filing_date) else None,
+                    'file_id': filing_row.file_id,
+                    'documents_href': filing_row.documents_href,
+                    'data_page_href': filing_row.data_page_href,
+                    'report_data_href': self._null_nan(getattr(filing_row, 'report_data_href', None)),
+                    'last_updated': last_updated
+                }
+                for filing_row, filing_date in zip(new_reports_tbl.itertuples(), filing_dates)]
+
+            # Bulk inserting the rows of each table in a single executemany:
+            self._db_session.execute(EDGARFilingModel.__table__.insert(), filing_rows)
+
+            if self._write_reports:
+                text_rows = [
+                    {
+                        'accession_number': filing_row.accession_number,
+                        'report_contents_txt': self._null_nan(filing_row.report_contents_txt)
+                    }
+                    for filing_row in new_reports_tbl.itertuples()]
+
+                self._db_session.execute(EDGARFilingTextModel.__table__.insert(), text_rows)
+
+            # Writing the financial data of the new filings that have interactive data:
+            for filing_index, accession_number in new_reports_tbl['accession_number'].items():
+                if filing_index in financial_reports:
+                    self._write_financial_report(accession_number, financial_reports[filing_index])
+
+        else:
+            raise ValueError(f"Object {web_object} Was Not Added to Session due to Validation Error")
+
+    def _get_new_reports(self, web_object, new_reports_tbl):
+        """
+        The method fetches the documents of the new filings of a web object and
+        extracts their text.
+
+        Documents that the url frontier of the web object skips, because another
+        web object has claimed them or a previous run has seen them, are only
+        dropped if their filing is stored by now. The documents of the remaining
+        skipped filings are fetched regardless of the frontier, as the web object
+        that claimed them may never write them.
+
+        Args:
+            web_object (EDGARResultsPageResponse): The web object of the filings.
+
+            new_reports_tbl (pandas dataframe): The rows of the _reports_tbl of the
+                web object that are not stored in the database.
+
+        Returns:
+            pandas dataframe: The rows of the filings that are still not stored, with
+                the documents and text columns added by _get_reports().
+
+        """
+        new_reports_tbl = web_object._get_reports(list(new_reports_tbl.index), extract_text=True)
+
+        skipped_reports = new_reports_tbl['report_skipped'].astype(bool)
+        if not skipped_reports.any():
+            return new_reports_tbl
+
+        stored_accession_numbers = self._get_stored_accession_numbers(
+            list(new_reports_tbl.loc[skipped_reports, 'accession_number']))
+        new_reports_tbl = new_reports_tbl[~new_reports_tbl['accession_number'].isin(stored_accession_numbers)]
+
+        return web_object._get_reports(list(new_reports_tbl.index), extract_text=True, ignore_frontier=True)
+
+    def _web_objs_committed(self, web_objects):
+        """
+        The method records the results pages and the documents of the committed
+        filings as seen by the url frontier of their web objects, so that a filing
+        is never skipped by a following crawl unless it is stored in the database.
+
+        """
+        super()._web_objs_committed(web_objects)
+
+        for web_object in web_objects:
+            web_object._mark_reports_seen(self._uncommitted_reports.pop(web_object, []))
+
+    def _web_objs_rolled_back(self, web_objects):
+        """
+        The method releases the url frontier claims on the results pages and the
+        documents of filings that failed to be written, so that they can be fetched
+        and written again.
+
+        """
+        super()._web_objs_rolled_back(web_objects)
+
+        for web_object in web_objects:
+            self._prepared_reports.pop(web_object, None)
+            web_object._release_reports(self._uncommitted_reports.pop(web_object, []))
+
+    def _write_financial_report(self, accession_number, workbook):
+        """
+        The method adds the financial data of a filing’s Financial_Report.xlsx
+        workbook to the database session in long format. The workbook is streamed
+        and written in chunks of rows, each with a single bulk insert, so that the
+        rows of large workbooks are never all held in memory. A workbook that can
+        not be parsed is skipped with a warning rather than failing the write of
+        the filing’s metadata. Each workbook is written within a savepoint, so the
+        chunks of a workbook that fails part way through are rolled back and no
+        partial financial statements are stored.
+
+        Args:
+            accession_number (str): The accession number of the filing.
+
+            workbook (bytes, str or file-like object): The workbook or None if the
+                filing has no workbook.
+
+        """
+        if workbook is None:
+            return
+
+        # Writing the workbook within a savepoint so a workbook failing part way is rolled back:
+        try:
+            with self._db_session.begin_nested():
+                for rows_chunk in iter_financial_report_chunks(workbook, accession_number):
+                    self._db_session.execute(EDGARFinancialDataModel.__table__.insert(), rows_chunk)
+
+        except Exception as error:
+
+            # A missing openpyxl is a configuration error rather than a bad workbook:
+            if isinstance(error, ImportError):
+                raise
+
+            warnings.warn(f"Financial data of filing {accession_number} could not be extracted: {error}")
+
+    def _get_stored_accession_numbers(self, accession_numbers):
+        """
+        The method queries the edgar_filings table for which of a list of accession
+        numbers are already stored. The query is split into chunks so that the
+        number of bound parameters stays within the limits of the database.
+
+        Args:
+            accession_numbers (list): The accession numbers to search for.
+
+        Returns:
+            set: The accession numbers that are already stored in the database.
+
+        """
+        stored_accession_numbers = set()
+        for chunk_start in range(0, len(accession_numbers), 500):
+
+            accession_chunk = accession_numbers[chunk_start:chunk_start + 500]
+            stored_accession_numbers.update(
+                row[0] for row in self._db_session.execute(
+                    select([EDGARFilingModel.accession_number]).where(
+                        EDGARFilingModel.accession_number.in_(accession_chunk))))
+
+        return stored_accession_numbers
+
+    def _get_company_watermark(self, cik):
+        """
+        The method returns the high-water mark of a company: the date of the latest
+        filing of the company that is stored in the database.
+
+        Args:
+            cik (str): The Central Index Key of the company.
+
+        Returns:
+            datetime.date: The date of the latest stored filing or None if no filings
+                of the company are stored.
+
+        """
+        watermark_row = self._db_session.query(
+            EDGARCompanyWatermarkModel).filter_by(cik=cik).first()
+
+        return watermark_row.latest_filing_date if watermark_row is not None else None
+
+    def _complete_company_crawl(self, cik):
+        """
+        The method raises the high-water mark of a company to the date of its latest
+        stored filing and commits it. It is called once a crawl of the company has
+        been written up to the previous mark or the last page of results (see
+        EDGARResultsPageCrawler._crawl_complete), as only then are all the filings
+        between the previous mark and the latest filing stored.
+
+        Args:
+            cik (str): The Central Index Key of the company.
+
+        Returns:
+            datetime.date: The high-water mark of the company or None if no filings
+                of the company are stored.
+
+        """
+        with self._write_lock:
+            try:
+                latest_filing_date = self._db_session.query(
+                    func.max(EDGARFilingModel.filing_date)).filter(EDGARFilingModel.cik == cik).scalar()
+
+                if latest_filing_date is not None:
+                    self._update_company_watermark(cik, latest_filing_date, datetime.datetime.now())
+
+                self._db_session.commit()
+
+            except Exception:
+                self._db_session.rollback()
+                raise
+
+        return self._get_company_watermark(cik)
+
+    def _update_company_watermark(self, cik, filing_date, last_updated):
+        """
+        The method raises the high-water mark of a company to a filing date, adding
+        the change to the database session. The mark is never lowered, so ingesting
+        an older results page does not move it backwards.
+
+        Args:
+            cik (str): The Central Index Key of the company.
+
+            filing_date (datetime.date): The date of the latest stored filing.
+
+            last_updated (datetime.datetime): The datetime the mark is raised.
+
+        """
+        watermark_row = self._db_session.query(
+            EDGARCompanyWatermarkModel).filter_by(cik=cik).first()
+
+        if watermark_row is None:
+            self._db_session.add(EDGARCompanyWatermarkModel(
+                cik = cik,
+                latest_filing_date = filing_date,
+                last_updated = last_updated))
+
+        elif watermark_row.latest_filing_date is None or filing_date > watermark_row.latest_filing_date:
+            watermark_row.latest_filing_date = filing_date
+            watermark_row.last_updated = last_updated
+
+    def _search_filing_text(self, query, limit=10):
+        """
+        The method searches the full-text index over the text of the stored filings
+        and returns the matching filings ranked by relevance. See search_filing_text()
+        for the query syntax.
+
+        Args:
+            query (str): The full-text search query.
+
+            limit (int): The maximum number of filings returned. Defaults to 10.
+
+        Returns:
+            pandas dataframe: The matching filings with the columns accession_number,
+                cik, filing, filing_date, rank and snippet.
+
+        """
+        if not self._full_text_index:
+            raise ValueError("The Ingestion Engine was not initialized with full_text_index=True")
+
+        return search_filing_text(self._sqlaengine, query, limit=limit)
+
+    @staticmethod
+    def _null_nan(value):
+        """Converts the 'NaN' placeholder used by the web objects into a database null."""
+        return None if value is None or value == 'NaN' else value
+
+    def _get_validation_status(self, obj):
+        '''
+        The validation method is extended from the Base Ingestion Engine to only
+        validate instances of the EDGARResultsPageResponse() object.
+
+        Args:
+
+            obj (object): The object that is being validated.
+
+        Returns:
+
+            int: The status code generated by the object parameter.
+
+        '''
+        if isinstance(obj, EDGARResultsPageResponse):
+            return 20
+
+        else:
+            return 10
+
+class EDGARFullIndexIngestionEngine(BaseWebPageIngestionEngine):
+    """
+    The EDGARFullIndexIngestionEngine bulk loads the records of EDGAR full-index
+    files (company.idx, form.idx or master.idx, see full_index_sec_edgar) into the
+    edgar_filing_index table (EDGARFilingIndexModel).
+
+    Like the StockDataSummaryIngestionEngine it does not ingest WebPageResponse
+    objects: the *args of WebPageResponseObjs are the paths of index files on local
+    disk (eg: files cached by get_full_index_file()). Each file is parsed as a stream
+    of records and written in chunks with one bulk insert (executemany) per chunk,
+    so a quarter's index of hundreds of thousands of filings is never held in memory
+    and never written one ORM instance at a time. Records that are already stored are
+    ignored by the database, so re-loading an index file (eg: the file of the current
+    quarter as it grows) only adds its new records.
+
+    Once a quarter is loaded, the filings of a company (or of a form type) are found
+    with the indexed _lookup_filings() query instead of by crawling results pages.
+    The methods from the BaseDataIngestionEngine that are overwritten are:
+
+    * _add_session_web_obj
+    * _get_validation_status
+
+    Args:
+
+        db_uri (str): The string URI for the database to be connected to. It is
+            used to initialize the SQLAlchemy database engine.
+
+        WebPageResponseObjs (str): Arguments that are the paths of EDGAR full-index
+            files, optionally gzipped.
+
+        kwargs (dictionary): Optional key-word arguments passed to the
+            BaseWebPageIngestionEngine (eg: single_writer) as well as:
+
+            * chunk_size (int): The number of records written per bulk insert.
+                Defaults to 10000.
 
     Attributes:
-        # TODO: Add attributes
+
+            _WebPageResponseObjs (list): The list of index file paths to be ingested.
+
+            _db_uri (str): The URI of the database used to initialize the SQLA engine.
+
+            _sqlaengine (sqlalchemy.engine.Engine): The SQLAlchemy engine object that
+                is used to represent and interact with the database.
+
+            _db_session (sqlalchemy.orm.session.Session): A persistent database
+                connection to the database binded to the database engine via the
+                _sqlaengine parameter.
+
+            _chunk_size (int): The number of records written per bulk insert.
 
     """
-    pass
+    def __init__(self, db_uri, *WebPageResponseObjs, **kwargs):
+
+        # Declaring the index specific configuration kwargs:
+        self._chunk_size = max(1, kwargs.pop('chunk_size', 10000))
+
+        # Initalizing the Parent BaseWebPageIngestionEngine object:
+        super().__init__(db_uri, *WebPageResponseObjs, **kwargs)
+
+        # Creating all tables associated with the SQLAlchemy Base Database Model:
+        Base.metadata.create_all(self._sqlaengine)
+
+    def _add_session_web_obj(self, web_object):
+        """
+        The method streams the records of an index file into the database session
+        in chunks, each written with a single bulk insert that ignores records that
+        are already stored. The records are committed by the parent method
+        “_write_web_objects”.
+
+        Args:
+            web_object (str): The path of the index file. It is validated.
+
+        """
+        # Ensuring that the index file has been validated:
+        if self._validation_dict[web_object] > 10:
+
+            index_insert = self._get_index_insert()
+            index_records = iter_full_index_records(web_object)
+
+            while True:
+                records_chunk = list(itertools.islice(index_records, self._chunk_size))
+                if not records_chunk:
+                    break
+
+                self._db_session.execute(index_insert, records_chunk)
+
+        else:
+            raise ValueError(f"Object {web_object} Was Not Added to Session due to Validation Error")
+
+    def _get_index_insert(self):
+        """
+        The method builds the bulk insert statement of the edgar_filing_index table
+        that ignores records whose primary key is already stored, using the syntax
+        of the connected database (INSERT OR IGNORE for SQLite, INSERT IGNORE for
+        MySQL and ON CONFLICT DO NOTHING for PostgreSQL).
+
+        Returns:
+            sqlalchemy.sql.expression.Insert: The insert statement.
+
+        """
+        index_table = EDGARFilingIndexModel.__table__
+
+        if self._sqlaengine.dialect.name == 'postgresql':
+            return postgresql_insert(index_table).on_conflict_do_nothing()
+
+        return index_table.insert().prefix_with('OR IGNORE', dialect='sqlite').prefix_with('IGNORE', dialect='mysql')
+
+    def _lookup_filings(self, cik=None, form_type=None, start_date=None, end_date=None, limit=None):
+        """
+        The method queries the edgar_filing_index table for the filings of a company
+        and/or form type within a date range, newest first. Queries by company or
+        form type are served by the indexes of the table.
+
+        Args:
+            cik (str or int): The Central Index Key of the company. It is zero padded.
+
+            form_type (str): The form type of the filings (eg: '10-K').
+
+            start_date (datetime.date): The earliest filing date included.
+
+            end_date (datetime.date): The latest filing date included.
+
+            limit (int): The maximum number of filings returned.
+
+        Returns:
+            pandas dataframe: The matching records with the columns of the
+                edgar_filing_index table.
+
+        """
+        index_table = EDGARFilingIndexModel.__table__
+        index_query = select([index_table])
+
+        if cik is not None:
+            index_query = index_query.where(index_table.c.cik == str(cik).zfill(10))
+
+        if form_type is not None:
+            index_query = index_query.where(index_table.c.form_type == form_type)
+
+        if start_date is not None:
+            index_query = index_query.where(index_table.c.date_filed >= start_date)
+
+        if end_date is not None:
+            index_query = index_query.where(index_table.c.date_filed <= end_date)
+
+        index_query = index_query.order_by(index_table.c.date_filed.desc(), index_table.c.accession_number.desc())
+        if limit is not None:
+            index_query = index_query.limit(limit)
+
+        with self._sqlaengine.connect() as db_con:
+            return pd.read_sql(index_query, db_con, parse_dates=['date_filed'])
+
+    def _get_validation_status(self, obj):
+        '''
+        The validation method validates the paths of existing files.
+
+        Args:
+
+            obj (object): The object that is being validated.
+
+        Returns:
+
+            int: The status code generated by the object parameter.
+
+        '''
+        if isinstance(obj, str) and os.path.isfile(obj):
+            return 20
+
+        else:
+            return 10
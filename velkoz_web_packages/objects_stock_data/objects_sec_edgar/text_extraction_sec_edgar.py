@@ -0,0 +1,256 @@
+# Importing native packages:
+import os
+import sys
+import time
+import zlib
+import codecs
+import argparse
+from html.parser import HTMLParser
+from concurrent.futures import ProcessPoolExecutor
+
+"""
+The script contains the methods used to store and extract the text of EDGAR
+report documents (10-K, 10-Q etc). Report documents are tens of MB of html so
+instead of storing parsed BeautifulSoup trees, report documents are stored as
+zlib compressed bytes and their text is extracted on demand by streaming the
+decompressed html through an event based html parser. At no point is the full
+document tree (or even the full decompressed document) held in memory.
+
+Text extraction is pure CPU work that holds the GIL, so the text of several
+reports is extracted in parallel by a pool of processes via extract_report_texts().
+Only the compressed bytes of each report are sent to the worker processes and
+only the extracted text is sent back.
+
+Running the script benchmarks extraction on a directory of saved report documents:
+
+python -m velkoz_web_packages.objects_stock_data.objects_sec_edgar.text_extraction_sec_edgar <report_dir> --workers 1 2 4
+
+"""
+
+# The tags whose contents are not part of the text of a report:
+_IGNORED_TAGS = {"script", "style", "head", "title"}
+
+# The tags that start a new line of text when they are opened or closed:
+_BLOCK_TAGS = {
+    "p", "div", "br", "tr", "td", "th", "li", "ul", "ol", "table", "h1", "h2",
+    "h3", "h4", "h5", "h6", "hr", "section", "article", "body", "html", "pre",
+    "blockquote", "dd", "dt", "center"}
+
+# The size of the chunks that documents are decompressed and parsed in:
+_CHUNK_SIZE = 64 * 1024
+
+class _ReportTextParser(HTMLParser):
+    """
+    The event based html parser that collects the text of a report document as
+    it is fed. Text within inline tags (span, font, a etc) is joined into the
+    current line and a new line is started at each block level tag, with the
+    whitespace of each line collapsed in the same manner as a browser.
+
+    Attributes:
+        _lines (list): The completed lines of text.
+
+        _line_buffer (list): The fragments of text of the current line.
+
+        _ignored_depth (int): The number of currently open ignored tags.
+
+    """
+    def __init__(self):
+
+        super().__init__(convert_charrefs=True)
+        self._lines = []
+        self._line_buffer = []
+        self._ignored_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+
+        if tag in _IGNORED_TAGS:
+            self._ignored_depth += 1
+
+        elif tag in _BLOCK_TAGS:
+            self._flush_line()
+
+    def handle_startendtag(self, tag, attrs):
+
+        if tag in _BLOCK_TAGS:
+            self._flush_line()
+
+    def handle_endtag(self, tag):
+
+        if tag in _IGNORED_TAGS:
+            self._ignored_depth = max(0, self._ignored_depth - 1)
+
+        elif tag in _BLOCK_TAGS:
+            self._flush_line()
+
+    def handle_data(self, data):
+
+        if self._ignored_depth == 0:
+            self._line_buffer.append(data)
+
+    def _flush_line(self):
+
+        line = " ".join("".join(self._line_buffer).split())
+        if line:
+            self._lines.append(line)
+
+        self._line_buffer = []
+
+    def get_text(self):
+        """Returns the text collected so far, one line per block of the document."""
+        self._flush_line()
+        return "\n".join(self._lines)
+
+def compress_report(report_html):
+    """
+    The method compresses the raw html of a report document for storage.
+
+    Args:
+        report_html (bytes): The raw html of the report document.
+
+    Returns:
+        bytes: The zlib compressed html.
+
+    """
+    return zlib.compress(report_html, 6)
+
+def decompress_report(compressed_report):
+    """
+    The method decompresses a report document compressed by compress_report().
+
+    Args:
+        compressed_report (bytes): The zlib compressed html.
+
+    Returns:
+        bytes: The raw html of the report document.
+
+    """
+    return zlib.decompress(compressed_report)
+
+def extract_report_text(report_html, compressed=True, encoding="utf-8"):
+    """
+    The method extracts the text of a report document without building a document
+    tree. The (compressed) bytes are decompressed, decoded and fed to an event
+    based html parser in chunks, meaning memory use is bounded by the size of the
+    chunks and the extracted text rather than the size of the document.
+
+    Args:
+        report_html (bytes): The html of the report document.
+
+        compressed (bool): Whether the html was compressed by compress_report().
+
+        encoding (str): The character encoding of the html. Undecodable bytes
+            are replaced rather than raising an error.
+
+    Returns:
+        str: The text of the report document with one line per block of html.
+
+    """
+    text_parser = _ReportTextParser()
+    text_decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    decompressor = zlib.decompressobj() if compressed else None
+
+    # Streaming the document through the decompressor, decoder and parser:
+    for chunk_start in range(0, len(report_html), _CHUNK_SIZE):
+
+        html_chunk = report_html[chunk_start:chunk_start + _CHUNK_SIZE]
+        if decompressor is not None:
+            html_chunk = decompressor.decompress(html_chunk, _CHUNK_SIZE * 16)
+
+            # Draining any output the decompressor held back due to the output limit:
+            while html_chunk:
+                text_parser.feed(text_decoder.decode(html_chunk))
+                html_chunk = decompressor.decompress(decompressor.unconsumed_tail, _CHUNK_SIZE * 16)
+
+        else:
+            text_parser.feed(text_decoder.decode(html_chunk))
+
+    if decompressor is not None:
+        text_parser.feed(text_decoder.decode(decompressor.flush()))
+
+    text_parser.feed(text_decoder.decode(b"", final=True))
+    text_parser.close()
+
+    return text_parser.get_text()
+
+def _extract_report_text_worker(report_html):
+    """The worker process entry point of extract_report_texts()."""
+    return extract_report_text(report_html)
+
+def extract_report_texts(report_htmls, max_workers=None):
+    """
+    The method extracts the text of several compressed report documents in
+    parallel using a pool of processes. The order of the texts matches the order
+    of the reports. If only one worker is requested (or there is at most one
+    report) the text is extracted in the calling process, avoiding the cost of
+    starting the pool.
+
+    Args:
+        report_htmls (list): The zlib compressed html of each report document
+            (see compress_report()).
+
+        max_workers (int): The number of worker processes. Defaults to the number
+            of CPUs.
+
+    Returns:
+        list: The text of each report document.
+
+    """
+    report_htmls = list(report_htmls)
+    max_workers = min(max_workers or os.cpu_count() or 1, len(report_htmls))
+
+    if max_workers <= 1:
+        return [extract_report_text(report_html) for report_html in report_htmls]
+
+    # Sending the reports in chunks so that small reports do not cost a round trip each:
+    chunk_size = max(1, len(report_htmls) // (max_workers * 4))
+
+    with ProcessPoolExecutor(max_workers=max_workers) as text_executor:
+        return list(text_executor.map(_extract_report_text_worker, report_htmls, chunksize=chunk_size))
+
+def main(argv=None):
+    """
+    The command line entry point that benchmarks extract_report_texts() on a
+    directory of saved report documents (.htm/.html files), printing the documents
+    extracted per second for each number of worker processes and the speedup over
+    the first number of workers.
+
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark parallel text extraction of a directory of EDGAR report documents.")
+    parser.add_argument("report_dir", help="A directory of .htm/.html report documents.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--repeat", type=int, default=1,
+        help="The number of times each document is extracted (to enlarge small directories).")
+    args = parser.parse_args(argv)
+
+    report_htmls = []
+    for file_name in sorted(os.listdir(args.report_dir)):
+        if file_name.lower().endswith((".htm", ".html")):
+            with open(os.path.join(args.report_dir, file_name), "rb") as report_file:
+                report_htmls.append(compress_report(report_file.read()))
+
+    if not report_htmls:
+        print(f"No .htm/.html report documents found in {args.report_dir}")
+        return 1
+
+    report_htmls = report_htmls * max(1, args.repeat)
+    print(f"Extracting the text of {len(report_htmls)} report documents:")
+
+    # The speedup of each run is relative to the first number of workers:
+    baseline_seconds = None
+    for num_workers in args.workers:
+
+        start_time = time.perf_counter()
+        extract_report_texts(report_htmls, max_workers=num_workers)
+        elapsed_seconds = time.perf_counter() - start_time
+
+        baseline_seconds = baseline_seconds or elapsed_seconds
+        print(
+            f"workers={num_workers:<3} seconds={elapsed_seconds:8.3f} "
+            f"docs/s={len(report_htmls) / elapsed_seconds:9.1f} "
+            f"speedup={baseline_seconds / elapsed_seconds:5.2f}x")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,59 @@
+# Importing native packages:
+import os
+import re
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 # Importing 3-rd party modules:
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 
 # Importing base web objects:
-from base_objects import BaseWebPageResponse, BaseWebPageIngestionEngine
+from velkoz_web_packages.objects_base.web_objects_base import BaseWebPageResponse, RequestRateLimiter
+
+# Importing the EDGAR report storage and text extraction methods:
+from velkoz_web_packages.objects_stock_data.objects_sec_edgar.text_extraction_sec_edgar import compress_report, extract_report_text, extract_report_texts
+
+# The SEC allows no more than 10 requests per second from a single client. This
+# rate limiter is shared by every EDGAR web object by default:
+SEC_RATE_LIMITER = RequestRateLimiter(10)
+
+# The environment variable the User-Agent of requests to the SEC is read from when
+# it is not passed via the headers kwarg (eg: "Sample Company admin@example.com"):
+SEC_USER_AGENT_ENV = "VELKOZ_SEC_USER_AGENT"
+
+def get_sec_headers(headers=None):
+    """
+    The method returns the headers of requests made to the SEC. The SEC requires
+    automated clients to declare themselves via a User-Agent header containing
+    the name and contact email of the client, and blocks requests that do not.
+    There is no default User-Agent: it is taken from the headers passed or, if
+    they do not contain one, from the VELKOZ_SEC_USER_AGENT environment variable.
+
+    Args:
+        headers (dict): The headers passed by the user of the library or None.
+
+    Returns:
+        dict: A copy of the headers containing a User-Agent.
+
+    Raises:
+        ValueError: If no User-Agent is passed and the environment variable is not set.
+
+    """
+    headers = dict(headers or {})
+    if not any(header_name.lower() == 'user-agent' and header_value for header_name, header_value in headers.items()):
+
+        user_agent = os.environ.get(SEC_USER_AGENT_ENV, '').strip()
+        if not user_agent:
+            raise ValueError(
+                "The SEC requires a User-Agent with your contact information (eg: 'Sample Company admin@example.com'). "
+                f"Pass it via the headers kwarg or set the {SEC_USER_AGENT_ENV} environment variable.")
+
+        headers['User-Agent'] = user_agent
+
+    return headers
 
 class EDGARResultsPageResponse(BaseWebPageResponse):
     """
@@ -17,7 +66,64 @@ class EDGARResultsPageResponse(BaseWebPageResponse):
     CIK# to url API. The Attributes listed below are the additional attributes
     that are added to the Base class BaseWebPageResponse.
 
+    Each row of the search results table links to further pages containing the
+    full report document and its interactive data. By default only the metadata
+    and hrefs of each filing are extracted, so listing a company’s filings costs
+    a single request. The documents of a single filing (or a selected subset of
+    filings) are fetched on demand via the _get_report() and _get_reports()
+    methods and cached within the object. Subsets are requested concurrently by a
+    bounded pool of threads. Every request made by the object (including the
+    initial results page) waits on a shared RequestRateLimiter so that the SEC’s
+    limit on requests per second is respected no matter how many threads or
+    objects are sending requests.
+
+    Report documents are large so they are not stored as parsed BeautifulSoup
+    trees. The raw html of each report is stored zlib compressed and its text is
+    only extracted (by streaming the html through an event based parser) when it
+    is requested via the _get_report_text() method, after which it is cached.
+    When the text of several reports is requested at once via _get_reports() it
+    is extracted in parallel by a pool of processes.
+
+    Args:
+        url (str): The url of the EDGAR search results page
+            (eg: 'https://www.sec.gov/cgi-bin/browse-edgar').
+
+        kwargs (dictionary): Optional arguments passed to the BaseWebPageResponse
+            (params, headers, rate_limiter) as well as:
+
+            * headers (dict): The headers of every request. They must contain a
+                User-Agent with the contact information of the client unless the
+                VELKOZ_SEC_USER_AGENT environment variable is set (see get_sec_headers()).
+            * sec_base_url (str): The root url that hrefs extracted from EDGAR
+                pages are appended to. Defaults to 'https://www.sec.gov'. It is
+                mainly overwritten to test the object against locally served pages.
+            * max_workers (int): The maximum number of threads fetching per-filing
+                pages concurrently. Defaults to 4.
+            * url_frontier (URLFrontier): A crawl frontier shared by the web objects
+                of a crawl. The results page and the documents of a filing are only
+                fetched if the frontier has not claimed or seen them already (eg: a
+                filing listed by several companies, or written by a previous run of
+                a resumed crawl). A skipped results page has no filings.
+            * text_workers (int): The number of processes extracting the text of
+                reports in parallel in _get_reports(). Defaults to the number of CPUs.
+            * fetch_reports (bool): Whether the documents of every filing are
+                fetched when the object is initialized and added to the _reports_tbl
+                as columns. Defaults to False.
+
     Attributes:
+        _sec_base_url (str): The root url that extracted hrefs are appended to.
+
+        _max_workers (int): The maximum number of concurrent per-filing fetches.
+
+        _text_workers (int): The number of text extraction processes or None.
+
+        _cik (str): The Central Index Key of the company, extracted from the
+            company information block of the results page (or the CIK param if
+            the block is not found). 'NaN' if neither is available.
+
+        _company_name (str): The name of the company extracted from the company
+            information block of the results page.
+
         _addr_business (str): A string representing the Business Address of the
             company extracted from the BeautifulSoup object via the
             __extract_address() method.
@@ -26,37 +132,347 @@ class EDGARResultsPageResponse(BaseWebPageResponse):
             company extracted from the BeautifulSoup object via the
             __extract_address() method.
 
-        _reports_tbl (pandas dataframe): A dataframe containing all the contents
-            that were extracted from the main search results table on the EDGAR
+        _reports_tbl (pandas dataframe): A dataframe containing the metadata of
+            each filing extracted from the main search results table on the EDGAR
             company reports page. The dataframe contains the following columns:
 
-            ---------------------------------------------------------------------------------------------------------
-            |filing|filing_description|filing_date|file_id|report_contents_html|report_contents_txt|report_data_href|
-            |------------------------------------------------------------------|-------------------|----------------|
-            |  str |        str       |     str   |  str  |BeautifulSoup Object|         str       |       str      |
-            ---------------------------------------------------------------------------------------------------------
+            ------------------------------------------------------------------------------------------------
+            |filing|filing_description|filing_date|file_id|accession_number|documents_href|data_page_href|
+            |------|------------------|-----------|-------|----------------|--------------|--------------|
+            |  str |        str       |     str   |  str  |       str      |      str     |   str/None   |
+            ------------------------------------------------------------------------------------------------
+
+            If the fetch_reports kwarg is set the documents of each filing are
+            added as the columns:
+
+            --------------------------------------------------------
+            |report_contents_zlib|report_data_href|report_skipped|
+            |--------------------|----------------|--------------|
+            |   bytes/'NaN'      |       str      |     bool     |
+            --------------------------------------------------------
+
+        _reports_cache (dict): The cache of filing documents already fetched
+            via the _get_report() method, keyed by row index of the _reports_tbl.
+
+        _reports_text_cache (dict): The cache of report text already extracted
+            via the _get_report_text() method, keyed by row index of the _reports_tbl.
 
     """
+    # The columns of the metadata of each filing in the _reports_tbl:
+    REPORTS_TBL_COLUMNS = [
+        'filing', 'filing_description', 'filing_date', 'file_id',
+        'accession_number', 'documents_href', 'data_page_href']
 
     def __init__(self, url, **kwargs):
 
-        # Re-deffiing url and kwargs to facilitate pass through to parent object:
-        self.kwargs = kwargs
-        self._url = url
+        # Declaring the SEC request kwargs, a User-Agent is required by the SEC:
+        kwargs['headers'] = get_sec_headers(kwargs.get('headers'))
+        kwargs.setdefault('rate_limiter', SEC_RATE_LIMITER)
+
+        # Declaring the EDGAR specific configuration kwargs:
+        self._sec_base_url = kwargs.pop('sec_base_url', 'https://www.sec.gov').rstrip('/')
+        self._max_workers = max(1, kwargs.pop('max_workers', 4))
+        self._text_workers = kwargs.pop('text_workers', None)
+        fetch_reports = kwargs.pop('fetch_reports', False)
+
+        # Declaring the cache of lazily fetched filing documents:
+        self._reports_cache = {}
+        self._reports_text_cache = {}
+        self._reports_cache_lock = threading.Lock()
 
         # Initalizing the base method:
         super().__init__(url, **kwargs)
 
+        # Parsing the html body of the results page:
+        results_page = BeautifulSoup(self._html_body, 'html.parser')
+
         # Declaring instance variables specific to EDGAR HTML page:
 
         # Company Header Information:
-        self._addr_mail = self.__extract_address()['mailing'] or 'NaN'
-        self._addr_business = self.__extract_address()['business'] or 'NaN'
+        company_info = self.__extract_company_info(results_page)
+        self._cik = company_info['cik']
+        self._company_name = company_info['name']
+
+        company_address = self.__extract_address(results_page)
+        self._addr_mail = company_address['mailing'] or 'NaN'
+        self._addr_business = company_address['business'] or 'NaN'
+
+        # Company Filing Table Information, without filings if the page was skipped by the url frontier:
+        if self._skipped:
+            self._reports_tbl = pd.DataFrame(columns=self.REPORTS_TBL_COLUMNS)
+        else:
+            self._reports_tbl = self.__extract_company_report_data(results_page) # Pandas dataframe
+
+        # Eagerly fetching the documents of every filing if requested:
+        if fetch_reports and not self._skipped:
+            self._reports_tbl = self._get_reports()
+
+    def _get_report(self, filing_index, ignore_frontier=False):
+        '''
+        The method returns the documents of a single filing, fetching them on the
+        first call and returning the cached documents on every following call.
+
+        If the object has a url_frontier the documents page of the filing is
+        claimed before it is fetched. If it has already been claimed (by another
+        object or thread) or seen (by a previous run) the documents are not fetched
+        and the 'report_skipped' key is set. A claimed page is only recorded as
+        seen once the filing is written to a database (see _mark_reports_seen()),
+        so a filing whose write fails is fetched again by the next run.
+
+        Args:
+            filing_index (int): The row index of the filing in the _reports_tbl.
+
+            ignore_frontier (bool): Whether the documents are fetched even if the
+                url_frontier has claimed or seen them, replacing cached documents
+                that were skipped. Defaults to False.
+
+        Returns:
+            dict: The documents of the filing with the keys 'report_contents_zlib'
+                (the zlib compressed html of the report), 'report_data_href' and
+                'report_skipped'. 'NaN' is used for any document that is not found.
+
+        '''
+        with self._reports_cache_lock:
+            cached_documents = self._reports_cache.get(filing_index)
+            if cached_documents is not None and not (ignore_frontier and cached_documents['report_skipped']):
+                return cached_documents
+
+        # Fetching the documents of the filing outside of the lock:
+        filing_row = self._reports_tbl.loc[filing_index]
+        url_frontier = None if ignore_frontier else self._kwargs.get('url_frontier')
+        documents_url = self._get_documents_url(filing_index)
+
+        # Skipping documents that the crawl frontier has already claimed or seen:
+        if url_frontier is not None and documents_url is not None and not url_frontier.claim_url(documents_url):
+            filing_documents = {
+                'report_contents_zlib': 'NaN',
+                'report_data_href': 'NaN',
+                'report_skipped': True}
+
+        else:
+            try:
+                report_contents_zlib, report_data_href = self.__extract_filing_documents(
+                    filing_row['documents_href'], filing_row['data_page_href'])
+
+            except Exception:
+                if url_frontier is not None and documents_url is not None:
+                    url_frontier.release_url(documents_url)
+                raise
+
+            filing_documents = {
+                'report_contents_zlib': report_contents_zlib,
+                'report_data_href': report_data_href,
+                'report_skipped': False}
+
+        with self._reports_cache_lock:
+            cached_documents = self._reports_cache.get(filing_index)
+            if cached_documents is None or (cached_documents['report_skipped'] and not filing_documents['report_skipped']):
+                self._reports_cache[filing_index] = filing_documents
+
+            return self._reports_cache[filing_index]
+
+    def _mark_reports_seen(self, filing_indices):
+        '''
+        The method records the documents pages of a set of filings as seen by the
+        url_frontier of the object, so that they are skipped by every following
+        crawl. It is called by the EDGARPageIngestionEngine once the filings are
+        committed to the database. It does nothing if the object has no url_frontier.
+
+        Args:
+            filing_indices (list): The row indices of the filings in the _reports_tbl.
+
+        '''
+        url_frontier = self._kwargs.get('url_frontier')
+        if url_frontier is None:
+            return
+
+        for filing_index in filing_indices:
+            documents_url = self._get_documents_url(filing_index)
+            if documents_url is not None:
+                url_frontier.mark_seen(documents_url)
+
+    def _release_reports(self, filing_indices):
+        '''
+        The method releases the claims of the url_frontier of the object on the
+        documents pages of a set of filings, so that another object can fetch and
+        write them. It is called by the EDGARPageIngestionEngine when writing the
+        filings fails. It does nothing if the object has no url_frontier.
+
+        Args:
+            filing_indices (list): The row indices of the filings in the _reports_tbl.
+
+        '''
+        url_frontier = self._kwargs.get('url_frontier')
+        if url_frontier is None:
+            return
+
+        for filing_index in filing_indices:
+            documents_url = self._get_documents_url(filing_index)
+            if documents_url is not None:
+                url_frontier.release_url(documents_url)
+
+    def _get_documents_url(self, filing_index):
+        '''Returns the url of the documents page of a filing or None if it has none.'''
+        documents_href = self._reports_tbl.loc[filing_index, 'documents_href']
+
+        return self._sec_base_url + documents_href if documents_href else None
+
+    def _get_report_text(self, filing_index):
+        '''
+        The method returns the text of a filing’s report document, fetching the
+        document if it has not been fetched yet. The text is extracted from the
+        compressed html on the first call and cached.
+
+        Args:
+            filing_index (int): The row index of the filing in the _reports_tbl.
+
+        Returns:
+            str: The text of the report document or 'NaN' if it was not found.
+
+        '''
+        with self._reports_cache_lock:
+            if filing_index in self._reports_text_cache:
+                return self._reports_text_cache[filing_index]
+
+        filing_documents = self._get_report(filing_index)
+
+        # The text of skipped documents is not cached as they may be fetched later:
+        if filing_documents['report_skipped']:
+            return 'NaN'
+
+        report_contents_zlib = filing_documents['report_contents_zlib']
+        if isinstance(report_contents_zlib, bytes):
+            report_contents_txt = extract_report_text(report_contents_zlib) or 'NaN'
+        else:
+            report_contents_txt = 'NaN'
+
+        with self._reports_cache_lock:
+            return self._reports_text_cache.setdefault(filing_index, report_contents_txt)
+
+    def _get_reports(self, filing_indices=None, extract_text=False, ignore_frontier=False):
+        '''
+        The method fetches the documents of a subset of filings concurrently and
+        returns the rows of said filings from the _reports_tbl with the documents
+        added as columns. Filings that were already fetched are read from the cache.
+
+        Args:
+            filing_indices (list): The row indices of the filings in the _reports_tbl.
+                If it is not provided every filing is fetched.
+
+            extract_text (bool): Whether the text of each report is extracted and
+                added as the 'report_contents_txt' column. Reports whose text is
+                not cached are extracted in parallel by a pool of processes.
+                Defaults to False.
+
+            ignore_frontier (bool): Whether the documents of filings are fetched
+                even if the url_frontier has claimed or seen them. See _get_report().
+                Defaults to False.
+
+        Returns:
+            pandas dataframe: The selected rows of the _reports_tbl with the columns
+                'report_contents_zlib', 'report_data_href' and 'report_skipped' (and
+                'report_contents_txt' if extract_text is set).
+
+        '''
+        if filing_indices is None:
+            filing_indices = list(self._reports_tbl.index)
+
+        # Fetching the documents of each filing concurrently (results keep order):
+        with ThreadPoolExecutor(max_workers=self._max_workers) as filing_executor:
+            filing_documents = list(filing_executor.map(
+                functools.partial(self._get_report, ignore_frontier=ignore_frontier), filing_indices))
+
+        filing_documents_df = pd.DataFrame(filing_documents, index=filing_indices)
+        if extract_text:
+
+            # Extracting the text of the uncached reports in parallel:
+            with self._reports_cache_lock:
+                uncached_reports = {
+                    filing_index: filing_document['report_contents_zlib']
+                    for filing_index, filing_document in zip(filing_indices, filing_documents)
+                    if filing_index not in self._reports_text_cache
+                    and isinstance(filing_document['report_contents_zlib'], bytes)}
+
+            report_texts = extract_report_texts(list(uncached_reports.values()), max_workers=self._text_workers)
+
+            with self._reports_cache_lock:
+                for filing_index, report_text in zip(uncached_reports, report_texts):
+                    self._reports_text_cache.setdefault(filing_index, report_text or 'NaN')
+
+            filing_documents_df['report_contents_txt'] = [
+                self._get_report_text(filing_index) for filing_index in filing_indices]
+
+        return pd.concat([self._reports_tbl.loc[filing_indices], filing_documents_df], axis=1)
+
+    def _get_financial_report(self, filing_index):
+        '''
+        The method downloads the Financial_Report.xlsx workbook containing the
+        financial data of a filing. The workbook is not cached as it is expected
+        to be parsed once (see financial_data_sec_edgar) and discarded.
 
-        # Company Filing Table Information:
-        self._reports_tbl = self.__extract_company_report_data() # Pandas dataframe
+        Args:
+            filing_index (int): The row index of the filing in the _reports_tbl.
+
+        Returns:
+            bytes: The content of the workbook or None if the filing has no
+                interactive data.
+
+        '''
+        report_data_href = self._get_report(filing_index)['report_data_href']
+        if report_data_href == 'NaN':
+            return None
+
+        self._kwargs['rate_limiter'].wait()
+
+        return requests.get(report_data_href, headers=self._kwargs['headers']).content
+
+    def _get_sec_page(self, href):
+        '''
+        The method performs a GET request for a page on the SEC website using the
+        headers and rate limiter of the object. It is safe to call from several
+        threads at once.
+
+        Args:
+            href (str): The href of the page relative to the sec_base_url.
+
+        Returns:
+            bytes: The content of the HTTP response.
+
+        '''
+        self._kwargs['rate_limiter'].wait()
+
+        return requests.get(self._sec_base_url + href, headers=self._kwargs['headers']).content
+
+    def __extract_company_info(self, results_page):
+        '''
+        The internal method that parses the main BeautifulSoup object for the
+        <span class='companyName'> tag containing the name and Central Index Key
+        of the company. If the tag is not found the CIK is taken from the 'CIK'
+        param used to request the page.
+
+        Args:
+            results_page (bs4.BeautifulSoup): The parsed EDGAR results page.
+
+        Returns:
+            dict: The dict {'cik', 'name'} of the company, with 'NaN' used for
+                missing values.
+
+        '''
+        company_name_span = results_page.find('span', class_='companyName')
+        company_name_txt = ' '.join(company_name_span.text.split()) if company_name_span is not None else ''
+
+        # The CIK is the 10 digit number following the 'CIK#:' marker:
+        cik_match = re.search(r'CIK#:\s*(\d+)', company_name_txt)
+        if cik_match:
+            cik = cik_match.group(1)
+        else:
+            cik = str((self._kwargs.get('params') or {}).get('CIK', '')) or 'NaN'
 
-    def __extract_address(self):
+        return {
+            'cik': cik.zfill(10) if cik.isdigit() else cik,
+            'name': company_name_txt.split(' CIK#')[0].strip() or 'NaN'}
+
+    def __extract_address(self, results_page):
         '''
         The internal method that parses the main BeautifulSoup object for the
         <div> tags containing the strings of the company's address information.
@@ -65,36 +481,45 @@ class EDGARResultsPageResponse(BaseWebPageResponse):
         concats each of these addresses into a len(2) dictionary as:
         {'mailin_address': mailing_address, 'business_address':business_address}.
 
+        Args:
+            results_page (bs4.BeautifulSoup): The parsed EDGAR results page.
+
         Returns:
             dict: The two length dict containing both the business and mailing address.
 
         '''
 
         # Searching the main soup for the tag <div class='mailer'>:
-        mailer_div_tags = self._html_body.find_all('div', class_='mailer')
+        mailer_div_tags = results_page.find_all('div', class_='mailer')
 
         # Iterating through each of the <div class='mailer'> and concating string
         # via list comprehension: [Mailing Address, Business Address]
         concat_addr_str = [
             ' '.join(mailer_div_tag.text.split()) for mailer_div_tag in mailer_div_tags]
 
+        # Padding missing addresses so that the dict can always be built:
+        concat_addr_str += [''] * (2 - len(concat_addr_str))
+
         # Returning the dict {'mailing', 'business'}:
         return {
             # Formatting address string to remove 'title markers':
-            'mailing': concat_addr_str[0].replace('Mailing Address', ''),
-            'business': concat_addr_str[1].replace('Business Address', '')}
+            'mailing': concat_addr_str[0].replace('Mailing Address', '').strip(),
+            'business': concat_addr_str[1].replace('Business Address', '').strip()}
 
-    def __extract_company_report_data(self):
+    def __extract_company_report_data(self, results_page):
         '''
         Method extracts and pre-processes all the data associated with the
         table of reports filed by the company on the EDGAR web page.
 
-        In addition to extracting the textual data from basic rows: 'Filings',
-        'Filing Date' etc the method also navigates to the pages containing the
-        associated full document in HTML format as well as the summary information
-        provided in the 'Interactive Data' page stored in .csv format. Both the
-        document and the .csv are stored within a pandas dataframe alongside the
-        basic textual data.
+        The method extracts the textual data from the basic rows: 'Filings',
+        'Filing Date' etc as well as the hrefs of the pages containing the
+        associated full document and its 'Interactive Data'. These pages are not
+        requested by this method, they are fetched on demand by the _get_report()
+        and _get_reports() methods. The accession number of each filing is
+        extracted from its description.
+
+        Args:
+            results_page (bs4.BeautifulSoup): The parsed EDGAR results page.
 
         Returns:
             pandas dataframe: The dataframe containing all relevant information
@@ -103,7 +528,7 @@ class EDGARResultsPageResponse(BaseWebPageResponse):
         '''
 
         # Extracting the table from the main webpage soup:
-        html_table = self._html_body.find('table', class_='tableFile2')
+        html_table = results_page.find('table', class_='tableFile2')
 
         # Extracting a list of table row objects <tr> from the table:
         tbl_row_lst = html_table.find_all('tr')
@@ -122,55 +547,32 @@ class EDGARResultsPageResponse(BaseWebPageResponse):
             # Creating list of be populated by each row:
             row_lst = []
 
-            # Building a list of lists for each row in the table [[row_1],... [row_n]]
-            # where each row = [cell_1, cell_2, cell_3, cell_4, str(cell_4), cell_5]:
+            # Building a list of the text cells and document hrefs of each row:
             for table_row in tbl_row_lst:
 
                 # Extracing all cells for each row:
                 table_cells = table_row.find_all('td')
 
-                # Formatting 'Description' Cell:
+                # Formatting 'Description' Cell and extracting the accession number from it:
                 description = " ".join(table_cells[2].text.split())
+                accession_match = re.search(r'Acc-no:\s*([\d-]+)', description)
 
-                # Formatting Filing Data cell:
-                filing_date = table_cells[3].text
-
-                # Formatting File Number:
-                file_num = table_cells[4].text or 'NaN'
-
-                # Extracting the data from the 'Format' cell:
-                format_doc = self.__extract_report_html(
-                    table_cells[1].find('a', id='documentsbutton')['href']) or 'NaN'
+                # Extracting the hrefs of the 'Format' cell:
+                documents_btn = table_cells[1].find('a', id='documentsbutton')
+                interactive_data_btn = table_cells[1].find('a', id='interactiveDataBtn')
 
-                # Attempting to extract only text from format_doc bs4 object:
-                format_doc_txt = format_doc.get_text('/n') or 'NaN'
-
-                # try-catch to get around ['href'] breaking 'or NaN' convention:
-                try:
-                    format_data_interactive = self.__extract_report_csv(
-                        table_cells[1].find('a', id='interactiveDataBtn')['href'])
-
-                except:
-                    format_data_interactive = 'NaN'
-
-                # Creating internal list of cells from table_cells list of len(5):
-                row = [
+                row_lst.append([
                     table_cells[0].text, # 'Filings' cell needs no Formatting
                     description, # The description of the Report
-                    filing_date, # The date the report was filed
-                    file_num, # The SEC internal file number for the report
-                    format_doc, # The full HTML contents of the report.
-                    format_doc_txt, # The textual content of the report.
-                    format_data_interactive # The link to the tabular data of the report
-                    ]
-
-                # Adding row to the list of rows:
-                row_lst.append(row)
+                    table_cells[3].text, # The date the report was filed
+                    table_cells[4].text or 'NaN', # The SEC internal file number for the report
+                    accession_match.group(1) if accession_match else 'NaN', # The unique id of the filing
+                    documents_btn['href'] if documents_btn is not None else None, # The documents page
+                    interactive_data_btn['href'] if interactive_data_btn is not None else None # The data page
+                    ])
 
             # Converting the list of rows into a pandas dataframe:
-            report_df = pd.DataFrame(row_lst, columns=[
-                'filing', 'filing_description', 'filing_date', 'file_id',
-                'report_contents_html', 'report_contents_txt', 'report_data_href'])
+            report_df = pd.DataFrame(row_lst, columns=self.REPORTS_TBL_COLUMNS)
 
             return report_df
 
@@ -178,6 +580,35 @@ class EDGARResultsPageResponse(BaseWebPageResponse):
         else:
             raise AssertionError('Table Headers Do Not Match- EDGAR Reports  table format may have changed')
 
+    def __extract_filing_documents(self, documents_href, interactive_data_href):
+        '''
+        The method fetches the documents of a single filing. It is called by the
+        _get_report() method, concurrently when several filings are requested.
+
+        Args:
+            documents_href (str): The href of the filing’s 'Documents' button.
+
+            interactive_data_href (str): The href of the filing’s 'Interactive Data'
+                button or None if the filing has no interactive data.
+
+        Returns:
+            list: The [report_contents_zlib, report_data_href] of the filing. 'NaN'
+                is used for any document that is not found.
+
+        '''
+        # Extracting the data from the 'Format' cell and compressing it for storage:
+        format_doc = self.__extract_report_html(documents_href) if documents_href else None
+        format_doc = compress_report(format_doc) if format_doc else 'NaN'
+
+        # try-catch to get around missing interactive data breaking 'or NaN' convention:
+        try:
+            format_data_interactive = self.__extract_report_csv(interactive_data_href) if interactive_data_href else 'NaN'
+
+        except:
+            format_data_interactive = 'NaN'
+
+        return [format_doc, format_data_interactive]
+
     def __extract_report_html(self, report_href):
         '''
         A method that takes the href to the full report document extracted by the
@@ -187,8 +618,9 @@ class EDGARResultsPageResponse(BaseWebPageResponse):
         The href parameter routes to the Document Format Files page. The method
         navigates to the href on said page that leads to the report, displayed in
         the SEC's Inline XBRL Viewer. It manipulates the href into a direct link
-        to the html version of the report. This html page is extracted and returned
-        as a bs4 object.
+        to the html version of the report. The raw html of this page is returned
+        unparsed, as parsing a full report into a bs4 object is expensive and the
+        tree is never needed.
 
         Args:
             report_href (str): The href extracted from a previous bs4 object in
@@ -197,15 +629,11 @@ class EDGARResultsPageResponse(BaseWebPageResponse):
                 the SEC's Inline XBRL Viewer.
 
         Returns:
-            BeautifulSoup obj: A bs4 object containing all the html contents of the
-                report.
+            bytes: The raw html contents of the report.
         '''
 
-        # Appending href onto core url to make funcional url:
-        doc_selector_url = 'https://www.sec.gov' + report_href
-
         # Sending GET request to new webpage and converting contents to bs4 object:
-        docs_page = BeautifulSoup(requests.get(doc_selector_url).content, 'html.parser')
+        docs_page = BeautifulSoup(self._get_sec_page(report_href), 'html.parser')
 
         # Extracting the <table summary = 'Document Format Files'> from the page:
         doc_format_table = docs_page.find('table', summary='Document Format Files')
@@ -220,18 +648,16 @@ class EDGARResultsPageResponse(BaseWebPageResponse):
         if table_header == ['Seq', 'Description', 'Document', 'Type', 'Size']:
 
             # Extracting the href from the second cell of Row 2 of the table:
-            document_url = 'https://www.sec.gov' + table_rows[1].find('a')['href']
+            document_href = table_rows[1].find('a')['href']
 
             # Dropping the '/ix?doc=' from the href if it is there so that only HTML
             # content is returned:
-            if '/ix?doc=' in document_url:
-                document_url = document_url.replace('/ix?doc=', '')
-
-            # Performing a GET request for the full report in HTML:
-            report_response = requests.get(document_url)
+            if '/ix?doc=' in document_href:
+                document_href = document_href.replace('/ix?doc=', '')
 
-            # returning the bs4 object of the HTTP response's content:
-            return BeautifulSoup(report_response.content, 'html.parser')
+            # Performing a GET request for the full report in HTML and returning
+            # the raw content of the HTTP response:
+            return self._get_sec_page(document_href)
 
         else:
             raise AssertionError('The Table Header for Document Format Files Failed. The Layout May have changed')
@@ -255,20 +681,164 @@ class EDGARResultsPageResponse(BaseWebPageResponse):
 
         '''
 
-        # Building a full url to the 'filing Data' page:
-        filing_data_url = 'https://www.sec.gov' + report_csv_href
-
         # Sending GET request to the page and converting contents to bs4 object:
-        filing_data_page = BeautifulSoup(requests.get(filing_data_url).content,
-            'html.parser')
+        filing_data_page = BeautifulSoup(self._get_sec_page(report_csv_href), 'html.parser')
 
         # Parsing the filing data page for the .xlsx download href:
         # Assumes only two <a class='xbrlviewer'> on page:
         xlsx_href =  filing_data_page.find_all('a', class_='xbrlviewer')[1]['href']
 
         # Creating and returning the download url for the .xlsx file:
-        return 'https://www.sec.gov' + xlsx_href
+        return self._sec_base_url + xlsx_href
+
+class EDGARResultsPageCrawler(object):
+    """
+    The EDGARResultsPageCrawler walks the paginated EDGAR search results of a
+    company in order (newest filings first), initializing an EDGARResultsPageResponse
+    for each page of results via the 'start' and 'count' params.
+
+    Rather than building one dataframe of a company’s full filing history, the
+    crawler exposes iterators over the pages and the filings of the company. While
+    the filings of one page are being consumed, the next page is fetched and parsed
+    in a background thread. Crawling stops at the first page that is not full (the
+    last page of results), at the max_pages limit or once a filing older than the
+    watermark is reached, meaning that crawling a company whose filings are already
+    stored up to the watermark (see EDGARPageIngestionEngine._get_company_watermark())
+    only requests the pages containing its new filings.
+
+    If the pages share a url_frontier (passed with the page kwargs) a page already
+    claimed or seen by the frontier is skipped without being requested and the
+    crawl continues with the next page, so a resumed crawl only requests the pages
+    it did not write. Whether the last crawl reached the watermark or the last page
+    of results (rather than the max_pages limit) is recorded in the _crawl_complete
+    attribute. The
+    high-water mark of the company should only be raised once such a complete
+    crawl is written (see EDGARPageIngestionEngine._complete_company_crawl()).
+
+    Args:
+        url (str): The url of the EDGAR search results page
+            (eg: 'https://www.sec.gov/cgi-bin/browse-edgar').
+
+        kwargs (dictionary): Optional arguments passed to each EDGARResultsPageResponse
+            (params, headers, rate_limiter, sec_base_url, max_workers) as well as
+            the following. A ValueError is raised when the crawler is initialized
+            if no User-Agent is available (see get_sec_headers()).
+
+            * count (int): The number of filings requested per page. Defaults to 40.
+            * max_pages (int): The maximum number of pages crawled. Defaults to None
+                (no limit).
+
+    Attributes:
+        _url (str): The url of the EDGAR search results page.
+
+        _params (dict): The params of the search that the pagination params are added to.
+
+        _count (int): The number of filings requested per page.
+
+        _max_pages (int): The maximum number of pages crawled or None.
+
+        _page_kwargs (dict): The kwargs used to initialize each EDGARResultsPageResponse.
+
+        _crawl_complete (bool): Whether the last page yielded by the last crawl
+            reached the watermark or the last page of results.
+
+    """
+    def __init__(self, url, **kwargs):
+
+        self._url = url
+        kwargs['headers'] = get_sec_headers(kwargs.get('headers'))
+        self._count = kwargs.pop('count', 40)
+        self._max_pages = kwargs.pop('max_pages', None)
+        self._params = dict(kwargs.pop('params', None) or {})
+        self._page_kwargs = kwargs
+        self._crawl_complete = False
+
+    def iter_pages(self, watermark=None):
+        """
+        The method returns an iterator over the results pages of the company. Each
+        page after the first is fetched in a background thread while the previous
+        page is being consumed.
+
+        Args:
+            watermark (datetime.date): The date of the latest filing that is already
+                known. Pages after the first page containing a filing older than the
+                watermark are not requested. Defaults to None (every page is crawled).
+
+        Yields:
+            EDGARResultsPageResponse: The results pages of the company in order.
+
+        """
+        watermark = pd.Timestamp(watermark) if watermark is not None else None
+        self._crawl_complete = False
+
+        with ThreadPoolExecutor(max_workers=1) as page_executor:
+
+            page_num = 0
+            page_future = page_executor.submit(self._get_results_page, 0)
+
+            while page_future is not None:
+
+                results_page = page_future.result()
+                page_future = None
+                page_num += 1
+
+                # Determining if there is a next page to prefetch before consuming this page (skipped pages have no filings):
+                filing_dates = pd.to_datetime(results_page._reports_tbl['filing_date'], errors='coerce')
+                page_is_full = results_page._skipped or len(filing_dates) >= self._count
+                reached_watermark = watermark is not None and (filing_dates < watermark).any()
+                below_max_pages = self._max_pages is None or page_num < self._max_pages
+
+                if page_is_full and below_max_pages and not reached_watermark:
+                    page_future = page_executor.submit(self._get_results_page, page_num * self._count)
+
+                # Recording whether this page ends the crawl at the watermark or the last page of results:
+                self._crawl_complete = not page_is_full or reached_watermark
+
+                yield results_page
+
+    def iter_filings(self, watermark=None):
+        """
+        The method returns an iterator over the filings of the company, newest first.
+        The documents of each filing are not fetched; they can be fetched on demand
+        via the _get_report() method of the page the filing belongs to.
+
+        Args:
+            watermark (datetime.date): The date of the latest filing that is already
+                known. Filings older than the watermark are not yielded and crawling
+                stops once one is reached. Filings made on the watermark date are
+                yielded as they may not all have been stored.
+
+        Yields:
+            tuple: The (EDGARResultsPageResponse, filing_index) of each filing, where
+                filing_index is the row index of the filing in the page’s _reports_tbl.
+
+        """
+        watermark = pd.Timestamp(watermark) if watermark is not None else None
+
+        for results_page in self.iter_pages(watermark):
+
+            filing_dates = pd.to_datetime(results_page._reports_tbl['filing_date'], errors='coerce')
+            for filing_index, filing_date in filing_dates.items():
+
+                if watermark is not None and filing_date < watermark:
+                    return
+
+                yield results_page, filing_index
+
+    def _get_results_page(self, start):
+        """
+        The method initializes the EDGARResultsPageResponse of a single page of results.
+
+        Args:
+            start (int): The offset of the first filing of the page.
+
+        Returns:
+            EDGARResultsPageResponse: The results page.
+
+        """
+        page_params = dict(self._params, start=start, count=self._count)
 
+        return EDGARResultsPageResponse(self._url, params=page_params, **self._page_kwargs)
 
 
 # Test:
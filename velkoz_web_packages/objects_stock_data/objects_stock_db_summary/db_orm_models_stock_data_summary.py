@@ -25,6 +25,10 @@ class NASDAQStockDataSummaryModel(Base):
         ticker (sqlalchemy.Column): The model parameter associated with the ticker
             column in the database. This is the primary key for the database.
 
+        symbol_id (sqlalchemy.Column): The integer id of the ticker in the symbols
+            dimension table (see SymbolModel), used to join the summary to the
+            tables that reference tickers by id.
+
         price_tbl (sqlalchemy.Column): The parameter associated with the 'price_tbl'
             column in the database. If no data table is found in the database that
             contains price data for a specific ticker is found then a 'NaN' value
@@ -50,6 +54,12 @@ class NASDAQStockDataSummaryModel(Base):
         primary_key = True,
         index = True)
 
+    symbol_id = Column(
+        'symbol_id',
+        Integer,
+        nullable = True,
+        index = True)
+
     price_tbl = Column(
         'price_tbl',
         String(20),
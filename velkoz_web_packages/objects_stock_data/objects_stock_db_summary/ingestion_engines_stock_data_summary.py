@@ -8,9 +8,13 @@ from velkoz_web_packages.objects_base.ingestion_engines_base import BaseWebPageI
 
 # Importing the SQLAlchemy database model and model base:
 from velkoz_web_packages.objects_stock_data.objects_stock_db_summary.db_orm_models_stock_data_summary import Base, NASDAQStockDataSummaryModel
+from velkoz_web_packages.objects_stock_data.objects_fund_holdings.db_orm_models_fund_holdings import FundHoldingsModel, FundHoldingsDigestModel
+from velkoz_web_packages.objects_stock_data.objects_fund_holdings.ingestion_engines_fund_holdings import migrate_ticker_keyed_holdings
+from velkoz_web_packages.objects_stock_data.objects_symbols.db_orm_models_symbols import SymbolModel
+from velkoz_web_packages.objects_stock_data.objects_symbols.symbol_registry import SymbolRegistry
 
 # Importing thrid party packages:
-from sqlalchemy import create_engine, MetaData, Column, String, DateTime, Integer, inspect
+from sqlalchemy import create_engine, MetaData, Column, String, DateTime, Integer, inspect, select, text, bindparam
 from sqlalchemy.orm import sessionmaker, Session, scoped_session
 import yfinance as yf
 
@@ -38,6 +42,7 @@ class StockDataSummaryIngestionEngine(BaseWebPageIngestionEngine):
     It does extend the BaseWebPageIngestionEngine and overwrites these methods:
 
     * _write_web_objects
+    * _flush_web_obj_batch
     * _add_session_web_obj
     * _get_validation_status
 
@@ -53,6 +58,9 @@ class StockDataSummaryIngestionEngine(BaseWebPageIngestionEngine):
             of stocks whose tickers are already being maintained within the
             connected databae.
 
+        kwargs (dictionary): Optional key-word arguments passed to the
+            BaseWebPageIngestionEngine (eg: single_writer).
+
     Attributes:
 
             _WebPageResponseObjs (list): A list of arguments that are assumed (and type
@@ -73,11 +81,59 @@ class StockDataSummaryIngestionEngine(BaseWebPageIngestionEngine):
                 connection to the database binded to the database engine via the
                 _sqlaengine parameter.
 
+            _symbol_registry (SymbolRegistry): The registry mapping the ticker
+                symbols to their integer ids in the symbols table.
+
     """
-    def __init__(self, db_uri, *WebPageResponseObjs):
+    def __init__(self, db_uri, *WebPageResponseObjs, **kwargs):
 
         # Initalizing parent Ingestion Engine:
-        super().__init__(db_uri, *WebPageResponseObjs)
+        super().__init__(db_uri, *WebPageResponseObjs, **kwargs)
+
+        self._symbol_registry = SymbolRegistry(self._sqlaengine)
+
+        # Migrating the summary and holdings tables written before symbol ids existed:
+        self._add_symbol_id_column()
+        migrate_ticker_keyed_holdings(self._sqlaengine, self._symbol_registry)
+
+    def _add_symbol_id_column(self):
+        """
+        The method adds the symbol_id column (and its index) to a summary table
+        written before the column was part of the NASDAQStockDataSummaryModel, as
+        create_all() does not alter existing tables. The symbol ids of the tickers
+        already in the table are registered and filled in, in the same transaction.
+        It does nothing if the table does not exist or already has the column.
+
+        """
+        summary_table = NASDAQStockDataSummaryModel.__table__
+        symbol_id_column = summary_table.c.symbol_id
+
+        with self._sqlaengine.begin() as db_con:
+
+            if not db_con.dialect.has_table(db_con, summary_table.name):
+                return
+
+            if symbol_id_column.name in {column["name"] for column in inspect(db_con).get_columns(summary_table.name)}:
+                return
+
+            quote = db_con.dialect.identifier_preparer.quote
+            db_con.execute(text(
+                f"ALTER TABLE {quote(summary_table.name)} ADD COLUMN {quote(symbol_id_column.name)} "
+                f"{symbol_id_column.type.compile(dialect=db_con.dialect)}"))
+
+            for summary_index in summary_table.indexes:
+                if symbol_id_column.name in summary_index.columns:
+                    summary_index.create(db_con)
+
+            # Filling in the symbol ids of the stored tickers:
+            stored_tickers = [ticker for ticker, in db_con.execute(select([summary_table.c.ticker]))]
+            symbol_ids = self._symbol_registry.get_symbol_ids(stored_tickers, con=db_con)
+
+            if symbol_ids:
+                db_con.execute(
+                    summary_table.update().where(summary_table.c.ticker == bindparam("stored_ticker")).values(
+                        symbol_id=bindparam("stored_symbol_id")),
+                    [{"stored_ticker": ticker, "stored_symbol_id": symbol_id} for ticker, symbol_id in symbol_ids.items()])
 
     def _write_web_objects(self):
         """The method that writes data from the WebPageResponseObj passed into the
@@ -105,23 +161,50 @@ class StockDataSummaryIngestionEngine(BaseWebPageIngestionEngine):
         is called only if their data is sucessfully written to the database.
 
         """
+        # Taking ownership of the ticker strings currently in the que:
+        web_objects = self._take_web_obj_que()
+
         # Performing validation/type checking on the *_WebResponseObj arguments:
-        self._validation_dict = self._validate_args()
+        self._validation_dict = self._validate_args(web_objects)
 
         # Query a list of all table names that exist in the database from new SQLA engine:
         self._existing_db_tables = set(self._sqlaengine.table_names())
+        self._existing_holdings_funds = self._get_existing_holdings_funds(self._existing_db_tables)
 
         # Iterating through the list of web objects adding them to the db session:
-        for web_object in self._WebPageResponseObjs:
+        for web_object_index, web_object in enumerate(web_objects):
+
+            try:
+                with self._write_lock:
+
+                    # Adding them to the database session:
+                    self._add_session_web_obj(web_object)
+
+                    # Writing the web objects to the database.
+                    self._db_session.commit()
 
-            # Adding them to the database session:
-            self._add_session_web_obj(web_object)
+            except Exception:
 
-            # Writing the web objects to the database.
-            self._db_session.commit()
+                # Returning the ticker strings that were not written to the que:
+                self._db_session.rollback()
+                self._return_web_obj_que(web_objects[web_object_index:])
+                raise
 
-        # If all web objects are sucessfully added to the session, purging the que:
-        self._purge_web_obj_que()
+    def _flush_web_obj_batch(self, batch):
+        """The method writes a batch of ticker symbols when the Ingestion Engine is
+        in streaming mode. It is overwritten to refresh the set of existing table
+        names before each batch, in the same manner as _write_web_objects(), so
+        that tables written while streaming are found.
+
+        Args:
+            batch (list): The list of ticker strings to be written.
+
+        """
+        # Query a list of all table names that exist in the database:
+        self._existing_db_tables = set(self._sqlaengine.table_names())
+        self._existing_holdings_funds = self._get_existing_holdings_funds(self._existing_db_tables)
+
+        super()._flush_web_obj_batch(batch)
 
     def _add_session_web_obj(self, web_object):
         """
@@ -166,7 +249,11 @@ class StockDataSummaryIngestionEngine(BaseWebPageIngestionEngine):
             Base.metadata.create_all(self._sqlaengine)
 
             # Searching the existing datbase tables for existing stock data tables:
-            ticker_value_dict = self._search_database_table_set(web_object, self._existing_db_tables)
+            ticker_value_dict = self._search_database_table_set(
+                web_object, self._existing_db_tables, self._existing_holdings_funds)
+
+            # Registering the ticker in the symbols table within the session's transaction:
+            symbol_id = self._symbol_registry.get_symbol_id(web_object, con=self._db_session.connection())
 
             # Querying the database for a potential instance of the data model
             # (database table 'nasdaq_stock_data_summary_tbl' row):
@@ -180,6 +267,7 @@ class StockDataSummaryIngestionEngine(BaseWebPageIngestionEngine):
                 # Initialize db model:
                 ticker_summary_instance = NASDAQStockDataSummaryModel(
                     ticker = web_object,
+                    symbol_id = symbol_id,
                     price_tbl = ticker_value_dict['price_tbl'],
                     holdings_tbl = ticker_value_dict['holdings_tbl'],
                     last_updated = ticker_value_dict['last_updated'])
@@ -191,6 +279,7 @@ class StockDataSummaryIngestionEngine(BaseWebPageIngestionEngine):
             else:
 
                 # Updating parameters for existing database model instance:
+                existing_ticker_row.symbol_id = symbol_id
                 existing_ticker_row.price_tbl = ticker_value_dict['price_tbl']
                 existing_ticker_row.holdings_tbl = ticker_value_dict['holdings_tbl']
                 existing_ticker_row.last_updated = ticker_value_dict['last_updated']
@@ -199,7 +288,31 @@ class StockDataSummaryIngestionEngine(BaseWebPageIngestionEngine):
                 self._db_session.commit()
 
 
-    def _search_database_table_set(self, ticker, tbl_set):
+    def _get_existing_holdings_funds(self, tbl_set):
+        """
+        The method queries the set of funds that have holdings snapshots stored in
+        the “fund_holdings” table, via the one row per fund digest table written
+        by the FundHoldingsDataIngestionEngine joined to the symbols table.
+
+        Args:
+            tbl_set (set): A set containing the names of the existing tables of the
+                connected database.
+
+        Returns:
+            set: The ticker symbols of the funds with stored holdings.
+
+        """
+        digest_table = FundHoldingsDigestModel.__table__
+        if digest_table.name not in tbl_set:
+            return set()
+
+        symbol_table = SymbolModel.__table__
+
+        with self._sqlaengine.connect() as db_con:
+            return {fund for fund, in db_con.execute(select([symbol_table.c.symbol]).select_from(
+                digest_table.join(symbol_table, digest_table.c.fund_id == symbol_table.c.symbol_id)))}
+
+    def _search_database_table_set(self, ticker, tbl_set, holdings_funds=frozenset()):
         """This method searches a set of strings for specific strings that are
         based on the input ticker and internal formatted strings.
 
@@ -211,7 +324,10 @@ class StockDataSummaryIngestionEngine(BaseWebPageIngestionEngine):
         for in the input "tbl_set" are as follows:
 
         - ticker_price_history --> The time series stock price history for the ticker.
-        - ticker_holdings_data --> The top 10 fund holdings table for the ticker.
+        - fund_holdings --> The table of fund holdings snapshots, if it contains
+            holdings for the ticker (the ticker is in holdings_funds).
+        - ticker_holdings_data --> The top 10 fund holdings table for the ticker
+            written by previous versions of the FundHoldingsDataIngestionEngine.
 
         Args:
             ticker (str): The ticker string that is used to format all of the
@@ -220,13 +336,16 @@ class StockDataSummaryIngestionEngine(BaseWebPageIngestionEngine):
             tbl_set (set): A set containing strings representing the names of
                 existing tables in the database that are searched by the method.
 
+            holdings_funds (set): The ticker symbols of the funds with holdings
+                stored in the “fund_holdings” table.
+
         Returns:
             dict : The dictionary containing the status of each ticker associated
                 database table. It is in the format of:
 
                 {
                     "price_tbl" : 'NaN' / 'f"{web_obj}_price_history"'
-                    "holdings_tbl" : 'NaN' / f"{web_obj}_holdings_data"
+                    "holdings_tbl" : 'NaN' / "fund_holdings" / f"{web_obj}_holdings_data"
                     "last_updated" : datetime.datetime.now()
                 }
 
@@ -242,7 +361,10 @@ class StockDataSummaryIngestionEngine(BaseWebPageIngestionEngine):
         if f"{ticker}_price_history" in tbl_set:
             db_values_dict['price_tbl'] = f"{ticker}_price_history"
 
-        if f"{ticker}_holdings_data" in tbl_set:
+        if ticker in holdings_funds:
+            db_values_dict['holdings_tbl'] = FundHoldingsModel.__table__.name
+
+        elif f"{ticker}_holdings_data" in tbl_set:
             db_values_dict['holdings_tbl'] = f"{ticker}_holdings_data"
 
         return db_values_dict
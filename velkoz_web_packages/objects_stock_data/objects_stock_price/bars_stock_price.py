@@ -0,0 +1,79 @@
+# Importing 3rd party packages:
+import pandas as pd
+
+"""
+The script contains the resampling of the daily price histories written by the
+StockPriceDataIngestionEngine into weekly and monthly bars. The bars of a ticker
+are materialized in the “{ticker}_price_weekly” and “{ticker}_price_monthly”
+tables so that they do not have to be rebuilt from the daily history each time
+they are read.
+
+Each bar is indexed by the last calendar day of its period (the Friday of a week
+or the last day of a month) and only periods with at least one trading day have
+a bar. As the bars of a period only depend on the daily rows of said period, new
+daily rows only change the bars of the periods they fall in, which is what allows
+the StockPriceDataIngestionEngine to update the bars incrementally.
+
+"""
+
+# The {frequency: pandas period frequency} of the materialized bars:
+BAR_FREQUENCIES = {"weekly": "W-FRI", "monthly": "M"}
+
+# The aggregation of each daily price column into a bar (other columns are not resampled):
+BAR_AGGREGATIONS = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "adj_close": "last",
+    "volume": "sum",
+    "dividends": "sum"}
+
+def get_bar_table_name(ticker, frequency):
+    """Returns the name of the table storing the bars of a ticker at a frequency (eg: “AAPL_price_weekly”)."""
+    return f"{ticker}_price_{frequency}"
+
+def get_bar_period_start(date, frequency):
+    """
+    The method returns the first calendar day of the bar period containing a date,
+    which is the first day whose daily rows are needed to rebuild said bar.
+
+    Args:
+        date (datetime): The date.
+
+        frequency (str): The bar frequency, a key of BAR_FREQUENCIES.
+
+    Returns:
+        pandas.Timestamp: The first day of the period.
+
+    """
+    return pd.Timestamp(date).to_period(BAR_FREQUENCIES[frequency]).start_time.normalize()
+
+def resample_price_bars(price_df, frequency):
+    """
+    The method resamples a daily price history into bars.
+
+    Args:
+        price_df (pandas.DataFrame): The daily price history indexed by date.
+
+        frequency (str): The bar frequency, a key of BAR_FREQUENCIES.
+
+    Returns:
+        pandas.DataFrame: The bars indexed by the last day of their period, with
+            the aggregated price columns of the daily history and the number of
+            trading_days of each period.
+
+    """
+    price_df = price_df.sort_index()
+    bar_periods = pd.DatetimeIndex(price_df.index).to_period(BAR_FREQUENCIES[frequency])
+
+    bar_aggregations = {column: aggregation for column, aggregation in BAR_AGGREGATIONS.items() if column in price_df.columns}
+    price_groups = price_df.groupby(bar_periods)
+
+    bars_df = price_groups.agg(bar_aggregations) if bar_aggregations else pd.DataFrame(index=price_groups.size().index)
+    bars_df["trading_days"] = price_groups.size()
+
+    bars_df.index = bars_df.index.to_timestamp(how="end").normalize()
+    bars_df.index.name = price_df.index.name or "Date"
+
+    return bars_df
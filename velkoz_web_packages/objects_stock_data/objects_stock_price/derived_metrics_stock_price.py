@@ -0,0 +1,126 @@
+# Importing 3rd party packages:
+import numpy as np
+import pandas as pd
+
+"""
+The script contains the vectorized computation of the metrics derived from the
+price histories written by the StockPriceDataIngestionEngine. The metrics of every
+ticker of a batch are computed at once on the concatenated price histories of the
+batch rather than in a loop per ticker:
+
+* adj_close --> The close adjusted for dividends and splits as a total return
+    series, anchored at the first stored close of the ticker.
+* return --> The daily total return of the adjusted close.
+* log_return --> The daily log return of the adjusted close.
+* volatility --> The annualized rolling standard deviation of the log returns.
+
+The adjusted close is adjusted forward (each price is the previous adjusted price
+grown by the day’s total return) rather than backward from the latest price, so
+that appending new prices never changes the metrics of the rows already stored
+and only the tail of a series has to be computed, given a warm-up window of the
+stored rows preceding it.
+
+"""
+
+# The columns added to the price histories by the derived metrics stage:
+DERIVED_METRIC_COLUMNS = ["adj_close", "return", "log_return", "volatility"]
+
+# The number of trading days per year used to annualize the volatility:
+TRADING_DAYS_PER_YEAR = 252
+
+def compute_derived_metrics(price_dfs, warmup_dfs=None, volatility_window=21, adjust_dividends=False):
+    """
+    The method computes the derived metric columns of a batch of price histories.
+
+    The price histories (and their warm-up windows) are concatenated into single
+    arrays with a segment per ticker, and every metric is computed for the whole
+    batch with NumPy operations that restart at the first row of each segment.
+
+    Args:
+        price_dfs (dict): The {ticker: price history} of the batch, in the schema
+            of the NASDAQStockPriceResponseObject._price_history_full parameter and
+            sorted by date.
+
+        warmup_dfs (dict): An optional {ticker: stored rows} of the rows stored
+            before the price history of each ticker, including their close and
+            adj_close columns. The metrics of the price history continue from these
+            rows as if the whole series had been computed at once.
+
+        volatility_window (int): The number of log returns of the rolling volatility.
+
+        adjust_dividends (bool): Whether the dividends and stock_splits columns are
+            applied to the adjusted close. The yf.Ticker.history() method already
+            adjusts the close it returns, so this is only enabled for unadjusted
+            price sources. Defaults to False (the adjusted close grows with the close).
+
+    Returns:
+        dict: The {ticker: price history} of the batch with the derived metric
+            columns added. The warm-up rows are not included.
+
+    """
+    warmup_dfs = warmup_dfs or {}
+    tickers = list(price_dfs)
+    if not tickers:
+        return {}
+
+    # Concatenating the warm-up rows and the price history of each ticker into one segment:
+    segment_dfs = [
+        pd.concat([warmup_dfs[ticker], price_dfs[ticker]]) if ticker in warmup_dfs else price_dfs[ticker]
+        for ticker in tickers]
+    warmup_lengths = np.array([len(warmup_dfs[ticker]) if ticker in warmup_dfs else 0 for ticker in tickers])
+    segment_lengths = np.array([len(segment_df) for segment_df in segment_dfs])
+    segment_starts = np.concatenate([[0], np.cumsum(segment_lengths)[:-1]])
+
+    batch_df = pd.concat(segment_dfs, ignore_index=True, sort=False)
+    segment_ids = np.repeat(np.arange(len(tickers)), segment_lengths)
+    is_segment_start = np.zeros(len(batch_df), dtype=bool)
+    is_segment_start[segment_starts[segment_lengths > 0]] = True
+
+    close = batch_df["close"].to_numpy(dtype=np.float64)
+    previous_close = np.roll(close, 1)
+    previous_close[is_segment_start] = np.nan
+
+    # Computing the gross total return of each day:
+    if adjust_dividends:
+        dividends = batch_df["dividends"].fillna(0.0).to_numpy(dtype=np.float64) if "dividends" in batch_df else 0.0
+        splits = batch_df["stock_splits"].to_numpy(dtype=np.float64) if "stock_splits" in batch_df else np.ones(len(batch_df))
+        splits = np.where(np.isnan(splits) | (splits == 0.0), 1.0, splits)
+        gross_return = (close * splits + dividends) / previous_close
+    else:
+        gross_return = close / previous_close
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_return = np.log(gross_return)
+
+    # Growing the adjusted close from the anchor of each segment (its stored adj_close or its first close):
+    cumulative_log_return = np.cumsum(np.where(np.isfinite(log_return), log_return, 0.0))
+    cumulative_log_return -= np.repeat(cumulative_log_return[segment_starts[segment_lengths > 0]], segment_lengths[segment_lengths > 0])
+
+    anchor = close[is_segment_start]
+    if "adj_close" in batch_df:
+        stored_anchor = batch_df["adj_close"].to_numpy(dtype=np.float64)[is_segment_start]
+        anchor = np.where(np.isnan(stored_anchor), anchor, stored_anchor)
+
+    adj_close = np.repeat(anchor, segment_lengths[segment_lengths > 0]) * np.exp(cumulative_log_return)
+
+    volatility = pd.Series(log_return).groupby(segment_ids).rolling(
+        volatility_window, min_periods=volatility_window).std().to_numpy() * np.sqrt(TRADING_DAYS_PER_YEAR)
+
+    metric_arrays = {
+        "adj_close": adj_close,
+        "return": gross_return - 1.0,
+        "log_return": log_return,
+        "volatility": volatility}
+
+    # Splitting the batch back into the price history of each ticker, without the warm-up rows:
+    metric_dfs = {}
+    for ticker, price_df, segment_start, warmup_length in zip(tickers, price_dfs.values(), segment_starts, warmup_lengths):
+
+        row_slice = slice(segment_start + warmup_length, segment_start + warmup_length + len(price_df))
+        metric_df = price_df.copy()
+        for metric_column in DERIVED_METRIC_COLUMNS:
+            metric_df[metric_column] = metric_arrays[metric_column][row_slice]
+
+        metric_dfs[ticker] = metric_df
+
+    return metric_dfs
@@ -0,0 +1,215 @@
+# Importing velkoz web packages:
+from velkoz_web_packages.objects_stock_data.objects_stock_price.web_objects_stock_price import fetch_price_history, format_price_history
+
+# Importing 3rd party packages:
+import numpy as np
+import pandas as pd
+from pandas.tseries.holiday import (AbstractHolidayCalendar, Holiday, GoodFriday, USMartinLutherKingJr,
+    USPresidentsDay, USMemorialDay, USLaborDay, USThanksgivingDay, nearest_workday, sunday_to_monday)
+
+"""
+The script contains the detection and targeted backfill of the trading days
+missing from the price histories written by the StockPriceDataIngestionEngine.
+
+When the nightly fetch of a ticker fails its price history silently misses the
+days of the failed runs. Rather than re-downloading the full history of every
+ticker, the stored dates of each ticker are compared to an exchange calendar to
+plan the minimal (ticker, start, end) date ranges that are missing, and only
+those ranges are fetched and inserted into the stored price histories:
+
+* NYSEHolidayCalendar / get_trading_days --> The trading days of an NYSE-like exchange.
+* get_last_completed_trading_day --> The last trading day whose session has closed.
+* plan_price_backfill --> The missing (ticker, start, end) ranges of a list of tickers.
+* backfill_price_gaps --> Fetches and inserts the planned ranges.
+
+"""
+
+class NYSEHolidayCalendar(AbstractHolidayCalendar):
+    """
+    The holiday calendar of an NYSE-like US equity exchange, used to determine
+    the trading days a stored price history is expected to contain.
+
+    It contains the regular full day holidays of the NYSE. Holidays falling on a
+    weekend are observed on the nearest weekday, except New Year’s Day, which is
+    not observed on the preceding Friday when it falls on a Saturday. Unscheduled
+    closures (eg: national days of mourning) are not included, so they are planned
+    as missing days and simply return no prices when they are fetched.
+
+    """
+    rules = [
+        Holiday("New Years Day", month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday("Juneteenth", month=6, day=19, start_date="2022-01-01", observance=nearest_workday),
+        Holiday("Independence Day", month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday("Christmas Day", month=12, day=25, observance=nearest_workday)]
+
+def get_trading_days(start, end):
+    """
+    The method returns the trading days of the NYSEHolidayCalendar between two dates.
+
+    Args:
+        start (str or datetime): The first date (inclusive).
+
+        end (str or datetime): The last date (inclusive).
+
+    Returns:
+        pandas.DatetimeIndex: The trading days.
+
+    """
+    return pd.date_range(
+        pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize(),
+        freq=pd.offsets.CustomBusinessDay(calendar=NYSEHolidayCalendar()))
+
+def get_last_completed_trading_day(today=None):
+    """
+    The method returns the last trading day of the NYSEHolidayCalendar before a
+    date, which is the last trading day whose prices are complete.
+
+    The trading day of the date itself is excluded as its session may not have
+    closed yet, and fetching it would only return the prices of the open session
+    (or no prices at all before the open).
+
+    Args:
+        today (str or datetime): The current date. Defaults to today.
+
+    Returns:
+        pandas.Timestamp: The last completed trading day.
+
+    """
+    today = pd.Timestamp.today().normalize() if today is None else pd.Timestamp(today).normalize()
+
+    # The longest run of non-trading days of the calendar is a holiday weekend of 4 days:
+    return get_trading_days(today - pd.Timedelta(days=10), today - pd.Timedelta(days=1))[-1]
+
+def plan_price_backfill(stock_data_reader, tickers, start, end=None, merge_gap_days=0, chunk_size=100):
+    """
+    The method plans the minimal date ranges that have to be fetched to fill the
+    trading days missing from the stored price histories of a list of tickers.
+
+    The stored days of every ticker are loaded as a single (date x ticker) array
+    via the StockDataReader.get_price_panel() method and compared to the trading
+    days of the NYSEHolidayCalendar at once. A trading day is missing if the ticker
+    has no stored close on that day. The days before the first stored day of a
+    ticker are not missing (the ticker was not listed yet), while a ticker without
+    any stored day in the range is missing the whole range.
+
+    Args:
+        stock_data_reader (StockDataReader): The reader of the database the price
+            histories are stored in.
+
+        tickers (list): The ticker symbols.
+
+        start (str or datetime): The first date checked.
+
+        end (str or datetime): The last date checked. Defaults to the last completed
+            trading day (see get_last_completed_trading_day), as the prices of the
+            current trading day are not complete before the close.
+
+        merge_gap_days (int): Ranges of a ticker separated by at most this number of
+            stored trading days are merged into one range, trading a few refetched
+            days for fewer requests. Defaults to 0 (ranges are never merged).
+
+        chunk_size (int): The number of tickers read per query.
+
+    Returns:
+        list: The (ticker, start, end) ranges of missing trading days, where start
+            and end are the first and last missing trading days (inclusive), sorted
+            by ticker position and date.
+
+    """
+    tickers = list(tickers)
+    end = get_last_completed_trading_day() if end is None else pd.Timestamp(end).normalize()
+    trading_days = get_trading_days(start, end)
+
+    if not len(trading_days) or not tickers:
+        return []
+
+    panel, dates, tickers = stock_data_reader.get_price_panel(
+        tickers, trading_days[0], trading_days[-1], fields=["close"], chunk_size=chunk_size)
+
+    # Selecting the trading days of the business day axis of the panel:
+    is_stored = ~np.isnan(panel[dates.get_indexer(trading_days), :, 0])
+
+    # Ignoring the days before the first stored day of each ticker:
+    is_missing = ~is_stored & np.logical_or.accumulate(is_stored, axis=0)
+    is_missing[:, ~is_stored.any(axis=0)] = True
+
+    # Finding the runs of missing days of every ticker from the edges of the (padded) missing mask:
+    padded_missing = np.pad(is_missing, ((1, 1), (0, 0))).astype(np.int8)
+    run_edges = np.diff(padded_missing, axis=0)
+    run_start_days, run_start_tickers = np.nonzero(run_edges == 1)
+    run_end_days, run_end_tickers = np.nonzero(run_edges == -1)
+
+    # Ordering the run edges by ticker then day so that starts and ends pair up:
+    start_order = np.lexsort((run_start_days, run_start_tickers))
+    end_order = np.lexsort((run_end_days, run_end_tickers))
+    run_tickers = run_start_tickers[start_order]
+    run_starts = run_start_days[start_order]
+    run_ends = run_end_days[end_order] - 1
+
+    # Merging the runs of a ticker separated by at most merge_gap_days stored days:
+    if merge_gap_days > 0 and len(run_tickers) > 1:
+        is_merged = (run_tickers[1:] == run_tickers[:-1]) & (run_starts[1:] - run_ends[:-1] - 1 <= merge_gap_days)
+        keep_start = np.concatenate([[True], ~is_merged])
+        keep_end = np.concatenate([~is_merged, [True]])
+        run_tickers, run_starts, run_ends = run_tickers[keep_start], run_starts[keep_start], run_ends[keep_end]
+
+    return [
+        (tickers[ticker_position], trading_days[run_start], trading_days[run_end])
+        for ticker_position, run_start, run_end in zip(run_tickers, run_starts, run_ends)]
+
+def backfill_price_gaps(ingestion_engine, backfill_plan, fetch_func=None, parse_func=None):
+    """
+    The method fetches the date ranges of a backfill plan and inserts the fetched
+    prices into the stored price histories via the
+    StockPriceDataIngestionEngine._merge_price_history() method.
+
+    Failures of a range are recorded and do not stop the backfill.
+
+    Args:
+        ingestion_engine (StockPriceDataIngestionEngine): The Ingestion Engine
+            connected to the database of the price histories.
+
+        backfill_plan (list): The (ticker, start, end) ranges returned by the
+            plan_price_backfill() method.
+
+        fetch_func (function): The range-aware fetch function called with
+            (ticker, start=start, end=end). Defaults to fetch_price_history.
+
+        parse_func (function): The function formatting the fetched prices.
+            Defaults to format_price_history.
+
+    Returns:
+        dict: The report of the backfill with the number of rows inserted per
+            ticker ("inserted"), the number of ranges fetched ("ranges") and the
+            {(ticker, start, end): error message} of the failed ranges ("failed").
+
+    """
+    fetch_func = fetch_func or fetch_price_history
+    parse_func = parse_func or format_price_history
+
+    backfill_report = {"inserted": {}, "ranges": 0, "failed": {}}
+
+    for ticker, range_start, range_end in backfill_plan:
+        try:
+            raw_price_df = fetch_func(ticker, start=range_start, end=range_end)
+            backfill_report["ranges"] += 1
+
+            if raw_price_df is None or len(raw_price_df) == 0:
+                continue
+
+            # Inserting the fetched days, the days that are already stored are left untouched:
+            with ingestion_engine._write_lock:
+                inserted_rows = ingestion_engine._merge_price_history(ticker, parse_func(raw_price_df))
+
+            backfill_report["inserted"][ticker] = backfill_report["inserted"].get(ticker, 0) + inserted_rows
+
+        except Exception as error:
+            backfill_report["failed"][(ticker, range_start, range_end)] = f"{type(error).__name__}: {error}"
+
+    return backfill_report
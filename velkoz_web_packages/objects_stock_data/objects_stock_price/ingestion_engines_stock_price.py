@@ -5,10 +5,13 @@ import warnings
 # Importing Base Ingestion Engine Objects:
 from velkoz_web_packages.objects_base.ingestion_engines_base import BaseWebPageIngestionEngine
 from velkoz_web_packages.objects_stock_data.objects_stock_price.web_objects_stock_price import NASDAQStockPriceResponseObject
+from velkoz_web_packages.objects_stock_data.objects_stock_price.derived_metrics_stock_price import DERIVED_METRIC_COLUMNS, compute_derived_metrics
+from velkoz_web_packages.objects_stock_data.objects_stock_price.bars_stock_price import BAR_FREQUENCIES, get_bar_table_name, get_bar_period_start, resample_price_bars
 
 
 # Importing thrid party packages:
-from sqlalchemy import create_engine, MetaData, Column, String, DateTime, Integer, inspect
+import pandas as pd
+from sqlalchemy import create_engine, MetaData, Column, String, DateTime, Integer, inspect, text
 from sqlalchemy.orm import sessionmaker, Session, scoped_session
 
 class StockPriceDataIngestionEngine(BaseWebPageIngestionEngine):
@@ -33,6 +36,21 @@ class StockPriceDataIngestionEngine(BaseWebPageIngestionEngine):
     * __add_session_web_obj
     * _get_validation_status
 
+    The Ingestion Engine has an optional derived metrics stage (see the
+    derived_metrics_stock_price module). When it is enabled the adj_close, return,
+    log_return and volatility columns are computed with vectorized operations and
+    written alongside the prices. Batches of price histories written via the
+    _prepare_write_batch() method have the metrics of all their tickers computed
+    at once. New prices appended to a stored price history via the
+    _append_price_history() method only have the metrics of the appended rows
+    computed, continuing from a warm-up window of the stored rows.
+
+    The Ingestion Engine can also maintain materialized weekly and monthly bars of
+    each ticker in the “{ticker}_price_weekly” and “{ticker}_price_monthly” tables
+    (see the bars_stock_price module). Writing a full price history rebuilds the
+    bars of the ticker, while appending prices only rebuilds the bars of the
+    periods the appended rows fall in.
+
     Args:
 
         db_uri (str): The string URI for the database to be connected to. It is
@@ -42,6 +60,22 @@ class StockPriceDataIngestionEngine(BaseWebPageIngestionEngine):
             (and type checked) to be instances of BaseWebPageResponse() objects or
             any object that uses BaseWebPageResponse() as its base.
 
+        derived_metrics (bool): Whether the derived metrics stage is enabled.
+            Defaults to False.
+
+        volatility_window (int): The number of daily log returns of the rolling
+            volatility metric. Defaults to 21.
+
+        adjust_dividends (bool): Whether the dividends and stock_splits columns are
+            applied to the adjusted close, for price sources that are not already
+            adjusted. Defaults to False.
+
+        materialize_bars (bool): Whether the weekly and monthly bar tables of each
+            written ticker are maintained. Defaults to False.
+
+        kwargs (dictionary): Optional key-word arguments passed to the
+            BaseWebPageIngestionEngine (eg: single_writer).
+
     Attributes:
 
             _WebPageResponseObjs (list): A list of arguments that are assumed (and type
@@ -62,15 +96,29 @@ class StockPriceDataIngestionEngine(BaseWebPageIngestionEngine):
                 connection to the database binded to the database engine via the
                 _sqlaengine parameter.
 
+            _derived_metrics (bool): Whether the derived metrics stage is enabled.
+
+            _volatility_window (int): The window of the rolling volatility metric.
+
+            _adjust_dividends (bool): Whether dividends and splits are applied to
+                the adjusted close.
+
+            _materialize_bars (bool): Whether the bar tables are maintained.
+
     References:
 
         * https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.DataFrame.to_sql.html
 
     """
-    def __init__(self, db_uri, *WebPageResponseObjs):
+    def __init__(self, db_uri, *WebPageResponseObjs, **kwargs):
+
+        self._derived_metrics = kwargs.pop("derived_metrics", False)
+        self._volatility_window = kwargs.pop("volatility_window", 21)
+        self._adjust_dividends = kwargs.pop("adjust_dividends", False)
+        self._materialize_bars = kwargs.pop("materialize_bars", False)
 
         # Initalizing the Parent BaseWebPageIngestionEngine object:
-        super().__init__(db_uri, *WebPageResponseObjs)
+        super().__init__(db_uri, *WebPageResponseObjs, **kwargs)
 
     def _add_session_web_obj(self, web_object):
         """
@@ -109,18 +157,293 @@ class StockPriceDataIngestionEngine(BaseWebPageIngestionEngine):
         # Ensuring that the Web Object has been validated:
         if self._validation_dict[web_object] > 10:
 
-            # Extracting the dataframe from the web object:
-            price_df = web_object._price_history_full
-            price_df_tbl_name = f"{web_object._ticker}_price_history"
-
-            # Writing the price dataframe to the database:
-            price_df.to_sql(
-                price_df_tbl_name, con=self._sqlaengine, if_exists='replace',
-                index=True)
+            # Writing the price dataframe extracted from the web object to the database:
+            self._write_price_history(web_object._ticker, web_object._price_history_full)
 
         else:
             raise ValueError(f"Object {web_object} Was Not Added to Session due to Validation Error")
 
+    def _write_price_history(self, ticker, price_df, con=None):
+        """
+        The method writes the price history dataframe of a single ticker to the
+        “{ticker}_price_history” database table, replacing any existing table.
+        The write listeners are notified of the write (see _notify_written()).
+
+        It contains the database writing logic of the _add_session_web_obj method
+        without requiring a StockPriceResponse Object so that data pipelines that
+        parse price data outside of a WebPageResponse Object can write it using
+        the same schema.
+
+        Args:
+            ticker (str): The ticker symbol that the price history describes.
+
+            price_df (pandas.DataFrame): The price history dataframe in the schema
+                of the NASDAQStockPriceResponseObject._price_history_full parameter.
+
+            con (sqlalchemy.engine.Connection): An optional connection used to
+                write the dataframe so that several writes can share a single
+                transaction. The Ingestion Engine’s SQLAlchemy engine is used if
+                no connection is provided.
+
+        """
+        # Computing the derived metrics if they were not computed with the rest of a batch:
+        if self._derived_metrics and not set(DERIVED_METRIC_COLUMNS).issubset(price_df.columns):
+            price_df = self._compute_derived_metrics({ticker: price_df})[ticker]
+
+        # Writing the price dataframe to the database:
+        price_df.to_sql(
+            f"{ticker}_price_history", con=con if con is not None else self._sqlaengine,
+            if_exists='replace', index=True)
+
+        # Rebuilding the bars of the ticker from the full price history:
+        if self._materialize_bars:
+            for frequency in BAR_FREQUENCIES:
+                resample_price_bars(price_df, frequency).to_sql(
+                    get_bar_table_name(ticker, frequency), con=con if con is not None else self._sqlaengine,
+                    if_exists='replace', index=True)
+
+        # Invalidating cached reads of the ticker once the write is committed:
+        self._notify_written("price", [ticker], con=con)
+
+    def _prepare_write_batch(self, write_batch):
+        """
+        The method prepares a batch of (ticker, price history) pairs before they are
+        written by the _write_price_history() method. If the derived metrics stage is
+        enabled the metrics of every price history of the batch are computed at once.
+        It is called by the StockDataPipeline before each batch is written.
+
+        Args:
+            write_batch (list): The list of (ticker, price history) pairs.
+
+        Returns:
+            list: The (ticker, price history) pairs to be written.
+
+        """
+        if not self._derived_metrics or not write_batch:
+            return write_batch
+
+        metric_dfs = self._compute_derived_metrics(dict(write_batch))
+        return [(ticker, metric_dfs[ticker]) for ticker, _ in write_batch]
+
+    def _append_price_history(self, ticker, price_df, con=None):
+        """
+        The method appends the prices dated after the last stored row of a ticker
+        to its “{ticker}_price_history” table, writing the full table via the
+        _write_price_history() method if it does not exist yet.
+
+        If the derived metrics stage is enabled only the metrics of the appended
+        rows are computed, continuing from the last volatility_window stored rows
+        so that they equal the metrics of a full recomputation. A stored table
+        written without the metric columns is rewritten in full with them.
+
+        Args:
+            ticker (str): The ticker symbol that the price history describes.
+
+            price_df (pandas.DataFrame): The price history dataframe, which may
+                overlap the stored rows.
+
+            con (sqlalchemy.engine.Connection): An optional connection used to
+                write the rows within an existing transaction.
+
+        Returns:
+            int: The number of rows appended.
+
+        """
+        if con is None:
+            with self._sqlaengine.begin() as conn:
+                return self._append_price_history(ticker, price_df, con=conn)
+
+        price_tbl = f"{ticker}_price_history"
+        if not con.dialect.has_table(con, price_tbl):
+            self._write_price_history(ticker, price_df.sort_index(), con=con)
+            return len(price_df)
+
+        # Reading the warm-up window of the stored rows preceding the appended rows:
+        stored_columns = [column["name"] for column in inspect(con).get_columns(price_tbl)]
+        warmup_df = self._read_price_tail(ticker, stored_columns[0], self._volatility_window, con)
+
+        new_price_df = price_df.sort_index()
+        if not warmup_df.empty:
+            new_price_df = new_price_df[new_price_df.index > warmup_df.index[-1]]
+
+        if new_price_df.empty:
+            return 0
+
+        if self._derived_metrics and not set(DERIVED_METRIC_COLUMNS).issubset(stored_columns):
+            stored_df = pd.read_sql(
+                text(f'SELECT * FROM "{price_tbl}" ORDER BY "{stored_columns[0]}"'), con,
+                index_col=stored_columns[0], parse_dates=[stored_columns[0]])
+            self._write_price_history(ticker, pd.concat([stored_df, new_price_df]), con=con)
+            return len(new_price_df)
+
+        if self._derived_metrics:
+            new_price_df = self._compute_derived_metrics({ticker: new_price_df}, {ticker: warmup_df})[ticker]
+
+        # Appending the rows in the column order of the stored table:
+        new_price_df = new_price_df.reindex(columns=stored_columns[1:])
+        new_price_df.index.name = stored_columns[0]
+
+        new_price_df.to_sql(price_tbl, con=con, if_exists='append', index=True)
+
+        if self._materialize_bars:
+            self._update_price_bars(ticker, stored_columns[0], new_price_df.index[0], con)
+
+        self._notify_written("price", [ticker], con=con)
+
+        return len(new_price_df)
+
+    def _merge_price_history(self, ticker, price_df, con=None):
+        """
+        The method inserts the rows of a price history whose dates are missing from
+        the stored price history of a ticker, such as the days of a gap backfilled
+        via a range-aware fetch. Rows already stored are left untouched.
+
+        The stored rows dated after the first inserted row are rewritten together
+        with the inserted rows so that the derived metrics (which depend on the
+        preceding rows) are recomputed from a warm-up window of the stored rows
+        preceding the first inserted row, and the bars of the affected periods are
+        rebuilt. The price history is written via the _write_price_history() method
+        if it does not exist yet.
+
+        Args:
+            ticker (str): The ticker symbol that the price history describes.
+
+            price_df (pandas.DataFrame): The price history dataframe.
+
+            con (sqlalchemy.engine.Connection): An optional connection used to
+                write the rows within an existing transaction.
+
+        Returns:
+            int: The number of rows inserted.
+
+        """
+        if con is None:
+            with self._sqlaengine.begin() as conn:
+                return self._merge_price_history(ticker, price_df, con=conn)
+
+        price_tbl = f"{ticker}_price_history"
+        if not con.dialect.has_table(con, price_tbl):
+            self._write_price_history(ticker, price_df.sort_index(), con=con)
+            return len(price_df)
+
+        price_df = price_df.sort_index()
+        if price_df.empty:
+            return 0
+
+        stored_columns = [column["name"] for column in inspect(con).get_columns(price_tbl)]
+        date_column = stored_columns[0]
+
+        # Selecting the rows whose dates are not stored:
+        stored_dates = pd.to_datetime(pd.Index([stored_date for stored_date, in con.execute(
+            text(f'SELECT "{date_column}" FROM "{price_tbl}" WHERE "{date_column}" >= :start_date AND "{date_column}" < :end_date'),
+            {"start_date": price_df.index[0].strftime("%Y-%m-%d"),
+                "end_date": (price_df.index[-1] + pd.Timedelta(days=1)).strftime("%Y-%m-%d")})]))
+        new_price_df = price_df[~pd.DatetimeIndex(price_df.index).normalize().isin(stored_dates.normalize())]
+
+        if new_price_df.empty:
+            return 0
+
+        first_new_date = new_price_df.index[0].strftime("%Y-%m-%d")
+
+        # Reading the stored rows after the first inserted row and the warm-up window before it:
+        tail_df = pd.read_sql(
+            text(f'SELECT * FROM "{price_tbl}" WHERE "{date_column}" >= :first_new_date'), con,
+            params={"first_new_date": first_new_date}, index_col=date_column, parse_dates=[date_column])
+        warmup_df = pd.read_sql(
+            text(f'SELECT * FROM "{price_tbl}" WHERE "{date_column}" < :first_new_date '
+                f'ORDER BY "{date_column}" DESC LIMIT {int(self._volatility_window)}'), con,
+            params={"first_new_date": first_new_date}, index_col=date_column, parse_dates=[date_column]).sort_index()
+
+        merged_df = pd.concat([tail_df, new_price_df.reindex(columns=tail_df.columns)]).sort_index()
+        if self._derived_metrics and set(DERIVED_METRIC_COLUMNS).issubset(stored_columns):
+            merged_df = self._compute_derived_metrics(
+                {ticker: merged_df.drop(columns=DERIVED_METRIC_COLUMNS)}, {ticker: warmup_df})[ticker]
+
+        # Rewriting the stored rows from the first inserted row onward:
+        merged_df = merged_df.reindex(columns=stored_columns[1:])
+        merged_df.index.name = date_column
+
+        con.execute(
+            text(f'DELETE FROM "{price_tbl}" WHERE "{date_column}" >= :first_new_date'), {"first_new_date": first_new_date})
+        merged_df.to_sql(price_tbl, con=con, if_exists='append', index=True)
+
+        if self._materialize_bars:
+            self._update_price_bars(ticker, date_column, new_price_df.index[0], con)
+
+        self._notify_written("price", [ticker], con=con)
+
+        return len(new_price_df)
+
+    def _update_price_bars(self, ticker, date_column, first_new_date, con):
+        """
+        The method rebuilds the bars of the periods affected by daily rows appended
+        to the price history of a ticker: the bars of each frequency from the period
+        containing the first appended date onward are deleted and rebuilt from the
+        daily rows of those periods only. Bar tables that do not exist yet are built
+        from the full price history.
+
+        Args:
+            ticker (str): The ticker symbol.
+
+            date_column (str): The name of the date column of the price history table.
+
+            first_new_date (datetime): The date of the first appended daily row.
+
+            con (sqlalchemy.engine.Connection): The connection of the transaction the
+                daily rows were appended in.
+
+        """
+        price_tbl = f"{ticker}_price_history"
+
+        for frequency in BAR_FREQUENCIES:
+
+            bar_tbl = get_bar_table_name(ticker, frequency)
+            period_start = get_bar_period_start(first_new_date, frequency)
+
+            if not con.dialect.has_table(con, bar_tbl):
+                period_start = None
+
+            # Reading the daily rows of the affected periods:
+            daily_query = f'SELECT * FROM "{price_tbl}"'
+            if period_start is not None:
+                daily_query += f' WHERE "{date_column}" >= :period_start'
+
+            daily_df = pd.read_sql(
+                text(daily_query), con, params={"period_start": period_start.strftime("%Y-%m-%d")} if period_start is not None else None,
+                index_col=date_column, parse_dates=[date_column])
+            bars_df = resample_price_bars(daily_df, frequency)
+
+            if period_start is None:
+                bars_df.to_sql(bar_tbl, con=con, if_exists='replace', index=True)
+                continue
+
+            # Replacing the bars of the affected periods, whose labels are on or after the period start:
+            con.execute(
+                text(f'DELETE FROM "{bar_tbl}" WHERE "{bars_df.index.name}" >= :period_start'),
+                {"period_start": period_start.strftime("%Y-%m-%d")})
+            bars_df.to_sql(bar_tbl, con=con, if_exists='append', index=True)
+
+    def _read_price_tail(self, ticker, date_column, num_rows, con):
+        """
+        The method reads the last num_rows stored rows of the price history of a
+        ticker, sorted by date.
+
+        Returns:
+            pandas.DataFrame: The stored rows indexed by date.
+
+        """
+        tail_df = pd.read_sql(
+            text(f'SELECT * FROM "{ticker}_price_history" ORDER BY "{date_column}" DESC LIMIT {int(num_rows)}'),
+            con, index_col=date_column, parse_dates=[date_column])
+
+        return tail_df.sort_index()
+
+    def _compute_derived_metrics(self, price_dfs, warmup_dfs=None):
+        """Computes the derived metrics of a {ticker: price history} batch with the parameters of the engine."""
+        return compute_derived_metrics(
+            price_dfs, warmup_dfs, volatility_window=self._volatility_window,
+            adjust_dividends=self._adjust_dividends)
+
     def _get_validation_status(self, obj):
         '''
         The validation method is extended from the Base Ingestion Engine to only
@@ -5,6 +5,7 @@ import time
 import requests
 from bs4 import BeautifulSoup
 import datetime
+import pandas as pd
 import yfinance as yf
 
 class NASDAQStockPriceResponseObject(yf.Ticker):
@@ -73,13 +74,60 @@ class NASDAQStockPriceResponseObject(yf.Ticker):
         self._initialized_time = datetime.datetime.now()
 
         # Declaring the full price history dataframe and renaming column names for db schema:
-        self._price_history_full = self.history(period="max").rename(columns = {
-                "Date" : "date",
-                "Open" : "open",
-                "High" : "high",
-                "Low" : "low",
-                "Close": "close",
-                "Volume": "volume",
-                "Dividends" : "dividends",
-                "Stock Splits" : "stock_splits"
-                })
+        self._price_history_full = format_price_history(self.history(period="max"))
+
+def fetch_price_history(ticker, start=None, end=None):
+    """
+    The method performs the network request for the price history of a ticker
+    without formatting it. It is the “fetch” half of the NASDAQStockPriceResponseObject
+    that is used by data pipelines that perform network I/O and data parsing in
+    separate stages.
+
+    The full price history is fetched by default. If a start or end date is
+    provided only the prices of said date range are fetched, which is used to
+    backfill the days missing from a stored price history without downloading
+    the full history again.
+
+    Args:
+        ticker (str): The ticker symbol of the stock whose price history is fetched.
+
+        start (str or datetime): The first date fetched (inclusive).
+
+        end (str or datetime): The last date fetched (inclusive).
+
+    Returns:
+        pandas.DataFrame: The raw result of the yf.Ticker.history() method.
+
+    """
+    if start is None and end is None:
+        return yf.Ticker(ticker).history(period="max")
+
+    # The end date of the yf.Ticker.history() method is exclusive:
+    return yf.Ticker(ticker).history(
+        start=None if start is None else pd.Timestamp(start).strftime("%Y-%m-%d"),
+        end=None if end is None else (pd.Timestamp(end) + pd.Timedelta(days=1)).strftime("%Y-%m-%d"))
+
+def format_price_history(price_history_df):
+    """
+    The method converts the raw price history dataframe generated by the
+    yf.Ticker.history() method into the database schema used by the
+    NASDAQStockPriceResponseObject. It is the “parse” half of the
+    NASDAQStockPriceResponseObject.
+
+    Args:
+        price_history_df (pandas.DataFrame): The raw price history dataframe.
+
+    Returns:
+        pandas.DataFrame: The price history dataframe with renamed columns.
+
+    """
+    return price_history_df.rename(columns = {
+        "Date" : "date",
+        "Open" : "open",
+        "High" : "high",
+        "Low" : "low",
+        "Close": "close",
+        "Volume": "volume",
+        "Dividends" : "dividends",
+        "Stock Splits" : "stock_splits"
+        })
@@ -0,0 +1,112 @@
+# Importing 3rd Party Packages:
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.ext.declarative import declarative_base
+
+# Creating the declarative base object used to create base database orm models:
+Base = declarative_base()
+
+class SymbolMetadataModel(Base):
+    """The SymbolMetadataModel is the SQLAlchemy model that represents the database
+    table used by the SymbolMetadataCache to persist the metadata of ticker symbols
+    (quote type, exchange and name) between runs.
+
+    Attributes:
+        __tablename__ (str): A metadata attribute that determines the name of the table
+            created by the cache.
+
+        __table_args__ (str): A metadata attribute that determines how the model
+            interacts with an existing equivalent databaset table that already
+            exists.
+
+        symbol (sqlalchemy.Column): The ticker symbol. This is the primary key of the table.
+
+        quote_type (sqlalchemy.Column): The Yahoo Finance quote type of the symbol
+            (eg: 'EQUITY', 'ETF', 'MUTUALFUND').
+
+        exchange (sqlalchemy.Column): The exchange the symbol is listed on.
+
+        name (sqlalchemy.Column): The name of the security.
+
+        fetched_at (sqlalchemy.Column): The datetime the metadata was fetched. It
+            is compared to the time-to-live of the cache to determine if the
+            metadata is stale.
+
+    """
+    # Declaring table meta-data:
+    __tablename__ = "symbol_metadata"
+    __table_args__ = {'extend_existing': True}
+
+    # Declaring the table schema:
+    symbol = Column(
+        'symbol',
+        String(20),
+        primary_key = True)
+
+    quote_type = Column(
+        'quote_type',
+        String(20),
+        nullable = True)
+
+    exchange = Column(
+        'exchange',
+        String(20),
+        nullable = True)
+
+    name = Column(
+        'name',
+        String(255),
+        nullable = True)
+
+    fetched_at = Column(
+        'fetched_at',
+        DateTime,
+        nullable = False)
+
+    # Dunder Methods:
+    def __repr__(self):
+        return f"SymbolMetadataModel({self.symbol})"
+
+class SymbolModel(Base):
+    """The SymbolModel is the SQLAlchemy model that represents the symbols dimension
+    table: the compact integer id assigned to every ticker symbol stored in the
+    database by the SymbolRegistry.
+
+    Long format tables (eg: fund_holdings) reference symbols by their integer id
+    rather than by their ticker string, which keeps the rows and indexes of said
+    tables small and makes joins on symbols integer comparisons.
+
+    Attributes:
+        __tablename__ (str): A metadata attribute that determines the name of the table
+            created by the registry.
+
+        __table_args__ (str): A metadata attribute that determines how the model
+            interacts with an existing equivalent databaset table that already
+            exists.
+
+        symbol_id (sqlalchemy.Column): The autoincrementing integer id of the symbol.
+            This is the primary key of the table.
+
+        symbol (sqlalchemy.Column): The ticker symbol. It is unique and indexed.
+
+    """
+    # Declaring table meta-data:
+    __tablename__ = "symbols"
+    __table_args__ = {'extend_existing': True}
+
+    # Declaring the table schema:
+    symbol_id = Column(
+        'symbol_id',
+        Integer,
+        primary_key = True,
+        autoincrement = True)
+
+    symbol = Column(
+        'symbol',
+        String(20),
+        unique = True,
+        index = True,
+        nullable = False)
+
+    # Dunder Methods:
+    def __repr__(self):
+        return f"SymbolModel({self.symbol_id}, {self.symbol})"
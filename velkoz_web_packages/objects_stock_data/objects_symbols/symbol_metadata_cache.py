@@ -0,0 +1,266 @@
+# Importing native packages:
+import datetime
+import warnings
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Importing thrid party packages:
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+import yfinance as yf
+
+# Importing the SQLAlchemy database model and model base:
+from velkoz_web_packages.objects_stock_data.objects_symbols.db_orm_models_symbols import Base, SymbolMetadataModel
+
+# The Yahoo Finance quote types of symbols that have fund holdings data:
+FUND_QUOTE_TYPES = {"ETF", "MUTUALFUND"}
+
+def fetch_symbol_metadata(symbol):
+    """
+    The default method used to fetch the metadata of a single symbol. It reads
+    the quote type, exchange and name from the yfinance Ticker.info dict.
+
+    Args:
+        symbol (str): The ticker symbol.
+
+    Returns:
+        dict: The {quote_type, exchange, name} of the symbol.
+
+    """
+    symbol_info = yf.Ticker(symbol).info
+
+    return {
+        "quote_type": symbol_info.get("quoteType"),
+        "exchange": symbol_info.get("exchange"),
+        "name": symbol_info.get("longName") or symbol_info.get("shortName")}
+
+def is_fund_quote_type(quote_type):
+    """Returns whether a quote type is that of a fund with holdings data."""
+    return quote_type in FUND_QUOTE_TYPES
+
+class SymbolMetadataCache(object):
+    """
+    A persistent cache of the metadata (quote type, exchange and name) of ticker
+    symbols.
+
+    Determining whether a ticker is a fund requires a heavy yfinance Ticker.info
+    request. The cache stores the result of said request in the symbol_metadata
+    database table (SymbolMetadataModel) and in memory so that it is made at most
+    once per symbol per time-to-live, across runs. Symbols whose metadata is missing
+    or stale are fetched in a batch by a pool of threads and written to the database
+    in a single transaction.
+
+    The fetch function is pluggable so that other sources of symbol metadata (or
+    offline fixtures) can be used in place of yfinance.
+
+    Args:
+        db_uri (str): The string URI of the database the cache is persisted to.
+
+        ttl (datetime.timedelta): The time after which cached metadata is stale
+            and fetched again. Defaults to 7 days.
+
+        fetch_func (function): The function fetching the metadata of a single
+            symbol. It is called with a symbol and returns a dict with the keys
+            quote_type, exchange and name. Defaults to fetch_symbol_metadata().
+
+        max_workers (int): The number of threads fetching metadata concurrently.
+
+    Attributes:
+        _sqlaengine (sqlalchemy.engine.Engine): The engine of the database the
+            cache is persisted to.
+
+        _ttl (datetime.timedelta): The time-to-live of cached metadata.
+
+        _fetch_func (function): The function fetching the metadata of a symbol.
+
+        _max_workers (int): The number of fetch threads.
+
+        _memory_cache (dict): The metadata of the symbols already read or fetched,
+            keyed by symbol.
+
+        _lock (threading.Lock): The lock guarding the memory cache.
+
+    """
+    def __init__(self, db_uri, ttl=datetime.timedelta(days=7), fetch_func=None, max_workers=8):
+
+        # Creating the database engine in the same manner as the Ingestion Engines:
+        if db_uri.startswith("sqlite") and (":memory:" in db_uri or db_uri.rstrip("/") == "sqlite:"):
+            self._sqlaengine = create_engine(db_uri, poolclass=StaticPool, connect_args={"check_same_thread": False})
+        else:
+            self._sqlaengine = create_engine(db_uri, pool_pre_ping=True)
+
+        Base.metadata.create_all(self._sqlaengine)
+
+        self._ttl = ttl
+        self._fetch_func = fetch_func or fetch_symbol_metadata
+        self._max_workers = max(1, max_workers)
+        self._memory_cache = {}
+        self._lock = threading.Lock()
+
+    def get_metadata(self, symbols, refresh=False):
+        """
+        The method returns the metadata of a list of symbols. Fresh metadata is read
+        from memory or the database and the metadata of the remaining symbols is
+        fetched in a single batch.
+
+        Args:
+            symbols (list): The ticker symbols.
+
+            refresh (bool): Whether the metadata of every symbol is fetched again,
+                ignoring the cache. Defaults to False.
+
+        Returns:
+            dict: The {quote_type, exchange, name, fetched_at} metadata of each symbol,
+                keyed by symbol. Symbols whose metadata could not be fetched are
+                not included.
+
+        """
+        symbols = list(dict.fromkeys(symbols))
+        stale_before = datetime.datetime.now() - self._ttl
+        symbol_metadata = {}
+
+        if not refresh:
+
+            # Reading the metadata from memory, then from the database:
+            with self._lock:
+                symbol_metadata.update({
+                    symbol: self._memory_cache[symbol] for symbol in symbols
+                    if symbol in self._memory_cache and self._memory_cache[symbol]["fetched_at"] >= stale_before})
+
+            stored_metadata = self._read_stored_metadata([symbol for symbol in symbols if symbol not in symbol_metadata])
+            symbol_metadata.update({
+                symbol: metadata for symbol, metadata in stored_metadata.items()
+                if metadata["fetched_at"] >= stale_before})
+
+        # Fetching and storing the metadata of the missing or stale symbols in a batch:
+        missing_symbols = [symbol for symbol in symbols if symbol not in symbol_metadata]
+        if missing_symbols:
+            fetched_metadata = self._fetch_metadata_batch(missing_symbols)
+            self._store_metadata(fetched_metadata)
+            symbol_metadata.update(fetched_metadata)
+
+        with self._lock:
+            self._memory_cache.update(symbol_metadata)
+
+        return symbol_metadata
+
+    def get_quote_type(self, symbol):
+        """
+        The method returns the quote type of a single symbol.
+
+        Args:
+            symbol (str): The ticker symbol.
+
+        Returns:
+            str: The quote type of the symbol or None if it could not be fetched.
+
+        """
+        return self.get_metadata([symbol]).get(symbol, {}).get("quote_type")
+
+    def filter_funds(self, symbols):
+        """
+        The method filters a list of symbols down to the funds (symbols whose quote
+        type is in FUND_QUOTE_TYPES), fetching the metadata of every uncached symbol
+        in a single batch. The order of the symbols is preserved.
+
+        Args:
+            symbols (list): The ticker symbols.
+
+        Returns:
+            list: The symbols that are funds.
+
+        """
+        symbol_metadata = self.get_metadata(symbols)
+
+        return [
+            symbol for symbol in symbols
+            if is_fund_quote_type(symbol_metadata.get(symbol, {}).get("quote_type"))]
+
+    def _read_stored_metadata(self, symbols):
+        """
+        The method reads the stored metadata of a list of symbols from the database,
+        querying in chunks to stay within the bound parameter limits of the database.
+
+        Args:
+            symbols (list): The ticker symbols.
+
+        Returns:
+            dict: The stored metadata keyed by symbol.
+
+        """
+        metadata_table = SymbolMetadataModel.__table__
+        stored_metadata = {}
+
+        with self._sqlaengine.connect() as db_con:
+            for chunk_start in range(0, len(symbols), 500):
+
+                metadata_rows = db_con.execute(metadata_table.select().where(
+                    metadata_table.c.symbol.in_(symbols[chunk_start:chunk_start + 500])))
+
+                for metadata_row in metadata_rows:
+                    stored_metadata[metadata_row.symbol] = {
+                        "quote_type": metadata_row.quote_type,
+                        "exchange": metadata_row.exchange,
+                        "name": metadata_row.name,
+                        "fetched_at": metadata_row.fetched_at}
+
+        return stored_metadata
+
+    def _fetch_metadata_batch(self, symbols):
+        """
+        The method fetches the metadata of a list of symbols concurrently. Symbols
+        whose fetch fails are left out (and so are fetched again on the next call)
+        with a single warning for the batch.
+
+        Args:
+            symbols (list): The ticker symbols.
+
+        Returns:
+            dict: The fetched metadata keyed by symbol.
+
+        """
+        def fetch_metadata(symbol):
+            try:
+                return symbol, self._fetch_func(symbol)
+            except Exception:
+                return symbol, None
+
+        fetched_at = datetime.datetime.now()
+        with ThreadPoolExecutor(max_workers=min(self._max_workers, len(symbols))) as fetch_executor:
+            fetch_results = list(fetch_executor.map(fetch_metadata, symbols))
+
+        failed_symbols = [symbol for symbol, metadata in fetch_results if metadata is None]
+        if failed_symbols:
+            warnings.warn(f"The metadata of {len(failed_symbols)} symbols could not be fetched: {failed_symbols[:10]}")
+
+        return {
+            symbol: {
+                "quote_type": metadata.get("quote_type"),
+                "exchange": metadata.get("exchange"),
+                "name": metadata.get("name"),
+                "fetched_at": fetched_at}
+            for symbol, metadata in fetch_results if metadata is not None}
+
+    def _store_metadata(self, symbol_metadata):
+        """
+        The method writes the metadata of a batch of symbols to the database in a
+        single transaction, replacing any stale rows of said symbols.
+
+        Args:
+            symbol_metadata (dict): The metadata keyed by symbol.
+
+        """
+        if not symbol_metadata:
+            return
+
+        metadata_table = SymbolMetadataModel.__table__
+        symbols = list(symbol_metadata)
+
+        with self._sqlaengine.begin() as db_con:
+
+            for chunk_start in range(0, len(symbols), 500):
+                db_con.execute(metadata_table.delete().where(
+                    metadata_table.c.symbol.in_(symbols[chunk_start:chunk_start + 500])))
+
+            db_con.execute(metadata_table.insert(), [
+                dict(metadata, symbol=symbol) for symbol, metadata in symbol_metadata.items()])
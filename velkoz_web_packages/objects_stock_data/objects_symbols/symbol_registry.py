@@ -0,0 +1,214 @@
+# Importing native packages:
+import threading
+
+# Importing thrid party packages:
+from sqlalchemy import select, event
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+
+# Importing the SQLAlchemy database model and model base:
+from velkoz_web_packages.objects_stock_data.objects_symbols.db_orm_models_symbols import Base, SymbolModel
+
+# The key of the ids registered by an uncommitted transaction in Connection.info:
+_PENDING_SYMBOL_IDS = "velkoz_pending_symbol_ids"
+
+class SymbolRegistry(object):
+    """
+    The in-process interning registry of the integer ids of ticker symbols stored
+    in the symbols dimension table (see SymbolModel).
+
+    Ticker symbols are mapped to their integer id (and back) from memory once they
+    have been read or registered, so that repeatedly writing the same symbols
+    only queries the database for symbols the registry has not seen before. Ids
+    of new symbols are inserted in bulk and are only interned once the
+    transaction that inserted them is committed: if said transaction is rolled
+    back the ids are discarded so that the registry never hands out an id that
+    does not exist in the database.
+
+    Args:
+        sqlaengine (sqlalchemy.engine.Engine): The engine of the database the
+            symbols table is stored in. The table is created if it does not exist.
+
+    Attributes:
+        _sqlaengine (sqlalchemy.engine.Engine): The engine of the database.
+
+        _symbol_ids (dict): The interned {symbol: symbol_id} mapping.
+
+        _symbols (dict): The interned {symbol_id: symbol} mapping.
+
+        _lock (threading.Lock): The lock guarding the interned mappings.
+
+    """
+    def __init__(self, sqlaengine):
+
+        self._sqlaengine = sqlaengine
+        SymbolModel.__table__.create(self._sqlaengine, checkfirst=True)
+
+        self._symbol_ids = {}
+        self._symbols = {}
+        self._lock = threading.Lock()
+
+        # Interning the ids registered by a transaction only once it is committed:
+        event.listen(self._sqlaengine, "commit", self._intern_pending_symbol_ids)
+        event.listen(self._sqlaengine, "rollback", self._discard_pending_symbol_ids)
+
+    def get_symbol_ids(self, symbols, con=None, register=True):
+        """
+        The method maps ticker symbols to their integer ids, registering the
+        symbols that are not yet stored in the symbols table.
+
+        Args:
+            symbols (iterable): The ticker symbols.
+
+            con (sqlalchemy.engine.Connection): An optional connection used to read
+                and register symbols so that the registration shares the transaction
+                of the rows referencing the symbols. A transaction of the registry's
+                engine is used if no connection is provided.
+
+            register (bool): Whether unknown symbols are registered. If False they
+                are left out of the returned dict. Defaults to True.
+
+        Returns:
+            dict: The {symbol: symbol_id} of each symbol.
+
+        """
+        symbols = [str(symbol) for symbol in dict.fromkeys(symbols)]
+
+        with self._lock:
+            symbol_ids = {symbol: self._symbol_ids[symbol] for symbol in symbols if symbol in self._symbol_ids}
+
+        unknown_symbols = [symbol for symbol in symbols if symbol not in symbol_ids]
+        if not unknown_symbols:
+            return symbol_ids
+
+        if con is None:
+            with self._sqlaengine.begin() as conn:
+                return dict(symbol_ids, **self._read_symbol_ids(unknown_symbols, conn, register))
+
+        return dict(symbol_ids, **self._read_symbol_ids(unknown_symbols, con, register))
+
+    def get_symbol_id(self, symbol, con=None, register=True):
+        """Returns the integer id of a single ticker symbol (None if it is unknown and register is False)."""
+        return self.get_symbol_ids([symbol], con=con, register=register).get(str(symbol))
+
+    def get_symbols(self, symbol_ids, con=None):
+        """
+        The method maps integer ids back to their ticker symbols.
+
+        Args:
+            symbol_ids (iterable): The integer symbol ids.
+
+            con (sqlalchemy.engine.Connection): An optional connection used to read
+                the ids that are not interned.
+
+        Returns:
+            dict: The {symbol_id: symbol} of each known id.
+
+        """
+        symbol_ids = [int(symbol_id) for symbol_id in dict.fromkeys(symbol_ids)]
+
+        with self._lock:
+            symbols = {symbol_id: self._symbols[symbol_id] for symbol_id in symbol_ids if symbol_id in self._symbols}
+
+        unknown_ids = [symbol_id for symbol_id in symbol_ids if symbol_id not in symbols]
+        if unknown_ids:
+
+            symbol_table = SymbolModel.__table__
+            read_con = con if con is not None else self._sqlaengine.connect()
+            try:
+                stored_symbols = self._select_chunked(
+                    read_con, symbol_table.c.symbol_id, unknown_ids)
+            finally:
+                if con is None:
+                    read_con.close()
+
+            self._intern(stored_symbols)
+            symbols.update({symbol_id: symbol for symbol, symbol_id in stored_symbols.items()})
+
+        return symbols
+
+    def _read_symbol_ids(self, symbols, con, register):
+        """
+        The method reads the ids of symbols that are not interned, registering the
+        symbols that are not stored if register is True. Stored ids are interned
+        immediately; the ids of newly inserted symbols are interned when the
+        transaction of con is committed.
+
+        """
+        symbol_table = SymbolModel.__table__
+
+        # Reusing the ids registered earlier by the same uncommitted transaction:
+        pending_symbol_ids = con.info.setdefault(_PENDING_SYMBOL_IDS, {})
+        symbol_ids = {symbol: pending_symbol_ids[symbol] for symbol in symbols if symbol in pending_symbol_ids}
+
+        stored_symbol_ids = self._select_chunked(
+            con, symbol_table.c.symbol, [symbol for symbol in symbols if symbol not in symbol_ids])
+        self._intern(stored_symbol_ids)
+        symbol_ids.update(stored_symbol_ids)
+
+        new_symbols = [symbol for symbol in symbols if symbol not in symbol_ids]
+        if register and new_symbols:
+
+            con.execute(self._get_symbol_insert(), [{"symbol": symbol} for symbol in new_symbols])
+            new_symbol_ids = self._select_chunked(con, symbol_table.c.symbol, new_symbols)
+
+            pending_symbol_ids.update(new_symbol_ids)
+            symbol_ids.update(new_symbol_ids)
+
+        return symbol_ids
+
+    def _select_chunked(self, con, key_column, keys):
+        """
+        The method selects the (symbol, symbol_id) rows whose key column is in a
+        list of keys, in chunks to stay within the bound parameter limits of the
+        database.
+
+        Returns:
+            dict: The {symbol: symbol_id} of the stored rows.
+
+        """
+        symbol_table = SymbolModel.__table__
+        stored_symbol_ids = {}
+
+        for chunk_start in range(0, len(keys), 500):
+            stored_symbol_ids.update(con.execute(
+                select([symbol_table.c.symbol, symbol_table.c.symbol_id]).where(
+                    key_column.in_(keys[chunk_start:chunk_start + 500]))).fetchall())
+
+        return stored_symbol_ids
+
+    def _get_symbol_insert(self):
+        """
+        The method builds the bulk insert statement of the symbols table that
+        ignores symbols registered concurrently by another process, using the
+        syntax of the connected database.
+
+        """
+        symbol_table = SymbolModel.__table__
+
+        if self._sqlaengine.dialect.name == 'postgresql':
+            return postgresql_insert(symbol_table).on_conflict_do_nothing()
+
+        return symbol_table.insert().prefix_with('OR IGNORE', dialect='sqlite').prefix_with('IGNORE', dialect='mysql')
+
+    def _intern(self, symbol_ids):
+        """Adds a {symbol: symbol_id} mapping to the interned mappings."""
+        with self._lock:
+            self._symbol_ids.update(symbol_ids)
+            self._symbols.update({symbol_id: symbol for symbol, symbol_id in symbol_ids.items()})
+
+    def _intern_pending_symbol_ids(self, con):
+        """The commit event listener interning the ids registered by the committed transaction."""
+        pending_symbol_ids = con.info.pop(_PENDING_SYMBOL_IDS, None)
+        if pending_symbol_ids:
+            self._intern(pending_symbol_ids)
+
+    def _discard_pending_symbol_ids(self, con):
+        """The rollback event listener discarding the ids registered by the rolled back transaction."""
+        con.info.pop(_PENDING_SYMBOL_IDS, None)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._symbol_ids)
+
+    def __repr__(self):
+        return f"SymbolRegistry(interned={len(self)})"
@@ -1,5 +1,10 @@
+# Importing native packages:
+import heapq
+import hashlib
+
 # Importing 3rd party packages:
 import pandas as pd
+from sqlalchemy import create_engine, inspect, text
 
 """
 The script contains methods that are used to assist in the compilation of stock
@@ -9,6 +14,10 @@ various processes that need to be done when constructing data pipelines at scale
 These compile methods all pertain to the stock data pipeline libraries. They involve:
 
 * Generating a list of stock ticker symbols from a csv containing ticker symbols.
+* Compiling the expected ingestion cost of each ticker from a database and from
+    previous fetch durations.
+* Splitting a list of ticker symbols into shards of roughly equal expected work
+    for parallel workers.
 
 """
 
@@ -45,3 +54,209 @@ def compile_ticker_list(csv_file):
     ticker_symbol_lst = ticker_symbol_col.to_list()
 
     return ticker_symbol_lst
+
+def compile_ticker_costs(ticker_lst, db_uri=None, fetch_durations=None):
+    """
+    The method compiles the expected cost of ingesting each ticker symbol in a
+    list based on the historical data that is available about said ticker.
+
+    Two sources of historical cost are supported. If a database URI is provided
+    the number of rows stored for each ticker (in its “{ticker}_price_history”
+    and legacy “{ticker}_holdings_data” tables and in its latest “fund_holdings”
+    snapshot) is counted. If
+    a dictionary of previous fetch durations is provided (in seconds) it is used
+    directly. As these two sources are measured in different units, each source
+    is normalized by its mean so that an average ticker has a cost of 1.0 per
+    source. The normalized costs of all available sources are then summed.
+
+    Tickers that have no historical data in a source are assigned the mean cost
+    of that source (1.0) so that new tickers are treated as average work instead
+    of free work.
+
+    Args:
+        ticker_lst (list): The list of ticker symbols to compile costs for.
+
+        db_uri (str): The optional string URI of the database containing the
+            stored stock data tables.
+
+        fetch_durations (dict): An optional dictionary of {ticker: seconds}
+            describing how long previous fetches of each ticker took.
+
+    Returns:
+        dict: The dictionary of {ticker: expected_cost} for every ticker in the
+            input list.
+
+    """
+    # Creating the list of cost sources to be normalized and summed:
+    cost_sources = []
+
+    # Counting the rows stored for each ticker in the connected database:
+    if db_uri is not None:
+
+        sqlaengine = create_engine(db_uri)
+        existing_db_tables = set(inspect(sqlaengine).get_table_names())
+
+        row_counts = {}
+        with sqlaengine.connect() as conn:
+
+            # Reading the size of the latest holdings snapshot of every fund in one query:
+            holdings_counts = {}
+            if "fund_holdings_digests" in existing_db_tables:
+                holdings_counts = dict(conn.execute(
+                    text(
+                        "SELECT s.symbol, d.row_count FROM fund_holdings_digests d "
+                        "JOIN symbols s ON s.symbol_id = d.fund_id")).fetchall())
+
+            for ticker in ticker_lst:
+
+                ticker_rows = holdings_counts.get(ticker) or 0
+                for ticker_tbl in (f"{ticker}_price_history", f"{ticker}_holdings_data"):
+                    if ticker_tbl in existing_db_tables:
+                        ticker_rows += conn.execute(
+                            text(f'SELECT COUNT(*) FROM "{ticker_tbl}"')).scalar()
+
+                # Only tickers with stored data are considered to have a known cost:
+                if ticker_rows > 0:
+                    row_counts[ticker] = ticker_rows
+
+        sqlaengine.dispose()
+        cost_sources.append(row_counts)
+
+    # Adding the previous fetch durations as a cost source:
+    if fetch_durations is not None:
+        cost_sources.append({
+            ticker: duration for ticker, duration in fetch_durations.items()
+            if duration is not None and duration > 0})
+
+    # Building the cost dict, defaulting to uniform cost if no sources are known:
+    ticker_costs = {ticker: 0.0 for ticker in ticker_lst}
+    for cost_source in cost_sources:
+
+        known_costs = [cost_source[ticker] for ticker in ticker_lst if ticker in cost_source]
+        source_mean = (sum(known_costs) / len(known_costs)) if known_costs else 1.0
+
+        for ticker in ticker_lst:
+            ticker_costs[ticker] += cost_source.get(ticker, source_mean) / source_mean
+
+    if len(cost_sources) == 0:
+        ticker_costs = {ticker: 1.0 for ticker in ticker_lst}
+
+    return ticker_costs
+
+def shard_ticker_list(ticker_lst, num_shards, ticker_costs=None, stable=False, load_factor=1.25):
+    """
+    The method splits a list of ticker symbols into a number of shards where each
+    shard contains a roughly equal amount of expected work.
+
+    By default the shards are built using the greedy “longest processing time
+    first” method. Tickers are sorted by expected cost (most expensive first) and
+    each ticker is assigned to the shard that currently has the smallest total
+    cost. Ties are broken by ticker symbol and shard number so the output is
+    deterministic for the same input.
+
+    If the stable parameter is set, tickers are instead assigned via rendezvous
+    (highest random weight) hashing with bounded loads. Each ticker ranks every
+    shard by a hash of (ticker, shard_number) and is placed in the highest
+    ranked shard whose total cost would not exceed load_factor times the mean
+    shard cost. This means that a ticker is almost always assigned to the same
+    worker across runs even as the ticker list or costs change slightly, which
+    keeps any per-worker caches warm, at the cost of a slightly less even split.
+
+    Args:
+        ticker_lst (list): The list of ticker symbols to be split. This is
+            typically the output of the compile_ticker_list() method.
+
+        num_shards (int): The number of shards (parallel workers) to split the
+            ticker list into.
+
+        ticker_costs (dict): An optional dictionary of {ticker: expected_cost}
+            typically generated by the compile_ticker_costs() method. Tickers
+            missing from the dictionary are assigned the mean cost. If it is not
+            provided every ticker is assigned an equal cost.
+
+        stable (bool): Whether tickers should be assigned to shards using stable
+            rendezvous hashing instead of the greedy cost balancing.
+
+        load_factor (float): The maximum ratio of a shard’s cost to the mean shard
+            cost that is allowed when performing stable assignment.
+
+    Returns:
+        list: A list of num_shards lists of ticker symbols. The tickers within
+            each shard are kept in the order they appeared in the input list.
+
+    """
+    if num_shards < 1:
+        raise ValueError("num_shards must be a positive integer.")
+
+    if stable and load_factor < 1:
+        raise ValueError("load_factor must be greater than or equal to 1.")
+
+    # Removing duplicate tickers while maintaining the order of the input list:
+    unique_ticker_lst = list(dict.fromkeys(ticker_lst))
+    ticker_order = {ticker: position for position, ticker in enumerate(unique_ticker_lst)}
+
+    # Building the cost of each ticker, filling unknown tickers with the mean cost:
+    ticker_costs = ticker_costs or {}
+    known_costs = [ticker_costs[ticker] for ticker in unique_ticker_lst if ticker in ticker_costs]
+    mean_cost = (sum(known_costs) / len(known_costs)) if known_costs else 1.0
+    costs = {ticker: float(ticker_costs.get(ticker, mean_cost)) for ticker in unique_ticker_lst}
+
+    # Sorting tickers most expensive first with the ticker symbol as a tie breaker:
+    sorted_tickers = sorted(unique_ticker_lst, key=lambda ticker: (-costs[ticker], str(ticker)))
+
+    shards = [[] for shard in range(num_shards)]
+
+    if stable:
+
+        # The maximum cost any single shard can be assigned:
+        shard_loads = [0.0] * num_shards
+        shard_capacity = load_factor * sum(costs.values()) / num_shards
+
+        for ticker in sorted_tickers:
+
+            # Ranking each shard by its hash weight for the ticker:
+            shard_ranking = sorted(
+                range(num_shards),
+                key=lambda shard: _rendezvous_weight(ticker, shard),
+                reverse=True)
+
+            # Assigning ticker to the highest ranked shard with remaining capacity:
+            assigned_shard = next(
+                (shard for shard in shard_ranking
+                    if shard_loads[shard] + costs[ticker] <= shard_capacity),
+                min(range(num_shards), key=lambda shard: (shard_loads[shard], shard)))
+
+            shards[assigned_shard].append(ticker)
+            shard_loads[assigned_shard] += costs[ticker]
+
+    else:
+
+        # Min-heap of (shard_load, shard_number) used to find the least loaded shard:
+        shard_heap = [(0.0, shard) for shard in range(num_shards)]
+
+        for ticker in sorted_tickers:
+            shard_load, shard = heapq.heappop(shard_heap)
+            shards[shard].append(ticker)
+            heapq.heappush(shard_heap, (shard_load + costs[ticker], shard))
+
+    # Restoring the input order of tickers within each shard:
+    return [sorted(shard, key=ticker_order.get) for shard in shards]
+
+def _rendezvous_weight(ticker, shard):
+    """
+    The internal method generates the deterministic hash weight of a (ticker, shard)
+    pair used by the rendezvous hashing in shard_ticker_list(). A md5 digest is
+    used instead of the builtin hash() so that weights are identical across
+    processes and python sessions.
+
+    Args:
+        ticker (str): The ticker symbol being assigned.
+
+        shard (int): The shard number being ranked.
+
+    Returns:
+        int: The integer weight of the pair.
+
+    """
+    digest = hashlib.md5(f"{ticker}:{shard}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
@@ -0,0 +1,915 @@
+# Importing native packages:
+import os
+import sys
+import time
+import queue
+import pickle
+import argparse
+import functools
+import itertools
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Shared memory (Python 3.8+) carries the data buffers of the payloads sent to the writer process:
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:
+    resource_tracker = shared_memory = None
+
+# Importing local packages:
+from velkoz_web_packages.objects_stock_data.stock_data_compiler import compile_ticker_list, shard_ticker_list
+from velkoz_web_packages.objects_stock_data.objects_stock_price.web_objects_stock_price import fetch_price_history, format_price_history
+from velkoz_web_packages.objects_stock_data.objects_stock_price.ingestion_engines_stock_price import StockPriceDataIngestionEngine
+from velkoz_web_packages.objects_stock_data.objects_fund_holdings.web_objects_fund_holdings import fetch_holdings_html, parse_holdings_html
+from velkoz_web_packages.objects_stock_data.objects_fund_holdings.ingestion_engines_fund_holdings import FundHoldingsDataIngestionEngine
+from velkoz_web_packages.objects_stock_data.objects_symbols.symbol_metadata_cache import SymbolMetadataCache
+
+"""
+The script contains the StockDataPipeline, the standard entry point for running
+stock data ingestion at scale. It ties together the ticker compiling methods in
+stock_data_compiler, the fetch/parse halves of the stock data WebPageResponse
+Objects and the stock data Ingestion Engines. The pipeline can be used through
+its python API or as a command line tool:
+
+    python -m velkoz_web_packages.objects_stock_data.stock_data_pipeline "sqlite:///stock.db" tickers.csv --data-type price
+
+"""
+
+# The stage functions and ingestion engine used for each supported type of stock data.
+# Each entry is (fetch_func, parse_func, ingestion_engine_class, engine_write_method):
+STOCK_DATA_TYPES = {
+    "price": (fetch_price_history, format_price_history, StockPriceDataIngestionEngine, "_write_price_history"),
+    "holdings": (fetch_holdings_html, parse_holdings_html, FundHoldingsDataIngestionEngine, "_write_holdings_data")
+}
+
+# The sentinel object placed onto a queue to signal the end of a stage's input:
+_STAGE_COMPLETE = object()
+
+# The number of seconds the main process of run_multiprocess() waits for a report before checking that no process died:
+_PROCESS_POLL_SECONDS = 1.0
+
+# Whether payload buffers are sent through shared memory. On Windows a shared memory
+# block is destroyed once the worker that created it closes it, so it is POSIX only:
+_SHARED_MEMORY_PAYLOADS = shared_memory is not None and os.name == "posix"
+
+class StockDataPipeline(object):
+    """
+    The StockDataPipeline object runs the ingestion of a list of ticker symbols
+    through three separate stages that are connected by bounded queues:
+
+    * fetch: A pool of threads that performs the network I/O for each ticker via
+        the fetch function of the data type (eg: fetch_price_history).
+    * parse: A pool of processes that converts the raw fetched data into the
+        dataframe written to the database via the parse function of the data type
+        (eg: format_price_history). Performing parsing in separate processes
+        means that CPU bound html parsing is not limited by the GIL.
+    * write: A single writer thread that collects parsed dataframes into batches
+        and writes each batch to the database in a single transaction via the
+        write method of the data type’s Ingestion Engine.
+
+    As each queue between stages is bounded, a slow stage causes the stages before
+    it to block instead of accumulating an unbounded amount of fetched or parsed
+    data in memory. Once all tickers have been processed a report describing the
+    throughput of the pipeline is returned.
+
+    The run_multiprocess() method provides an alternative mode in which worker
+    processes perform both fetching and parsing and a single dedicated writer
+    process owns the database connection.
+
+    Args:
+
+        db_uri (str): The string URI for the database to be connected to. It is
+            used to initialize the Ingestion Engine.
+
+        data_type (str): The type of stock data to ingest. Either "price" or
+            "holdings" (the keys of STOCK_DATA_TYPES).
+
+        fetch_workers (int): The number of threads performing fetch requests.
+
+        parse_workers (int): The number of processes parsing fetched data. If
+            set to 0 parsing is performed on a thread instead of a process pool.
+
+        write_batch_size (int): The number of parsed tickers written to the
+            database per transaction.
+
+        queue_size (int): The maximum number of items that can wait between
+            two stages before the upstream stage is blocked.
+
+        fetch_func (function): An optional function overwriting the fetch function
+            of the data type. It is called with a ticker symbol.
+
+        parse_func (function): An optional function overwriting the parse function
+            of the data type. It is called with the output of the fetch function and
+            must be picklable (defined at the module level) to be used by the
+            process pool.
+
+        symbol_cache (SymbolMetadataCache): An optional symbol metadata cache. If it
+            is provided to a holdings pipeline, tickers that are not funds are
+            filtered out (and reported as skipped) in a single batch before any
+            ticker is fetched, so the fetch stage no longer checks the quote type
+            of each ticker.
+
+        engine_kwargs (dict): Optional key-word arguments passed to the Ingestion
+            Engine of the write stage (eg: {"derived_metrics": True}).
+
+    Attributes:
+
+        _db_uri (str): The URI of the database used to initialize the Ingestion Engine.
+
+        _data_type (str): The type of stock data being ingested.
+
+        _fetch_func (function): The function performing the fetch stage.
+
+        _parse_func (function): The function performing the parse stage.
+
+        _ingestion_engine (BaseWebPageIngestionEngine): The Ingestion Engine that
+            is used by the write stage.
+
+        _write_method (function): The Ingestion Engine method used to write a single
+            (ticker, dataframe) pair.
+
+        _fetch_workers (int): The number of fetch threads.
+
+        _parse_workers (int): The number of parse processes.
+
+        _write_batch_size (int): The number of tickers written per transaction.
+
+        _queue_size (int): The maximum size of the queues between stages.
+
+        _symbol_cache (SymbolMetadataCache): The cache used to filter holdings tickers or None.
+
+        _engine_kwargs (dict): The key-word arguments of the Ingestion Engine.
+
+    """
+    def __init__(self, db_uri, data_type="price", fetch_workers=8, parse_workers=2,
+        write_batch_size=50, queue_size=100, fetch_func=None, parse_func=None, symbol_cache=None,
+        engine_kwargs=None):
+
+        if data_type not in STOCK_DATA_TYPES:
+            raise ValueError(f"Unsupported data type {data_type}. Must be one of {list(STOCK_DATA_TYPES)}")
+
+        # Declaring instance variables:
+        self._db_uri = db_uri
+        self._data_type = data_type
+
+        default_fetch_func, default_parse_func, engine_class, write_method_name = STOCK_DATA_TYPES[data_type]
+        self._fetch_func = fetch_func or default_fetch_func
+        self._parse_func = parse_func or default_parse_func
+
+        # Skipping the per-ticker quote type check of the holdings fetch when tickers are pre-filtered:
+        self._symbol_cache = symbol_cache if data_type == "holdings" else None
+        if self._symbol_cache is not None and fetch_func is None:
+            self._fetch_func = functools.partial(fetch_holdings_html, check_quote_type=False)
+
+        # Initalizing the Ingestion Engine used by the single writer stage:
+        self._engine_kwargs = dict(engine_kwargs or {})
+        self._ingestion_engine = engine_class(db_uri, **self._engine_kwargs)
+        self._write_method = getattr(self._ingestion_engine, write_method_name)
+
+        # Declaring the concurrency parameters of each stage:
+        self._fetch_workers = max(1, fetch_workers)
+        self._parse_workers = max(0, parse_workers)
+        self._write_batch_size = max(1, write_batch_size)
+        self._queue_size = max(1, queue_size)
+
+    def run(self, ticker_lst):
+        """
+        The method runs every ticker in the input list through the fetch, parse
+        and write stages and blocks until all tickers have been processed.
+
+        Failures of an individual ticker in any stage are recorded in the report
+        and do not stop the pipeline. Tickers whose fetch function returns None
+        (eg: equities passed to the holdings pipeline) are recorded as skipped.
+
+        Args:
+            ticker_lst (list): The list of ticker symbols to ingest.
+
+        Returns:
+            dict: The throughput report of the pipeline run. It contains the keys:
+
+                * "tickers": The number of tickers passed into the pipeline.
+                * "written": The number of tickers written to the database.
+                * "skipped": The list of tickers that had no data to write.
+                * "failed": A dict of {ticker: error message} for failed tickers.
+                * "rows_written": The number of dataframe rows written.
+                * "batches_written": The number of write transactions.
+                * "elapsed_seconds": The wall-clock duration of the run.
+                * "tickers_per_second": The number of tickers written per second.
+                * "stage_seconds": A dict of the total time spent in each stage.
+                * "fetch_durations": A dict of {ticker: seconds} spent fetching each
+                    ticker. It can be passed into compile_ticker_costs().
+
+        """
+        self._report = {
+            "tickers": len(ticker_lst),
+            "written": 0,
+            "skipped": [],
+            "failed": {},
+            "rows_written": 0,
+            "batches_written": 0,
+            "elapsed_seconds": 0.0,
+            "tickers_per_second": 0.0,
+            "stage_seconds": {"fetch": 0.0, "parse": 0.0, "write": 0.0},
+            "fetch_durations": {}
+        }
+        self._report_lock = threading.Lock()
+
+        ticker_lst = self._filter_tickers(ticker_lst, self._report)
+
+        # Declaring the queues connecting each stage:
+        ticker_queue = queue.Queue()
+        fetched_queue = queue.Queue(maxsize=self._queue_size)
+        parse_future_queue = queue.Queue(maxsize=self._queue_size)
+        parsed_queue = queue.Queue(maxsize=self._queue_size)
+
+        for ticker in ticker_lst:
+            ticker_queue.put(ticker)
+
+        for worker in range(self._fetch_workers):
+            ticker_queue.put(_STAGE_COMPLETE)
+
+        start_time = time.perf_counter()
+
+        # Parsing on a thread if no parse processes are requested:
+        if self._parse_workers > 0:
+            parse_executor = ProcessPoolExecutor(max_workers=self._parse_workers)
+        else:
+            parse_executor = ThreadPoolExecutor(max_workers=1)
+
+        # The countdown of fetch threads used to close the fetched queue:
+        self._active_fetch_workers = self._fetch_workers
+
+        stage_threads = [
+            threading.Thread(target=self._fetch_stage, args=(ticker_queue, fetched_queue), daemon=True)
+            for worker in range(self._fetch_workers)]
+        stage_threads.append(threading.Thread(
+            target=self._parse_dispatch_stage, args=(fetched_queue, parse_future_queue, parse_executor), daemon=True))
+        stage_threads.append(threading.Thread(
+            target=self._parse_collect_stage, args=(parse_future_queue, parsed_queue), daemon=True))
+        stage_threads.append(threading.Thread(
+            target=self._write_stage, args=(parsed_queue,), daemon=True))
+
+        for stage_thread in stage_threads:
+            stage_thread.start()
+
+        for stage_thread in stage_threads:
+            stage_thread.join()
+
+        parse_executor.shutdown()
+
+        # Building the final throughput report:
+        elapsed_seconds = time.perf_counter() - start_time
+        self._report["elapsed_seconds"] = elapsed_seconds
+        self._report["tickers_per_second"] = self._report["written"] / elapsed_seconds if elapsed_seconds > 0 else 0.0
+
+        return self._report
+
+    def _fetch_stage(self, ticker_queue, fetched_queue):
+        """
+        The method run by each fetch thread. It takes tickers from the ticker queue,
+        performs the fetch function and places (ticker, raw_data) onto the bounded
+        fetched queue. The last fetch thread to finish signals the parse stage.
+
+        """
+        while True:
+
+            ticker = ticker_queue.get()
+            if ticker is _STAGE_COMPLETE:
+                break
+
+            fetch_start = time.perf_counter()
+            try:
+                raw_data = self._fetch_func(ticker)
+
+            except Exception as error:
+                self._record_failure(ticker, "fetch", error)
+                continue
+
+            finally:
+                fetch_duration = time.perf_counter() - fetch_start
+                with self._report_lock:
+                    self._report["fetch_durations"][ticker] = fetch_duration
+                    self._report["stage_seconds"]["fetch"] += fetch_duration
+
+            if raw_data is None:
+                with self._report_lock:
+                    self._report["skipped"].append(ticker)
+                continue
+
+            # Blocking here if the parse stage is behind (backpressure):
+            fetched_queue.put((ticker, raw_data))
+
+        # The final fetch thread to complete closes the fetched queue:
+        with self._report_lock:
+            self._active_fetch_workers -= 1
+            last_fetch_worker = self._active_fetch_workers == 0
+
+        if last_fetch_worker:
+            fetched_queue.put(_STAGE_COMPLETE)
+
+    def _parse_dispatch_stage(self, fetched_queue, parse_future_queue, parse_executor):
+        """
+        The method submits fetched data to the parse executor. The resulting
+        futures are placed onto a bounded queue so the number of in-flight parse
+        tasks is limited by the queue size.
+
+        """
+        while True:
+
+            fetched_item = fetched_queue.get()
+            if fetched_item is _STAGE_COMPLETE:
+                parse_future_queue.put(_STAGE_COMPLETE)
+                break
+
+            ticker, raw_data = fetched_item
+            parse_future_queue.put((ticker, time.perf_counter(), parse_executor.submit(self._parse_func, raw_data)))
+
+    def _parse_collect_stage(self, parse_future_queue, parsed_queue):
+        """
+        The method collects the results of the parse futures in submission order
+        and places (ticker, dataframe) onto the bounded parsed queue.
+
+        """
+        while True:
+
+            parse_item = parse_future_queue.get()
+            if parse_item is _STAGE_COMPLETE:
+                parsed_queue.put(_STAGE_COMPLETE)
+                break
+
+            ticker, submit_time, parse_future = parse_item
+            try:
+                parsed_df = parse_future.result()
+
+            except Exception as error:
+                self._record_failure(ticker, "parse", error)
+                continue
+
+            with self._report_lock:
+                self._report["stage_seconds"]["parse"] += time.perf_counter() - submit_time
+
+            parsed_queue.put((ticker, parsed_df))
+
+    def _write_stage(self, parsed_queue):
+        """
+        The method run by the single writer thread. It collects parsed dataframes
+        into batches of write_batch_size and writes each batch in one transaction.
+
+        """
+        write_batch = []
+        while True:
+
+            parsed_item = parsed_queue.get()
+            if parsed_item is _STAGE_COMPLETE:
+                break
+
+            write_batch.append(parsed_item)
+            if len(write_batch) >= self._write_batch_size:
+                self._write_batch(write_batch)
+                write_batch = []
+
+        # Writing the final partial batch:
+        if len(write_batch) > 0:
+            self._write_batch(write_batch)
+
+    def _write_batch(self, write_batch):
+        """
+        The method writes a batch of (ticker, dataframe) pairs to the database via
+        the Ingestion Engine and records the outcome in the report of the run.
+
+        """
+        write_start = time.perf_counter()
+        written_batch, batches_written, write_failures = _write_stock_data_batch(
+            self._ingestion_engine, self._write_method, write_batch)
+
+        with self._report_lock:
+            self._report["failed"].update(write_failures)
+            self._report["written"] += len(written_batch)
+            self._report["rows_written"] += sum(len(parsed_df) for ticker, parsed_df in written_batch)
+            self._report["batches_written"] += batches_written
+            self._report["stage_seconds"]["write"] += time.perf_counter() - write_start
+
+    def run_multiprocess(self, ticker_lst, worker_processes=None):
+        """
+        The method runs every ticker in the input list through the pipeline using
+        separate processes instead of the thread based stages of the run() method.
+
+        A pool of worker processes each fetch and parse tickers, building the
+        dataframe that is written to the database. Instead of sending whole
+        WebPageResponse Objects (and their http responses) between processes,
+        each worker sends a compact payload of the parsed dataframe, serialized
+        via pickle protocol 5 with its buffers in shared memory (see
+        encode_stock_data_payload()), to a single dedicated writer process over a
+        bounded queue. The writer
+        process is the only process that initializes an Ingestion Engine and
+        connects to the database, writing payloads in batches of write_batch_size.
+        This means that CPU bound parsing scales with the number of cores while
+        the database (notably SQLite) only ever sees one writer.
+
+        The main process waits for the report of each process while polling that
+        no process has died before sending its report (eg: killed or crashed in
+        the Ingestion Engine). As the other processes would then block forever on
+        the dead process, they are terminated and the run ends with the exit codes
+        of the dead processes in the "process_errors" of the report.
+
+        Args:
+            ticker_lst (list): The list of ticker symbols to ingest.
+
+            worker_processes (int): The number of fetch/parse worker processes.
+                Defaults to the number of CPUs.
+
+        Returns:
+            dict: The throughput report of the run in the same format as the
+                report returned by the run() method, with the {process name: error}
+                of the processes that died in "process_errors".
+
+        """
+        worker_processes = worker_processes or multiprocessing.cpu_count()
+        mp_context = multiprocessing.get_context()
+
+        skipped_tickers = []
+        report_tickers = len(ticker_lst)
+        ticker_lst = self._filter_tickers(ticker_lst, {"skipped": skipped_tickers})
+
+        # Declaring the queues connecting the main, worker and writer processes:
+        ticker_queue = mp_context.Queue()
+        payload_queue = mp_context.Queue(maxsize=self._queue_size)
+        report_queue = mp_context.Queue()
+
+        for ticker in ticker_lst:
+            ticker_queue.put(ticker)
+
+        for worker in range(worker_processes):
+            ticker_queue.put(None)
+
+        # Sharing the resource tracker of the main process with the workers, so that the shared memory
+        # blocks of a worker are not unlinked when it exits before the writer has decoded them:
+        if _SHARED_MEMORY_PAYLOADS:
+            resource_tracker.ensure_running()
+
+        start_time = time.perf_counter()
+
+        writer_process = mp_context.Process(
+            target=_writer_process_main,
+            args=(self._db_uri, self._data_type, self._write_batch_size, worker_processes,
+                payload_queue, report_queue, self._engine_kwargs))
+        worker_process_lst = [
+            mp_context.Process(
+                target=_worker_process_main,
+                args=(self._fetch_func, self._parse_func, ticker_queue, payload_queue, report_queue))
+            for worker in range(worker_processes)]
+
+        writer_process.start()
+        for worker_process in worker_process_lst:
+            worker_process.start()
+
+        # Collecting the partial reports of every worker and the writer process:
+        report = {
+            "tickers": report_tickers,
+            "written": 0,
+            "skipped": skipped_tickers,
+            "failed": {},
+            "rows_written": 0,
+            "batches_written": 0,
+            "elapsed_seconds": 0.0,
+            "tickers_per_second": 0.0,
+            "stage_seconds": {"fetch": 0.0, "parse": 0.0, "write": 0.0},
+            "fetch_durations": {},
+            "process_errors": {}
+        }
+        pipeline_processes = [writer_process] + worker_process_lst
+        reported_processes = set()
+
+        while len(reported_processes) < len(pipeline_processes) and not report["process_errors"]:
+
+            # Checking that no process died without its report while waiting for the next one:
+            try:
+                process_report = report_queue.get(timeout=_PROCESS_POLL_SECONDS)
+
+            except queue.Empty:
+                report["process_errors"] = {
+                    process.name: f"exited with exit code {process.exitcode} before sending its report"
+                    for process in pipeline_processes
+                    if process.exitcode not in (None, 0) and process.name not in reported_processes}
+                continue
+
+            reported_processes.add(process_report.pop("process"))
+            for report_key, report_value in process_report.items():
+
+                if isinstance(report_value, dict) and report_key == "stage_seconds":
+                    for stage, seconds in report_value.items():
+                        report["stage_seconds"][stage] += seconds
+
+                elif isinstance(report_value, dict):
+                    report[report_key].update(report_value)
+
+                else:
+                    report[report_key] += report_value
+
+        if report["process_errors"]:
+
+            # Terminating the processes that would otherwise block forever on the dead process:
+            for pipeline_process in pipeline_processes:
+                if pipeline_process.is_alive():
+                    pipeline_process.terminate()
+
+            _discard_payload_queue(payload_queue)
+
+        for pipeline_process in pipeline_processes:
+            pipeline_process.join()
+
+        # Building the final throughput report:
+        elapsed_seconds = time.perf_counter() - start_time
+        report["elapsed_seconds"] = elapsed_seconds
+        report["tickers_per_second"] = report["written"] / elapsed_seconds if elapsed_seconds > 0 else 0.0
+
+        return report
+
+    def _filter_tickers(self, ticker_lst, report):
+        """
+        The method removes the tickers that have no data of the pipeline's data type
+        (equities passed to a holdings pipeline) before any ticker is fetched, using
+        the symbol metadata cache. The removed tickers are added to the report as
+        skipped. Tickers are returned unchanged if the pipeline has no cache.
+
+        Args:
+            ticker_lst (list): The list of ticker symbols to ingest.
+
+            report (dict): The report the skipped tickers are added to.
+
+        Returns:
+            list: The tickers to be fetched.
+
+        """
+        if self._symbol_cache is None:
+            return ticker_lst
+
+        fund_tickers = set(self._symbol_cache.filter_funds(ticker_lst))
+        report["skipped"].extend(ticker for ticker in ticker_lst if ticker not in fund_tickers)
+
+        return [ticker for ticker in ticker_lst if ticker in fund_tickers]
+
+    def _record_failure(self, ticker, stage, error):
+        """
+        The method records the failure of a ticker in a pipeline stage in the
+        report of the current run.
+
+        """
+        with self._report_lock:
+            self._report["failed"][ticker] = f"{stage}: {type(error).__name__}: {error}"
+
+def encode_stock_data_payload(ticker, parsed_df):
+    """
+    The method serializes a parsed dataframe into the compact payload that is
+    sent from worker processes to the writer process.
+
+    The dataframe is pickled with protocol 5 and its large data buffers (the numpy
+    arrays backing each column) are collected out-of-band and copied into a single
+    shared memory block instead of the pickle stream. Only the ticker, the small
+    pickle stream and the name of the block are sent through the payload queue,
+    never the WebPageResponse Object that produced the dataframe. The block is
+    unlinked by the decode_stock_data_payload() method.
+
+    On Python 3.7 (which has neither protocol 5 nor shared memory) and on Windows
+    the dataframe is pickled in-band with the highest available protocol.
+
+    Args:
+        ticker (str): The ticker symbol the dataframe describes.
+
+        parsed_df (pandas.DataFrame): The parsed dataframe to be written.
+
+    Returns:
+        tuple: The (ticker, pickled_df, shm_name, buffer_sizes) payload, where
+            shm_name is the name of the shared memory block holding the buffers
+            or None if the buffers are in the pickle stream.
+
+    """
+    if not _SHARED_MEMORY_PAYLOADS:
+        return (ticker, pickle.dumps(parsed_df, protocol=pickle.HIGHEST_PROTOCOL), None, [])
+
+    df_buffers = []
+    pickled_df = pickle.dumps(parsed_df, protocol=5, buffer_callback=df_buffers.append)
+    df_buffers = [df_buffer.raw() for df_buffer in df_buffers]
+    buffer_sizes = [df_buffer.nbytes for df_buffer in df_buffers]
+
+    # A shared memory block cannot be empty (eg: a dataframe without rows):
+    if sum(buffer_sizes) == 0:
+        return (ticker, pickle.dumps(parsed_df, protocol=5), None, [])
+
+    # Copying every buffer into one shared memory block that the writer process attaches to:
+    shm_block = shared_memory.SharedMemory(create=True, size=sum(buffer_sizes))
+    try:
+        for df_buffer, buffer_start in zip(df_buffers, itertools.accumulate([0] + buffer_sizes)):
+            shm_block.buf[buffer_start:buffer_start + df_buffer.nbytes] = df_buffer
+
+    except Exception:
+        shm_block.close()
+        shm_block.unlink()
+        raise
+
+    shm_block.close()
+
+    return (ticker, pickled_df, shm_block.name, buffer_sizes)
+
+def decode_stock_data_payload(payload):
+    """
+    The method rebuilds the (ticker, dataframe) pair from a payload generated by
+    the encode_stock_data_payload() method.
+
+    The buffers of the dataframe are copied out of the shared memory block of the
+    payload and the block is unlinked immediately, so a block never outlives the
+    decoding of its payload.
+
+    Args:
+        payload (tuple): The (ticker, pickled_df, shm_name, buffer_sizes) payload.
+
+    Returns:
+        tuple: The (ticker, pandas.DataFrame) pair.
+
+    """
+    ticker, pickled_df, shm_name, buffer_sizes = payload
+    if shm_name is None:
+        return (ticker, pickle.loads(pickled_df))
+
+    shm_block = shared_memory.SharedMemory(name=shm_name)
+    try:
+        df_buffers = [
+            bytearray(shm_block.buf[buffer_start:buffer_start + buffer_size])
+            for buffer_start, buffer_size in zip(itertools.accumulate([0] + buffer_sizes), buffer_sizes)]
+
+    finally:
+        shm_block.close()
+        shm_block.unlink()
+
+    return (ticker, pickle.loads(pickled_df, buffers=df_buffers))
+
+def _discard_payload_queue(payload_queue):
+    """
+    The method empties the payload queue of a run_multiprocess() run that was
+    ended early, unlinking the shared memory blocks of the payloads that will
+    never be decoded by the writer process.
+
+    """
+    while True:
+        try:
+            payload = payload_queue.get(timeout=_PROCESS_POLL_SECONDS)
+
+        except (queue.Empty, OSError, EOFError):
+            break
+
+        if payload is not None and payload[2] is not None:
+            try:
+                shm_block = shared_memory.SharedMemory(name=payload[2])
+                shm_block.close()
+                shm_block.unlink()
+
+            except FileNotFoundError:
+                pass
+
+def _write_stock_data_batch(ingestion_engine, write_method, write_batch):
+    """
+    The method writes a batch of (ticker, dataframe) pairs to the database via an
+    Ingestion Engine write method within a single transaction. If the transaction
+    fails each ticker is retried individually so that one bad dataframe does not
+    fail the rest of the batch.
+
+    If the Ingestion Engine fails to prepare the batch (eg: computing its derived
+    metrics) every ticker of the batch fails, rather than being written without
+    the prepared data.
+
+    Args:
+        ingestion_engine (BaseWebPageIngestionEngine): The Ingestion Engine
+            connected to the database.
+
+        write_method (function): The Ingestion Engine method that writes a single
+            (ticker, dataframe) pair.
+
+        write_batch (list): The list of (ticker, dataframe) pairs.
+
+    Returns:
+        tuple: The (written_batch, batches_written, failures) of the write where
+            failures is a dict of {ticker: error message}.
+
+    """
+    # Letting the Ingestion Engine process the whole batch at once before it is written (eg: derived metrics):
+    prepare_write_batch = getattr(ingestion_engine, "_prepare_write_batch", None)
+    if prepare_write_batch is not None:
+        try:
+            write_batch = prepare_write_batch(write_batch)
+
+        except Exception as error:
+            return ([], 0, {ticker: f"prepare: {type(error).__name__}: {error}" for ticker, _ in write_batch})
+
+    try:
+        with ingestion_engine._write_lock, ingestion_engine._sqlaengine.begin() as conn:
+            for ticker, parsed_df in write_batch:
+                write_method(ticker, parsed_df, con=conn)
+
+        return (write_batch, 1, {})
+
+    except Exception:
+
+        written_batch = []
+        write_failures = {}
+        for ticker, parsed_df in write_batch:
+            try:
+                with ingestion_engine._write_lock:
+                    write_method(ticker, parsed_df)
+                written_batch.append((ticker, parsed_df))
+
+            except Exception as error:
+                write_failures[ticker] = f"write: {type(error).__name__}: {error}"
+
+        return (written_batch, len(written_batch), write_failures)
+
+def _worker_process_main(fetch_func, parse_func, ticker_queue, payload_queue, report_queue):
+    """
+    The method run by each worker process of StockDataPipeline.run_multiprocess().
+    It fetches and parses tickers until it receives a None ticker, sending an
+    encoded payload per ticker to the writer process and a partial report of its
+    fetch/parse work to the main process.
+
+    """
+    process_report = {
+        "process": multiprocessing.current_process().name,
+        "skipped": [],
+        "failed": {},
+        "stage_seconds": {"fetch": 0.0, "parse": 0.0},
+        "fetch_durations": {}
+    }
+
+    while True:
+
+        ticker = ticker_queue.get()
+        if ticker is None:
+            break
+
+        fetch_start = time.perf_counter()
+        try:
+            raw_data = fetch_func(ticker)
+
+        except Exception as error:
+            process_report["failed"][ticker] = f"fetch: {type(error).__name__}: {error}"
+            continue
+
+        finally:
+            fetch_duration = time.perf_counter() - fetch_start
+            process_report["fetch_durations"][ticker] = fetch_duration
+            process_report["stage_seconds"]["fetch"] += fetch_duration
+
+        if raw_data is None:
+            process_report["skipped"].append(ticker)
+            continue
+
+        parse_start = time.perf_counter()
+        try:
+            payload = encode_stock_data_payload(ticker, parse_func(raw_data))
+
+        except Exception as error:
+            process_report["failed"][ticker] = f"parse: {type(error).__name__}: {error}"
+            continue
+
+        process_report["stage_seconds"]["parse"] += time.perf_counter() - parse_start
+
+        # Blocking here if the writer process is behind (backpressure):
+        payload_queue.put(payload)
+
+    # Signaling the writer process that this worker is complete:
+    payload_queue.put(None)
+    report_queue.put(process_report)
+
+def _writer_process_main(db_uri, data_type, write_batch_size, num_workers, payload_queue, report_queue, engine_kwargs=None):
+    """
+    The method run by the single writer process of StockDataPipeline.run_multiprocess().
+    It is the only process that connects to the database. It decodes payloads
+    from the worker processes and writes them in batches until every worker has
+    signaled that it is complete, then sends a partial report of its writes to
+    the main process.
+
+    """
+    engine_class, write_method_name = STOCK_DATA_TYPES[data_type][2:]
+    ingestion_engine = engine_class(db_uri, **(engine_kwargs or {}))
+    write_method = getattr(ingestion_engine, write_method_name)
+
+    process_report = {
+        "process": multiprocessing.current_process().name,
+        "written": 0,
+        "failed": {},
+        "rows_written": 0,
+        "batches_written": 0,
+        "stage_seconds": {"write": 0.0}
+    }
+
+    def write_batch(batch):
+        write_start = time.perf_counter()
+        written_batch, batches_written, write_failures = _write_stock_data_batch(
+            ingestion_engine, write_method, batch)
+
+        process_report["failed"].update(write_failures)
+        process_report["written"] += len(written_batch)
+        process_report["rows_written"] += sum(len(parsed_df) for ticker, parsed_df in written_batch)
+        process_report["batches_written"] += batches_written
+        process_report["stage_seconds"]["write"] += time.perf_counter() - write_start
+
+    batch = []
+    active_workers = num_workers
+    while active_workers > 0:
+
+        payload = payload_queue.get()
+        if payload is None:
+            active_workers -= 1
+            continue
+
+        batch.append(decode_stock_data_payload(payload))
+        if len(batch) >= write_batch_size:
+            write_batch(batch)
+            batch = []
+
+    # Writing the final partial batch:
+    if len(batch) > 0:
+        write_batch(batch)
+
+    ingestion_engine._sqlaengine.dispose()
+    report_queue.put(process_report)
+
+def format_pipeline_report(report):
+    """
+    The method formats the throughput report returned by StockDataPipeline.run()
+    into a human readable string.
+
+    Args:
+        report (dict): The report returned by StockDataPipeline.run().
+
+    Returns:
+        str: The formatted report.
+
+    """
+    report_lines = [
+        f"Tickers: {report['tickers']}  Written: {report['written']}  "
+        f"Skipped: {len(report['skipped'])}  Failed: {len(report['failed'])}",
+        f"Rows written: {report['rows_written']} in {report['batches_written']} batches",
+        f"Elapsed: {report['elapsed_seconds']:.2f}s  Throughput: {report['tickers_per_second']:.2f} tickers/s",
+        "Stage time: " + "  ".join(
+            f"{stage}={seconds:.2f}s" for stage, seconds in report["stage_seconds"].items())
+    ]
+    report_lines.extend(f"  FAILED {ticker}: {error}" for ticker, error in report["failed"].items())
+    report_lines.extend(
+        f"  PROCESS ERROR {process_name}: {error}" for process_name, error in report.get("process_errors", {}).items())
+
+    return "\n".join(report_lines)
+
+def main(argv=None):
+    """
+    The command line entry point for the StockDataPipeline. It compiles the ticker
+    list from a csv file, optionally selects a single shard of said list (for
+    running one shard per scheduler worker) and runs the pipeline, printing the
+    throughput report.
+
+    """
+    parser = argparse.ArgumentParser(
+        description="Ingest stock price or fund holdings data for a csv of ticker symbols.")
+    parser.add_argument("db_uri", help="The SQLAlchemy URI of the database to write to.")
+    parser.add_argument("ticker_csv", help="A csv file with a 'ticker_symbols' column.")
+    parser.add_argument("--data-type", choices=sorted(STOCK_DATA_TYPES), default="price")
+    parser.add_argument("--fetch-workers", type=int, default=8)
+    parser.add_argument("--parse-workers", type=int, default=2)
+    parser.add_argument("--worker-processes", type=int, default=0,
+        help="Run with this many fetch/parse processes and a dedicated writer process.")
+    parser.add_argument("--write-batch-size", type=int, default=50)
+    parser.add_argument("--queue-size", type=int, default=100)
+    parser.add_argument("--num-shards", type=int, default=1)
+    parser.add_argument("--shard-index", type=int, default=0)
+    parser.add_argument("--symbol-cache-uri", default=None,
+        help="The SQLAlchemy URI of a symbol metadata cache used to filter out non-fund holdings tickers.")
+    parser.add_argument("--derived-metrics", action="store_true",
+        help="Write the derived metrics (adjusted close, returns, volatility) alongside the prices.")
+    parser.add_argument("--materialize-bars", action="store_true",
+        help="Maintain the weekly and monthly bar tables of each written ticker.")
+    args = parser.parse_args(argv)
+
+    ticker_lst = compile_ticker_list(args.ticker_csv)
+    if args.num_shards > 1:
+        ticker_lst = shard_ticker_list(ticker_lst, args.num_shards, stable=True)[args.shard_index]
+
+    pipeline = StockDataPipeline(
+        args.db_uri,
+        data_type=args.data_type,
+        fetch_workers=args.fetch_workers,
+        parse_workers=args.parse_workers,
+        write_batch_size=args.write_batch_size,
+        queue_size=args.queue_size,
+        symbol_cache=SymbolMetadataCache(args.symbol_cache_uri) if args.symbol_cache_uri else None,
+        engine_kwargs={"derived_metrics": args.derived_metrics, "materialize_bars": args.materialize_bars}
+            if args.data_type == "price" else None)
+
+    if args.worker_processes > 0:
+        report = pipeline.run_multiprocess(ticker_lst, worker_processes=args.worker_processes)
+    else:
+        report = pipeline.run(ticker_lst)
+    print(format_pipeline_report(report))
+
+    return 0 if len(report["failed"]) == 0 and not report.get("process_errors") else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
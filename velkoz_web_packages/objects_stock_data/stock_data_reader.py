@@ -0,0 +1,434 @@
+# Importing native packages:
+import threading
+import collections
+
+# Importing velkoz web packages:
+from velkoz_web_packages.objects_base.ingestion_engines_base import add_write_listener, remove_write_listener
+from velkoz_web_packages.objects_stock_data.objects_fund_holdings.db_orm_models_fund_holdings import FundHoldingsModel
+from velkoz_web_packages.objects_stock_data.objects_symbols.db_orm_models_symbols import SymbolModel
+
+# Importing 3rd party packages:
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, inspect, select, func, and_, text
+
+"""
+The script contains the read side of the stock data library. The Ingestion Engines
+only write data, so the StockDataReader provides the queries used to read the
+price histories and fund holdings written by them back into pandas dataframes:
+
+* Reading the price history of one or several tickers, restricted to a date
+    range and a subset of columns.
+* Reading the latest holdings of a fund.
+* Loading the prices of many tickers into a single dense (date x ticker x field)
+    NumPy array for backtests.
+
+Reads are cached in a bounded LRU cache. The cached entries of a ticker are
+invalidated whenever an Ingestion Engine of the same process writes data for
+said ticker to the same database.
+
+"""
+
+class StockDataReader(object):
+    """
+    The StockDataReader reads the stock data written to a database by the
+    StockPriceDataIngestionEngine and the FundHoldingsDataIngestionEngine.
+
+    The full table of each ticker that is read is kept in an LRU cache of at most
+    cache_size entries, so that repeated reads of the same tickers (with any date
+    range or columns) are served from memory. The reader registers itself as a
+    write listener of the Ingestion Engines (see add_write_listener()): when an
+    Ingestion Engine commits data for a ticker to the database of the reader, the
+    cached entries of that ticker are dropped and the next read queries the
+    database again. Writes made by other processes are not seen by the listener;
+    the clear_cache() method can be called to drop every cached entry.
+
+    Dataframes returned by the reader are copies, so modifying them does not
+    modify the cache.
+
+    Args:
+        db_uri (str): The string URI of the database to read from.
+
+        cache_size (int): The maximum number of cached (data_type, ticker) entries.
+            Defaults to 256.
+
+    Attributes:
+        _db_uri (str): The URI of the database.
+
+        _sqlaengine (sqlalchemy.engine.Engine): The SQLAlchemy engine used to read
+            from the database.
+
+        _db_url (str): The rendered URL of the database, compared to the URL of
+            the writes the reader is notified of.
+
+        _cache_size (int): The maximum number of cached entries.
+
+        _cache (collections.OrderedDict): The cached {(data_type, ticker): dataframe}
+            entries, from least to most recently used. Tickers without data are
+            cached as None.
+
+        _cache_lock (threading.Lock): The lock guarding the cache and its statistics.
+
+        _cache_stats (dict): The hits, misses, evictions and invalidations of the cache.
+
+        _invalidation_count (int): The number of invalidations so far, used to
+            avoid caching a read that was concurrent with a write.
+
+    """
+    def __init__(self, db_uri, cache_size=256):
+
+        if cache_size < 1:
+            raise ValueError(f"The cache_size of the StockDataReader must be at least 1, not {cache_size}")
+
+        self._db_uri = db_uri
+        self._sqlaengine = create_engine(self._db_uri, pool_pre_ping=True)
+        self._db_url = str(self._sqlaengine.url)
+
+        self._cache_size = cache_size
+        self._cache = collections.OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+        self._invalidation_count = 0
+
+        # Invalidating cached tickers when they are written by an Ingestion Engine:
+        add_write_listener(self._invalidate_written)
+
+    def get_price_history(self, tickers, start=None, end=None, columns=None):
+        """
+        The method reads the price history of one or several tickers from the
+        “{ticker}_price_history” tables.
+
+        Args:
+            tickers (str or list): A ticker symbol or a list of ticker symbols.
+
+            start (str or datetime): The first date of the price history (inclusive).
+                Defaults to the first stored date.
+
+            end (str or datetime): The last date of the price history (inclusive).
+                Defaults to the last stored date.
+
+            columns (list): The price columns to read (eg: ["close", "volume"]).
+                Defaults to every column.
+
+        Returns:
+            pandas.DataFrame or dict: The price history indexed by date if a single
+                ticker is passed, else a {ticker: price history} dict. Tickers
+                without a price history table are None or left out of the dict.
+
+        """
+        if isinstance(tickers, str):
+            return self._select_price_history(self._get_cached("price", tickers), start, end, columns)
+
+        price_histories = {}
+        for ticker in tickers:
+            price_df = self._select_price_history(self._get_cached("price", ticker), start, end, columns)
+            if price_df is not None:
+                price_histories[ticker] = price_df
+
+        return price_histories
+
+    def get_price_panel(self, tickers, start, end, fields=("close",), chunk_size=100, memmap_path=None):
+        """
+        The method loads the prices of many tickers into a dense NumPy array of
+        shape (dates, tickers, fields) aligned on a business day calendar.
+
+        The array is preallocated and filled with NaN, then the price rows of the
+        tickers are read with a single UNION ALL query per chunk of chunk_size
+        tickers and written directly into the array, without building a dataframe
+        per ticker. Days without a price (holidays, missing data or tickers without
+        a price history table) are left as NaN and stored rows falling on weekends
+        are dropped. Panels are not cached.
+
+        Args:
+            tickers (list): The ticker symbols, in the order of the ticker axis.
+
+            start (str or datetime): The first date of the panel (inclusive).
+
+            end (str or datetime): The last date of the panel (inclusive).
+
+            fields (iterable): The price columns loaded, in the order of the field
+                axis. Defaults to ("close",). Fields missing from a ticker's table
+                are NaN.
+
+            chunk_size (int): The number of tickers read per query. Defaults to 100.
+
+            memmap_path (str): An optional path of a .npy file the panel is written
+                to as a memory-mapped array (see numpy.lib.format.open_memmap),
+                for universes too large to be held in memory.
+
+        Returns:
+            tuple: The (panel, dates, tickers) where panel is the float64 array
+                (or numpy.memmap), dates the pandas.DatetimeIndex of the date axis
+                and tickers the list of ticker symbols of the ticker axis.
+
+        """
+        tickers = list(tickers)
+        fields = list(fields)
+        dates = pd.bdate_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize())
+        panel_shape = (len(dates), len(tickers), len(fields))
+
+        # Preallocating the panel filled with NaN for the days without prices:
+        if memmap_path is not None:
+            panel = np.lib.format.open_memmap(memmap_path, mode="w+", dtype=np.float64, shape=panel_shape)
+            panel[:] = np.nan
+        else:
+            panel = np.full(panel_shape, np.nan)
+
+        if not len(dates):
+            return panel, dates, tickers
+
+        # Reading the dates as strings bound as query parameters so that they compare the same way on every database:
+        date_params = {
+            "start_date": dates[0].strftime("%Y-%m-%d"),
+            "end_date": (dates[-1] + pd.Timedelta(days=1)).strftime("%Y-%m-%d")}
+
+        for chunk_start in range(0, len(tickers), chunk_size):
+
+            with self._sqlaengine.connect() as db_con:
+
+                panel_query = self._build_price_panel_query(
+                    db_con, tickers[chunk_start:chunk_start + chunk_size], chunk_start, fields)
+                if panel_query is None:
+                    continue
+
+                price_rows = db_con.execute(panel_query, date_params).fetchall()
+
+            if not price_rows:
+                continue
+
+            ticker_positions, row_dates, *field_values = zip(*price_rows)
+
+            # Mapping each row onto the date axis, dropping the rows that are not business days:
+            date_positions = dates.get_indexer(pd.to_datetime(pd.Index(row_dates)).normalize())
+            on_calendar = date_positions >= 0
+
+            panel[date_positions[on_calendar], np.asarray(ticker_positions)[on_calendar], :] = np.column_stack([
+                np.asarray(values, dtype=np.float64) for values in field_values])[on_calendar]
+
+        if memmap_path is not None:
+            panel.flush()
+
+        return panel, dates, tickers
+
+    def _build_price_panel_query(self, db_con, ticker_chunk, chunk_start, fields):
+        """
+        The method builds the UNION ALL query reading the price rows of a chunk of
+        tickers between the :start_date and :end_date parameters. Each row is
+        (ticker_position, date, *fields), where ticker_position is the position of
+        the ticker on the ticker axis of the panel.
+
+        Args:
+            db_con (sqlalchemy.engine.Connection): The connection used to look up
+                the price history tables and their columns.
+
+        Returns:
+            sqlalchemy.sql.elements.TextClause: The query, or None if no ticker of
+                the chunk has a price history table.
+
+        """
+        db_inspector = inspect(db_con)
+        quote = db_con.dialect.identifier_preparer.quote
+
+        ticker_selects = []
+        for ticker_position, ticker in enumerate(ticker_chunk, start=chunk_start):
+
+            price_tbl = f"{ticker}_price_history"
+            if not db_con.dialect.has_table(db_con, price_tbl):
+                continue
+
+            # The date column is the index column written first by the StockPriceDataIngestionEngine:
+            tbl_columns = [column["name"] for column in db_inspector.get_columns(price_tbl)]
+            date_column = quote(tbl_columns[0])
+
+            field_columns = ", ".join(
+                f"{quote(field)} AS f{field_num}" if field in tbl_columns else f"NULL AS f{field_num}"
+                for field_num, field in enumerate(fields))
+
+            ticker_selects.append(
+                f"SELECT {ticker_position} AS ticker_position, {date_column} AS price_date, {field_columns} "
+                f"FROM {quote(price_tbl)} WHERE {date_column} >= :start_date AND {date_column} < :end_date")
+
+        return text(" UNION ALL ".join(ticker_selects)) if ticker_selects else None
+
+    def get_holdings(self, fund):
+        """
+        The method reads the latest holdings of a fund from the snapshots of the
+        “fund_holdings” table, falling back to the legacy “{fund}_holdings_data”
+        table written by earlier versions of the FundHoldingsDataIngestionEngine.
+
+        Args:
+            fund (str): The ticker symbol of the fund.
+
+        Returns:
+            pandas.DataFrame: The holdings indexed by symbol with the columns name
+                and percent_holdings, or None if no holdings are stored for the fund.
+
+        """
+        holdings_df = self._get_cached("holdings", fund)
+        return None if holdings_df is None else holdings_df.copy()
+
+    def get_cache_stats(self):
+        """
+        The method returns the statistics of the LRU cache of the reader.
+
+        Returns:
+            dict: The hits, misses, evictions and invalidations counters, the
+                hit_rate and the current and maximum size of the cache.
+
+        """
+        with self._cache_lock:
+            cache_stats = dict(self._cache_stats, size=len(self._cache), max_size=self._cache_size)
+
+        cache_reads = cache_stats["hits"] + cache_stats["misses"]
+        cache_stats["hit_rate"] = cache_stats["hits"] / cache_reads if cache_reads else 0.0
+
+        return cache_stats
+
+    def clear_cache(self):
+        """Drops every cached entry, eg: after data was written by another process."""
+        with self._cache_lock:
+            self._cache.clear()
+            self._invalidation_count += 1
+
+    def close(self):
+        """Unregisters the write listener of the reader and disposes of its database engine."""
+        remove_write_listener(self._invalidate_written)
+        self._sqlaengine.dispose()
+
+    def _get_cached(self, data_type, ticker):
+        """
+        The method returns the cached dataframe of a ticker, reading it from the
+        database and caching it on a miss. The least recently used entry is evicted
+        when the cache is full.
+
+        Args:
+            data_type (str): The kind of data read, "price" or "holdings".
+
+            ticker (str): The ticker symbol.
+
+        Returns:
+            pandas.DataFrame: The cached dataframe (not a copy) or None.
+
+        """
+        cache_key = (data_type, ticker)
+
+        with self._cache_lock:
+            if cache_key in self._cache:
+                self._cache.move_to_end(cache_key)
+                self._cache_stats["hits"] += 1
+                return self._cache[cache_key]
+
+            self._cache_stats["misses"] += 1
+            invalidation_count = self._invalidation_count
+
+        ticker_df = self._read_price_history(ticker) if data_type == "price" else self._read_holdings(ticker)
+
+        with self._cache_lock:
+
+            # Not caching the read if a write was committed while it was in progress:
+            if invalidation_count == self._invalidation_count:
+                self._cache[cache_key] = ticker_df
+                self._cache.move_to_end(cache_key)
+
+                while len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+                    self._cache_stats["evictions"] += 1
+
+        return ticker_df
+
+    def _invalidate_written(self, db_url, data_type, tickers):
+        """
+        The write listener dropping the cached entries of the tickers written to
+        the database of the reader.
+
+        Args:
+            db_url (str): The rendered URL of the written database.
+
+            data_type (str): The kind of data written.
+
+            tickers (frozenset): The ticker symbols written.
+
+        """
+        if db_url != self._db_url:
+            return
+
+        with self._cache_lock:
+            self._invalidation_count += 1
+
+            for ticker in tickers:
+                if self._cache.pop((data_type, ticker), False) is not False:
+                    self._cache_stats["invalidations"] += 1
+
+    def _has_table(self, tbl_name):
+        """Returns whether a table exists in the database of the reader."""
+        with self._sqlaengine.connect() as con:
+            return self._sqlaengine.dialect.has_table(con, tbl_name)
+
+    def _select_price_history(self, price_df, start, end, columns):
+        """Returns a copy of the rows between start and end and the columns of a cached price history."""
+        if price_df is None:
+            return None
+
+        price_df = price_df.loc[
+            pd.Timestamp(start) if start is not None else None:pd.Timestamp(end) if end is not None else None]
+
+        return price_df[list(columns)].copy() if columns is not None else price_df.copy()
+
+    def _read_price_history(self, ticker):
+        """
+        The method reads the “{ticker}_price_history” table of a ticker, indexed by
+        its date column and sorted by date.
+
+        Returns:
+            pandas.DataFrame: The price history or None if the table does not exist.
+
+        """
+        price_tbl = f"{ticker}_price_history"
+        if not self._has_table(price_tbl):
+            return None
+
+        price_df = pd.read_sql_table(price_tbl, self._sqlaengine)
+
+        # The index written by the StockPriceDataIngestionEngine is the first column:
+        price_df = price_df.set_index(price_df.columns[0])
+        price_df.index = pd.to_datetime(price_df.index)
+
+        return price_df.sort_index()
+
+    def _read_holdings(self, fund):
+        """
+        The method reads the latest holdings snapshot of a fund in a single query,
+        joining the snapshot rows to the symbols table.
+
+        Returns:
+            pandas.DataFrame: The holdings indexed by symbol or None.
+
+        """
+        if self._has_table(FundHoldingsModel.__table__.name):
+
+            holdings_table = FundHoldingsModel.__table__
+            fund_symbols = SymbolModel.__table__.alias("fund_symbols")
+            holding_symbols = SymbolModel.__table__.alias("holding_symbols")
+
+            fund_id = select([fund_symbols.c.symbol_id]).where(fund_symbols.c.symbol == fund).as_scalar()
+            latest_as_of_date = select([func.max(holdings_table.c.as_of_date)]).where(
+                holdings_table.c.fund_id == fund_id).as_scalar()
+
+            holdings_query = select([
+                holding_symbols.c.symbol, holdings_table.c.name, holdings_table.c.percent_holdings]).select_from(
+                holdings_table.join(holding_symbols, holdings_table.c.symbol_id == holding_symbols.c.symbol_id)).where(
+                and_(holdings_table.c.fund_id == fund_id, holdings_table.c.as_of_date == latest_as_of_date)).order_by(
+                holdings_table.c.percent_holdings.desc())
+
+            holdings_df = pd.read_sql(holdings_query, self._sqlaengine, index_col="symbol")
+            if not holdings_df.empty:
+                return holdings_df
+
+        if self._has_table(f"{fund}_holdings_data"):
+            return pd.read_sql_table(f"{fund}_holdings_data", self._sqlaengine, index_col="symbol")
+
+        return None
+
+    # Dunder Methods:
+    def __repr__(self):
+        return f"StockDataReader({self._db_uri}, cache_size={self._cache_size})"